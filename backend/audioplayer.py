@@ -1,21 +1,42 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import os
-import random
+import time
+import itertools
+import functools
+import threading
+from collections import deque
 from urllib.parse import urlparse
-import gi
-
-# pylint: disable=C0413
-gi.require_version("Gst", "1.0")
-from gi.repository import Gst
-import magic
 from cleep.exception import (
     MissingParameter,
+    InvalidParameter,
     CommandError,
-    CommandInfo,
 )
 from cleep.core import CleepModule
 from cleep.common import CATEGORIES
+from .lazyimport import Gst, GstController, magic
+from .loudnessanalyzer import LoudnessAnalyzer
+from .pipelineteardown import PipelineTeardown
+from .decoderbenchmark import DecoderBenchmark
+from .clipcache import ClipCache
+from .clipplayer import ClipPlayer
+from .track import Track
+from .player import Player, Playlist, PlayerInternal
+from .shuffleorder import ShuffleOrder
+
+
+def _player_locked(method):
+    """
+    Decorator running player command while holding player lock. Player identifier must be
+    the first command argument.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, player_uuid, *args, **kwargs):
+        with self._get_player_lock(player_uuid):
+            return method(self, player_uuid, *args, **kwargs)
+
+    return wrapper
 
 
 class Audioplayer(CleepModule):
@@ -47,16 +68,38 @@ class Audioplayer(CleepModule):
     MODULE_URLBUGS = "https://github.com/CleepDevice/cleepapp-audioplayer/issues"
 
     MODULE_CONFIG_FILE = "audioplayer.conf"
-    DEFAULT_CONFIG = {}
+    DEFAULT_CONFIG = {
+        "output_format": {
+            "rate": None,
+            "channels": None,
+            "format": None,
+        },
+        "loudness_analysis": False,
+        "loudness_workers": 1,
+        "loudness_niceness": 19,
+        "idle_timeout": 0,
+        "max_active_players": 0,
+        "delta_events": False,
+        "max_playlist_tracks": 20,
+        "decoders_ranking": {},
+        "warmup": False,
+        "audio_sink": {
+            "element": None,
+            "device": None,
+        },
+        "clip_cache_size": 4,
+    }
+    LOUDNESS_CACHE_FILE = "/etc/cleep/audioplayer.loudness.json"
 
     # Audio pipelines description according to audio type (mime)
     # Order matters: elements will be loaded as they are stored
+    # Decoder lists alternatives by preference, it is replaced by fastest one once decoders are ranked
     AUDIO_PIPELINE_ELEMENTS = {
         # MP3
         "audio/mpeg": {
             "tags": "id3demux",
             "parser": "mpegaudioparse",
-            "decoder": "mpg123audiodec",
+            "decoder": ["mpg123audiodec", "avdec_mp3"],
             "converter": "audioconvert",
             "gain": "rgvolume",
             "converter2": "audioconvert",
@@ -65,7 +108,7 @@ class Audioplayer(CleepModule):
         # FLAC
         "audio/flac": {
             "parser": "flacparse",
-            "decoder": "flacdec",
+            "decoder": ["flacdec", "avdec_flac"],
             "converter": "audioconvert",
             "gain": "rgvolume",
             "converter2": "audioconvert",
@@ -75,7 +118,7 @@ class Audioplayer(CleepModule):
         "audio/ogg": {
             "demux": "oggdemux",
             "tags": "oggparse",
-            "decoder": "vorbisdec",
+            "decoder": ["vorbisdec", "ivorbisdec", "avdec_vorbis"],
             "converter": "audioconvert",
             "gain": "rgvolume",
             "converter2": "audioconvert",
@@ -84,7 +127,7 @@ class Audioplayer(CleepModule):
         # AAC
         "audio/x-hx-aac-adts": {
             "parser": "aacparse",
-            "decoder": "faad",
+            "decoder": ["faad", "fdkaacdec", "avdec_aac"],
             "converter": "audioconvert",
             "gain": "rgvolume",
             "converter2": "audioconvert",
@@ -92,7 +135,7 @@ class Audioplayer(CleepModule):
         },
         "audio/x-hx-aac-adif": {
             "parser": "aacparse",
-            "decoder": "faad",
+            "decoder": ["faad", "fdkaacdec", "avdec_aac"],
             "converter": "audioconvert",
             "gain": "rgvolume",
             "converter2": "audioconvert",
@@ -100,21 +143,67 @@ class Audioplayer(CleepModule):
         },
         "audio/aac": {
             "parser": "aacparse",
-            "decoder": "faad",
+            "decoder": ["faad", "fdkaacdec", "avdec_aac"],
             "converter": "audioconvert",
             "gain": "rgvolume",
             "converter2": "audioconvert",
             "resampler": "audioresample",
         },
     }
-    MAX_PLAYLIST_TRACKS = 20
+    # elements required whatever the audio format, module does not start without them
+    REQUIRED_ELEMENTS = [
+        "filesrc",
+        "progressreport",
+        "volume",
+        "autoaudiosink",
+        "capsfilter",
+        "queue",
+    ]
+    # elements required to play url resources
+    STREAMING_ELEMENTS = ["souphttpsrc"]
+    # elements required to decode and play clips
+    CLIP_ELEMENTS = ["decodebin", "appsink", "appsrc"]
+    # upper bound of decoded clips cache size (MB)
+    MAX_CLIP_CACHE_SIZE = 64
+    # upper bound of configurable max playlist tracks
+    MAX_PLAYLIST_TRACKS = 100000
+    # max time to wait for pipeline preroll when resuming suspended player (seconds)
+    RESUME_TIMEOUT = 5
+    # volume fade curves
+    FADE_CURVES = ["linear", "cubic"]
+    # max volume fade duration (milliseconds)
+    MAX_FADE_DURATION = 60000
+    # window during which coalesced volume updates are merged (seconds)
+    VOLUME_COALESCE_DELAY = 0.1
+    # progress report frequency when position updates are disabled (seconds)
+    DEFAULT_PROGRESS_FREQ = 15
+    # max position updates interval (seconds)
+    MAX_POSITION_INTERVAL = 60
+    # number of recent events kept for late clients
+    EVENTS_BACKLOG_SIZE = 200
+    # audio sink buffering profiles: sink buffer and segment durations (microseconds) and
+    # duration buffered by a queue decoupling decoding from sink (milliseconds, 0 for no queue).
+    # Balanced profile matches audio sinks default values.
+    LATENCY_PROFILES = {
+        "low-latency": {"buffer_time": 40000, "latency_time": 10000, "queue_time": 0},
+        "balanced": {"buffer_time": 200000, "latency_time": 10000, "queue_time": 0},
+        "robust": {"buffer_time": 500000, "latency_time": 20000, "queue_time": 2000},
+    }
+    DEFAULT_LATENCY_PROFILE = "balanced"
 
+    # Output sample formats that can be fixed at pipeline output
+    OUTPUT_SAMPLE_FORMATS = ["S16LE", "S24LE", "S32LE", "F32LE", "F64LE"]
+    # Sample formats natively produced by rgvolume element. When output format is one of them,
+    # conversion after gain element is useless: the first converter does all the work at once
+    GAIN_SAMPLE_FORMATS = ["F32LE", "F64LE"]
+
+    # player states by Gst.State name (gstreamer is loaded on first use)
     PLAYER_STATES = {
-        Gst.State.VOID_PENDING: "stopped",
-        Gst.State.NULL: "stopped",
-        Gst.State.READY: "stopped",
-        Gst.State.PAUSED: "paused",
-        Gst.State.PLAYING: "playing",
+        "VOID_PENDING": "stopped",
+        "NULL": "stopped",
+        "READY": "stopped",
+        "PAUSED": "paused",
+        "PLAYING": "playing",
     }
 
     def __init__(self, bootstrap, debug_enabled):
@@ -129,13 +218,61 @@ class Audioplayer(CleepModule):
 
         # list of players. Players are volatile data and must be hold by creator::
         #   {
-        #       player_uuid (string): {
-        #           see list of fields in __create_player
-        #       },
+        #       player_uuid (string): Player,
         #       ...
         #   }
         self.players = {}
+        # registry lock protects players dict, each player state is protected by its own lock.
+        # Player lock can be held while acquiring registry lock, never the opposite.
+        self.__players_lock = threading.RLock()
+        self.__players_locks = {}
+        # output caps negotiated with audio sink (None if output format is not fixed)
+        self.output_caps = None
+        self.loudness_analyzer = None
+        # gstreamer is initialized on first command that needs it
+        self.__gstreamer_lock = threading.Lock()
+        self.__gstreamer_ready = False
+        self.__player_states = None
+        # gstreamer element factories resolved at startup by element name
+        self.element_factories = {}
+        # audio formats whose pipeline elements are all available
+        self.supported_formats = []
+        # decoder used by each supported audio format
+        self.decoders = {}
+        # concrete audio sink used by all pipelines, resolved once (see __resolve_audio_sink)
+        self.audio_sink = None
+        # released pipelines are stopped and freed in background
+        self.pipeline_teardown = PipelineTeardown(self.logger)
+        # decoded clips and persistent pipeline playing them
+        self.clip_cache = None
+        self.clip_player = ClipPlayer(self.logger)
+        # delay before releasing pipeline of paused player (seconds, 0 to disable)
+        self.idle_timeout = 0
+        # max number of players with allocated pipeline (0 for unlimited)
+        self.max_active_players = 0
+        # send only changed fields in playback update events
+        self.delta_events = False
+        # max number of tracks in player playlist
+        self.max_playlist_tracks = 20
+        # latest pending coalesced volume per player
+        self.__pending_volumes = {}
+        self.__pending_volumes_lock = threading.Lock()
+        self.__pending_volumes_timer = None
+        self.stats = {
+            "volume_updates": 0,
+            "volume_merged": 0,
+        }
+        # track identifiers generator, ids are unique across players
+        self.__track_ids = itertools.count(1)
+        # recent events with their sequence id (position events are not kept)
+        self.events_backlog = deque(maxlen=self.EVENTS_BACKLOG_SIZE)
+        self.events_seq = 0
+        self.__events_lock = threading.Lock()
         self.event_playback_update = self._get_event("audioplayer.playback.update")
+        self.event_playback_position = self._get_event(
+            "audioplayer.playback.position"
+        )
+        self.event_playlist_update = self._get_event("audioplayer.playlist.update")
 
     def _configure(self):
         """
@@ -143,18 +280,359 @@ class Audioplayer(CleepModule):
         Use this function to configure your variables and local stuff that is not blocking.
         At this time other applications are not started and all your command requests will fail.
         """
-        Gst.init(None)
+        config = self._get_config()
+        self.idle_timeout = config["idle_timeout"]
+        self.max_active_players = config["max_active_players"]
+        self.delta_events = config["delta_events"]
+        self.max_playlist_tracks = config["max_playlist_tracks"]
+        self.loudness_analyzer = LoudnessAnalyzer(
+            self.logger,
+            self.cleep_filesystem,
+            self.LOUDNESS_CACHE_FILE,
+            config["loudness_workers"],
+            config["loudness_niceness"],
+        )
+        if config["loudness_analysis"]:
+            self.loudness_analyzer.start()
+        self.pipeline_teardown.start()
+        self.clip_cache = ClipCache(
+            self.logger, config["clip_cache_size"] * 1024 * 1024
+        )
+        if config["warmup"]:
+            threading.Thread(target=self._warmup, name="warmup", daemon=True).start()
+
+    def _init_gstreamer(self):
+        """
+        Load and initialize gstreamer if not already done. Gstreamer is not loaded at startup
+        to not slow down Cleep start, it is initialized by first command that needs it.
+        """
+        if self.__gstreamer_ready:
+            return
+        with self.__gstreamer_lock:
+            if self.__gstreamer_ready:
+                return
+            start = time.perf_counter()
+            Gst.init(None)
+            self.__resolve_element_factories()
+            self.__resolve_audio_sink()
+            self.__negotiate_output_caps()
+            self.__gstreamer_ready = True
+            self.logger.info(
+                "Gstreamer initialized in %.0fms", (time.perf_counter() - start) * 1000
+            )
+
+    def _warmup(self):
+        """
+        Instantiate once pipeline of each supported audio format to load gstreamer plugins,
+        decoders libraries and audio sink before first playback command.
+        Pipelines end with a fake sink and are discarded once ready.
+        """
+        try:
+            start = time.perf_counter()
+            self._init_gstreamer()
+
+            # opening audio device is the slowest part of first pipeline startup
+            sink = self.__make_sink()
+            sink.set_state(Gst.State.READY)
+            sink.set_state(Gst.State.NULL)
+
+            for audio_format in self.supported_formats:
+                format_start = time.perf_counter()
+                self.__warmup_pipeline(audio_format)
+                self.logger.debug(
+                    'Warm-up of "%s" pipeline took %.0fms',
+                    audio_format,
+                    (time.perf_counter() - format_start) * 1000,
+                )
+
+            self.logger.info(
+                "Warm-up done in %.0fms", (time.perf_counter() - start) * 1000
+            )
+        except Exception:
+            self.logger.exception("Error during warm-up")
+
+    def __warmup_pipeline(self, audio_format):
+        """
+        Build pipeline of specified audio format ending with fake sink, bring it to ready state and
+        release it
+
+        Args:
+            audio_format (string): audio format (mime type)
+        """
+        pipeline = Gst.Pipeline.new(f"warmup-{audio_format}")
+        elements = [
+            self.__make_element(value, key)
+            for key, value in self.__get_pipeline_elements(audio_format).items()
+        ]
+        elements.append(Gst.ElementFactory.make("fakesink", "sink"))
+        for element in elements:
+            pipeline.add(element)
+        try:
+            for current, following in zip(elements, elements[1:]):
+                current.link(following)
+            pipeline.set_state(Gst.State.READY)
+        finally:
+            pipeline.set_state(Gst.State.NULL)
+            PipelineTeardown.teardown(pipeline, elements)
+
+    def __resolve_element_factories(self):
+        """
+        Resolve once factories of all gstreamer elements used in pipelines.
+        Audio formats with missing elements are disabled.
+
+        Raises:
+            Exception: if a required element is missing
+        """
+        names = set(
+            self.REQUIRED_ELEMENTS + self.STREAMING_ELEMENTS + self.CLIP_ELEMENTS
+        )
+        for elements in self.AUDIO_PIPELINE_ELEMENTS.values():
+            for value in elements.values():
+                names.update(value if isinstance(value, list) else [value])
+
+        self.element_factories = {}
+        for name in sorted(names):
+            factory = Gst.ElementFactory.find(name)
+            if factory:
+                self.element_factories[name] = factory
+            else:
+                self.logger.warning('Gstreamer element "%s" is not installed', name)
+
+        missing = [
+            name
+            for name in self.REQUIRED_ELEMENTS
+            if name not in self.element_factories
+        ]
+        if missing:
+            raise Exception(
+                f'Required gstreamer elements are missing: {", ".join(missing)}'
+            )
+
+        self.supported_formats = [
+            audio_format
+            for audio_format in self.AUDIO_PIPELINE_ELEMENTS
+            if not self.__get_missing_elements(audio_format)
+        ]
+        self.logger.info("Supported audio formats: %s", self.supported_formats)
+        self.__select_decoders()
+
+    def __get_missing_elements(self, audio_format):
+        """
+        Return pipeline elements of specified audio format that are not installed.
+        Decoder is missing only if none of its alternatives is installed.
+
+        Args:
+            audio_format (string): audio format (mime type)
+
+        Returns:
+            list: names of missing elements
+        """
+        missing = []
+        for value in self.AUDIO_PIPELINE_ELEMENTS[audio_format].values():
+            names = value if isinstance(value, list) else [value]
+            if not any(name in self.element_factories for name in names):
+                missing.extend(names)
+        return missing
+
+    def __get_installed_decoders(self, audio_format):
+        """
+        Return installed decoders of specified audio format, fastest first according to
+        last ranking, then by preference
+
+        Args:
+            audio_format (string): audio format (mime type)
+
+        Returns:
+            list: decoder names
+        """
+        candidates = self.AUDIO_PIPELINE_ELEMENTS[audio_format]["decoder"]
+        ranking = self._get_config_field("decoders_ranking").get(audio_format, [])
+        ranked = [
+            result["decoder"]
+            for result in ranking
+            if result["cpu"] is not None and result["decoder"] in candidates
+        ]
+        decoders = ranked + [name for name in candidates if name not in ranked]
+        return [name for name in decoders if name in self.element_factories]
+
+    def __select_decoders(self):
+        """
+        Select decoder of each supported audio format
+        """
+        self.decoders = {}
+        for audio_format in self.supported_formats:
+            self.decoders[audio_format] = self.__get_installed_decoders(audio_format)[0]
+        self.logger.debug("Selected decoders: %s", self.decoders)
+
+    def __make_element(self, factory_name, name):
+        """
+        Create gstreamer element from factory resolved at startup
+
+        Args:
+            factory_name (string): element factory name
+            name (string): element name
+
+        Returns:
+            Gst.Element: created element or None if factory is not available
+        """
+        factory = self.element_factories.get(factory_name)
+        return factory.create(name) if factory else None
+
+    def __resolve_audio_sink(self):
+        """
+        Resolve once concrete audio sink used by all pipelines. Configured sink is used if any,
+        otherwise autoaudiosink is probed once to find the sink and device it selects, instead of
+        probing available sinks each time a pipeline starts.
+        """
+        config = self._get_config_field("audio_sink")
+        if config.get("element"):
+            if self.__find_sink_factory(config["element"]):
+                self.audio_sink = {
+                    "element": config["element"],
+                    "device": config.get("device"),
+                }
+                self.logger.info("Use configured audio sink: %s", self.audio_sink)
+                return
+            self.logger.warning(
+                'Configured audio sink "%s" is not installed, probe audio sink',
+                config["element"],
+            )
+
+        self.audio_sink = {"element": "autoaudiosink", "device": None}
+        sink = self.__make_element("autoaudiosink", "sink")
+        try:
+            # autoaudiosink selects its child sink when it gets ready
+            sink.set_state(Gst.State.READY)
+            if sink.get_children_count() == 0:
+                self.logger.warning("No audio sink found by autoaudiosink")
+                return
+            child = sink.get_child_by_index(0)
+            element = child.get_factory().get_name()
+            if not self.__find_sink_factory(element):
+                return
+            device = (
+                child.get_property("device") if child.find_property("device") else None
+            )
+            self.audio_sink = {"element": element, "device": device}
+            self.logger.info("Audio sink resolved: %s", self.audio_sink)
+        except Exception:
+            self.logger.exception("Error probing audio sink, autoaudiosink is used")
+        finally:
+            sink.set_state(Gst.State.NULL)
+
+    def __find_sink_factory(self, element):
+        """
+        Find factory of specified audio sink and keep it with resolved factories
+
+        Args:
+            element (string): sink element name
+
+        Returns:
+            bool: True if sink factory is available
+        """
+        if element not in self.element_factories:
+            factory = Gst.ElementFactory.find(element)
+            if not factory:
+                return False
+            self.element_factories[element] = factory
+        return True
+
+    def __make_sink(self):
+        """
+        Create resolved audio sink
+
+        Returns:
+            Gst.Element: audio sink
+        """
+        sink = self.__make_element(self.audio_sink["element"], "sink")
+        if self.audio_sink["device"] is not None:
+            sink.set_property("device", self.audio_sink["device"])
+        return sink
+
+    def __negotiate_output_caps(self):
+        """
+        Negotiate configured output format with audio sink once for all players.
+        If sink does not support configured format, output format is not fixed and
+        pipelines negotiate their format as usual.
+        """
+        self.output_caps = None
+        output_format = self._get_config_field("output_format")
+        fields = []
+        if output_format.get("format"):
+            fields.append(f'format={output_format["format"]}')
+        if output_format.get("rate"):
+            fields.append(f'rate={output_format["rate"]}')
+        if output_format.get("channels"):
+            fields.append(f'channels={output_format["channels"]}')
+        if not fields:
+            self.logger.debug("No output format configured")
+            return
+
+        caps = Gst.Caps.from_string(",".join(["audio/x-raw"] + fields))
+        sink = self.__make_sink()
+        try:
+            # sink must be ready to expose real device caps
+            sink.set_state(Gst.State.READY)
+            sink_caps = sink.get_static_pad("sink").query_caps(None)
+            if not caps.can_intersect(sink_caps):
+                self.logger.warning(
+                    "Output format %s is not supported by audio sink, output format is not fixed",
+                    caps.to_string(),
+                )
+                return
+            self.output_caps = caps.intersect(sink_caps)
+            self.logger.info(
+                "Output format negotiated with audio sink: %s",
+                self.output_caps.to_string(),
+            )
+        except Exception:
+            self.logger.exception("Error negotiating output format with audio sink")
+        finally:
+            sink.set_state(Gst.State.NULL)
 
     def _on_stop(self):
         """
         Stop module
         """
+        if self.loudness_analyzer:
+            self.loudness_analyzer.stop()
+        if self.__pending_volumes_timer:
+            self.__pending_volumes_timer.cancel()
+
         # destroy all players
-        players_to_delete = [
-            player_uuid for player_uuid, player in self.players.items()
-        ]
-        for player_uuid in players_to_delete:
-            self.__destroy_player(self.players[player_uuid])
+        for player in self._get_players_snapshot():
+            self.__destroy_player(player)
+        self.pipeline_teardown.stop()
+        self.clip_player.stop()
+
+    def _get_player_lock(self, player_uuid):
+        """
+        Return lock of specified player. Registry lock is returned for unknown player.
+
+        Args:
+            player_uuid (string): player identifier
+
+        Returns:
+            threading.RLock: player lock
+        """
+        with self.__players_lock:
+            if player_uuid not in self.players:
+                return self.__players_lock
+            lock = self.__players_locks.get(player_uuid)
+            if lock is None:
+                lock = threading.RLock()
+                self.__players_locks[player_uuid] = lock
+            return lock
+
+    def _get_players_snapshot(self):
+        """
+        Return copy of players list safe to iterate while players are added or removed
+
+        Returns:
+            list: list of players
+        """
+        with self.__players_lock:
+            return list(self.players.values())
 
     def __prepare_player(self, player_uuid, source, audio_format):
         """
@@ -168,7 +646,7 @@ class Audioplayer(CleepModule):
             audio_format (string): audio format (mime)
 
         Returns:
-            player (dict): player as returned by __create_player
+            player (Player): player
         """
         if player_uuid not in self.players:
             raise Exception(f'Player "{player_uuid}" does not exist')
@@ -184,81 +662,36 @@ class Audioplayer(CleepModule):
         Create player structure
 
         Returns:
-            dict: player structure::
-
-            {
-                uuid (string): player uuid
-                state (string): player state (see PLAYER_STATE_XXX)
-                player (Gst.Pipeline): direct access to pipeline (aka player) (default None)
-                playlist (dict): {
-                    current_index (number): current track (default None)
-                    tracks (list): list of tracks (default [])
-                }
-                source (Gst.ElementFactory): direct access to source element (default None)
-                volume (Gst.ElementFactory): direct access to volume element (default None)
-                pipeline (dict): all pipeline elements (default [])
-            }
-
+            Player: new player with empty playlist
         """
-        return {
-            "uuid": self._get_unique_id(),
-            "playlist": {
-                "index": None,
-                "duration": None,
-                "tracks": [],
-                "repeat": False,
-                "shuffle": False,
-                "volume": 0,
-                "metadata": None,
-            },
-            "player": None,
-            "source": None,
-            "volume": None,
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": False,
-                "last_state": Gst.State.NULL,
-            },
-        }
+        return Player(
+            self._get_unique_id(),
+            playlist=Playlist(),
+            internal=PlayerInternal(last_used=time.time()),
+        )
 
     # pylint: disable=R0201
     def __reset_player(self, player):
         """
-        Reset existing player deleting gstreamer pipeline elements and resetting some internals flags
+        Reset existing player detaching its gstreamer pipeline and resetting some internals flags.
+        Pipeline is stopped here, releasing audio device before any new pipeline starts on it, then its
+        elements are deleted by teardown worker.
 
         Args:
-            player (dict): structure as returned by __create_player
+            player (Player): player
         """
-        # make sure player is stopped
-        if player["player"]:
-            player["player"].set_state(Gst.State.NULL)
-
-        # unlink pipeline elements
-        previous = None
-        for _, current in reversed(list(enumerate(player["pipeline"]))):
-            if not previous:
-                # last element linked to nothing, drop it
-                previous = current
-                continue
+        if player.player:
+            player.player.set_state(Gst.State.NULL)
+            self.pipeline_teardown.submit(player.player, list(player.pipeline))
 
-            current.unlink(previous)
-            previous = current
-
-        # remove elements from pipeline
-        pipeline = player["player"]
-        for element in player["pipeline"]:
-            pipeline.remove(element)
-
-        # finally destroy pipeline and reset player
-        del pipeline
-        player["pipeline"].clear()
-        player["player"] = None
-        player["source"] = None
-        player["volume"] = None
-        player["playlist"]["metadata"] = None
-        player["internal"]["tags_sent"] = False
-        player["internal"]["last_state"] = Gst.State.NULL
+        player.pipeline.clear()
+        player.player = None
+        player.source = None
+        player.volume = None
+        player.playlist.metadata = None
+        player.internal.tags_sent = False
+        player.internal.fade = None
+        player.internal.last_state = Gst.State.NULL
 
     # pylint: disable=R0201
     def _destroy_player(self, player):
@@ -266,15 +699,46 @@ class Audioplayer(CleepModule):
         Set player destroy flag to True to perform safe player deletion during
         process loop
         """
-        player["internal"]["to_destroy"] = True
+        player.internal.to_destroy = True
 
     # pylint: disable=R0201
     def __destroy_player(self, player):
         """
         Destroy player. This method should be exclusively used during app cycle life.
         """
-        self.__reset_player(player)
-        del self.players[player["uuid"]]
+        with self._get_player_lock(player.uuid):
+            self.__reset_player(player)
+            with self.__players_lock:
+                self.players.pop(player.uuid, None)
+                self.__players_locks.pop(player.uuid, None)
+
+    def __get_pipeline_elements(self, audio_format):
+        """
+        Return pipeline elements for specified audio format according to negotiated output format
+
+        Args:
+            audio_format (string): audio format (mime type)
+
+        Returns:
+            dict: pipeline elements (see AUDIO_PIPELINE_ELEMENTS)
+        """
+        elements = dict(
+            self.AUDIO_PIPELINE_ELEMENTS[audio_format],
+            decoder=self.decoders[audio_format],
+        )
+        if not self.output_caps:
+            return elements
+
+        # when output is fixed to gain sample format, first converter converts decoded
+        # samples to final format and channels, second one would always run in passthrough.
+        # Other output formats keep all stages, capsfilter only fixes the format negotiated.
+        output_format = self._get_config_field("output_format")
+        if output_format.get("format") in self.GAIN_SAMPLE_FORMATS:
+            elements = {
+                key: value for key, value in elements.items() if key != "converter2"
+            }
+
+        return elements
 
     def __build_pipeline(self, source, audio_format, player):
         """
@@ -283,81 +747,382 @@ class Audioplayer(CleepModule):
         Args:
             source (Gst.ElementFactory): gstreamer source element
             audio_format (string): audio format (mime type)
-            player (dict): player structure as returned by __create_player
+            player (Player): player
         """
         # create default mandatory elements
-        pipeline = Gst.Pipeline.new(player["uuid"])
-        progress = Gst.ElementFactory.make("progressreport", "progress")
-        progress.set_property("update-freq", 15)
+        pipeline = Gst.Pipeline.new(player.uuid)
+        progress = self.__make_element("progressreport", "progress")
+        progress.set_property(
+            "update-freq",
+            player.internal.position_interval or self.DEFAULT_PROGRESS_FREQ,
+        )
         progress.set_property("silent", True)
-        volume = Gst.ElementFactory.make("volume", "volume")
-        sink = Gst.ElementFactory.make("autoaudiosink", "sink")
+        volume = self.__make_element("volume", "volume")
+        sink = self.__make_sink()
+        profile = self.LATENCY_PROFILES[player.internal.latency_profile]
+        self.__apply_latency_profile(sink, profile)
 
         # prepare player pipeline elements
-        self.logger.debug("Prepare player %s pipeline", player["uuid"])
-        elements = self.AUDIO_PIPELINE_ELEMENTS[audio_format]
-        player["pipeline"].append(source)
-        player["pipeline"].append(progress)
+        self.logger.debug("Prepare player %s pipeline", player.uuid)
+        elements = self.__get_pipeline_elements(audio_format)
+        player.pipeline.append(source)
+        player.pipeline.append(progress)
         for (key, value) in elements.items():
-            element = Gst.ElementFactory.make(value, key)
+            element = self.__make_element(value, key)
             if not element:
                 self.logger.error(
                     'No gstreamer element created for "%s:%s"', key, value
                 )
                 raise Exception("Error configuring audio player")
-            player["pipeline"].append(element)
-        player["pipeline"].append(volume)
-        player["pipeline"].append(sink)
+            player.pipeline.append(element)
+        if self.output_caps:
+            # fix output format: converters and resampler run in passthrough when
+            # decoded stream already matches it
+            caps_filter = self.__make_element("capsfilter", "outputcaps")
+            caps_filter.set_property("caps", self.output_caps)
+            player.pipeline.append(caps_filter)
+        if profile["queue_time"]:
+            # volume stays after queue so volume changes are not delayed by buffered audio
+            queue = self.__make_element("queue", "queue")
+            queue.set_property("max-size-time", profile["queue_time"] * Gst.MSECOND)
+            queue.set_property("max-size-buffers", 0)
+            queue.set_property("max-size-bytes", 0)
+            player.pipeline.append(queue)
+        player.pipeline.append(volume)
+        player.pipeline.append(sink)
 
         # build player pipeline
-        self.logger.trace(f'build player {player["uuid"]} pipeline')
-        previous_element = player["pipeline"][0]
+        self.logger.trace(f'build player {player.uuid} pipeline')
+        previous_element = player.pipeline[0]
         pipeline.add(previous_element)
-        for current_element in player["pipeline"][1:]:
+        for current_element in player.pipeline[1:]:
             pipeline.add(current_element)
             self.logger.trace(" - Link %s to %s", previous_element, current_element)
             previous_element.link(current_element)
             previous_element = current_element
 
         # set player shortcuts
-        player["source"] = source
-        player["volume"] = volume
-        player["player"] = pipeline
+        player.source = source
+        player.volume = volume
+        player.player = pipeline
+
+    def __apply_latency_profile(self, sink, profile):
+        """
+        Configure audio sink buffering according to latency profile
+
+        Args:
+            sink (Gst.Element): audio sink
+            profile (dict): latency profile (see LATENCY_PROFILES)
+        """
+        if not sink.find_property("buffer-time"):
+            # autoaudiosink fallback does not expose its child sink properties
+            self.logger.debug("Audio sink buffering can't be configured")
+            return
+        sink.set_property("buffer-time", profile["buffer_time"])
+        sink.set_property("latency-time", profile["latency_time"])
+
+    def __suspend_player(self, player):
+        """
+        Release pipeline of idle player keeping its playlist and position.
+        Pipeline is rebuilt lazily on next playback command.
+
+        Args:
+            player (Player): player
+        """
+        success, position = player.player.query_position(Gst.Format.TIME)
+        self.logger.info(
+            'Player "%s" is idle, release its pipeline at position %s',
+            player.uuid,
+            position if success else 0,
+        )
+        self.__reset_player(player)
+        player.internal.position = position if success else 0
+        player.internal.paused_since = None
+        player.internal.last_state = Gst.State.PAUSED
+
+    def __resume_player(self, player_uuid, paused=False):
+        """
+        Rebuild pipeline of suspended player and restore track position
+
+        Args:
+            player_uuid (string): player identifier
+            paused (bool, optional): resume player paused. Defaults to False.
+        """
+        player = self.players[player_uuid]
+        position = player.internal.position
+        track = player.playlist.tracks[player.playlist.index]
+        self.logger.debug(
+            'Resume player "%s" at position %s', player_uuid, position
+        )
+        self.__play_track(track, player_uuid, paused=True)
+        if position:
+            # seek is only possible once pipeline is prerolled
+            player.player.get_state(self.RESUME_TIMEOUT * Gst.SECOND)
+            player.player.seek_simple(
+                Gst.Format.TIME,
+                Gst.SeekFlags.FLUSH | Gst.SeekFlags.KEY_UNIT,
+                position,
+            )
+        player.internal.position = 0
+        if not paused:
+            player.player.set_state(Gst.State.PLAYING)
+
+    def __get_active_players(self):
+        """
+        Return players that own a pipeline
+
+        Returns:
+            list: list of players
+        """
+        return [
+            player
+            for player in self._get_players_snapshot()
+            if player.player and not player.internal.to_destroy
+        ]
+
+    def __ensure_pipeline_budget(self, player_uuid=None):
+        """
+        Make sure a new pipeline can be allocated, suspending least recently used paused players if necessary
+
+        Args:
+            player_uuid (string, optional): player that needs a pipeline. Defaults to None.
+
+        Raises:
+            CommandError: if all active players are playing and budget is exhausted
+        """
+        if not self.max_active_players:
+            return
+
+        active_players = [
+            player
+            for player in self.__get_active_players()
+            if player.uuid != player_uuid
+        ]
+        busy_players = []
+        while len(active_players) >= self.max_active_players:
+            paused_players = [
+                player
+                for player in active_players
+                if player.internal.last_state == Gst.State.PAUSED
+                and player not in busy_players
+            ]
+            if not paused_players:
+                raise CommandError(
+                    f"Maximum number of active players reached ({self.max_active_players})"
+                )
+            lru_player = min(
+                paused_players, key=lambda player: player.internal.last_used
+            )
+            # never wait for another player lock to avoid deadlock between commands
+            lock = self._get_player_lock(lru_player.uuid)
+            if not lock.acquire(blocking=False):
+                busy_players.append(lru_player)
+                continue
+            try:
+                self.__suspend_player(lru_player)
+            finally:
+                lock.release()
+            active_players.remove(lru_player)
+
+    def __fade_volume(self, player_uuid, volume, duration, curve="linear", action=None):
+        """
+        Fade player volume inside pipeline using a control source on volume element
+
+        Args:
+            player_uuid (string): player identifier
+            volume (int): target volume (percentage)
+            duration (int): fade duration (milliseconds)
+            curve (string, optional): fade curve (see FADE_CURVES). Defaults to "linear".
+            action (string, optional): action to perform at end of fade ("pause" or "stop"). Defaults to None.
+        """
+        player = self.players[player_uuid]
+        self.__cancel_fade(player)
+        if action is None:
+            player.playlist.volume = volume
+        if not player.player:
+            # suspended player, volume is applied when pipeline is rebuilt
+            return
+
+        # control source values are synchronized on stream time
+        success, position = player.player.query_position(Gst.Format.TIME)
+        position = position if success else 0
+        end = position + duration * Gst.MSECOND
+        control_source = GstController.InterpolationControlSource()
+        control_source.set_property(
+            "mode",
+            GstController.InterpolationMode.CUBIC_MONOTONIC
+            if curve == "cubic"
+            else GstController.InterpolationMode.LINEAR,
+        )
+        control_source.set(position, player.volume.get_property("volume"))
+        control_source.set(end, float(volume / 100.0))
+        binding = GstController.DirectControlBinding.new_absolute(
+            player.volume, "volume", control_source
+        )
+        player.volume.add_control_binding(binding)
+        player.internal.fade = {
+            "binding": binding,
+            "volume": volume,
+            "end": end,
+            "action": action,
+        }
+        self.logger.debug(
+            'Player "%s" fades volume to %s in %sms (action=%s)',
+            player_uuid,
+            volume,
+            duration,
+            action,
+        )
+
+    def __fade_in(self, player_uuid, duration):
+        """
+        Fade player volume from silence to player volume
+
+        Args:
+            player_uuid (string): player identifier
+            duration (int): fade duration (milliseconds)
+        """
+        player = self.players[player_uuid]
+        player.volume.set_property("volume", 0.0)
+        self.__fade_volume(player_uuid, player.playlist.volume, duration)
+
+    def __cancel_fade(self, player):
+        """
+        Remove running fade control binding
+
+        Args:
+            player (Player): player
+        """
+        fade = player.internal.fade
+        if not fade:
+            return
+        player.internal.fade = None
+        if player.volume:
+            player.volume.remove_control_binding(fade["binding"])
+
+    def __pop_fade_action(self, player_uuid):
+        """
+        Cancel running fade of player and return action it should perform at its end
+
+        Args:
+            player_uuid (string): player identifier
+
+        Returns:
+            string: fade action ("pause" or "stop") or None
+        """
+        player = self.players[player_uuid]
+        fade = player.internal.fade
+        if not fade:
+            return None
+        self.__cancel_fade(player)
+        return fade["action"]
+
+    def __process_fades(self):
+        """
+        Finalize ended volume fades and perform their action
+        """
+        players_fades = [
+            player
+            for player in self._get_players_snapshot()
+            if player.internal.fade and player.player
+        ]
+        for player in players_fades:
+            with self._get_player_lock(player.uuid):
+                self.__process_fade(player.uuid, player)
+
+    def __process_fade(self, player_uuid, player):
+        """
+        Finalize player volume fade if ended
+
+        Args:
+            player_uuid (string): player identifier
+            player (Player): player
+        """
+        fade = player.internal.fade
+        if not fade or not player.player:
+            return
+        success, position = player.player.query_position(Gst.Format.TIME)
+        if not success or position < fade["end"]:
+            return
+
+        self.__cancel_fade(player)
+        if fade["action"] == "stop":
+            self.__stop_player(player_uuid)
+        elif fade["action"] == "pause":
+            player.player.set_state(Gst.State.PAUSED)
+            # restore volume for next resume
+            player.volume.set_property(
+                "volume", float(player.playlist.volume / 100.0)
+            )
+        else:
+            player.volume.set_property("volume", float(fade["volume"] / 100.0))
+
+    def __reap_idle_players(self):
+        """
+        Release pipeline of players paused for more than idle timeout
+        """
+        if not self.idle_timeout:
+            return
+
+        now = time.time()
+        for player in self._get_players_snapshot():
+            with self._get_player_lock(player.uuid):
+                if not player.player or player.internal.to_destroy:
+                    continue
+                if player.internal.last_state != Gst.State.PAUSED:
+                    player.internal.paused_since = None
+                elif player.internal.paused_since is None:
+                    player.internal.paused_since = now
+                elif now - player.internal.paused_since >= self.idle_timeout:
+                    self.__suspend_player(player)
 
     def _on_process(self):
         """
         On process
         """
         self.__process_players_messages()
+        self.__process_fades()
+        self.__reap_idle_players()
+        self.clip_player.process()
 
         # destroy players
         players_to_delete = [
-            player_uuid
-            for player_uuid, player in self.players.items()
-            if player["internal"]["to_destroy"]
+            player
+            for player in self._get_players_snapshot()
+            if player.internal.to_destroy
         ]
         if len(players_to_delete) > 0:
-            self.logger.debug("Players to delete: %s", players_to_delete)
-            for player_uuid in players_to_delete:
-                self.__destroy_player(self.players[player_uuid])
+            self.logger.debug(
+                "Players to delete: %s", [player.uuid for player in players_to_delete]
+            )
+            for player in players_to_delete:
+                self.__destroy_player(player)
 
     def __process_players_messages(self):
         """
         Process all players messages
         """
-        for player_uuid, player in self.players.items():
-            try:
-                message = player["player"].get_bus().pop()
-                while message:
-                    self.__process_gstreamer_message(
-                        player_uuid, player["player"], message
+        for player in self._get_players_snapshot():
+            player_uuid = player.uuid
+            with self._get_player_lock(player_uuid):
+                if not player.player or player_uuid not in self.players:
+                    # suspended or destroyed player
+                    continue
+                try:
+                    message = player.player.get_bus().pop()
+                    while message:
+                        self.__process_gstreamer_message(
+                            player_uuid, player.player, message
+                        )
+                        del message
+                        if not player.player:
+                            # pipeline released after error
+                            break
+                        message = player.player.get_bus().pop()
+                except Exception:
+                    self.logger.exception(
+                        'Error processing player "%s" messages', player_uuid
                     )
-                    del message
-                    message = player["player"].get_bus().pop()
-            except Exception:
-                self.logger.exception(
-                    'Error processing player "%s" messages', player_uuid
-                )
 
     def __process_gstreamer_message(self, player_uuid, player, message):
         """
@@ -372,9 +1137,13 @@ class Audioplayer(CleepModule):
         self.logger.trace('Player "%s" received message: %s', player_uuid, message_type)
         if message_type == Gst.MessageType.EOS:
             self.logger.debug('Player "%s" EOS: end of stream', player_uuid)
-            player.set_state(Gst.State.NULL)
-            self.__play_next_track(player_uuid)
-            self.__send_playback_event(player_uuid, player)
+            # ended pipeline is handed to teardown worker when next track pipeline is built
+            # or when player is destroyed
+            if not self.__play_next_track(player_uuid) and player_uuid in self.players:
+                self.players[player_uuid].internal.last_state = Gst.State.NULL
+                self.__send_playback_update(
+                    player_uuid, self.__get_playback_info(player_uuid)
+                )
         elif message_type == Gst.MessageType.STATE_CHANGED:
             self.__send_playback_event(player_uuid, player)
         elif message_type == Gst.MessageType.ERROR:
@@ -382,11 +1151,20 @@ class Audioplayer(CleepModule):
             self.logger.error(
                 'Player "%s" ERROR: error=%s debug=%s', player_uuid, error, debug
             )
-            player.set_state(Gst.State.NULL)
-            self.__send_playback_event(player_uuid, player)
+            if message.src and message.src.get_name() == "sink":
+                self.__handle_sink_error()
+            if self.__pop_fade_action(player_uuid) == "stop":
+                # player was fading out before being stopped
+                self.__stop_player(player_uuid)
+                return
+            # failed pipeline is stopped by teardown worker, next play command rebuilds it
+            self.__reset_player(self.players[player_uuid])
+            self.__send_playback_update(
+                player_uuid, self.__get_playback_info(player_uuid)
+            )
         elif (
             message_type == Gst.MessageType.TAG
-            and not self.players[player_uuid]["internal"]["tags_sent"]
+            and not self.players[player_uuid].internal.tags_sent
         ):
             tags = message.parse_tag()
             complete, metadata = self.__get_audio_metadata(tags)
@@ -394,12 +1172,51 @@ class Audioplayer(CleepModule):
                 'Player "%s" TAG [complete=%s]: %s', player_uuid, complete, metadata
             )
             if complete:
-                self.players[player_uuid]["playlist"]["metadata"] = metadata
+                self.players[player_uuid].playlist.metadata = metadata
                 self.__send_playback_event(player_uuid, player, force=True)
-                self.players[player_uuid]["internal"]["tags_sent"] = complete
+                self.players[player_uuid].internal.tags_sent = complete
         elif message_type == Gst.MessageType.DURATION_CHANGED:
             self.logger.debug('Player "%s" DURATION_CHANGED', player_uuid)
             self.__send_playback_event(player_uuid, player)
+        elif (
+            message_type == Gst.MessageType.ELEMENT
+            and self.players[player_uuid].internal.position_interval
+        ):
+            structure = message.get_structure()
+            if structure and structure.get_name() == "progress":
+                self.__send_position_event(player_uuid, player)
+
+    def __handle_sink_error(self):
+        """
+        Probe audio sink again after audio device error (device unplugged, sound server restarted...)
+        so next pipelines use available device. Configured sink is kept.
+        """
+        if self._get_config_field("audio_sink").get("element"):
+            self.logger.warning("Configured audio sink %s failed", self.audio_sink)
+            return
+        self.logger.info("Audio sink %s failed, probe audio sink", self.audio_sink)
+        self.__resolve_audio_sink()
+        # clip player is restarted on new sink by next clip
+        self.clip_player.stop()
+
+    def __send_position_event(self, player_uuid, player):
+        """
+        Send current playback position using lightweight event
+
+        Args:
+            player_uuid (string): player identifier
+            player (Gst.Pipeline): player
+        """
+        success, position = player.query_position(Gst.Format.TIME)
+        if not success:
+            return
+        self.event_playback_position.send(
+            {
+                "playeruuid": player_uuid,
+                "position": int(position / Gst.SECOND),
+                "duration": self.players[player_uuid].playlist.duration,
+            }
+        )
 
     def __send_playback_event(self, player_uuid, player, force=False):
         """
@@ -413,21 +1230,105 @@ class Audioplayer(CleepModule):
         # state
         _, current_state, _ = player.get_state(1)
         if not force and current_state in (
-            self.players[player_uuid]["internal"]["last_state"],
+            self.players[player_uuid].internal.last_state,
             Gst.State.READY,
         ):
             return
         player_data = self.players[player_uuid]
-        player_data["internal"]["last_state"] = current_state
+        player_data.internal.last_state = current_state
 
         # duration
         duration_true, duration = player.query_duration(Gst.Format.TIME)
         duration = int(duration / 1000000000) if duration_true else None
         if duration:
-            player_data["playlist"]["duration"] = duration
+            player_data.playlist.duration = duration
+            playlist = player_data.playlist
+            playlist.tracks[playlist.index].duration = duration
 
         playback_info = self.__get_playback_info(player_uuid)
-        self.event_playback_update.send(playback_info)
+        self.__send_playback_update(player_uuid, playback_info)
+
+    def __send_event(self, event, params):
+        """
+        Send event and keep it in events backlog
+
+        Args:
+            event (Event): event instance
+            params (dict): event parameters
+        """
+        with self.__events_lock:
+            self.events_seq += 1
+            self.events_backlog.append(
+                {
+                    "id": self.events_seq,
+                    "event": event.EVENT_NAME,
+                    "params": params,
+                    "timestamp": int(time.time()),
+                }
+            )
+        event.send(params)
+
+    def __send_playback_update(self, player_uuid, playback_info):
+        """
+        Send playback update event. In delta mode only fields that changed since last event
+        are sent with player sequence number.
+
+        Args:
+            player_uuid (string): player identifier
+            playback_info (dict): playback info as returned by __get_playback_info
+        """
+        if not self.delta_events:
+            self.__send_event(self.event_playback_update, playback_info)
+            return
+
+        internal = self.players[player_uuid].internal
+        last_event = internal.last_event
+        delta = {
+            key: value
+            for key, value in playback_info.items()
+            if key not in last_event or last_event[key] != value
+        }
+        if not delta:
+            return
+        internal.last_event = playback_info
+        internal.event_seq += 1
+        delta["playeruuid"] = player_uuid
+        delta["seq"] = internal.event_seq
+        self.__send_event(self.event_playback_update, delta)
+
+    def __send_playlist_update(self, player_uuid, changes):
+        """
+        Bump playlist version and send playlist changes so clients can apply them incrementally
+
+        Args:
+            player_uuid (string): player identifier
+            changes (list): list of changes applied in order::
+
+                [
+                    {
+                        action (string): insert|remove|move|shuffle
+                        index (int): first track index (insert, remove)
+                        count (int): number of tracks (insert, remove, move)
+                        ids (list): inserted track ids, tracks are fetched with get_playlist (insert)
+                        from (int): first moved track index (move)
+                        to (int): index of first moved track after move (move)
+                        shuffle (bool): playlist is shuffled (shuffle)
+                    },
+                    ...
+                ]
+
+        """
+        playlist = self.players[player_uuid].playlist
+        playlist.version += 1
+        self.__send_event(
+            self.event_playlist_update,
+            {
+                "playeruuid": player_uuid,
+                "version": playlist.version,
+                "index": playlist.index,
+                "changes": changes,
+            },
+        )
 
     def __get_playback_info(self, player_uuid):
         """
@@ -445,6 +1346,7 @@ class Audioplayer(CleepModule):
                 metadata (dict): current track metadata
                 state (Gst.State): player state
                 duration (number): track duration (in seconds)
+                latency_profile (string): audio sink buffering profile
             }
 
         """
@@ -456,16 +1358,19 @@ class Audioplayer(CleepModule):
                 "metadata": {},
                 "state": self._get_player_state(Gst.State.NULL),
                 "duration": 0,
+                "latency_profile": None,
             }
 
         player = self.players[player_uuid]
+        track = player.playlist.tracks[player.playlist.index]
         return {
-            "index": player["playlist"]["index"],
+            "index": player.playlist.index,
             "playeruuid": player_uuid,
-            "track": player["playlist"]["tracks"][player["playlist"]["index"]],
-            "metadata": player["playlist"]["metadata"],
-            "state": self._get_player_state(player["internal"]["last_state"]),
-            "duration": player["playlist"]["duration"],
+            "track": track.to_dict(),
+            "metadata": player.playlist.metadata,
+            "state": self._get_player_state(player.internal.last_state),
+            "duration": player.playlist.duration,
+            "latency_profile": player.internal.latency_profile,
         }
 
     def __get_audio_metadata(self, tags):
@@ -549,7 +1454,7 @@ class Audioplayer(CleepModule):
         """
         try:
             mime = magic.from_file(filepath, mime=True)
-            return mime if mime in list(self.AUDIO_PIPELINE_ELEMENTS.keys()) else None
+            return mime if mime in self.supported_formats else None
         except Exception:
             self.logger.exception("Error getting file format")
             return None
@@ -573,24 +1478,66 @@ class Audioplayer(CleepModule):
         raise Exception("Resource is invalid (file may not exist)")
 
     @staticmethod
-    def _make_track(resource, audio_format):
+    def _make_track(resource, audio_format, track_id=None):
         """
-        Create track dict
+        Create track
+
+        Args:
+            resource (string): audio resource (file or url)
+            audio_format (string): resource format (mime)
+            track_id (int, optional): track identifier. Defaults to None.
 
         Returns:
-            dict: track object::
+            Track: track object
+        """
+        return Track(track_id, resource, audio_format)
 
-            {
-                resource (string): audio resource (file or url)
-                audio_format (string): resource format (mime)
-            }
+    def __new_track(self, player, resource, audio_format):
+        """
+        Create track with new identifier. Track must be indexed once inserted in playlist.
+
+        Args:
+            player (Player): player
+            resource (string): audio resource (file or url)
+            audio_format (string): resource format (mime)
 
+        Returns:
+            Track: track object
         """
-        return {
-            "resource": resource,
-            "audio_format": audio_format,
-        }
+        track = Audioplayer._make_track(resource, audio_format, next(self.__track_ids))
+        if player.internal.shuffle_order:
+            player.internal.shuffle_order.add(track.id)
+        return track
+
+    def __get_track_position(self, player_uuid, track_id):
+        """
+        Return current playlist position of specified track
+
+        Args:
+            player_uuid (string): player identifier
+            track_id (int): track identifier
+
+        Returns:
+            int: track position in playlist or None if track is not in playlist
+        """
+        return self.players[player_uuid].internal.tracks_index.get(track_id)
+
+    @staticmethod
+    def __index_tracks(player, start=0, end=None):
+        """
+        Update playlist position of tracks in specified range of playlist
+
+        Args:
+            player (Player): player
+            start (int, optional): first position to update. Defaults to 0.
+            end (int, optional): position after last one to update. Defaults to end of playlist.
+        """
+        tracks = player.playlist.tracks
+        tracks_index = player.internal.tracks_index
+        for position in range(start, len(tracks) if end is None else end):
+            tracks_index[tracks[position].id] = position
 
+    @_player_locked
     def add_track(self, player_uuid, resource, audio_format=None, track_index=None):
         """
         Add track in specified player playlist.
@@ -612,6 +1559,7 @@ class Audioplayer(CleepModule):
             CommandError: if player does not exist
             MissingParameter: if parameters are missing
         """
+        self._init_gstreamer()
         self._check_parameters(
             [
                 {
@@ -627,14 +1575,18 @@ class Audioplayer(CleepModule):
                     "value": audio_format,
                     "type": str,
                     "none": True,
-                    "validator": lambda v: v in self.AUDIO_PIPELINE_ELEMENTS,
+                    "validator": lambda v: v in self.supported_formats,
                     "message": f'Audio format "{audio_format}" is not supported',
                 },
                 {
-                    "name": "track_number",
+                    "name": "track_index",
                     "value": track_index,
                     "type": int,
                     "none": True,
+                    "validator": lambda v: 0
+                    <= v
+                    <= len(self.players[player_uuid].playlist.tracks),
+                    "message": "Track index is invalid",
                 },
             ]
         )
@@ -642,8 +1594,8 @@ class Audioplayer(CleepModule):
             raise MissingParameter("Url resource must have audio_format specified")
 
         if (
-            len(self.players[player_uuid]["playlist"]["tracks"])
-            > self.MAX_PLAYLIST_TRACKS
+            len(self.players[player_uuid].playlist.tracks)
+            >= self.max_playlist_tracks
         ):
             return False
 
@@ -653,22 +1605,33 @@ class Audioplayer(CleepModule):
             player_uuid,
             track_index,
         )
-        track = Audioplayer._make_track(resource, audio_format)
-        track_index = track_index or len(
-            self.players[player_uuid]["playlist"]["tracks"]
+        playlist = self.players[player_uuid].playlist
+        track = self.__new_track(self.players[player_uuid], resource, audio_format)
+        self.__analyze_loudness(resource)
+        if track_index is None:
+            track_index = len(playlist.tracks)
+        playlist.tracks.insert(track_index, track)
+        self.__index_tracks(self.players[player_uuid], track_index)
+        # keep current track pointer on the same track
+        if playlist.index is not None and track_index <= playlist.index:
+            playlist.index += 1
+        self.__send_playlist_update(
+            player_uuid,
+            [{"action": "insert", "index": track_index, "count": 1, "ids": [track.id]}],
         )
-        self.players[player_uuid]["playlist"]["tracks"].insert(track_index, track)
         self.logger.debug(
             'Player "%s" playlist: %s',
             player_uuid,
-            self.players[player_uuid]["playlist"],
+            self.players[player_uuid].playlist,
         )
 
         return True
 
-    def add_tracks(self, player_uuid, tracks):
+    @_player_locked
+    def add_tracks(self, player_uuid, tracks, track_index=None):
         """
-        Add multiple tracks at once
+        Add multiple tracks at once. All tracks are validated first, then valid ones are inserted
+        together and a single playlist update event is sent.
 
         Args:
             player_uuid (str): player identifier
@@ -682,26 +1645,136 @@ class Audioplayer(CleepModule):
                     ...
                 ]
 
+            track_index (number, optional): insert tracks at specified playlist position or at end of playlist. Defaults to None.
+
+        Returns:
+            dict: result::
+
+            {
+                added (list): identifiers of added tracks
+                failed (list): list of failed entries::
+
+                    [
+                        {
+                            index (int): entry index in tracks parameter
+                            error (string): failure reason
+                        },
+                        ...
+                    ]
+
+            }
+
         Raises:
-            CommandError: if player does not exist
             MissingParameter: if parameters are missing
             InvalidParameter: if command parameters are invalid
         """
-        self._check_parameters([{"name": "tracks", "value": tracks, "type": list}])
+        self._init_gstreamer()
+        self._check_parameters(
+            [
+                {
+                    "name": "player_uuid",
+                    "value": player_uuid,
+                    "type": str,
+                    "validator": lambda v: v in self.players,
+                    "message": f'Player "{player_uuid}" does not exist',
+                },
+                {"name": "tracks", "value": tracks, "type": list},
+                {
+                    "name": "track_index",
+                    "value": track_index,
+                    "type": int,
+                    "none": True,
+                    "validator": lambda v: 0
+                    <= v
+                    <= len(self.players[player_uuid].playlist.tracks),
+                    "message": "Track index is invalid",
+                },
+            ]
+        )
+
+        player = self.players[player_uuid]
+        playlist = player.playlist
+        available = max(self.max_playlist_tracks - len(playlist.tracks), 0)
+        new_tracks = []
+        failed = []
+        for index, entry in enumerate(tracks):
+            error = self.__check_track_entry(entry)
+            if not error and len(new_tracks) >= available:
+                error = "Playlist limit reached"
+            if error:
+                failed.append({"index": index, "error": error})
+                continue
+            new_tracks.append(
+                self.__new_track(player, entry["resource"], entry.get("audio_format"))
+            )
+            self.__analyze_loudness(entry["resource"])
+
+        if new_tracks:
+            if track_index is None:
+                track_index = len(playlist.tracks)
+            playlist.tracks[track_index:track_index] = new_tracks
+            self.__index_tracks(player, track_index)
+            # keep current track pointer on the same track
+            if playlist.index is not None and track_index <= playlist.index:
+                playlist.index += len(new_tracks)
+            self.__send_playlist_update(
+                player_uuid,
+                [
+                    {
+                        "action": "insert",
+                        "index": track_index,
+                        "count": len(new_tracks),
+                        "ids": [track.id for track in new_tracks],
+                    }
+                ],
+            )
+        self.logger.info(
+            'Player "%s": %s tracks added at position %s, %s failed',
+            player_uuid,
+            len(new_tracks),
+            track_index,
+            len(failed),
+        )
+
+        return {
+            "added": [track.id for track in new_tracks],
+            "failed": failed,
+        }
+
+    def __check_track_entry(self, entry):
+        """
+        Check track entry of add_tracks command
+
+        Args:
+            entry (dict): track entry
 
-        for track in tracks:
-            if not self.add_track(
-                player_uuid, track["resource"], track["audio_format"]
-            ):
-                raise CommandInfo("All tracks were not added (playlist limit reached)")
+        Returns:
+            string: error message or None if entry is valid
+        """
+        if not isinstance(entry, dict) or not isinstance(entry.get("resource"), str):
+            return "Track resource is missing"
+        audio_format = entry.get("audio_format")
+        if audio_format is not None and audio_format not in self.supported_formats:
+            return f'Audio format "{audio_format}" is not supported'
+        try:
+            if not Audioplayer._is_filepath(entry["resource"]) and not audio_format:
+                return "Url resource must have audio_format specified"
+        except Exception as error:
+            return str(error)
+        return None
 
-    def remove_track(self, player_uuid, track_index):
+    @_player_locked
+    def remove_track(self, player_uuid, track_index=None, track_id=None):
         """
         Remove track from player playlist
 
         Args:
             player_uuid (string): player identifier
-            track_index (int): track index (0 is the first playlist track)
+            track_index (int, optional): track index (0 is the first playlist track). Defaults to None.
+            track_id (int, optional): track identifier. Takes precedence over track_index. Defaults to None.
+
+        Raises:
+            MissingParameter: if neither track_index nor track_id is specified
         """
         self._check_parameters(
             [
@@ -712,13 +1785,30 @@ class Audioplayer(CleepModule):
                     "validator": lambda v: v in self.players,
                     "message": f'Player "{player_uuid}" does not exist',
                 },
+                {
+                    "name": "track_id",
+                    "value": track_id,
+                    "type": int,
+                    "none": True,
+                    "validator": lambda v: v
+                    in self.players[player_uuid].internal.tracks_index,
+                    "message": "Track does not exist",
+                },
+            ]
+        )
+        if track_id is not None:
+            track_index = self.__get_track_position(player_uuid, track_id)
+        if track_index is None:
+            raise MissingParameter("Parameter track_index or track_id must be specified")
+        self._check_parameters(
+            [
                 {
                     "name": "track_index",
                     "value": track_index,
                     "type": int,
                     "validator": lambda v: 0
                     <= v
-                    < len(self.players[player_uuid]["playlist"]["tracks"]),
+                    < len(self.players[player_uuid].playlist.tracks),
                     "message": "Track index is invalid",
                 },
                 {
@@ -726,13 +1816,28 @@ class Audioplayer(CleepModule):
                     "value": track_index,
                     "type": int,
                     "validator": lambda v: v
-                    != self.players[player_uuid]["playlist"]["index"],
+                    != self.players[player_uuid].playlist.index,
                     "message": "You can't remove current track",
                 },
             ]
         )
 
-        removed_track = self.players[player_uuid]["playlist"]["tracks"].pop(track_index)
+        playlist = self.players[player_uuid].playlist
+        removed_track = playlist.tracks.pop(track_index)
+        self.players[player_uuid].internal.tracks_index.pop(
+            removed_track.id, None
+        )
+        self.__index_tracks(self.players[player_uuid], track_index)
+        if self.players[player_uuid].internal.shuffle_order:
+            self.players[player_uuid].internal.shuffle_order.remove(
+                removed_track.id
+            )
+        # keep current track pointer on the same track
+        if track_index < playlist.index:
+            playlist.index -= 1
+        self.__send_playlist_update(
+            player_uuid, [{"action": "remove", "index": track_index, "count": 1}]
+        )
         self.logger.debug(
             'Player "%s" has track removed: %s', player_uuid, removed_track
         )
@@ -745,6 +1850,8 @@ class Audioplayer(CleepModule):
         paused=False,
         repeat=False,
         shuffle=False,
+        fade=0,
+        latency_profile=None,
     ):
         """
         Create a player and start playing specified resource
@@ -755,11 +1862,15 @@ class Audioplayer(CleepModule):
             volume (int, optional): player volume. Defaults to 100.
             paused (bool, optional): start playback paused. Useful to create player instance in silently. Defaults to False.
             repeat (bool, optional): enable repeat. Defaults to False.
-            shuffle (bool, optional): True to shuffle playlist at end of it. Defaults to False.
+            shuffle (bool, optional): True to play playlist in shuffled order. Defaults to False.
+            fade (int, optional): fade in duration (milliseconds). Defaults to 0.
+            latency_profile (str, optional): audio sink buffering profile (see LATENCY_PROFILES):
+                low-latency for UI sounds, robust for streams on busy devices. Defaults to balanced.
 
         Returns:
             string: player identifier
         """
+        self._init_gstreamer()
         self._check_parameters(
             [
                 {"name": "resource", "value": resource, "type": str, "none": True},
@@ -768,7 +1879,7 @@ class Audioplayer(CleepModule):
                     "value": audio_format,
                     "type": str,
                     "none": True,
-                    "validator": lambda v: v in self.AUDIO_PIPELINE_ELEMENTS,
+                    "validator": lambda v: v in self.supported_formats,
                     "message": f"Audio format {audio_format}is not supported",
                 },
                 {
@@ -781,57 +1892,157 @@ class Audioplayer(CleepModule):
                 {"name": "paused", "value": paused, "type": bool},
                 {"name": "repeat", "value": repeat, "type": bool},
                 {"name": "shuffle", "value": shuffle, "type": bool},
+                {
+                    "name": "fade",
+                    "value": fade,
+                    "type": int,
+                    "validator": lambda v: 0 <= v <= self.MAX_FADE_DURATION,
+                    "message": f"Fade must be between 0 and {self.MAX_FADE_DURATION}",
+                },
+                {
+                    "name": "latency_profile",
+                    "value": latency_profile,
+                    "type": str,
+                    "none": True,
+                    "validator": lambda v: v in self.LATENCY_PROFILES,
+                    "message": f'Latency profile "{latency_profile}" is not supported',
+                },
             ]
         )
 
+        self.__ensure_pipeline_budget()
+
         player = self.__create_player()
-        track = Audioplayer._make_track(resource, audio_format)
-        player["playlist"]["index"] = 0
-        player["playlist"]["volume"] = volume
-        player["playlist"]["tracks"].append(track)
-        self.players[player["uuid"]] = player
+        player.internal.latency_profile = (
+            latency_profile or self.DEFAULT_LATENCY_PROFILE
+        )
+        track = self.__new_track(player, resource, audio_format)
+        player.playlist.index = 0
+        player.playlist.volume = volume
+        player.playlist.tracks.append(track)
+        self.__index_tracks(player)
+
+        # player is reachable by other commands once registered: hold its lock until it is set up
+        lock = threading.RLock()
+        with lock:
+            with self.__players_lock:
+                self.__players_locks[player.uuid] = lock
+                self.players[player.uuid] = player
+
+            self.set_repeat(player.uuid, repeat, shuffle)
+
+            try:
+                # silent start, fade in raises volume
+                self.__play_track(track, player.uuid, 0 if fade else volume, paused)
+                if fade:
+                    self.__fade_in(player.uuid, fade)
+                return player.uuid
+            except Exception as error:
+                self.logger.exception("Unable to play resource %s", resource)
+                self.__destroy_player(player)
+                raise CommandError("Unable to play resource") from error
+
+    def play_clip(self, resource, volume=100):
+        """
+        Play short local audio file (notification sound, chime...) without creating player.
+        Clip is decoded once and kept in memory, then played by a persistent low-latency pipeline.
+        Clips requested while another clip is playing are played after it, each at its own volume.
+
+        Args:
+            resource (str): local filepath
+            volume (int, optional): clip volume. Defaults to 100.
 
-        self.set_repeat(player["uuid"], repeat, shuffle)
+        Returns:
+            int: clip duration (milliseconds)
+
+        Raises:
+            CommandError: if clip can't be played
+        """
+        self._init_gstreamer()
+        self._check_parameters(
+            [
+                {
+                    "name": "resource",
+                    "value": resource,
+                    "type": str,
+                    "validator": os.path.isfile,
+                    "message": f'Clip "{resource}" does not exist',
+                },
+                {
+                    "name": "volume",
+                    "value": volume,
+                    "type": int,
+                    "validator": lambda v: 0 < v <= 100,
+                    "message": "Volume must be between 1 and 100",
+                },
+            ]
+        )
+        if any(name not in self.element_factories for name in self.CLIP_ELEMENTS):
+            raise CommandError("Clip playback is not supported")
 
         try:
-            self.__play_track(track, player["uuid"], volume, paused)
-            return player["uuid"]
+            clip = self.clip_cache.get(resource)
+            if not self.clip_player.started:
+                sink = self.__make_sink()
+                self.__apply_latency_profile(
+                    sink, self.LATENCY_PROFILES["low-latency"]
+                )
+                self.clip_player.start(sink)
+            self.clip_player.play(clip, volume)
+            return clip.duration
         except Exception as error:
-            self.logger.exception("Unable to play resource %s", resource)
-            self.__destroy_player(player)
-            raise CommandError("Unable to play resource") from error
+            self.logger.exception("Unable to play clip %s", resource)
+            raise CommandError("Unable to play clip") from error
 
     def __play_track(self, track, player_uuid, volume=None, paused=False):
         """
         Play audio stream to
 
         Args:
-            track (dict): track object
+            track (Track): track object
             player_uuid (string): player identifier
             volume (int): player volume
             paused (bool): start playback paused
         """
+        # track change ends running fade-out: its pending action is performed, not dropped
+        action = self.__pop_fade_action(player_uuid)
+        if action == "stop":
+            self.__stop_player(player_uuid)
+            return
+        paused = paused or action == "pause"
+
+        if not self.players[player_uuid].player:
+            self.__ensure_pipeline_budget(player_uuid)
+        self.players[player_uuid].internal.last_used = time.time()
+
         # prepare player
-        if Audioplayer._is_filepath(track["resource"]):
-            audio_format = self.__get_file_audio_format(track["resource"])
+        if Audioplayer._is_filepath(track.resource):
+            audio_format = self.__get_file_audio_format(track.resource)
             if not audio_format:
                 raise CommandError("Audio file not supported")
-            track["audio_format"] = audio_format
-            source = Gst.ElementFactory.make("filesrc", "source")
+            track.audio_format = audio_format
+            source = self.__make_element("filesrc", "source")
         else:
-            source = Gst.ElementFactory.make("souphttpsrc", "source")
-        player = self.__prepare_player(player_uuid, source, track["audio_format"])
+            source = self.__make_element("souphttpsrc", "source")
+            if not source:
+                raise CommandError("Url playback is not supported")
+        player = self.__prepare_player(player_uuid, source, track.audio_format)
 
         try:
             # configure player
-            player["source"].set_property("location", track["resource"])
-            volume = volume or self.players[player_uuid]["playlist"]["volume"]
+            player.source.set_property("location", track.resource)
+            self.__apply_loudness(player, track)
+            volume = (
+                volume
+                if volume is not None
+                else self.players[player_uuid].playlist.volume
+            )
             if volume is not None:
-                player["volume"].set_property("volume", float(volume / 100.0))
+                player.volume.set_property("volume", float(volume / 100.0))
 
             # start playback
             state = Gst.State.PAUSED if paused else Gst.State.PLAYING
-            player["player"].set_state(state)
+            player.player.set_state(state)
             self.logger.info(
                 'Player "%s" %s %s',
                 player_uuid,
@@ -842,30 +2053,53 @@ class Audioplayer(CleepModule):
             self.logger.exception("Error playing track %s with %s", track, player_uuid)
             raise error
 
+    def __analyze_loudness(self, resource):
+        """
+        Queue loudness analysis of specified resource if analysis is enabled and resource is a local file
+
+        Args:
+            resource (string): audio resource
+        """
+        if not self._get_config_field("loudness_analysis") or not os.path.isfile(
+            resource
+        ):
+            return
+        self.loudness_analyzer.analyze(resource)
+
+    def __apply_loudness(self, player, track):
+        """
+        Feed analyzed track gain to gain element. Gain is used by element when track has no ReplayGain tags.
+
+        Args:
+            player (Player): player
+            track (Track): track object
+        """
+        if not self._get_config_field("loudness_analysis"):
+            return
+        gain = self.loudness_analyzer.get_gain(track.resource)
+        if gain is None:
+            self.__analyze_loudness(track.resource)
+            return
+        self.logger.debug("Apply track gain %s to %s", gain, track.resource)
+        player.player.get_by_name("gain").set_property("fallback-gain", gain)
+
     def _get_track_index(self, player_uuid, track):
         """
         Search track index in player playlist
 
         Args:
             player_uuid (string): player identifier
-            track (dict): track data
+            track (Track): track object
 
         Returns:
-            number: track playlist index
+            number: track playlist index (0 if track is not in playlist)
         """
-        return next(
-            (
-                index
-                for index, atrack in enumerate(
-                    self.players[player_uuid]["playlist"]["tracks"]
-                )
-                if atrack["resource"] == track["resource"]
-            ),
-            0,
-        )
+        index = self.__get_track_position(player_uuid, track.id)
+        return index if index is not None else 0
 
+    @_player_locked
     def pause_playback(
-        self, player_uuid, force_pause=False, force_play=False, volume=None
+        self, player_uuid, force_pause=False, force_play=False, volume=None, fade=0
     ):
         """
         Toggle pause status for specified player.
@@ -875,6 +2109,7 @@ class Audioplayer(CleepModule):
             force_pause (bool, optional): force pause. Defaults to False.
             force_play (bool, optional): force play. If both force_pause and force_play are True it toggles current state. Defaults to False.
             volume (int, optional): if specified set player volume. Defaults to None.
+            fade (int, optional): fade out before pausing or fade in after resuming duration (milliseconds). Defaults to 0.
 
         Returns:
             string: player state as describe in PLAYER_STATES
@@ -898,6 +2133,13 @@ class Audioplayer(CleepModule):
                 },
                 {"name": "force_pause", "value": force_pause, "type": bool},
                 {"name": "force_play", "value": force_play, "type": bool},
+                {
+                    "name": "fade",
+                    "value": fade,
+                    "type": int,
+                    "validator": lambda v: 0 <= v <= self.MAX_FADE_DURATION,
+                    "message": f"Fade must be between 0 and {self.MAX_FADE_DURATION}",
+                },
             ]
         )
 
@@ -905,9 +2147,19 @@ class Audioplayer(CleepModule):
             self._set_volume(player_uuid, volume)
 
         player = self.players[player_uuid]
+        player.internal.last_used = time.time()
+        if not player.player:
+            # player pipeline was released after idle timeout, rebuild it
+            if force_pause and not force_play:
+                return self._get_player_state(Gst.State.PAUSED)
+            self.__resume_player(player_uuid)
+            if fade:
+                self.__fade_in(player_uuid, fade)
+            return self._get_player_state(Gst.State.PLAYING)
+
+        _, current_state, _ = player.player.get_state(1)
         new_state = Gst.State.PAUSED if force_pause else Gst.State.PLAYING
         if (force_pause and force_play) or (not force_pause and not force_play):
-            _, current_state, _ = player["player"].get_state(1)
             self.logger.debug(
                 "Change player %s state to %s", player_uuid, current_state
             )
@@ -916,11 +2168,28 @@ class Audioplayer(CleepModule):
                 if current_state == Gst.State.PLAYING
                 else Gst.State.PLAYING
             )
-        player["player"].set_state(new_state)
+
+        # running fade is superseded by this state change
+        self.__cancel_fade(player)
+        player.volume.set_property("volume", float(player.playlist.volume / 100.0))
+
+        if new_state == Gst.State.PAUSED:
+            # only a playing player is faded out
+            fade = fade if current_state == Gst.State.PLAYING else 0
+        if fade and new_state == Gst.State.PAUSED:
+            # player is paused at end of fade
+            self.__fade_volume(player_uuid, 0, fade, action="pause")
+        elif fade:
+            player.volume.set_property("volume", 0.0)
+            player.player.set_state(new_state)
+            self.__fade_in(player_uuid, fade)
+        else:
+            player.player.set_state(new_state)
 
         return self._get_player_state(new_state)
 
-    def stop_playback(self, player_uuid):
+    @_player_locked
+    def stop_playback(self, player_uuid, fade=0):
         """
         Stop specified player playback and destroy player.
         The player will not be available anymore after the stop command, the playlist is also deleted.
@@ -929,6 +2198,7 @@ class Audioplayer(CleepModule):
 
         Args:
             player_uuid (string): player identifier
+            fade (int, optional): fade out duration before stopping (milliseconds). Defaults to 0.
 
         Raises:
             CommandError: if player does not exist
@@ -942,21 +2212,51 @@ class Audioplayer(CleepModule):
                     "validator": lambda v: v in self.players,
                     "message": f'Player "{player_uuid}" does not exist',
                 },
+                {
+                    "name": "fade",
+                    "value": fade,
+                    "type": int,
+                    "validator": lambda v: 0 <= v <= self.MAX_FADE_DURATION,
+                    "message": f"Fade must be between 0 and {self.MAX_FADE_DURATION}",
+                },
             ]
         )
 
-        self.players[player_uuid]["player"].set_state(Gst.State.NULL)
+        player = self.players[player_uuid]
+        if (
+            fade
+            and player.player
+            and player.internal.last_state == Gst.State.PLAYING
+        ):
+            # player is stopped at end of fade
+            self.__fade_volume(player_uuid, 0, fade, action="stop")
+            return
+
+        self.__stop_player(player_uuid)
+
+    def __stop_player(self, player_uuid):
+        """
+        Stop player playback and destroy it
+
+        Args:
+            player_uuid (string): player identifier
+        """
+        # pipeline is stopped by teardown worker, player is removed during next process loop
+        self.__reset_player(self.players[player_uuid])
         self._destroy_player(self.players[player_uuid])
 
         playback_info = self.__get_playback_info(player_uuid)
         self.logger.debug('Playback info for "%s": %s', player_uuid, playback_info)
-        self.event_playback_update.send(
-            {
-                "playeruuid": player_uuid,
-                "state": self._get_player_state(Gst.State.NULL),
-            }
-        )
+        params = {
+            "playeruuid": player_uuid,
+            "state": self._get_player_state(Gst.State.NULL),
+        }
+        if self.delta_events:
+            self.players[player_uuid].internal.event_seq += 1
+            params["seq"] = self.players[player_uuid].internal.event_seq
+        self.__send_event(self.event_playback_update, params)
 
+    @_player_locked
     def play_next_track(self, player_uuid):
         """
         Play next track in specified player playlist
@@ -985,8 +2285,8 @@ class Audioplayer(CleepModule):
             ]
         )
 
-        playlist = self.players[player_uuid]["playlist"]
-        if playlist["index"] + 1 >= len(playlist["tracks"]) and not playlist["repeat"]:
+        playlist = self.players[player_uuid].playlist
+        if not self.__has_next_track(player_uuid) and not playlist.repeat:
             self.logger.debug(
                 'Player "%s" is already playing last playlist track', player_uuid
             )
@@ -1008,14 +2308,20 @@ class Audioplayer(CleepModule):
         """
         if player_uuid not in self.players:
             return False
-        playlist = self.players[player_uuid]["playlist"]
-        if playlist["index"] + 1 >= len(playlist["tracks"]):
+        playlist = self.players[player_uuid].playlist
+        if not self.__has_next_track(player_uuid):
             return self.__handle_end_of_playlist(player_uuid)
 
         # update playlist
-        playlist["index"] += 1
-        playlist["duration"] = None
-        next_track = playlist["tracks"][playlist["index"]]
+        shuffle_order = self.players[player_uuid].internal.shuffle_order
+        if shuffle_order:
+            playlist.index = self.__get_track_position(
+                player_uuid, shuffle_order.next()
+            )
+        else:
+            playlist.index += 1
+        playlist.duration = None
+        next_track = playlist.tracks[playlist.index]
         self.logger.debug(
             'Found next track to play on player "%s": %s', player_uuid, next_track
         )
@@ -1027,6 +2333,22 @@ class Audioplayer(CleepModule):
 
         return True
 
+    def __has_next_track(self, player_uuid):
+        """
+        Return True if there is a track to play after current one in play order
+
+        Args:
+            player_uuid (string): player identifier
+
+        Returns:
+            bool: True if next track exists
+        """
+        shuffle_order = self.players[player_uuid].internal.shuffle_order
+        if shuffle_order:
+            return shuffle_order.has_next()
+        playlist = self.players[player_uuid].playlist
+        return playlist.index + 1 < len(playlist.tracks)
+
     def __handle_end_of_playlist(self, player_uuid):
         """
         Handle end of playlist according to player configuration
@@ -1037,14 +2359,19 @@ class Audioplayer(CleepModule):
         Returns:
             bool: True if playback continues, False otherwise
         """
-        playlist = self.players[player_uuid]["playlist"]
-        if playlist["repeat"]:
-            # restart playlist
-            if playlist["shuffle"]:
-                self.shuffle_playlist(player_uuid)
-            playlist["index"] = 0
-            playlist["duration"] = None
-            track = playlist["tracks"][0]
+        playlist = self.players[player_uuid].playlist
+        if playlist.repeat:
+            # restart playlist, new shuffled cycle is drawn if playlist is shuffled
+            internal = self.players[player_uuid].internal
+            if internal.shuffle_order:
+                internal.shuffle_order = ShuffleOrder(internal.tracks_index.keys())
+                playlist.index = self.__get_track_position(
+                    player_uuid, internal.shuffle_order.next()
+                )
+            else:
+                playlist.index = 0
+            playlist.duration = None
+            track = playlist.tracks[playlist.index]
             self.__play_track(track, player_uuid)
             self.logger.debug('Player "%s" restarts playlist', player_uuid)
             return True
@@ -1056,6 +2383,7 @@ class Audioplayer(CleepModule):
         self._destroy_player(self.players[player_uuid])
         return False
 
+    @_player_locked
     def play_previous_track(self, player_uuid):
         """
         Play previous track in specified player playlist
@@ -1082,40 +2410,50 @@ class Audioplayer(CleepModule):
             ]
         )
 
-        playlist = self.players[player_uuid]["playlist"]
-        self.logger.debug('Player "%s" playlist: %s', player_uuid, playlist)
-        if playlist["index"] == 0:
+        playlist = self.players[player_uuid].playlist
+        shuffle_order = self.players[player_uuid].internal.shuffle_order
+        previous_id = shuffle_order.previous() if shuffle_order else None
+        if (shuffle_order and previous_id is None) or (
+            not shuffle_order and playlist.index == 0
+        ):
             self.logger.debug(
                 'Player "%s" has no previous track in playlist', player_uuid
             )
             return False
 
-        playlist["index"] -= 1
-        playlist["duration"] = None
-        previous_track = playlist["tracks"][playlist["index"]]
+        if shuffle_order:
+            playlist.index = self.__get_track_position(player_uuid, previous_id)
+        else:
+            playlist.index -= 1
+        playlist.duration = None
+        previous_track = playlist.tracks[playlist.index]
         self.__play_track(previous_track, player_uuid)
 
         return True
 
-    def play_track(self, player_uuid, track_index):
+    @_player_locked
+    def play_track(self, player_uuid, track_index=None, track_id=None):
         """
         Play track at specified index
 
         Args:
             player_uuid (string): player identifier
-            track_index (int): track index
+            track_index (int, optional): track index. Defaults to None.
+            track_id (int, optional): track identifier. Takes precedence over track_index. Defaults to None.
 
         Returns:
-            bool: True if playback started for specified track index, False otherwise
+            bool: True if playback started for specified track, False otherwise
         """
         if player_uuid not in self.players:
             self.logger.warning("Cant play track: player %s does not exist", player_uuid)
             return False
-        playlist = self.players[player_uuid]["playlist"]
+        playlist = self.players[player_uuid].playlist
+        if track_id is not None:
+            track_index = self.__get_track_position(player_uuid, track_id)
         if (
             track_index is None
             or track_index < 0
-            or track_index >= len(playlist["tracks"])
+            or track_index >= len(playlist.tracks)
         ):
             self.logger.warning(
                 "Cant play track: invalid track index %s specified", track_index
@@ -1123,9 +2461,11 @@ class Audioplayer(CleepModule):
             return False
 
         # update playlist
-        playlist["index"] = track_index
-        playlist["duration"] = None
-        next_track = playlist["tracks"][playlist["index"]]
+        playlist.index = track_index
+        playlist.duration = None
+        next_track = playlist.tracks[playlist.index]
+        if self.players[player_uuid].internal.shuffle_order:
+            self.players[player_uuid].internal.shuffle_order.play(next_track.id)
         self.logger.debug(
             'Found next track to play on player "%s": %s', player_uuid, next_track
         )
@@ -1139,15 +2479,85 @@ class Audioplayer(CleepModule):
 
         return True
 
-    def get_players(self):
+    @_player_locked
+    def move_track(self, player_uuid, track_id, track_index):
         """
-        Return list of players
+        Move track to another playlist position. Current track keeps playing.
 
-        Returns:
-            list: list of players with current playback info::
+        Args:
+            player_uuid (string): player identifier
+            track_id (int): track identifier
+            track_index (int): new track index (0 is the first playlist track)
 
-            {
-                playeruuid (string): player identifier
+        Raises:
+            InvalidParameter: if parameters are invalid
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "player_uuid",
+                    "value": player_uuid,
+                    "type": str,
+                    "validator": lambda v: v in self.players,
+                    "message": f'Player "{player_uuid}" does not exist',
+                },
+                {
+                    "name": "track_id",
+                    "value": track_id,
+                    "type": int,
+                    "validator": lambda v: v
+                    in self.players[player_uuid].internal.tracks_index,
+                    "message": "Track does not exist",
+                },
+                {
+                    "name": "track_index",
+                    "value": track_index,
+                    "type": int,
+                    "validator": lambda v: 0
+                    <= v
+                    < len(self.players[player_uuid].playlist.tracks),
+                    "message": "Track index is invalid",
+                },
+            ]
+        )
+
+        playlist = self.players[player_uuid].playlist
+        from_index = self.__get_track_position(player_uuid, track_id)
+        if from_index == track_index:
+            return
+        playlist.tracks.insert(track_index, playlist.tracks.pop(from_index))
+        self.__index_tracks(
+            self.players[player_uuid],
+            min(from_index, track_index),
+            max(from_index, track_index) + 1,
+        )
+
+        # keep current track pointer on the same track
+        current = playlist.index
+        if current == from_index:
+            playlist.index = track_index
+        elif from_index < current <= track_index:
+            playlist.index -= 1
+        elif track_index <= current < from_index:
+            playlist.index += 1
+
+        self.__send_playlist_update(
+            player_uuid,
+            [{"action": "move", "from": from_index, "to": track_index, "count": 1}],
+        )
+
+    def get_players(self, usage=False):
+        """
+        Return list of players
+
+        Args:
+            usage (bool, optional): return players with pipelines usage. Defaults to False.
+
+        Returns:
+            list: list of players with current playback info::
+
+            {
+                playeruuid (string): player identifier
                 playback (dict): current track
                     {
                         resource (string): file/url
@@ -1155,24 +2565,152 @@ class Audioplayer(CleepModule):
                     }
                 state (Gst.State): player state
                 volume (int): player volume
+            }
+
+            dict: if usage is True::
+
+            {
+                players (list): list of players as described above
+                usage (dict): {
+                    active (int): number of players with allocated pipeline
+                    suspended (int): number of players with released pipeline
+                    max (int): max number of active players (0 for unlimited)
+                }
+            }
+
         """
-        return [
-            self.__get_playback_info(player["uuid"]) for player in self.players.values()
-        ]
+        snapshot = self._get_players_snapshot()
+        players = []
+        for player in snapshot:
+            with self._get_player_lock(player.uuid):
+                players.append(self.__get_playback_info(player.uuid))
+        if not usage:
+            return players
+
+        active = len(self.__get_active_players())
+        return {
+            "players": players,
+            "usage": {
+                "active": active,
+                "suspended": len(snapshot) - active,
+                "max": self.max_active_players,
+            },
+        }
 
-    def get_playlist(self, player_uuid):
+    @_player_locked
+    def get_playback_snapshot(self, player_uuid):
+        """
+        Return full player playback info with current event sequence number.
+        Useful to resync client when delta events were missed.
+
+        Args:
+            player_uuid (string): player identifier
+
+        Returns:
+            dict: playback info (see audioplayer.playback.update event) with seq field
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "player_uuid",
+                    "value": player_uuid,
+                    "type": str,
+                    "validator": lambda v: v in self.players,
+                    "message": f'Player "{player_uuid}" does not exist',
+                },
+            ]
+        )
+
+        snapshot = self.__get_playback_info(player_uuid)
+        snapshot["seq"] = self.players[player_uuid].internal.event_seq
+        return snapshot
+
+    def get_events_since(self, seq):
+        """
+        Return events sent after specified sequence id. Useful for reconnecting clients to catch up
+        without refreshing all players.
+
+        Args:
+            seq (int): last event sequence id known by client (0 to get all backlog)
+
+        Returns:
+            dict: events::
+
+            {
+                seq (int): last event sequence id
+                complete (bool): False if some events were dropped from backlog, client must refresh all its data
+                events (list): list of events::
+
+                    [
+                        {
+                            id (int): event sequence id
+                            event (string): event name
+                            params (dict): event parameters
+                            timestamp (int): event timestamp
+                        },
+                        ...
+                    ]
+
+            }
+
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "seq",
+                    "value": seq,
+                    "type": int,
+                    "validator": lambda v: v >= 0,
+                    "message": "Sequence id must be positive",
+                },
+            ]
+        )
+
+        with self.__events_lock:
+            events = list(self.events_backlog)
+            last_seq = self.events_seq
+
+        oldest_seq = events[0]["id"] if events else last_seq + 1
+        return {
+            "seq": last_seq,
+            "complete": seq + 1 >= oldest_seq and seq <= last_seq,
+            "events": [event for event in events if event["id"] > seq],
+        }
+
+    @_player_locked
+    def get_playlist(
+        self, player_uuid, offset=0, limit=None, fields=None, summary=False
+    ):
         """
         Return player playlist
 
         Args:
             player_uuid (string): player identifier
+            offset (int, optional): index of first returned track. Defaults to 0.
+            limit (int, optional): max number of returned tracks. Defaults to None (all tracks).
+            fields (list, optional): track fields to return (id, resource, audio_format, duration).
+                                     Defaults to None (all fields).
+            summary (bool, optional): return only playlist summary without tracks. Defaults to False.
 
         Returns:
             dict: current playlist::
 
             {
-                tracks (list): list of tracks
-                current_index (number): current track index (0 is the first playlist track)
+                tracks (list): list of tracks from offset
+                index (number): current track index (0 is the first playlist track)
+                offset (int): index of first returned track
+                count (int): number of tracks in playlist
+                version (int): playlist version
+                ...
+            }
+
+            dict: if summary is True::
+
+            {
+                count (int): number of tracks in playlist
+                index (number): current track index
+                total_duration (int): sum of known tracks duration (seconds)
+                version (int): playlist version
             }
 
         """
@@ -1185,19 +2723,181 @@ class Audioplayer(CleepModule):
                     "validator": lambda v: v in self.players,
                     "message": f'Player "{player_uuid}" does not exist',
                 },
+                {
+                    "name": "offset",
+                    "value": offset,
+                    "type": int,
+                    "validator": lambda v: v >= 0,
+                    "message": "Offset must be positive",
+                },
+                {
+                    "name": "limit",
+                    "value": limit,
+                    "type": int,
+                    "none": True,
+                    "validator": lambda v: v > 0,
+                    "message": "Limit must be greater than 0",
+                },
+                {
+                    "name": "fields",
+                    "value": fields,
+                    "type": list,
+                    "none": True,
+                    "validator": lambda v: len(v) > 0
+                    and all(field in Track.FIELDS for field in v),
+                    "message": f"Fields must be in {list(Track.FIELDS)}",
+                },
+                {"name": "summary", "value": summary, "type": bool},
+            ]
+        )
+
+        playlist = self.players[player_uuid].playlist
+        if summary:
+            return {
+                "count": len(playlist.tracks),
+                "index": playlist.index,
+                "total_duration": sum(
+                    track.duration for track in playlist.tracks if track.duration
+                ),
+                "version": playlist.version,
+            }
+
+        return dict(
+            playlist.to_dict(offset, limit, fields),
+            offset=offset,
+            count=len(playlist.tracks),
+        )
+
+    @_player_locked
+    def fade_volume(self, player_uuid, volume, duration, curve="linear"):
+        """
+        Smoothly change player volume. Fade is performed inside the pipeline.
+
+        Args:
+            player_uuid (string): player identifier
+            volume (int): target volume (percentage)
+            duration (int): fade duration (milliseconds)
+            curve (string, optional): fade curve (linear or cubic). Defaults to "linear".
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "player_uuid",
+                    "value": player_uuid,
+                    "type": str,
+                    "validator": lambda v: v in self.players,
+                    "message": f'Player "{player_uuid}" does not exist',
+                },
+                {
+                    "name": "volume",
+                    "value": volume,
+                    "type": int,
+                    "validator": lambda v: 0 <= v <= 100,
+                    "message": "Volume must be between 0 and 100",
+                },
+                {
+                    "name": "duration",
+                    "value": duration,
+                    "type": int,
+                    "validator": lambda v: 0 < v <= self.MAX_FADE_DURATION,
+                    "message": f"Duration must be between 1 and {self.MAX_FADE_DURATION}",
+                },
+                {
+                    "name": "curve",
+                    "value": curve,
+                    "type": str,
+                    "validator": lambda v: v in self.FADE_CURVES,
+                    "message": f'Fade curve "{curve}" is not supported',
+                },
             ]
         )
 
-        return self.players[player_uuid]["playlist"]
+        self.__fade_volume(player_uuid, volume, duration, curve)
 
-    def set_volume(self, player_uuid, volume):
+    @_player_locked
+    def set_position_updates(self, player_uuid, interval):
+        """
+        Enable playback position events for specified player
+
+        Args:
+            player_uuid (string): player identifier
+            interval (int): interval between position events in seconds (0 to disable)
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "player_uuid",
+                    "value": player_uuid,
+                    "type": str,
+                    "validator": lambda v: v in self.players,
+                    "message": f'Player "{player_uuid}" does not exist',
+                },
+                {
+                    "name": "interval",
+                    "value": interval,
+                    "type": int,
+                    "validator": lambda v: 0 <= v <= self.MAX_POSITION_INTERVAL,
+                    "message": f"Interval must be between 0 and {self.MAX_POSITION_INTERVAL}",
+                },
+            ]
+        )
+
+        player = self.players[player_uuid]
+        player.internal.position_interval = interval
+        if player.player:
+            player.player.get_by_name("progress").set_property(
+                "update-freq", interval or self.DEFAULT_PROGRESS_FREQ
+            )
+
+    @_player_locked
+    def set_latency_profile(self, player_uuid, latency_profile):
+        """
+        Set audio sink buffering profile of specified player. Profile is applied to next pipeline
+        built for player (next track).
+
+        Args:
+            player_uuid (string): player identifier
+            latency_profile (string): latency profile (see LATENCY_PROFILES)
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "player_uuid",
+                    "value": player_uuid,
+                    "type": str,
+                    "validator": lambda v: v in self.players,
+                    "message": f'Player "{player_uuid}" does not exist',
+                },
+                {
+                    "name": "latency_profile",
+                    "value": latency_profile,
+                    "type": str,
+                    "validator": lambda v: v in self.LATENCY_PROFILES,
+                    "message": f'Latency profile "{latency_profile}" is not supported',
+                },
+            ]
+        )
+
+        self.players[player_uuid].internal.latency_profile = latency_profile
+
+    @_player_locked
+    def set_volume(self, player_uuid, volume, coalesce=False):
         """
         Set player volume
 
         Args:
             player_uuid (string): player identifier
             volume (number): percentage volume
-        """
+            coalesce (bool, optional): merge volume updates received in a short window and only
+                apply the latest one. Useful for volume sliders. Defaults to False.
+        """
+        if coalesce:
+            # lightweight path for frequent updates, player existence is checked when applying volume
+            if not isinstance(volume, int) or not 0 < volume <= 100:
+                raise InvalidParameter("Volume must be between 1 and 100")
+            self.__queue_volume(player_uuid, volume)
+            return
+
         self._check_parameters(
             [
                 {
@@ -1220,6 +2920,186 @@ class Audioplayer(CleepModule):
 
         self._set_volume(player_uuid, volume)
 
+    def __queue_volume(self, player_uuid, volume):
+        """
+        Queue volume update, previous pending volume of player is overwritten
+
+        Args:
+            player_uuid (string): player identifier
+            volume (int): volume to set
+        """
+        with self.__pending_volumes_lock:
+            if player_uuid in self.__pending_volumes:
+                self.stats["volume_merged"] += 1
+            self.__pending_volumes[player_uuid] = volume
+            if self.__pending_volumes_timer:
+                return
+            self.__pending_volumes_timer = threading.Timer(
+                self.VOLUME_COALESCE_DELAY, self.__apply_pending_volumes
+            )
+            self.__pending_volumes_timer.daemon = True
+            self.__pending_volumes_timer.start()
+
+    def __apply_pending_volumes(self):
+        """
+        Apply latest pending volume of each player
+        """
+        with self.__pending_volumes_lock:
+            pending_volumes = self.__pending_volumes
+            self.__pending_volumes = {}
+            self.__pending_volumes_timer = None
+
+        for player_uuid, volume in pending_volumes.items():
+            with self._get_player_lock(player_uuid):
+                # player may have been destroyed since volume was queued
+                if player_uuid not in self.players:
+                    continue
+                try:
+                    self._set_volume(player_uuid, volume)
+                    self.stats["volume_updates"] += 1
+                except Exception:
+                    self.logger.exception(
+                        'Unable to set volume of player "%s"', player_uuid
+                    )
+
+    def get_capabilities(self):
+        """
+        Return audio formats playable with installed gstreamer elements
+
+        Returns:
+            dict: capabilities::
+
+            {
+                formats (dict): {
+                    audio_format (string): {
+                        playable (bool): True if all pipeline elements are installed
+                        missing (list): names of missing gstreamer elements
+                        decoder (string): decoder in use (None if format is not playable)
+                        ranking (list): last decoders ranking as returned by rank_decoders
+                    },
+                    ...
+                },
+                streaming (bool): True if url resources can be played
+                clips (bool): True if clips can be played
+                audio_sink (dict): audio sink used by pipelines {element (string), device (string)}
+            }
+
+        """
+        self._init_gstreamer()
+        ranking = self._get_config_field("decoders_ranking")
+        formats = {}
+        for audio_format in self.AUDIO_PIPELINE_ELEMENTS:
+            missing = self.__get_missing_elements(audio_format)
+            formats[audio_format] = {
+                "playable": not missing,
+                "missing": missing,
+                "decoder": self.decoders.get(audio_format),
+                "ranking": ranking.get(audio_format, []),
+            }
+
+        return {
+            "formats": formats,
+            "streaming": all(
+                name in self.element_factories for name in self.STREAMING_ELEMENTS
+            ),
+            "clips": all(name in self.element_factories for name in self.CLIP_ELEMENTS),
+            "audio_sink": self.audio_sink,
+        }
+
+    def rank_decoders(self, audio_format=None):
+        """
+        Measure CPU cost of installed decoders decoding the same sample and select the fastest
+        one of each audio format. Ranking is saved and applied at next startups.
+        Decoders run in a dedicated process so playback in progress does not distort ranking.
+
+        Args:
+            audio_format (string, optional): rank decoders of this audio format only. Defaults to all formats.
+
+        Returns:
+            dict: ranking by audio format::
+
+            {
+                audio_format (string): [
+                    {
+                        decoder (string): decoder name
+                        cpu (float): CPU time spent decoding sample in seconds (None if decoder failed)
+                    },
+                    ...
+                ],
+                ...
+            }
+
+        Raises:
+            CommandError: if ranking can't be saved
+        """
+        self._init_gstreamer()
+        self._check_parameters(
+            [
+                {
+                    "name": "audio_format",
+                    "value": audio_format,
+                    "type": str,
+                    "none": True,
+                    "validator": lambda v: v in self.supported_formats,
+                    "message": f'Audio format "{audio_format}" is not supported',
+                },
+            ]
+        )
+
+        benchmark = DecoderBenchmark(self.logger)
+        ranking = self._get_config_field("decoders_ranking")
+        results = {}
+        # formats sharing same pipeline and decoders are ranked once
+        measured = {}
+        formats = [audio_format] if audio_format else self.supported_formats
+        for current_format in formats:
+            # elements preceding decoder in pipeline
+            chain = []
+            for key, value in self.AUDIO_PIPELINE_ELEMENTS[current_format].items():
+                if key == "decoder":
+                    break
+                chain.append(value)
+            decoders = self.__get_installed_decoders(current_format)
+            key = (tuple(chain), tuple(sorted(decoders)))
+            if key not in measured:
+                try:
+                    measured[key] = benchmark.rank(current_format, chain, decoders)
+                except Exception:
+                    self.logger.exception(
+                        'Unable to rank "%s" decoders', current_format
+                    )
+                    continue
+            results[current_format] = measured[key]
+            ranking[current_format] = measured[key]
+
+        if not self._set_config_field("decoders_ranking", ranking):
+            raise CommandError("Unable to save configuration")
+        self.__select_decoders()
+
+        return results
+
+    def get_stats(self):
+        """
+        Return audioplayer internal counters
+
+        Returns:
+            dict: counters::
+
+            {
+                volume_updates (int): number of coalesced volume updates applied
+                volume_merged (int): number of volume updates merged into a later one
+                pending_teardowns (int): number of released pipelines waiting for teardown
+                clip_cache (dict): decoded clips cache statistics (see ClipCache.get_stats)
+            }
+
+        """
+        return dict(
+            self.stats,
+            pending_teardowns=self.pipeline_teardown.pending,
+            clip_cache=self.clip_cache.get_stats(),
+        )
+
+    @_player_locked
     def _set_volume(self, player_uuid, volume):
         """
         Set player volume
@@ -1229,19 +3109,23 @@ class Audioplayer(CleepModule):
             volume (int): volume to set
         """
         self.logger.debug("Set player %s volume to %s", player_uuid, volume)
-        self.players[player_uuid]["volume"].set_property(
-            "volume", float(volume / 100.0)
-        )
-        self.players[player_uuid]["playlist"]["volume"] = volume
+        self.__cancel_fade(self.players[player_uuid])
+        if self.players[player_uuid].volume:
+            self.players[player_uuid].volume.set_property(
+                "volume", float(volume / 100.0)
+            )
+        self.players[player_uuid].playlist.volume = volume
 
-    def set_repeat(self, player_uuid, repeat, shuffle=False):
+    @_player_locked
+    def set_repeat(self, player_uuid, repeat, shuffle=None):
         """
         Repeat playlist when end of it is reached
 
         Args:
             player_uuid (string): player identifier
             repeat (bool): True to repeat playlist, False otherwise
-            shuffle (bool, optional): True to shuffle playlist when end is reached. Defaults to False.
+            shuffle (bool, optional): True to play playlist in shuffled order, False to play it in order.
+                Defaults to None (shuffle left unchanged).
 
         Raises:
             CommandError: if player does not exist
@@ -1260,6 +3144,7 @@ class Audioplayer(CleepModule):
                     "name": "shuffle",
                     "value": shuffle,
                     "type": bool,
+                    "none": True,
                 },
             ]
         )
@@ -1270,12 +3155,30 @@ class Audioplayer(CleepModule):
             shuffle,
         )
 
-        self.players[player_uuid]["playlist"]["repeat"] = repeat
-        self.players[player_uuid]["playlist"]["shuffle"] = shuffle
+        self.players[player_uuid].playlist.repeat = repeat
+        if shuffle is False:
+            self.__unshuffle(player_uuid)
+        elif shuffle and not self.players[player_uuid].internal.shuffle_order:
+            self.__shuffle(player_uuid)
 
+    @_player_locked
     def shuffle_playlist(self, player_uuid):
         """
-        Shuffle playlist
+        Shuffle playlist play order. Current track is kept, other tracks are played in random order.
+        Playlist tracks order is not modified.
+
+        Args:
+            player_uuid (string): player identifier
+        """
+        if player_uuid not in self.players:
+            raise CommandError(f'Player "{player_uuid}" does not exist')
+
+        self.__shuffle(player_uuid)
+
+    @_player_locked
+    def unshuffle_playlist(self, player_uuid):
+        """
+        Restore playlist play order. Playback continues from current track in original order.
 
         Args:
             player_uuid (string): player identifier
@@ -1283,11 +3186,371 @@ class Audioplayer(CleepModule):
         if player_uuid not in self.players:
             raise CommandError(f'Player "{player_uuid}" does not exist')
 
-        tracks = self.players[player_uuid]["playlist"]["tracks"]
-        current_track = tracks.pop(self.players[player_uuid]["playlist"]["index"])
-        random.shuffle(tracks)
-        tracks.insert(0, current_track)
-        self.players[player_uuid]["playlist"]["index"] = 0
+        self.__unshuffle(player_uuid)
+
+    def __shuffle(self, player_uuid):
+        """
+        Start new shuffled play order from current track
+
+        Args:
+            player_uuid (string): player identifier
+        """
+        player = self.players[player_uuid]
+        playlist = player.playlist
+        current_id = (
+            playlist.tracks[playlist.index].id
+            if playlist.index is not None
+            else None
+        )
+        player.internal.shuffle_order = ShuffleOrder(
+            player.internal.tracks_index.keys(), current_id
+        )
+        if not playlist.shuffle:
+            playlist.shuffle = True
+            self.__send_playlist_update(
+                player_uuid, [{"action": "shuffle", "shuffle": True}]
+            )
+
+    def __unshuffle(self, player_uuid):
+        """
+        Drop shuffled play order
+
+        Args:
+            player_uuid (string): player identifier
+        """
+        playlist = self.players[player_uuid].playlist
+        self.players[player_uuid].internal.shuffle_order = None
+        if playlist.shuffle:
+            playlist.shuffle = False
+            self.__send_playlist_update(
+                player_uuid, [{"action": "shuffle", "shuffle": False}]
+            )
+
+    def set_output_format(self, rate=None, channels=None, sample_format=None):
+        """
+        Set fixed output format of all players. Output format is negotiated once with audio sink
+        and applied to new pipelines. Set all parameters to None to let pipelines negotiate their format (default).
+        Only useful to force a format on sinks accepting several ones, it brings no measurable CPU saving.
+
+        Args:
+            rate (int, optional): output sample rate (Hz). Defaults to None.
+            channels (int, optional): output channels count. Defaults to None.
+            sample_format (str, optional): output sample format (see OUTPUT_SAMPLE_FORMATS). Defaults to None.
+
+        Returns:
+            bool: True if output format is supported by audio sink, False otherwise
+        """
+        self._init_gstreamer()
+        self._check_parameters(
+            [
+                {
+                    "name": "rate",
+                    "value": rate,
+                    "type": int,
+                    "none": True,
+                    "validator": lambda v: 8000 <= v <= 192000,
+                    "message": "Rate must be between 8000 and 192000",
+                },
+                {
+                    "name": "channels",
+                    "value": channels,
+                    "type": int,
+                    "none": True,
+                    "validator": lambda v: 1 <= v <= 8,
+                    "message": "Channels must be between 1 and 8",
+                },
+                {
+                    "name": "sample_format",
+                    "value": sample_format,
+                    "type": str,
+                    "none": True,
+                    "validator": lambda v: v in self.OUTPUT_SAMPLE_FORMATS,
+                    "message": f'Sample format "{sample_format}" is not supported',
+                },
+            ]
+        )
+
+        output_format = {
+            "rate": rate,
+            "channels": channels,
+            "format": sample_format,
+        }
+        if not self._set_config_field("output_format", output_format):
+            raise CommandError("Unable to save configuration")
+        self.__negotiate_output_caps()
+
+        return self.output_caps is not None or not any(output_format.values())
+
+    def set_audio_sink(self, element=None, device=None):
+        """
+        Pin audio sink used by all players. Set all parameters to None to use sink selected by
+        autoaudiosink. Applied to new pipelines.
+
+        Args:
+            element (str, optional): sink element name (alsasink, pulsesink...). Defaults to None.
+            device (str, optional): sink device (hw:1,0...). Defaults to sink default device.
+
+        Returns:
+            dict: audio sink in use::
+
+            {
+                element (string): sink element name
+                device (string): sink device (None for default device)
+            }
+
+        Raises:
+            MissingParameter: if device is specified without element
+            CommandError: if configuration can't be saved
+        """
+        self._init_gstreamer()
+        self._check_parameters(
+            [
+                {
+                    "name": "element",
+                    "value": element,
+                    "type": str,
+                    "none": True,
+                    "validator": self.__find_sink_factory,
+                    "message": f'Audio sink "{element}" is not installed',
+                },
+                {"name": "device", "value": device, "type": str, "none": True},
+            ]
+        )
+        if device is not None and element is None:
+            raise MissingParameter("Parameter element must be specified with device")
+
+        if not self._set_config_field(
+            "audio_sink", {"element": element, "device": device}
+        ):
+            raise CommandError("Unable to save configuration")
+        self.__resolve_audio_sink()
+        # clip player is restarted on new sink by next clip
+        self.clip_player.stop()
+        # supported output format depends on sink
+        self.__negotiate_output_caps()
+
+        return self.audio_sink
+
+    def set_warmup(self, enabled):
+        """
+        Enable pipelines warm-up at startup: pipeline of each supported audio format is built once in
+        background to hide first playback latency. Change is applied at next application start.
+
+        Args:
+            enabled (bool): True to enable warm-up
+        """
+        self._check_parameters([{"name": "enabled", "value": enabled, "type": bool}])
+
+        if not self._set_config_field("warmup", enabled):
+            raise CommandError("Unable to save configuration")
+
+    def set_delta_events(self, enabled):
+        """
+        Enable delta playback events: only fields that changed are sent with a per-player sequence number.
+        Use get_playback_snapshot command to get full playback info.
+
+        Args:
+            enabled (bool): True to enable delta events
+        """
+        self._check_parameters([{"name": "enabled", "value": enabled, "type": bool}])
+
+        if not self._set_config_field("delta_events", enabled):
+            raise CommandError("Unable to save configuration")
+        self.delta_events = enabled
+        # next events of all players contain all fields
+        for player in self._get_players_snapshot():
+            with self._get_player_lock(player.uuid):
+                player.internal.last_event = {}
+
+    def set_idle_timeout(self, idle_timeout):
+        """
+        Set delay after which paused players release their pipeline. Playlist, current track and
+        position are kept and pipeline is rebuilt on next playback command.
+
+        Args:
+            idle_timeout (int): idle timeout in seconds (0 to disable)
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "idle_timeout",
+                    "value": idle_timeout,
+                    "type": int,
+                    "validator": lambda v: v >= 0,
+                    "message": "Idle timeout must be positive",
+                },
+            ]
+        )
+
+        if not self._set_config_field("idle_timeout", idle_timeout):
+            raise CommandError("Unable to save configuration")
+        self.idle_timeout = idle_timeout
+
+    def set_max_active_players(self, max_active_players):
+        """
+        Set max number of players with allocated pipeline. When budget is exhausted, least recently
+        used paused players release their pipeline.
+
+        Args:
+            max_active_players (int): max number of active players (0 for unlimited)
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "max_active_players",
+                    "value": max_active_players,
+                    "type": int,
+                    "validator": lambda v: v >= 0,
+                    "message": "Max active players must be positive",
+                },
+            ]
+        )
+
+        if not self._set_config_field("max_active_players", max_active_players):
+            raise CommandError("Unable to save configuration")
+        self.max_active_players = max_active_players
+
+    def set_max_playlist_tracks(self, max_tracks):
+        """
+        Set max number of tracks in player playlist
+
+        Args:
+            max_tracks (int): max number of tracks
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "max_tracks",
+                    "value": max_tracks,
+                    "type": int,
+                    "validator": lambda v: 0 < v <= self.MAX_PLAYLIST_TRACKS,
+                    "message": f"Max tracks must be between 1 and {self.MAX_PLAYLIST_TRACKS}",
+                },
+            ]
+        )
+
+        if not self._set_config_field("max_playlist_tracks", max_tracks):
+            raise CommandError("Unable to save configuration")
+        self.max_playlist_tracks = max_tracks
+
+    def set_clip_cache_size(self, size):
+        """
+        Set max memory used by decoded clips. Least recently played clips are evicted first.
+
+        Args:
+            size (int): max size of decoded clips (MB)
+        """
+        self._check_parameters(
+            [
+                {
+                    "name": "size",
+                    "value": size,
+                    "type": int,
+                    "validator": lambda v: 0 < v <= self.MAX_CLIP_CACHE_SIZE,
+                    "message": f"Size must be between 1 and {self.MAX_CLIP_CACHE_SIZE}",
+                },
+            ]
+        )
+
+        if not self._set_config_field("clip_cache_size", size):
+            raise CommandError("Unable to save configuration")
+        self.clip_cache.max_size = size * 1024 * 1024
+
+    def set_loudness_analysis(self, enabled, workers=None, niceness=None):
+        """
+        Configure background loudness analysis of local files. Analyzed gain is applied
+        at playback time to tracks without ReplayGain tags.
+
+        Args:
+            enabled (bool): True to enable analysis
+            workers (int, optional): number of analysis processes. Defaults to None (unchanged).
+            niceness (int, optional): niceness of analysis processes. Defaults to None (unchanged).
+        """
+        self._check_parameters(
+            [
+                {"name": "enabled", "value": enabled, "type": bool},
+                {
+                    "name": "workers",
+                    "value": workers,
+                    "type": int,
+                    "none": True,
+                    "validator": lambda v: 1 <= v <= 4,
+                    "message": "Workers must be between 1 and 4",
+                },
+                {
+                    "name": "niceness",
+                    "value": niceness,
+                    "type": int,
+                    "none": True,
+                    "validator": lambda v: 0 <= v <= 19,
+                    "message": "Niceness must be between 0 and 19",
+                },
+            ]
+        )
+
+        config = {"loudness_analysis": enabled}
+        if workers is not None:
+            config["loudness_workers"] = workers
+        if niceness is not None:
+            config["loudness_niceness"] = niceness
+        if not self._update_config(config):
+            raise CommandError("Unable to save configuration")
+
+        # restart analyzer with new settings
+        self.loudness_analyzer.stop()
+        self.loudness_analyzer.workers = self._get_config_field("loudness_workers")
+        self.loudness_analyzer.niceness = self._get_config_field("loudness_niceness")
+        if enabled:
+            self.loudness_analyzer.start()
+
+    def analyze_loudness(self, resources):
+        """
+        Queue loudness analysis of specified local files
+
+        Args:
+            resources (list): list of local filepaths
+
+        Returns:
+            int: number of queued analysis (already analyzed files are skipped)
+
+        Raises:
+            CommandError: if loudness analysis is disabled
+        """
+        self._check_parameters(
+            [{"name": "resources", "value": resources, "type": list}]
+        )
+        if not self._get_config_field("loudness_analysis"):
+            raise CommandError("Loudness analysis is disabled")
+        self._init_gstreamer()
+
+        return len(
+            [
+                resource
+                for resource in resources
+                if os.path.isfile(resource)
+                and self.loudness_analyzer.analyze(resource)
+            ]
+        )
+
+    def get_loudness_analysis(self):
+        """
+        Return loudness analysis status
+
+        Returns:
+            dict: loudness analysis status::
+
+            {
+                enabled (bool): True if analysis is enabled
+                pending (int): number of pending analysis
+                analyzed (int): number of analyzed files
+                workers (int): number of analysis processes
+                niceness (int): analysis processes niceness
+            }
+
+        """
+        status = self.loudness_analyzer.get_status()
+        status["enabled"] = self._get_config_field("loudness_analysis")
+        return status
 
     def _get_player_state(self, gst_state):
         """
@@ -1299,4 +3562,9 @@ class Audioplayer(CleepModule):
         Returns:
             string: player state as returned by PLAYER_STATES
         """
-        return self.PLAYER_STATES[gst_state]
+        if self.__player_states is None:
+            self.__player_states = {
+                getattr(Gst.State, name): state
+                for name, state in self.PLAYER_STATES.items()
+            }
+        return self.__player_states[gst_state]
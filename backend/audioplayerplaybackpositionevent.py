@@ -0,0 +1,22 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from cleep.libs.internals.event import Event
+
+
+class AudioplayerPlaybackPositionEvent(Event):
+    """
+    Audioplayer.playback.position event
+    """
+
+    EVENT_NAME = "audioplayer.playback.position"
+    EVENT_PARAMS = ["playeruuid", "position", "duration"]
+
+    def __init__(self, params):
+        """
+        Constructor
+
+        Args:
+            params (dict): event parameters
+        """
+        Event.__init__(self, params)
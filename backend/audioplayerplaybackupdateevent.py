@@ -10,7 +10,16 @@ class AudioplayerPlaybackUpdateEvent(Event):
     """
 
     EVENT_NAME = "audioplayer.playback.update"
-    EVENT_PARAMS = ["playeruuid", "state", "duration", "track", "metadata", "index"]
+    EVENT_PARAMS = [
+        "playeruuid",
+        "state",
+        "duration",
+        "track",
+        "metadata",
+        "index",
+        "seq",
+        "latency_profile",
+    ]
 
     def __init__(self, params):
         """
@@ -0,0 +1,22 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from cleep.libs.internals.event import Event
+
+
+class AudioplayerPlaylistUpdateEvent(Event):
+    """
+    Audioplayer.playlist.update event
+    """
+
+    EVENT_NAME = "audioplayer.playlist.update"
+    EVENT_PARAMS = ["playeruuid", "version", "index", "changes"]
+
+    def __init__(self, params):
+        """
+        Constructor
+
+        Args:
+            params (dict): event parameters
+        """
+        Event.__init__(self, params)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import threading
+from collections import OrderedDict
+from .lazyimport import Gst
+
+
+class Clip:
+    """
+    Decoded audio clip
+    """
+
+    __slots__ = ("filepath", "data", "mtime")
+
+    def __init__(self, filepath, data, mtime):
+        """
+        Constructor
+
+        Args:
+            filepath (string): clip file path
+            data (bytes): decoded PCM samples (see ClipCache.CAPS)
+            mtime (float): file modification time when clip was decoded
+        """
+        self.filepath = filepath
+        self.data = data
+        self.mtime = mtime
+
+    @property
+    def duration(self):
+        """
+        Return clip duration
+
+        Returns:
+            int: clip duration in milliseconds
+        """
+        return len(self.data) * 1000 // ClipCache.BYTES_PER_SECOND
+
+    def __repr__(self):
+        return f"Clip({self.filepath!r}, size={len(self.data)})"
+
+
+class ClipCache:
+    """
+    Bounded cache of decoded audio clips with least recently used eviction.
+    All clips are decoded to the same PCM format so they can be played by a single persistent
+    pipeline without decoding nor disk access.
+    """
+
+    CAPS = "audio/x-raw,format=S16LE,layout=interleaved,rate=48000,channels=2"
+    BYTES_PER_SECOND = 48000 * 2 * 2
+    DECODE_PIPELINE = f"filesrc name=src ! decodebin ! audioconvert ! audioresample ! {CAPS} ! appsink name=sink sync=false"
+    DECODE_TIMEOUT = 10
+
+    def __init__(self, logger, max_size):
+        """
+        Constructor
+
+        Args:
+            logger (Logger): logger instance
+            max_size (int): max size of decoded clips in cache (bytes)
+        """
+        self.logger = logger
+        self.__max_size = max_size
+        self.__clips = OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def max_size(self):
+        """
+        Return cache max size
+
+        Returns:
+            int: max size of decoded clips in cache (bytes)
+        """
+        return self.__max_size
+
+    @max_size.setter
+    def max_size(self, max_size):
+        """
+        Set cache max size, evicting clips if necessary
+
+        Args:
+            max_size (int): max size of decoded clips in cache (bytes)
+        """
+        with self.__lock:
+            self.__max_size = max_size
+            self.__evict()
+
+    def get_stats(self):
+        """
+        Return cache statistics
+
+        Returns:
+            dict: statistics::
+
+            {
+                clips (int): number of cached clips
+                size (int): size of cached clips (bytes)
+                max_size (int): cache max size (bytes)
+                hits (int): number of clips found in cache
+                misses (int): number of clips decoded
+            }
+
+        """
+        with self.__lock:
+            return {
+                "clips": len(self.__clips),
+                "size": self.__size,
+                "max_size": self.__max_size,
+                "hits": self.__hits,
+                "misses": self.__misses,
+            }
+
+    def get(self, filepath):
+        """
+        Return decoded clip of specified file, decoding it if not cached or if file changed
+
+        Args:
+            filepath (string): clip file path
+
+        Returns:
+            Clip: decoded clip
+
+        Raises:
+            Exception: if clip can't be decoded or is larger than cache
+        """
+        mtime = os.path.getmtime(filepath)
+        with self.__lock:
+            clip = self.__clips.get(filepath)
+            if clip and clip.mtime == mtime:
+                self.__clips.move_to_end(filepath)
+                self.__hits += 1
+                return clip
+            self.__misses += 1
+
+        # decode outside lock to not block cached clips
+        clip = Clip(filepath, self._decode(filepath), mtime)
+        with self.__lock:
+            previous = self.__clips.pop(filepath, None)
+            if previous:
+                self.__size -= len(previous.data)
+            self.__clips[filepath] = clip
+            self.__size += len(clip.data)
+            self.__evict()
+        self.logger.debug("Clip %s cached", clip)
+
+        return clip
+
+    def clear(self):
+        """
+        Remove all clips from cache
+        """
+        with self.__lock:
+            self.__clips.clear()
+            self.__size = 0
+
+    def __evict(self):
+        """
+        Remove least recently used clips until cache fits max size. Lock must be held.
+        """
+        while self.__size > self.__max_size and self.__clips:
+            _, clip = self.__clips.popitem(last=False)
+            self.__size -= len(clip.data)
+            self.logger.debug("Clip %s evicted from cache", clip)
+
+    def _decode(self, filepath):
+        """
+        Decode file to cache PCM format
+
+        Args:
+            filepath (string): clip file path
+
+        Returns:
+            bytes: decoded PCM samples
+
+        Raises:
+            Exception: if file can't be decoded or is larger than cache
+        """
+        pipeline = Gst.parse_launch(self.DECODE_PIPELINE)
+        pipeline.get_by_name("src").set_property("location", filepath)
+        sink = pipeline.get_by_name("sink")
+        chunks = []
+        size = 0
+        pipeline.set_state(Gst.State.PLAYING)
+        try:
+            while True:
+                sample = sink.emit("try-pull-sample", self.DECODE_TIMEOUT * Gst.SECOND)
+                if sample is None:
+                    break
+                buffer = sample.get_buffer()
+                chunk = buffer.extract_dup(0, buffer.get_size())
+                size += len(chunk)
+                if size > self.__max_size:
+                    raise Exception("Clip is larger than clip cache")
+                chunks.append(chunk)
+
+            message = pipeline.get_bus().pop_filtered(Gst.MessageType.ERROR)
+            if message:
+                error, _ = message.parse_error()
+                raise Exception(error.message)
+            if not sink.get_property("eos"):
+                raise Exception("Clip decoding timed out")
+        finally:
+            pipeline.set_state(Gst.State.NULL)
+
+        return b"".join(chunks)
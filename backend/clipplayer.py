@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from .lazyimport import Gst
+from .clipcache import ClipCache
+
+
+class ClipPlayer:
+    """
+    Persistent pipeline playing decoded clips pushed from memory.
+    Pipeline is live and stays playing, so a clip starts as soon as its samples are pushed.
+    Clips pushed while another one is playing are played after it. Volume is applied to clip samples
+    before they are pushed so queued clips keep their own volume. Scaled samples of last played clips
+    are kept so a clip replayed at the same volume is not scaled again.
+    """
+
+    PIPELINE = (
+        "appsrc name=src is-live=true format=time do-timestamp=true"
+        " ! audioconvert ! audioresample name=resample"
+    )
+    # number of scaled clips kept
+    SCALED_CLIPS = 8
+
+    def __init__(self, logger):
+        """
+        Constructor
+
+        Args:
+            logger (Logger): logger instance
+        """
+        self.logger = logger
+        self.__pipeline = None
+        self.__source = None
+        self.__lock = threading.Lock()
+        self.__scaled = OrderedDict()
+
+    @property
+    def started(self):
+        """
+        Return True if pipeline is running
+
+        Returns:
+            bool: True if pipeline is running
+        """
+        return self.__pipeline is not None
+
+    def start(self, sink):
+        """
+        Build pipeline and start it
+
+        Args:
+            sink (Gst.Element): configured audio sink
+        """
+        with self.__lock:
+            if self.__pipeline:
+                return
+            pipeline = Gst.parse_launch(self.PIPELINE)
+            source = pipeline.get_by_name("src")
+            source.set_property("caps", Gst.Caps.from_string(ClipCache.CAPS))
+            pipeline.add(sink)
+            pipeline.get_by_name("resample").link(sink)
+            pipeline.set_state(Gst.State.PLAYING)
+            self.__pipeline = pipeline
+            self.__source = source
+            self.logger.debug("Clip player started")
+
+    def stop(self):
+        """
+        Stop pipeline
+        """
+        with self.__lock:
+            if not self.__pipeline:
+                return
+            self.__pipeline.set_state(Gst.State.NULL)
+            self.__pipeline = None
+            self.__source = None
+            self.logger.debug("Clip player stopped")
+
+    def play(self, clip, volume):
+        """
+        Push clip samples to pipeline
+
+        Args:
+            clip (Clip): decoded clip
+            volume (int): clip volume (percentage)
+
+        Raises:
+            Exception: if pipeline is not started or refuses samples
+        """
+        data = clip.data if volume == 100 else self.__get_scaled_samples(clip, volume)
+        with self.__lock:
+            if not self.__pipeline:
+                raise Exception("Clip player is not started")
+            buffer = Gst.Buffer.new_wrapped(data)
+            buffer.duration = clip.duration * Gst.MSECOND
+            result = self.__source.emit("push-buffer", buffer)
+            if result != Gst.FlowReturn.OK:
+                raise Exception(f"Clip player refused clip: {result}")
+
+    def __get_scaled_samples(self, clip, volume):
+        """
+        Return clip samples scaled to specified volume, scaling them if not already done
+
+        Args:
+            clip (Clip): decoded clip
+            volume (int): volume (percentage)
+
+        Returns:
+            bytes: scaled PCM samples
+        """
+        # clip decoded again after file modification has new mtime
+        key = (clip.filepath, clip.mtime, volume)
+        with self.__lock:
+            data = self.__scaled.get(key)
+            if data is not None:
+                self.__scaled.move_to_end(key)
+                return data
+
+        data = ClipPlayer._scale_samples(clip.data, volume)
+        with self.__lock:
+            self.__scaled[key] = data
+            while len(self.__scaled) > self.SCALED_CLIPS:
+                self.__scaled.popitem(last=False)
+        return data
+
+    @staticmethod
+    def _scale_samples(data, volume):
+        """
+        Scale clip samples to specified volume
+
+        Args:
+            data (bytes): PCM samples (see ClipCache.CAPS)
+            volume (int): volume (percentage)
+
+        Returns:
+            bytes: scaled PCM samples
+        """
+        samples = array("h", data)
+        if sys.byteorder == "big":
+            samples.byteswap()
+        samples = array("h", [sample * volume // 100 for sample in samples])
+        if sys.byteorder == "big":
+            samples.byteswap()
+        return samples.tobytes()
+
+    def process(self):
+        """
+        Process pipeline messages. Pipeline is stopped on error, it is rebuilt by next clip.
+
+        Returns:
+            bool: True if pipeline failed
+        """
+        with self.__lock:
+            if not self.__pipeline:
+                return False
+            message = self.__pipeline.get_bus().pop_filtered(Gst.MessageType.ERROR)
+        if not message:
+            return False
+
+        error, debug = message.parse_error()
+        self.logger.error("Clip player ERROR: error=%s debug=%s", error, debug)
+        self.stop()
+        return True
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import time
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from .lazyimport import Gst
+
+
+def _measure_pipeline(description, timeout):
+    """
+    Run pipeline until end of stream. Executed in benchmark process.
+
+    Args:
+        description (string): pipeline description
+        timeout (int): pipeline timeout (seconds)
+
+    Returns:
+        float: CPU time spent by process while pipeline was running (seconds)
+
+    Raises:
+        Exception: if pipeline failed or timed out
+    """
+    Gst.init(None)
+    pipeline = Gst.parse_launch(description)
+    bus = pipeline.get_bus()
+    start = time.process_time()
+    try:
+        pipeline.set_state(Gst.State.PLAYING)
+        message = bus.timed_pop_filtered(
+            timeout * Gst.SECOND,
+            Gst.MessageType.EOS | Gst.MessageType.ERROR,
+        )
+        if not message:
+            raise Exception("Pipeline timed out")
+        if message.type == Gst.MessageType.ERROR:
+            error, _ = message.parse_error()
+            raise Exception(error.message)
+        return time.process_time() - start
+    finally:
+        pipeline.set_state(Gst.State.NULL)
+
+
+class DecoderBenchmark:
+    """
+    Rank audio decoders by CPU time spent decoding the same generated sample on this hardware.
+    Pipelines run in a dedicated process: CPU time of the module process also counts players,
+    loudness analysis, clips and other applications, it can't be used to compare decoders.
+    """
+
+    SAMPLE_PIPELINE = (
+        "audiotestsrc num-buffers={buffers} samplesperbuffer=4410 wave=pink-noise"
+        " ! audio/x-raw,rate=44100,channels=2 ! audioconvert ! {encoder} ! filesink location={location}"
+    )
+    # 4410 samples per buffer at 44100Hz: 10 buffers per second of audio
+    BUFFERS_PER_SECOND = 10
+    SAMPLE_DURATION = 30
+    RUNS = 3
+    PIPELINE_TIMEOUT = 60
+    # encoders producing benchmark sample of each audio format
+    ENCODERS = {
+        "audio/mpeg": "lamemp3enc",
+        "audio/flac": "flacenc",
+        "audio/ogg": "vorbisenc ! oggmux",
+        "audio/x-hx-aac-adts": "avenc_aac ! aacparse ! audio/mpeg,stream-format=adts",
+        "audio/x-hx-aac-adif": "avenc_aac ! aacparse ! audio/mpeg,stream-format=adts",
+        "audio/aac": "avenc_aac ! aacparse ! audio/mpeg,stream-format=adts",
+    }
+
+    def __init__(self, logger):
+        """
+        Constructor
+
+        Args:
+            logger (Logger): logger instance
+        """
+        self.logger = logger
+        self.__executor = None
+
+    def rank(self, audio_format, chain, decoders):
+        """
+        Rank decoders of specified audio format
+
+        Args:
+            audio_format (string): audio format (mime type)
+            chain (list): names of elements preceding decoder in playback pipeline (demuxer, parser...)
+            decoders (list): names of installed candidate decoders
+
+        Returns:
+            list: decoders sorted from fastest to slowest, failing decoders last::
+
+            [
+                {
+                    decoder (string): decoder name
+                    cpu (float): CPU time spent decoding sample in seconds (None if decoder failed)
+                },
+                ...
+            ]
+
+        Raises:
+            Exception: if benchmark sample can't be generated
+        """
+        encoder = self.ENCODERS.get(audio_format)
+        if not encoder:
+            raise Exception(f'No encoder to generate "{audio_format}" sample')
+
+        handle, location = tempfile.mkstemp(prefix="audioplayer-bench-")
+        os.close(handle)
+        self.__executor = ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        )
+        try:
+            self._run(
+                self.SAMPLE_PIPELINE.format(
+                    buffers=self.SAMPLE_DURATION * self.BUFFERS_PER_SECOND,
+                    encoder=encoder,
+                    location=location,
+                )
+            )
+            results = []
+            for decoder in decoders:
+                description = " ! ".join(
+                    [f"filesrc location={location}"]
+                    + chain
+                    + [decoder, "fakesink sync=false"]
+                )
+                try:
+                    # keep best run to limit noise of other process activity
+                    cpu = min(self._run(description) for _ in range(self.RUNS))
+                except Exception:
+                    self.logger.exception('Decoder "%s" benchmark failed', decoder)
+                    cpu = None
+                self.logger.debug(
+                    'Decoder "%s" for "%s": cpu=%s', decoder, audio_format, cpu
+                )
+                results.append({"decoder": decoder, "cpu": cpu})
+        finally:
+            self.__executor.shutdown()
+            self.__executor = None
+            os.remove(location)
+
+        return sorted(
+            results,
+            key=lambda result: (result["cpu"] is None, result["cpu"] or 0.0),
+        )
+
+    def _run(self, description):
+        """
+        Run pipeline until end of stream in benchmark process
+
+        Args:
+            description (string): pipeline description
+
+        Returns:
+            float: CPU time spent by benchmark process while pipeline was running (seconds)
+
+        Raises:
+            Exception: if pipeline failed or timed out
+        """
+        return self.__executor.submit(
+            _measure_pipeline, description, self.PIPELINE_TIMEOUT
+        ).result()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+
+
+class LazyModule:
+    """
+    Module proxy importing module on first attribute access.
+    Gstreamer bindings and libmagic are slow to load, they are loaded when first used instead of
+    when Cleep loads the application.
+    """
+
+    def __init__(self, loader):
+        """
+        Constructor
+
+        Args:
+            loader (function): function importing and returning module
+        """
+        self.__loader = loader
+        self.__module = None
+        self.__lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        """
+        Return True if module is loaded
+
+        Returns:
+            bool: True if module is loaded
+        """
+        return self.__module is not None
+
+    def load(self):
+        """
+        Import module if not already done
+
+        Returns:
+            module: loaded module
+        """
+        if self.__module is None:
+            with self.__lock:
+                if self.__module is None:
+                    self.__module = self.__loader()
+        return self.__module
+
+    def __getattr__(self, name):
+        if name.startswith("_LazyModule__"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+
+def _load_gst():
+    # pylint: disable=C0415
+    import gi
+
+    gi.require_version("Gst", "1.0")
+    from gi.repository import Gst as module
+
+    return module
+
+
+def _load_gst_controller():
+    # pylint: disable=C0415
+    import gi
+
+    gi.require_version("Gst", "1.0")
+    gi.require_version("GstController", "1.0")
+    from gi.repository import GstController as module
+
+    return module
+
+
+def _load_magic():
+    # pylint: disable=C0415
+    import magic as module
+
+    return module
+
+
+Gst = LazyModule(_load_gst)
+GstController = LazyModule(_load_gst_controller)
+magic = LazyModule(_load_magic)
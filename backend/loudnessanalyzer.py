@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import math
+import threading
+import multiprocessing
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from .lazyimport import Gst
+
+ANALYSIS_PIPELINE = "filesrc name=source ! decodebin ! audioconvert ! audioresample ! rganalysis ! fakesink sync=false"
+ANALYSIS_TIMEOUT = 300
+
+
+def _init_worker(niceness):
+    """
+    Lower analysis process priority to not compete with live playback.
+    Process is niced before gstreamer is loaded so all its threads, including gstreamer
+    streaming threads, are created with this niceness.
+
+    Args:
+        niceness (int): process niceness
+    """
+    os.setpriority(os.PRIO_PROCESS, 0, niceness)
+
+
+def _compute_replaygain(filepath):
+    """
+    Run rganalysis pipeline on specified file. Executed in analysis process.
+
+    Args:
+        filepath (string): local file path
+
+    Returns:
+        tuple: track gain (dB) and peak, (None, None) if analysis failed
+    """
+    Gst.init(None)
+    gain = None
+    peak = None
+    pipeline = Gst.parse_launch(ANALYSIS_PIPELINE)
+    pipeline.get_by_name("source").set_property("location", filepath)
+    bus = pipeline.get_bus()
+    try:
+        pipeline.set_state(Gst.State.PLAYING)
+        while True:
+            message = bus.timed_pop_filtered(
+                ANALYSIS_TIMEOUT * Gst.SECOND,
+                Gst.MessageType.TAG | Gst.MessageType.EOS | Gst.MessageType.ERROR,
+            )
+            if not message or message.type != Gst.MessageType.TAG:
+                break
+            tags = message.parse_tag()
+            found, value = tags.get_double(Gst.TAG_TRACK_GAIN)
+            if found:
+                gain = value
+            found, value = tags.get_double(Gst.TAG_TRACK_PEAK)
+            if found:
+                peak = value
+    finally:
+        pipeline.set_state(Gst.State.NULL)
+
+    return gain, peak
+
+
+class LoudnessAnalyzer:
+    """
+    Compute ReplayGain track gain and peak of local audio files in background.
+    Analysis runs in niced worker processes: niceness of a thread is not applied to gstreamer
+    streaming threads taken from gstreamer thread pool, only a niced process is.
+    Results are cached persistently to be applied at playback time.
+    """
+
+    def __init__(self, logger, cleep_filesystem, cache_path, workers=1, niceness=19):
+        """
+        Constructor
+
+        Args:
+            logger (Logger): logger instance
+            cleep_filesystem (CleepFilesystem): filesystem instance
+            cache_path (string): path of cache file
+            workers (int, optional): number of analysis processes. Defaults to 1.
+            niceness (int, optional): niceness of analysis processes. Defaults to 19.
+        """
+        self.logger = logger
+        self.cleep_filesystem = cleep_filesystem
+        self.cache_path = cache_path
+        self.workers = workers
+        self.niceness = niceness
+        self.__lock = threading.Lock()
+        self.__pending = set()
+        self.__executor = None
+        self.__cache = {}
+
+    def start(self):
+        """
+        Load cache and start workers
+        """
+        cache = None
+        try:
+            if os.path.exists(self.cache_path):
+                cache = self.cleep_filesystem.read_json(self.cache_path)
+        except Exception:
+            self.logger.exception("Unable to read loudness cache")
+        self.__cache = cache or {}
+        # spawned processes don't inherit gstreamer state of application process
+        self.__executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.niceness,),
+        )
+
+    def stop(self):
+        """
+        Stop workers. Pending analysis are cancelled
+        """
+        if self.__executor:
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+            self.__executor = None
+        with self.__lock:
+            self.__pending.clear()
+
+    def get_status(self):
+        """
+        Return analyzer status
+
+        Returns:
+            dict: analyzer status::
+
+            {
+                pending (int): number of pending analysis
+                analyzed (int): number of cached analysis
+                workers (int): number of analysis processes
+                niceness (int): analysis processes niceness
+            }
+
+        """
+        with self.__lock:
+            return {
+                "pending": len(self.__pending),
+                "analyzed": len(self.__cache),
+                "workers": self.workers,
+                "niceness": self.niceness,
+            }
+
+    def analyze(self, filepath):
+        """
+        Queue file analysis if file was not already analyzed
+
+        Args:
+            filepath (string): local file path
+
+        Returns:
+            bool: True if analysis is queued, False otherwise
+        """
+        if not self.__executor:
+            return False
+        with self.__lock:
+            if filepath in self.__pending or self.__get_cached(filepath):
+                return False
+            self.__pending.add(filepath)
+        try:
+            stat = os.stat(filepath)
+            future = self.__executor.submit(_compute_replaygain, filepath)
+        except Exception:
+            self.logger.exception('Unable to queue loudness analysis of "%s"', filepath)
+            with self.__lock:
+                self.__pending.discard(filepath)
+            return False
+        future.add_done_callback(partial(self.__analyzed, filepath, stat))
+
+        return True
+
+    def get_gain(self, filepath):
+        """
+        Return track gain to apply to specified file. Gain is limited to avoid clipping according to track peak
+
+        Args:
+            filepath (string): local file path
+
+        Returns:
+            float: track gain (dB) or None if file was not analyzed
+        """
+        with self.__lock:
+            result = self.__get_cached(filepath)
+        if not result:
+            return None
+
+        gain = result["gain"]
+        if result["peak"] and result["peak"] > 0:
+            gain = min(gain, -20.0 * math.log10(result["peak"]))
+        return gain
+
+    def __get_cached(self, filepath):
+        """
+        Return cached analysis if file did not change since analysis
+
+        Args:
+            filepath (string): local file path
+
+        Returns:
+            dict: cached analysis or None
+        """
+        result = self.__cache.get(filepath)
+        if not result:
+            return None
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        if result["mtime"] != int(stat.st_mtime) or result["size"] != stat.st_size:
+            return None
+        return result
+
+    def __analyzed(self, filepath, stat, future):
+        """
+        Cache result of file loudness analysis
+
+        Args:
+            filepath (string): local file path
+            stat (os.stat_result): file stat when analysis was queued
+            future (Future): analysis future
+        """
+        try:
+            if future.cancelled():
+                return
+            gain, peak = future.result()
+            if gain is None:
+                self.logger.warning('No loudness computed for "%s"', filepath)
+                return
+            self.logger.debug(
+                'Loudness of "%s": gain=%s peak=%s', filepath, gain, peak
+            )
+            with self.__lock:
+                self.__cache[filepath] = {
+                    "gain": gain,
+                    "peak": peak,
+                    "mtime": int(stat.st_mtime),
+                    "size": stat.st_size,
+                }
+        except Exception:
+            self.logger.exception('Error analyzing loudness of "%s"', filepath)
+        finally:
+            with self.__lock:
+                self.__pending.discard(filepath)
+                save = len(self.__pending) == 0
+            if save:
+                self.__save_cache()
+
+    def __save_cache(self):
+        """
+        Save cache to filesystem
+        """
+        with self.__lock:
+            cache = dict(self.__cache)
+        try:
+            if not self.cleep_filesystem.write_json(self.cache_path, cache):
+                self.logger.error("Unable to save loudness cache")
+        except Exception:
+            self.logger.exception("Unable to save loudness cache")
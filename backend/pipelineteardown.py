@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import queue
+import threading
+
+
+class PipelineTeardown:
+    """
+    Tear down released gstreamer pipelines in background.
+    Pipelines are submitted already switched to NULL state, so their audio device is released before
+    a new pipeline starts. Unlinking and removing elements is then done by a dedicated worker instead
+    of the module process loop.
+    """
+
+    STOP_TIMEOUT = 10.0
+
+    def __init__(self, logger):
+        """
+        Constructor
+
+        Args:
+            logger (Logger): logger instance
+        """
+        self.logger = logger
+        self.__queue = queue.Queue()
+        self.__thread = None
+        self.__lock = threading.Lock()
+        self.__pending = 0
+
+    def start(self):
+        """
+        Start worker
+        """
+        if self.__thread:
+            return
+        self.__thread = threading.Thread(
+            target=self.__run, name="teardown", daemon=True
+        )
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Stop worker once queued pipelines are torn down
+        """
+        if not self.__thread:
+            return
+        self.__queue.put(None)
+        self.__thread.join(self.STOP_TIMEOUT)
+        if self.__thread.is_alive():
+            self.logger.warning(
+                "Teardown worker still running, %s pipelines pending", self.pending
+            )
+        self.__thread = None
+
+    @property
+    def pending(self):
+        """
+        Return number of pipelines waiting for teardown
+
+        Returns:
+            int: number of pending teardowns
+        """
+        with self.__lock:
+            return self.__pending
+
+    def submit(self, pipeline, elements):
+        """
+        Queue pipeline teardown. Pipeline is torn down immediately if worker is not running.
+
+        Args:
+            pipeline (Gst.Pipeline): pipeline to tear down, already in NULL state
+            elements (list): pipeline elements in link order
+        """
+        if not self.__thread:
+            self.teardown(pipeline, elements)
+            return
+        with self.__lock:
+            self.__pending += 1
+        self.__queue.put((pipeline, elements))
+
+    def __run(self):
+        """
+        Worker loop
+        """
+        while True:
+            item = self.__queue.get()
+            if item is None:
+                break
+            try:
+                self.teardown(*item)
+            except Exception:
+                self.logger.exception("Error tearing down pipeline")
+            finally:
+                del item
+                with self.__lock:
+                    self.__pending -= 1
+
+    @staticmethod
+    def teardown(pipeline, elements):
+        """
+        Release pipeline elements
+
+        Args:
+            pipeline (Gst.Pipeline): pipeline to tear down, already in NULL state
+            elements (list): pipeline elements in link order
+        """
+        # unlink pipeline elements, last element is linked to nothing
+        for current, following in zip(elements, elements[1:]):
+            current.unlink(following)
+
+        # remove elements from pipeline
+        for element in elements:
+            pipeline.remove(element)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import time
+from .lazyimport import Gst
+
+
+class Playlist:
+    """
+    Player playlist
+    """
+
+    __slots__ = (
+        "index",
+        "duration",
+        "tracks",
+        "repeat",
+        "shuffle",
+        "volume",
+        "metadata",
+        "version",
+    )
+
+    # pylint: disable=R0913
+    def __init__(
+        self,
+        index=None,
+        duration=None,
+        tracks=None,
+        repeat=False,
+        shuffle=False,
+        volume=0,
+        metadata=None,
+        version=0,
+    ):
+        """
+        Constructor
+
+        Args:
+            index (int, optional): current track index. Defaults to None.
+            duration (int, optional): current track duration in seconds. Defaults to None.
+            tracks (list, optional): list of Track. Defaults to empty list.
+            repeat (bool, optional): repeat playlist. Defaults to False.
+            shuffle (bool, optional): playlist is shuffled. Defaults to False.
+            volume (int, optional): player volume. Defaults to 0.
+            metadata (dict, optional): current track metadata. Defaults to None.
+            version (int, optional): playlist version, incremented each time tracks are changed. Defaults to 0.
+        """
+        self.index = index
+        self.duration = duration
+        self.tracks = tracks if tracks is not None else []
+        self.repeat = repeat
+        self.shuffle = shuffle
+        self.volume = volume
+        self.metadata = metadata
+        self.version = version
+
+    def to_dict(self, offset=0, limit=None, fields=None):
+        """
+        Return playlist as dict
+
+        Args:
+            offset (int, optional): index of first track to return. Defaults to 0.
+            limit (int, optional): max number of tracks to return. Defaults to all tracks.
+            fields (list, optional): list of track fields to return (see Track.FIELDS). Defaults to all fields.
+
+        Returns:
+            dict: playlist::
+
+            {
+                index (int): current track index
+                duration (int): current track duration in seconds
+                tracks (list): list of tracks as returned by Track.to_dict
+                repeat (bool): repeat playlist
+                shuffle (bool): playlist is shuffled
+                volume (int): player volume
+                metadata (dict): current track metadata
+                version (int): playlist version
+            }
+
+        """
+        end = offset + limit if limit is not None else None
+        return {
+            "index": self.index,
+            "duration": self.duration,
+            "tracks": [track.to_dict(fields) for track in self.tracks[offset:end]],
+            "repeat": self.repeat,
+            "shuffle": self.shuffle,
+            "volume": self.volume,
+            "metadata": self.metadata,
+            "version": self.version,
+        }
+
+    def __repr__(self):
+        return f"Playlist(index={self.index}, tracks={len(self.tracks)}, version={self.version})"
+
+
+class PlayerInternal:
+    """
+    Player internal state, never returned to clients
+    """
+
+    __slots__ = (
+        "to_destroy",
+        "tags_sent",
+        "last_state",
+        "paused_since",
+        "position",
+        "last_used",
+        "fade",
+        "position_interval",
+        "event_seq",
+        "last_event",
+        "tracks_index",
+        "shuffle_order",
+        "latency_profile",
+    )
+
+    # pylint: disable=R0913,R0914
+    def __init__(
+        self,
+        to_destroy=False,
+        tags_sent=False,
+        last_state=None,
+        paused_since=None,
+        position=0,
+        last_used=None,
+        fade=None,
+        position_interval=0,
+        event_seq=0,
+        last_event=None,
+        tracks_index=None,
+        shuffle_order=None,
+        latency_profile="balanced",
+    ):
+        """
+        Constructor
+
+        Args:
+            to_destroy (bool, optional): player will be destroyed during next process loop. Defaults to False.
+            tags_sent (bool, optional): track metadata already sent. Defaults to False.
+            last_state (Gst.State, optional): last player state sent. Defaults to Gst.State.NULL.
+            paused_since (float, optional): timestamp player is paused since. Defaults to None.
+            position (int, optional): track position saved when player is suspended (nanoseconds). Defaults to 0.
+            last_used (float, optional): timestamp of last playback command. Defaults to now.
+            fade (dict, optional): running volume fade. Defaults to None.
+            position_interval (int, optional): position events interval in seconds (0 if disabled). Defaults to 0.
+            event_seq (int, optional): sequence number of last playback event. Defaults to 0.
+            last_event (dict, optional): playback info sent in last playback event. Defaults to empty dict.
+            tracks_index (dict, optional): playlist position of tracks by id. Defaults to empty dict.
+            shuffle_order (ShuffleOrder, optional): play order when playlist is shuffled. Defaults to None.
+            latency_profile (string, optional): audio sink buffering profile. Defaults to "balanced".
+        """
+        self.to_destroy = to_destroy
+        self.tags_sent = tags_sent
+        self.last_state = last_state if last_state is not None else Gst.State.NULL
+        self.paused_since = paused_since
+        self.position = position
+        self.last_used = last_used if last_used is not None else time.time()
+        self.fade = fade
+        self.position_interval = position_interval
+        self.event_seq = event_seq
+        self.last_event = last_event if last_event is not None else {}
+        self.tracks_index = tracks_index if tracks_index is not None else {}
+        self.shuffle_order = shuffle_order
+        self.latency_profile = latency_profile
+
+
+class Player:
+    """
+    Audio player: gstreamer pipeline handles, playlist and internal state
+
+    Players are kept in slotted objects: attribute access is cheaper than nested dict lookups on
+    message dispatch path and each player holds no per-instance dict.
+    """
+
+    __slots__ = (
+        "uuid",
+        "player",
+        "source",
+        "volume",
+        "pipeline",
+        "playlist",
+        "internal",
+    )
+
+    # pylint: disable=R0913
+    def __init__(
+        self,
+        uuid,
+        player=None,
+        source=None,
+        volume=None,
+        pipeline=None,
+        playlist=None,
+        internal=None,
+    ):
+        """
+        Constructor
+
+        Args:
+            uuid (string): player identifier
+            player (Gst.Pipeline, optional): pipeline (None if player is suspended). Defaults to None.
+            source (Gst.Element, optional): source element. Defaults to None.
+            volume (Gst.Element, optional): volume element. Defaults to None.
+            pipeline (list, optional): all pipeline elements in link order. Defaults to empty list.
+            playlist (Playlist, optional): player playlist. Defaults to empty playlist.
+            internal (PlayerInternal, optional): player internal state. Defaults to initial state.
+        """
+        self.uuid = uuid
+        self.player = player
+        self.source = source
+        self.volume = volume
+        self.pipeline = pipeline if pipeline is not None else []
+        self.playlist = playlist if playlist is not None else Playlist()
+        self.internal = internal if internal is not None else PlayerInternal()
+
+    def __repr__(self):
+        return f"Player({self.uuid!r}, {self.playlist!r})"
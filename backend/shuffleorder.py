@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import random
+
+
+class ShuffleOrder:
+    """
+    Shuffled play order over playlist track ids
+
+    Order is generated lazily with an incremental Fisher-Yates: each next step draws one id from
+    the pool of tracks not played yet, so it costs O(1) whatever the playlist size.
+    Playlist tracks are never reordered, dropping the shuffle order restores the original order.
+    """
+
+    def __init__(self, track_ids, current_id=None):
+        """
+        Constructor
+
+        Args:
+            track_ids (iterable): playlist track ids
+            current_id (int, optional): id of current track, first in shuffled order. Defaults to None.
+        """
+        # track ids not played yet in current cycle and their position in pool
+        self.__pool = []
+        self.__pool_positions = {}
+        # track ids in shuffled order
+        self.__history = []
+        self.__position = -1
+
+        for track_id in track_ids:
+            if track_id != current_id:
+                self.__add_to_pool(track_id)
+        if current_id is not None:
+            self.__history.append(current_id)
+            self.__position = 0
+
+    def next(self):
+        """
+        Return next track id
+
+        Returns:
+            int: next track id or None if all tracks were played
+        """
+        if self.__position + 1 < len(self.__history):
+            self.__position += 1
+            return self.__history[self.__position]
+        if not self.__pool:
+            return None
+
+        track_id = self.__pool[random.randrange(len(self.__pool))]
+        self.__remove_from_pool(track_id)
+        self.__history.append(track_id)
+        self.__position += 1
+        return track_id
+
+    def has_next(self):
+        """
+        Return True if there is a next track in shuffled order
+
+        Returns:
+            bool: True if next track exists
+        """
+        return self.__position + 1 < len(self.__history) or len(self.__pool) > 0
+
+    def previous(self):
+        """
+        Return previous track id
+
+        Returns:
+            int: previous track id or None if current track is the first one
+        """
+        if self.__position <= 0:
+            return None
+        self.__position -= 1
+        return self.__history[self.__position]
+
+    def add(self, track_id):
+        """
+        Add new playlist track to tracks to play
+
+        Args:
+            track_id (int): track id
+        """
+        self.__add_to_pool(track_id)
+
+    def remove(self, track_id):
+        """
+        Remove track from shuffled order
+
+        Args:
+            track_id (int): track id
+        """
+        if track_id in self.__pool_positions:
+            self.__remove_from_pool(track_id)
+            return
+        self.__remove_from_history(track_id)
+
+    def play(self, track_id):
+        """
+        Move specified track right after current one and make it current
+
+        Args:
+            track_id (int): track id
+        """
+        if track_id in self.__pool_positions:
+            self.__remove_from_pool(track_id)
+        else:
+            self.__remove_from_history(track_id)
+        self.__history.insert(self.__position + 1, track_id)
+        self.__position += 1
+
+    def __remove_from_history(self, track_id):
+        """
+        Remove track id from already played ids
+
+        Args:
+            track_id (int): track id
+        """
+        try:
+            index = self.__history.index(track_id)
+        except ValueError:
+            return
+        del self.__history[index]
+        if index <= self.__position:
+            self.__position -= 1
+
+    def __add_to_pool(self, track_id):
+        """
+        Add track id to pool
+
+        Args:
+            track_id (int): track id
+        """
+        self.__pool_positions[track_id] = len(self.__pool)
+        self.__pool.append(track_id)
+
+    def __remove_from_pool(self, track_id):
+        """
+        Remove track id from pool swapping it with last pool item
+
+        Args:
+            track_id (int): track id
+        """
+        index = self.__pool_positions.pop(track_id)
+        last_id = self.__pool.pop()
+        if last_id != track_id:
+            self.__pool[index] = last_id
+            self.__pool_positions[last_id] = index
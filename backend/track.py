@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import sys
+
+
+class Track:
+    """
+    Playlist track
+
+    Tracks are stored in slotted objects to keep playlists of thousands of tracks compact.
+    Audio formats come from a small set of mime types so they are interned and shared by all tracks.
+    """
+
+    __slots__ = ("id", "resource", "_audio_format", "duration")
+    FIELDS = ("id", "resource", "audio_format", "duration")
+
+    def __init__(self, track_id, resource, audio_format):
+        """
+        Constructor
+
+        Args:
+            track_id (int): track identifier, stable while track is in playlist
+            resource (string): audio resource (file or url)
+            audio_format (string): resource format (mime)
+        """
+        self.id = track_id
+        self.resource = resource
+        self.audio_format = audio_format
+        self.duration = None
+
+    @property
+    def audio_format(self):
+        """
+        Return track audio format
+
+        Returns:
+            string: resource format (mime)
+        """
+        return self._audio_format
+
+    @audio_format.setter
+    def audio_format(self, audio_format):
+        """
+        Set track audio format
+
+        Args:
+            audio_format (string): resource format (mime)
+        """
+        self._audio_format = (
+            sys.intern(audio_format) if audio_format is not None else None
+        )
+
+    def to_dict(self, fields=None):
+        """
+        Return track as dict
+
+        Args:
+            fields (list, optional): list of fields to return (see FIELDS). Defaults to all fields.
+
+        Returns:
+            dict: track::
+
+            {
+                id (int): track identifier
+                resource (string): audio resource (file or url)
+                audio_format (string): resource format (mime)
+                duration (int): track duration in seconds (None if track was not played yet)
+            }
+
+        """
+        if fields is not None:
+            return {field: getattr(self, field) for field in fields}
+        return {
+            "id": self.id,
+            "resource": self.resource,
+            "audio_format": self._audio_format,
+            "duration": self.duration,
+        }
+
+    def __repr__(self):
+        return f"Track({self.id}, {self.resource!r}, {self._audio_format!r})"
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Measure start delay of a short clip played through a new decoding pipeline and through
+persistent clip player fed from decoded clips cache
+
+Delay is the time from play request until first clip buffer reaches audio sink. Clips are played
+at CLIP_VOLUME so the clip player volume scaling is measured too.
+
+Usage: python3 bench_clip.py [runs] [sink]
+"""
+import os
+import sys
+import time
+import logging
+import tempfile
+import threading
+import gi
+
+# pylint: disable=C0413
+gi.require_version("Gst", "1.0")
+from gi.repository import Gst
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from backend.clipcache import ClipCache
+from backend.clipplayer import ClipPlayer
+
+CLIP_PIPELINE = (
+    "audiotestsrc num-buffers=48 samplesperbuffer=1000 wave=ticks ! audio/x-raw,rate=48000,channels=2"
+    " ! audioconvert ! vorbisenc ! oggmux ! filesink location={location}"
+)
+PLAYBACK_PIPELINE = (
+    "filesrc location={location} ! decodebin ! audioconvert ! audioresample"
+    " ! volume volume={volume} ! {sink} name=sink"
+)
+CLIP_VOLUME = 50
+
+
+def run_pipeline(description):
+    """
+    Run pipeline until end of stream
+
+    Args:
+        description (string): pipeline description
+    """
+    pipeline = Gst.parse_launch(description)
+    pipeline.set_state(Gst.State.PLAYING)
+    pipeline.get_bus().timed_pop_filtered(
+        Gst.CLOCK_TIME_NONE, Gst.MessageType.EOS | Gst.MessageType.ERROR
+    )
+    pipeline.set_state(Gst.State.NULL)
+
+
+def watch_first_buffer(sink):
+    """
+    Watch buffers reaching sink
+
+    Args:
+        sink (Gst.Element): audio sink
+
+    Returns:
+        tuple: event set and list filled with arrival time of next buffer, probe id
+    """
+    arrived = threading.Event()
+    arrival = []
+
+    def on_buffer(_pad, _info):
+        if not arrived.is_set():
+            arrival.append(time.perf_counter())
+            arrived.set()
+        return Gst.PadProbeReturn.OK
+
+    probe = sink.get_static_pad("sink").add_probe(Gst.PadProbeType.BUFFER, on_buffer)
+    return arrived, arrival, probe
+
+
+def run_pipeline_playback(location, sink_name):
+    """
+    Play clip with new pipeline as start_playback does
+
+    Returns:
+        float: delay until first buffer reaches sink (seconds)
+    """
+    start = time.perf_counter()
+    pipeline = Gst.parse_launch(
+        PLAYBACK_PIPELINE.format(
+            location=location, sink=sink_name, volume=CLIP_VOLUME / 100
+        )
+    )
+    arrived, arrival, _ = watch_first_buffer(pipeline.get_by_name("sink"))
+    pipeline.set_state(Gst.State.PLAYING)
+    arrived.wait(5)
+    pipeline.get_bus().timed_pop_filtered(
+        Gst.CLOCK_TIME_NONE, Gst.MessageType.EOS | Gst.MessageType.ERROR
+    )
+    pipeline.set_state(Gst.State.NULL)
+    return arrival[0] - start
+
+
+def run_clip_playback(cache, player, sink, location):
+    """
+    Play clip with persistent clip player
+
+    Returns:
+        float: delay until first buffer reaches sink (seconds)
+    """
+    arrived, arrival, probe = watch_first_buffer(sink)
+    start = time.perf_counter()
+    clip = cache.get(location)
+    player.play(clip, CLIP_VOLUME)
+    arrived.wait(5)
+    delay = arrival[0] - start
+    sink.get_static_pad("sink").remove_probe(probe)
+    time.sleep(clip.duration / 1000)
+    return delay
+
+
+def main():
+    """
+    Main
+    """
+    Gst.init(None)
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    sink_name = sys.argv[2] if len(sys.argv) > 2 else "alsasink"
+    logger = logging.getLogger("bench")
+    handle, location = tempfile.mkstemp(prefix="audioplayer-bench-", suffix=".ogg")
+    os.close(handle)
+    try:
+        run_pipeline(CLIP_PIPELINE.format(location=location))
+
+        results = sorted(run_pipeline_playback(location, sink_name) for _ in range(runs))
+        print(f"    pipeline: median={results[len(results) // 2] * 1000:.1f}ms")
+
+        cache = ClipCache(logger, 4 * 1024 * 1024)
+        player = ClipPlayer(logger)
+        sink = Gst.ElementFactory.make(sink_name, "sink")
+        player.start(sink)
+        # first play decodes clip and scales it to volume
+        cold = run_clip_playback(cache, player, sink, location)
+        results = sorted(
+            run_clip_playback(cache, player, sink, location) for _ in range(runs)
+        )
+        player.stop()
+        print(f"  clip (cold): {cold * 1000:.1f}ms")
+        print(f"clip (cached): median={results[len(results) // 2] * 1000:.1f}ms")
+    finally:
+        os.remove(location)
+
+
+if __name__ == "__main__":
+    main()
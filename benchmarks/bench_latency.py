@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Measure start-to-audible delay of audioplayer latency profiles
+
+Delay is the time from pipeline start until first buffer reaches audio sink, plus sink latency
+reported by pipeline latency query (audio buffered by sink before being played by device).
+
+Usage: python3 bench_latency.py [runs] [sink]
+"""
+import os
+import sys
+import time
+import threading
+import gi
+
+# pylint: disable=C0413
+gi.require_version("Gst", "1.0")
+from gi.repository import Gst
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from backend.audioplayer import Audioplayer
+
+PIPELINE = "audiotestsrc is-live=true wave=sine ! audioconvert ! audioresample"
+
+
+def run(profile, sink_name):
+    """
+    Play pipeline configured with latency profile until first buffer reaches sink
+
+    Args:
+        profile (dict): latency profile (see Audioplayer.LATENCY_PROFILES)
+        sink_name (string): audio sink element name
+
+    Returns:
+        tuple: time to first buffer and sink latency (seconds)
+    """
+    description = PIPELINE
+    if profile["queue_time"]:
+        description += f" ! queue max-size-time={profile['queue_time'] * Gst.MSECOND}"
+        description += " max-size-buffers=0 max-size-bytes=0"
+    description += (
+        f" ! volume ! {sink_name} name=sink buffer-time={profile['buffer_time']}"
+        f" latency-time={profile['latency_time']}"
+    )
+    pipeline = Gst.parse_launch(description)
+    first_buffer = threading.Event()
+    arrival = []
+
+    def on_buffer(_pad, _info):
+        if not first_buffer.is_set():
+            arrival.append(time.perf_counter())
+            first_buffer.set()
+        return Gst.PadProbeReturn.OK
+
+    pipeline.get_by_name("sink").get_static_pad("sink").add_probe(
+        Gst.PadProbeType.BUFFER, on_buffer
+    )
+    start = time.perf_counter()
+    pipeline.set_state(Gst.State.PLAYING)
+    first_buffer.wait(5)
+    pipeline.get_state(Gst.CLOCK_TIME_NONE)
+    query = Gst.Query.new_latency()
+    latency = 0
+    if pipeline.query(query):
+        _, min_latency, _ = query.parse_latency()
+        latency = min_latency / Gst.SECOND
+    pipeline.set_state(Gst.State.NULL)
+    return arrival[0] - start, latency
+
+
+def main():
+    """
+    Main
+    """
+    Gst.init(None)
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    sink_name = sys.argv[2] if len(sys.argv) > 2 else "alsasink"
+    print(f"Start-to-audible delay with {sink_name}, median of {runs} runs")
+    for name, profile in Audioplayer.LATENCY_PROFILES.items():
+        results = sorted((run(profile, sink_name) for _ in range(runs)), key=sum)
+        first_buffer, latency = results[len(results) // 2]
+        print(
+            f"{name:>12}: first-buffer={first_buffer * 1000:.1f}ms "
+            f"sink-latency={latency * 1000:.1f}ms "
+            f"audible={(first_buffer + latency) * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Measure niceness of threads running loudness analysis and playback slowdown while analysis runs
+
+A sample file is analyzed in loop by LoudnessAnalyzer while a reference pipeline decodes the same
+file as fast as possible. Niceness of every thread of analysis processes (including gstreamer
+streaming threads) is read from /proc during analysis.
+
+Usage: python3 bench_loudness.py [workers] [niceness]
+"""
+import os
+import sys
+import time
+import logging
+import tempfile
+import multiprocessing
+import gi
+
+# pylint: disable=C0413
+gi.require_version("Gst", "1.0")
+from gi.repository import Gst
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from backend.loudnessanalyzer import LoudnessAnalyzer
+
+SAMPLE_PIPELINE = (
+    "audiotestsrc num-buffers=600 samplesperbuffer=4410 wave=pink-noise ! audio/x-raw,rate=44100,channels=2"
+    " ! audioconvert ! vorbisenc ! oggmux ! filesink location={location}"
+)
+DECODE_PIPELINE = "filesrc location={location} ! decodebin ! audioconvert ! audioresample ! fakesink sync=false"
+
+
+class NoFilesystem:
+    """
+    Cleep filesystem replacement, cache is not saved
+    """
+
+    def read_json(self, _path):
+        return {}
+
+    def write_json(self, _path, _content):
+        return True
+
+
+def run_pipeline(description):
+    """
+    Run pipeline until end of stream
+
+    Returns:
+        float: run duration (seconds)
+    """
+    start = time.perf_counter()
+    pipeline = Gst.parse_launch(description)
+    pipeline.set_state(Gst.State.PLAYING)
+    pipeline.get_bus().timed_pop_filtered(
+        Gst.CLOCK_TIME_NONE, Gst.MessageType.EOS | Gst.MessageType.ERROR
+    )
+    pipeline.set_state(Gst.State.NULL)
+    return time.perf_counter() - start
+
+
+def get_threads_niceness(pid):
+    """
+    Return niceness of all threads of specified process
+
+    Returns:
+        dict: niceness by thread name
+    """
+    threads = {}
+    for tid in os.listdir(f"/proc/{pid}/task"):
+        try:
+            with open(f"/proc/{pid}/task/{tid}/stat", encoding="utf-8") as stat:
+                content = stat.read()
+        except OSError:
+            continue
+        name = content[content.index("(") + 1 : content.rindex(")")]
+        fields = content[content.rindex(")") + 2 :].split()
+        # niceness is 19th field of stat, 3rd one is state
+        threads[f"{name}/{tid}"] = int(fields[16])
+    return threads
+
+
+def main():
+    """
+    Main
+    """
+    Gst.init(None)
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    niceness = int(sys.argv[2]) if len(sys.argv) > 2 else 19
+    handle, location = tempfile.mkstemp(prefix="audioplayer-bench-", suffix=".ogg")
+    os.close(handle)
+    try:
+        run_pipeline(SAMPLE_PIPELINE.format(location=location))
+        decode = DECODE_PIPELINE.format(location=location)
+        idle = min(run_pipeline(decode) for _ in range(3))
+        print(f"decode alone: {idle * 1000:.1f}ms")
+
+        analyzer = LoudnessAnalyzer(
+            logging.getLogger("bench"), NoFilesystem(), "/tmp/bench.json", workers, niceness
+        )
+        analyzer.start()
+        for index in range(workers * 4):
+            # different paths so nothing is served from analysis cache
+            link = f"{location}.{index}.ogg"
+            os.symlink(location, link)
+            analyzer.analyze(link)
+        time.sleep(1)
+        for child in multiprocessing.active_children():
+            niceness_found = sorted(set(get_threads_niceness(child.pid).values()))
+            print(f"analysis process {child.pid} threads niceness: {niceness_found}")
+        busy = min(run_pipeline(decode) for _ in range(3))
+        print(f"decode during analysis: {busy * 1000:.1f}ms ({(busy / idle - 1) * 100:+.1f}%)")
+        analyzer.stop()
+    finally:
+        for index in range(workers * 4):
+            if os.path.lexists(f"{location}.{index}.ogg"):
+                os.remove(f"{location}.{index}.ogg")
+        os.remove(location)
+
+
+if __name__ == "__main__":
+    main()
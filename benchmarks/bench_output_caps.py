@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Measure CPU cost of audioplayer conversion chain with and without fixed output caps
+
+Both chains feed a capsfilter holding audio sink caps, as a real sink constrains its input,
+so default chain pays for conversion and resampling to device format too.
+Fixed-caps chain is built as __get_pipeline_elements builds it: second converter is only dropped
+when output format is a gain sample format (F32LE, F64LE), for other formats only capsfilter is
+added and chain cost is unchanged.
+
+Usage: python3 bench_output_caps.py [seconds]
+"""
+import sys
+import time
+import gi
+
+# pylint: disable=C0413
+gi.require_version("Gst", "1.0")
+from gi.repository import Gst
+
+# audio sink caps: usual ALSA hardware format and sound server float format
+SINKS = {
+    "S16LE sink": "audio/x-raw,format=S16LE,rate=48000,channels=2",
+    "F32LE sink": "audio/x-raw,format=F32LE,rate=48000,channels=2",
+}
+
+# output caps are fixed to sink caps
+CHAINS = {
+    # chain built for every format when no output format is configured
+    "default": "audioconvert ! rgvolume ! audioconvert ! audioresample ! volume",
+    # chain built when output format is fixed to sink format
+    "fixed-caps": "audioconvert ! rgvolume ! audioconvert ! audioresample ! {sink_caps} ! volume",
+    # chain built when output format is fixed to gain sample format
+    "fixed-caps-gain": "audioconvert ! rgvolume ! audioresample ! {sink_caps} ! volume",
+}
+
+INPUTS = {
+    "44.1kHz S16LE": "audio/x-raw,format=S16LE,rate=44100,channels=2,layout=interleaved",
+    "48kHz S16LE": "audio/x-raw,format=S16LE,rate=48000,channels=2,layout=interleaved",
+}
+
+
+def run(input_caps, chain, sink_caps, seconds):
+    """
+    Run pipeline as fast as possible and return consumed CPU time
+
+    Args:
+        input_caps (string): caps of decoded stream
+        chain (string): chain description
+        sink_caps (string): caps accepted by audio sink
+        seconds (int): audio duration to process
+
+    Returns:
+        float: CPU time (seconds)
+    """
+    samples = 1024
+    rate = int(input_caps.split("rate=")[1].split(",")[0])
+    buffers = int(seconds * rate / samples)
+    pipeline = Gst.parse_launch(
+        f"audiotestsrc wave=pink-noise num-buffers={buffers} samplesperbuffer={samples} "
+        f"! {input_caps} ! {chain.format(sink_caps=sink_caps)} ! {sink_caps} ! fakesink sync=false"
+    )
+    start = time.process_time()
+    pipeline.set_state(Gst.State.PLAYING)
+    pipeline.get_bus().timed_pop_filtered(
+        Gst.CLOCK_TIME_NONE, Gst.MessageType.EOS | Gst.MessageType.ERROR
+    )
+    elapsed = time.process_time() - start
+    pipeline.set_state(Gst.State.NULL)
+    return elapsed
+
+
+def main():
+    """
+    Main
+    """
+    Gst.init(None)
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    print(f"CPU time to process {seconds}s of audio")
+    for sink_name, sink_caps in SINKS.items():
+        # second converter is only dropped for gain sample formats
+        fixed = "fixed-caps-gain" if "F32LE" in sink_caps else "fixed-caps"
+        chains = {name: CHAINS[name] for name in ("default", fixed)}
+        for input_name, input_caps in INPUTS.items():
+            results = {
+                name: run(input_caps, chain, sink_caps, seconds)
+                for name, chain in chains.items()
+            }
+            print(
+                f"{sink_name} {input_name:>14}: "
+                + " ".join(
+                    f"{name}={elapsed:.3f}s ({100.0 * (1 - elapsed / results['default']):+.1f}%)"
+                    for name, elapsed in results.items()
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
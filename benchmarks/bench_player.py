@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Measure memory and message dispatch cost of audioplayer players stored as nested dicts and slotted objects
+
+Usage: python3 bench_player.py [players]
+"""
+import os
+import sys
+import time
+import timeit
+import tracemalloc
+
+# pylint: disable=C0413
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from backend.player import Player, Playlist, PlayerInternal
+from backend.track import Track
+
+DISPATCHES = 200000
+STATE_PLAYING = 4
+
+
+def make_dict_player(uuid):
+    """
+    Player as stored before slotted players
+    """
+    return {
+        "uuid": uuid,
+        "playlist": {
+            "index": 0,
+            "duration": None,
+            "tracks": [Track(1, "/music/track.mp3", "audio/mpeg")],
+            "repeat": False,
+            "shuffle": False,
+            "volume": 50,
+            "metadata": None,
+            "version": 0,
+        },
+        "player": None,
+        "source": None,
+        "volume": None,
+        "pipeline": [],
+        "internal": {
+            "to_destroy": False,
+            "tags_sent": False,
+            "last_state": 1,
+            "paused_since": None,
+            "position": 0,
+            "last_used": time.time(),
+            "fade": None,
+            "position_interval": 0,
+            "event_seq": 0,
+            "last_event": {},
+            "tracks_index": {},
+            "shuffle_order": None,
+        },
+    }
+
+
+def make_slotted_player(uuid):
+    """
+    Slotted player
+    """
+    return Player(
+        uuid,
+        playlist=Playlist(
+            index=0, tracks=[Track(1, "/music/track.mp3", "audio/mpeg")], volume=50
+        ),
+        internal=PlayerInternal(last_state=1),
+    )
+
+
+def dispatch_dict(players, uuid):
+    """
+    Field accesses of a state changed message handling (see __send_playback_event)
+    """
+    if players[uuid]["internal"]["to_destroy"] or not players[uuid]["playlist"]["tracks"]:
+        return
+    players[uuid]["internal"]["last_state"] = STATE_PLAYING
+    players[uuid]["playlist"]["duration"] = 180
+    playlist = players[uuid]["playlist"]
+    playlist["tracks"][playlist["index"]].duration = 180
+    players[uuid]["internal"]["event_seq"] += 1
+
+
+def dispatch_slotted(players, uuid):
+    """
+    Same accesses on slotted player
+    """
+    if players[uuid].internal.to_destroy or not players[uuid].playlist.tracks:
+        return
+    players[uuid].internal.last_state = STATE_PLAYING
+    players[uuid].playlist.duration = 180
+    playlist = players[uuid].playlist
+    playlist.tracks[playlist.index].duration = 180
+    players[uuid].internal.event_seq += 1
+
+
+def measure_memory(count, make_player):
+    """
+    Return bytes allocated per player (tracks excluded)
+    """
+    uuids = [f"uuid-{index}" for index in range(count)]
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    players = {uuid: make_player(uuid) for uuid in uuids}
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    track_size = tracemalloc_size(lambda: Track(1, "/music/track.mp3", "audio/mpeg"))
+    return (after - before) / count - track_size, players
+
+
+def tracemalloc_size(factory):
+    """
+    Return bytes allocated by factory
+    """
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    obj = factory()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return after - before
+
+
+def main():
+    """
+    Main
+    """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    print(f"{count} players, {DISPATCHES} dispatches")
+    for name, make_player, dispatch in (
+        ("dict", make_dict_player, dispatch_dict),
+        ("slotted", make_slotted_player, dispatch_slotted),
+    ):
+        size, players = measure_memory(count, make_player)
+        uuid = next(iter(players))
+        duration = timeit.timeit(lambda: dispatch(players, uuid), number=DISPATCHES)
+        print(
+            f"{name:>8}: {size:.0f}B/player dispatch={duration / DISPATCHES * 1e9:.0f}ns"
+        )
+
+
+if __name__ == "__main__":
+    main()
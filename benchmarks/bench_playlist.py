@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Measure memory and operations cost of audioplayer playlist storage with dict and slotted tracks
+
+Usage: python3 bench_playlist.py [sizes...]
+"""
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+# pylint: disable=C0413
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from backend.track import Track
+
+FORMATS = ["audio/mpeg", "audio/flac", "audio/ogg", "audio/aac"]
+LOOKUPS = 1000
+
+
+def make_dict_track(track_id, resource, audio_format):
+    """
+    Track as stored before slotted tracks
+    """
+    return {"id": track_id, "resource": resource, "audio_format": audio_format}
+
+
+def make_resource(index):
+    """
+    Return resource path. Format strings are rebuilt for each track like when coming from RPC
+    """
+    return (
+        f"/media/music/artist{index % 500}/album{index % 50}/{index:06d} track title.mp3",
+        "".join(["audio/", FORMATS[index % len(FORMATS)].split("/")[1]]),
+    )
+
+
+def build(size, make_track):
+    """
+    Build playlist and index
+
+    Returns:
+        tuple: tracks list, index by id, bytes allocated
+    """
+    resources = [make_resource(index) for index in range(size)]
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracks = []
+    index = {}
+    for track_id, (resource, audio_format) in enumerate(resources, 1):
+        track = make_track(track_id, resource, audio_format)
+        tracks.append(track)
+        index[track_id] = track
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tracks, index, after - before
+
+
+def run(size, make_track):
+    """
+    Run benchmark for specified playlist size
+
+    Returns:
+        dict: bytes per track, add (us), remove (us) and lookup (us) mean costs
+    """
+    tracks, index, allocated = build(size, make_track)
+    ids = random.sample(list(index.keys()), LOOKUPS)
+
+    start = time.perf_counter()
+    for track_id in ids:
+        tracks.index(index[track_id])
+    lookup = (time.perf_counter() - start) / LOOKUPS
+
+    start = time.perf_counter()
+    for track_id in ids:
+        tracks.pop(tracks.index(index.pop(track_id)))
+    remove = (time.perf_counter() - start) / LOOKUPS
+
+    resource, audio_format = make_resource(size)
+    start = time.perf_counter()
+    for track_id in range(size + 1, size + 1 + LOOKUPS):
+        track = make_track(track_id, resource, audio_format)
+        tracks.insert(len(tracks) // 2, track)
+        index[track_id] = track
+    add = (time.perf_counter() - start) / LOOKUPS
+
+    return {
+        "bytes": allocated / size,
+        "add": add * 1e6,
+        "remove": remove * 1e6,
+        "lookup": lookup * 1e6,
+    }
+
+
+def main():
+    """
+    Main
+    """
+    sizes = [int(size) for size in sys.argv[1:]] or [10000, 50000, 100000]
+    print("Per track memory (track, list slot and id index entry) and mean operation cost")
+    for size in sizes:
+        for name, make_track in (("dict", make_dict_track), ("slotted", Track)):
+            result = run(size, make_track)
+            print(
+                f"{size:>7} {name:>8}: {result['bytes']:.0f}B/track "
+                f"add={result['add']:.1f}us remove={result['remove']:.1f}us "
+                f"lookup={result['lookup']:.1f}us"
+            )
+
+
+if __name__ == "__main__":
+    main()
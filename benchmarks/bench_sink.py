@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Measure pipeline start latency with autoaudiosink and with concrete sink it selects
+
+Usage: python3 bench_sink.py [runs]
+"""
+import sys
+import time
+import gi
+
+# pylint: disable=C0413
+gi.require_version("Gst", "1.0")
+from gi.repository import Gst
+
+PIPELINE = "audiotestsrc ! audioconvert ! volume ! {sink}"
+
+
+def resolve_sink():
+    """
+    Return sink element selected by autoaudiosink and its device
+
+    Returns:
+        string: sink description
+    """
+    sink = Gst.ElementFactory.make("autoaudiosink", "sink")
+    sink.set_state(Gst.State.READY)
+    child = sink.get_child_by_index(0)
+    description = child.get_factory().get_name()
+    if child.find_property("device"):
+        description += f' device="{child.get_property("device")}"'
+    sink.set_state(Gst.State.NULL)
+    return description
+
+
+def run(sink):
+    """
+    Build pipeline and wait for it to play
+
+    Args:
+        sink (string): sink description
+
+    Returns:
+        float: duration from pipeline creation to playing state (seconds)
+    """
+    start = time.perf_counter()
+    pipeline = Gst.parse_launch(PIPELINE.format(sink=sink))
+    pipeline.set_state(Gst.State.PLAYING)
+    pipeline.get_state(Gst.CLOCK_TIME_NONE)
+    elapsed = time.perf_counter() - start
+    pipeline.set_state(Gst.State.NULL)
+    return elapsed
+
+
+def main():
+    """
+    Main
+    """
+    Gst.init(None)
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    sinks = {"autoaudiosink": "autoaudiosink", "resolved": resolve_sink()}
+    print(f"Resolved sink: {sinks['resolved']}")
+    # first run loads plugins, not measured
+    run(sinks["autoaudiosink"])
+    for name, sink in sinks.items():
+        results = sorted(run(sink) for _ in range(runs))
+        print(
+            f"{name:>14}: median={results[len(results) // 2] * 1000:.1f}ms "
+            f"min={results[0] * 1000:.1f}ms max={results[-1] * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Measure audioplayer startup cost with eager and lazy gstreamer and libmagic loading
+
+Each measure runs in a fresh python process so nothing is already imported or initialized.
+Startup is the time spent when Cleep loads the application, first play the time to have the
+first pipeline playing. With lazy loading gstreamer cost moves from startup to first play.
+
+Usage: python3 bench_startup.py [runs]
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+EAGER_IMPORT = """
+import gi
+gi.require_version("Gst", "1.0")
+gi.require_version("GstController", "1.0")
+from gi.repository import Gst, GstController
+import magic
+Gst.init(None)
+"""
+
+LAZY_IMPORT = """
+from backend.lazyimport import Gst, GstController, magic
+"""
+
+LOAD = """
+Gst.init(None)
+GstController.InterpolationControlSource
+magic.Magic
+"""
+
+FIRST_PLAY = """
+pipeline = Gst.parse_launch("audiotestsrc num-buffers=10 ! audioconvert ! volume ! autoaudiosink")
+pipeline.set_state(Gst.State.PLAYING)
+pipeline.get_state(Gst.CLOCK_TIME_NONE)
+pipeline.set_state(Gst.State.NULL)
+"""
+
+SCENARIOS = {
+    # gstreamer and libmagic loaded and initialized with application
+    "eager": (EAGER_IMPORT, FIRST_PLAY),
+    # gstreamer and libmagic loaded and initialized by first playback command
+    "lazy": (LAZY_IMPORT, LOAD + FIRST_PLAY),
+}
+
+TIMED = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+{startup}
+startup = time.perf_counter() - start
+start = time.perf_counter()
+{first_play}
+print(startup, time.perf_counter() - start)
+"""
+
+
+def run(startup, first_play):
+    """
+    Run scenario in new process
+
+    Args:
+        startup (string): code executed at application load
+        first_play (string): code executed by first playback command
+
+    Returns:
+        tuple: startup and first play durations (seconds)
+    """
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            TIMED.format(root=ROOT, startup=startup, first_play=first_play),
+        ],
+        text=True,
+    )
+    startup_time, first_play_time = output.split()
+    return float(startup_time), float(first_play_time)
+
+
+def main():
+    """
+    Main
+    """
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"Best of {runs} runs")
+    for name, (startup, first_play) in SCENARIOS.items():
+        results = [run(startup, first_play) for _ in range(runs)]
+        print(
+            f"{name:>6}: startup={min(r[0] for r in results) * 1000:.1f}ms "
+            f"first-play={min(r[1] for r in results) * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,7 @@ function($rootScope, cleepService, toastService, audioplayerService, $mdDialog)
         self.selectedPlayerId = undefined;
         self.volume = 100;
         self.repeat = false;
+        self.shuffle = false;
         self.playerIndex = null;
         self.players = [];
 
@@ -71,28 +72,36 @@ function($rootScope, cleepService, toastService, audioplayerService, $mdDialog)
                     if (response.error) {
                         return;
                     }
-                    self.loadPlaylist(self.selectedPlayerId);
+                    self.shuffle = true;
                 });
         };
 
+        self.setShuffle = function() {
+            if (self.shuffle) {
+                audioplayerService.shufflePlaylist(self.selectedPlayerId);
+            } else {
+                audioplayerService.unshufflePlaylist(self.selectedPlayerId);
+            }
+        };
+
         self.addTrack = function() {
-            audioplayerService.addTrack(self.selectedPlayerId, self.url, self.selectedFormat, self.trackIndex)
-                .then((response) => {
-                    if (response.error) {
-                        return;
-                    }
-                    self.loadPlaylist(self.selectedPlayerId);
-                });
+            audioplayerService.addTrack(self.selectedPlayerId, self.url, self.selectedFormat, self.trackIndex);
         };
 
-        self.removeTrack = function(trackIndex) {
-            audioplayerService.removeTrack(self.selectedPlayerId, trackIndex)
-                .then((response) => {
-                    if (response.error) {
-                        return;
-                    }
-                    self.loadPlaylist(self.selectedPlayerId);
-                });
+        self.removeTrack = function(trackId) {
+            audioplayerService.removeTrack(self.selectedPlayerId, trackId);
+        };
+
+        self.showPreviousTracks = function() {
+            const offset = Math.max(audioplayerService.playlist.offset - audioplayerService.PLAYLIST_WINDOW, 0);
+            audioplayerService.getPlaylist(self.selectedPlayerId, offset);
+        };
+
+        self.showNextTracks = function() {
+            const offset = audioplayerService.playlist.offset + audioplayerService.PLAYLIST_WINDOW;
+            if (offset < audioplayerService.playlist.count) {
+                audioplayerService.getPlaylist(self.selectedPlayerId, offset);
+            }
         };
 
         self.loadPlaylist = function(playerId) {
@@ -100,6 +109,7 @@ function($rootScope, cleepService, toastService, audioplayerService, $mdDialog)
                 .then((response) => {
                     self.selectedPlayerId = playerId;
                     self.repeat = response.data.repeat;
+                    self.shuffle = response.data.shuffle;
                     self.volume = response.data.volume;
                 });
         };
@@ -6,12 +6,15 @@
  */
 angular
 .module('Cleep')
-.service('audioplayerService', ['$rootScope', 'rpcService',
-function($rootScope, rpcService) {
+.service('audioplayerService', ['$rootScope', '$q', '$timeout', 'rpcService',
+function($rootScope, $q, $timeout, rpcService) {
     var self = this;
     self.players = [];
     self.playlist = {};
     self.playlistPlayerId = null;
+    self.VOLUME_DEBOUNCE_DELAY = 150;
+    self.PLAYLIST_WINDOW = 50;
+    self.pendingVolumes = {};
 
     self.refreshPlayers = function() {
         return rpcService.sendCommand('get_players', 'audioplayer')
@@ -53,11 +56,28 @@ function($rootScope, rpcService) {
         });
     };
 
+    /**
+     * Set player volume
+     * Calls are debounced per player: only latest volume is sent and all callers get its response
+     */
     self.setVolume = function(playerId, volume) {
-        return rpcService.sendCommand('set_volume', 'audioplayer', {
-            player_uuid: playerId,
-            volume: volume,
-        });
+        const pending = self.pendingVolumes[playerId];
+        if (pending) {
+            $timeout.cancel(pending.timer);
+        }
+        const deferred = pending ? pending.deferred : $q.defer();
+        const timer = $timeout(() => {
+            delete self.pendingVolumes[playerId];
+            rpcService.sendCommand('set_volume', 'audioplayer', {
+                player_uuid: playerId,
+                volume: volume,
+                coalesce: true,
+            })
+                .then(deferred.resolve, deferred.reject);
+        }, self.VOLUME_DEBOUNCE_DELAY);
+        self.pendingVolumes[playerId] = { timer, deferred };
+
+        return deferred.promise;
     };
 
     self.setRepeat = function(playerId, repeat) {
@@ -73,9 +93,46 @@ function($rootScope, rpcService) {
         });
     };
 
-    self.getPlaylist = function(playerId) {
+    self.unshufflePlaylist = function(playerId) {
+        return rpcService.sendCommand('unshuffle_playlist', 'audioplayer', {
+            player_uuid: playerId,
+        });
+    };
+
+    self.getPlaybackSnapshot = function(playerId) {
+        return rpcService.sendCommand('get_playback_snapshot', 'audioplayer', {
+            player_uuid: playerId,
+        });
+    };
+
+    /**
+     * Resync player after missed delta event
+     */
+    self.resyncPlayer = function(playerId) {
+        return self.getPlaybackSnapshot(playerId)
+            .then((response) => {
+                if (response.error) return;
+                const player = self.players.find((player) => player.playeruuid === playerId);
+                if (player) {
+                    Object.assign(player, response.data);
+                } else {
+                    self.players.push(response.data);
+                }
+                if (playerId === self.playlistPlayerId) {
+                    self.playlist.index = response.data.index;
+                }
+                return response;
+            });
+    };
+
+    /**
+     * Get playlist window. Only tracks from offset to offset + PLAYLIST_WINDOW are fetched
+     */
+    self.getPlaylist = function(playerId, offset) {
         return rpcService.sendCommand('get_playlist', 'audioplayer', {
             player_uuid: playerId,
+            offset: offset || 0,
+            limit: self.PLAYLIST_WINDOW,
         })
             .then((response) => {
                 if (response.error) return;
@@ -94,19 +151,96 @@ function($rootScope, rpcService) {
         });
     };
 
-    self.removeTrack = function(playerId, trackIndex) {
+    self.removeTrack = function(playerId, trackId) {
         return rpcService.sendCommand('remove_track', 'audioplayer', {
             player_uuid: playerId,
+            track_id: trackId,
+        });
+    };
+
+    self.moveTrack = function(playerId, trackId, trackIndex) {
+        return rpcService.sendCommand('move_track', 'audioplayer', {
+            player_uuid: playerId,
+            track_id: trackId,
             track_index: trackIndex,
         });
     };
 
+    self.playTrack = function(playerId, trackId) {
+        return rpcService.sendCommand('play_track', 'audioplayer', {
+            player_uuid: playerId,
+            track_id: trackId,
+        });
+    };
+
+    /**
+     * Apply playlist changes received from playlist update event to loaded playlist window
+     * Return false if changes can't be applied locally and window must be fetched again
+     */
+    self.applyPlaylistChanges = function(changes) {
+        const playlist = self.playlist;
+        for (const change of changes) {
+            switch (change.action) {
+                case 'insert': {
+                    // only inserted ids are sent, window must be fetched if tracks are inserted in it
+                    const position = change.index - playlist.offset;
+                    playlist.count += change.count;
+                    if (position < 0) {
+                        playlist.offset += change.count;
+                    } else if (position < self.PLAYLIST_WINDOW) {
+                        return false;
+                    }
+                    break;
+                }
+                case 'remove': {
+                    const start = change.index - playlist.offset;
+                    const end = start + change.count;
+                    playlist.count -= change.count;
+                    if (end <= 0) {
+                        playlist.offset -= change.count;
+                    } else {
+                        playlist.tracks.splice(Math.max(start, 0), Math.min(end, playlist.tracks.length) - Math.max(start, 0));
+                        playlist.offset = Math.min(playlist.offset, change.index);
+                    }
+                    break;
+                }
+                case 'move': {
+                    const from = change.from - playlist.offset;
+                    const to = change.to - playlist.offset;
+                    if (from < 0 || to < 0 || from + change.count > playlist.tracks.length || to >= playlist.tracks.length) {
+                        return false;
+                    }
+                    const moved = playlist.tracks.splice(from, change.count);
+                    playlist.tracks.splice(to, 0, ...moved);
+                    break;
+                }
+                case 'shuffle':
+                    playlist.shuffle = change.shuffle;
+                    break;
+            }
+        }
+        return true;
+    };
+
     /**
      * Catch events
      */
+    $rootScope.$on('audioplayer.playlist.update', function(event, uuid, params) {
+        if (params.playeruuid !== self.playlistPlayerId || !self.playlist.tracks) {
+            return;
+        }
+        if (params.version !== self.playlist.version + 1 || !self.applyPlaylistChanges(params.changes)) {
+            // changes missed or outside window, get playlist window again
+            self.getPlaylist(params.playeruuid, self.playlist.offset);
+            return;
+        }
+        self.playlist.version = params.version;
+        self.playlist.index = params.index;
+    });
+
     $rootScope.$on('audioplayer.playback.update', function(event, uuid, params) {
-        // update playlist
-        if (Object.keys(self.playlist).length) {
+        // update playlist (delta events only contain changed fields)
+        if (Object.keys(self.playlist).length && params.playeruuid === self.playlistPlayerId && 'index' in params) {
             self.playlist.index = params.index;
         }
 
@@ -132,6 +266,11 @@ function($rootScope, rpcService) {
         let found = false;
         for (const player of self.players) {
             if (player.playeruuid === params.playeruuid) {
+                if (params.seq !== undefined && player.seq !== undefined && params.seq !== player.seq + 1) {
+                    // delta event missed, get full player state
+                    self.resyncPlayer(params.playeruuid);
+                    return;
+                }
                 Object.assign(player, params);
                 found = true;
                 break;
@@ -3,11 +3,18 @@
 import unittest
 import logging
 import sys
+import threading
+from collections import deque
 
 sys.path.append("../")
 from backend.audioplayer import Audioplayer
 from backend.audioplayer import Gst
 from backend.audioplayerplaybackupdateevent import AudioplayerPlaybackUpdateEvent
+from backend.audioplayerplaybackpositionevent import AudioplayerPlaybackPositionEvent
+from backend.audioplayerplaylistupdateevent import AudioplayerPlaylistUpdateEvent
+from backend.track import Track
+from backend.player import Player, Playlist, PlayerInternal
+from backend.shuffleorder import ShuffleOrder
 from cleep.exception import (
     InvalidParameter,
     MissingParameter,
@@ -16,7 +23,7 @@ from cleep.exception import (
     CommandInfo,
 )
 from cleep.libs.tests import session
-from mock import Mock, patch, MagicMock
+from mock import Mock, patch, MagicMock, ANY, call
 
 
 class GstreamerMsg:
@@ -42,20 +49,84 @@ class TestAudioplayer(unittest.TestCase):
         self.module = self.session.setup(Audioplayer)
         if start:
             self.session.start_module(self.module)
+            self.module._init_gstreamer()
 
     def test_configure(self):
         self.init(False)
 
         with patch("backend.audioplayer.Gst") as gstMock:
             self.session.start_module(self.module)
-            gstMock.init.assert_called_with(None)
+            gstMock.init.assert_not_called()
+
+    def test_init_gstreamer(self):
+        self.init(False)
+
+        with patch("backend.audioplayer.Gst") as gstMock:
+            self.session.start_module(self.module)
+            self.module._init_gstreamer()
+            find_calls = gstMock.ElementFactory.find.call_count
+            self.module._init_gstreamer()
+
+            gstMock.init.assert_called_once_with(None)
+            self.assertGreater(find_calls, 0)
+            self.assertEqual(gstMock.ElementFactory.find.call_count, find_calls)
+
+    def test_start_playback_init_gstreamer(self):
+        self.init(False)
+        self.session.start_module(self.module)
+        self.module._init_gstreamer = Mock(side_effect=Exception("stop"))
+
+        with self.assertRaises(Exception):
+            self.module.start_playback("/dummy/file.mp3")
+
+        self.module._init_gstreamer.assert_called_once()
+
+    def test_configure_warmup(self):
+        self.init(False)
+        self.module._get_config = Mock(
+            return_value=dict(self.module.DEFAULT_CONFIG, warmup=True)
+        )
+
+        with patch("backend.audioplayer.threading.Thread") as threadMock:
+            self.session.start_module(self.module)
+
+            threadMock.assert_any_call(
+                target=self.module._warmup, name="warmup", daemon=True
+            )
+
+    @patch("backend.audioplayer.Gst")
+    def test_warmup(self, gstMock):
+        self.init()
+        self.module.logger = Mock()
+        pipelineMock = Mock()
+        gstMock.Pipeline.new.return_value = pipelineMock
+
+        self.module._warmup()
+
+        formats_count = len(self.module.supported_formats)
+        self.assertGreater(formats_count, 0)
+        self.assertEqual(gstMock.Pipeline.new.call_count, formats_count)
+        pipelineMock.set_state.assert_any_call(gstMock.State.READY)
+        # pipelines are released once ready
+        self.assertEqual(pipelineMock.set_state.call_count, 2 * formats_count)
+        gstMock.ElementFactory.make.assert_called_with("fakesink", "sink")
+        self.module.logger.info.assert_called_with("Warm-up done in %.0fms", ANY)
+
+    def test_warmup_exception(self):
+        self.init()
+        self.module.logger = Mock()
+        self.module._init_gstreamer = Mock(side_effect=Exception("Test exception"))
+
+        self.module._warmup()
+
+        self.module.logger.exception.assert_called_with("Error during warm-up")
 
     def test_on_stop(self):
         self.init()
-        player = {
-            "uuid": "the-uuid",
-            "player": "player-stuff",
-        }
+        player = Player(
+            uuid="the-uuid",
+            player="player-stuff",
+        )
         self.module.players = {"the-uuid": player}
         self.module._Audioplayer__destroy_player = Mock()
 
@@ -66,10 +137,10 @@ class TestAudioplayer(unittest.TestCase):
 
     def test__prepare_player(self):
         self.init()
-        player = {
-            "uuid": "the-uuid",
-            "player": "player-stuff",
-        }
+        player = Player(
+            uuid="the-uuid",
+            player="player-stuff",
+        )
         self.module.players = {"the-uuid": player}
         self.module._Audioplayer__reset_player = Mock()
         self.module._Audioplayer__build_pipeline = Mock()
@@ -96,9 +167,19 @@ class TestAudioplayer(unittest.TestCase):
     def test__create_player(self):
         self.init()
         self.module._get_unique_id = Mock(return_value="the-uuid")
-        player = {
-            "uuid": "the-uuid",
-            "playlist": {
+
+        with patch("backend.audioplayer.time.time", Mock(return_value=1000)):
+            result = self.module._Audioplayer__create_player()
+
+        self.assertIsInstance(result, Player)
+        self.assertEqual(result.uuid, "the-uuid")
+        self.assertIsNone(result.player)
+        self.assertIsNone(result.source)
+        self.assertIsNone(result.volume)
+        self.assertListEqual(result.pipeline, [])
+        self.assertDictEqual(
+            result.playlist.to_dict(),
+            {
                 "index": None,
                 "tracks": [],
                 "repeat": False,
@@ -106,23 +187,21 @@ class TestAudioplayer(unittest.TestCase):
                 "volume": 0,
                 "metadata": None,
                 "duration": None,
+                "version": 0,
             },
-            "player": None,
-            "source": None,
-            "volume": None,
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": False,
-                # NOT TESTED
-                #    "last_state": Gst.State.NULL,
-            },
-        }
-
-        result = self.module._Audioplayer__create_player()
-
-        del result["internal"]["last_state"]
-        self.assertEqual(result, player)
+        )
+        self.assertFalse(result.internal.to_destroy)
+        self.assertFalse(result.internal.tags_sent)
+        self.assertEqual(result.internal.last_state, Gst.State.NULL)
+        self.assertIsNone(result.internal.paused_since)
+        self.assertEqual(result.internal.position, 0)
+        self.assertEqual(result.internal.last_used, 1000)
+        self.assertIsNone(result.internal.fade)
+        self.assertEqual(result.internal.position_interval, 0)
+        self.assertEqual(result.internal.event_seq, 0)
+        self.assertDictEqual(result.internal.last_event, {})
+        self.assertDictEqual(result.internal.tracks_index, {})
+        self.assertIsNone(result.internal.shuffle_order)
 
     def test__reset_player(self):
         self.init()
@@ -130,98 +209,97 @@ class TestAudioplayer(unittest.TestCase):
         pipeline_elt1 = Mock()
         pipeline_elt2 = Mock()
         pipeline_elt3 = Mock()
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": ["track1", "track2", "track3"],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": player,
-            "source": "source",
-            "volume": "volume",
-            "pipeline": [
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=["track1", "track2", "track3"],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=player,
+            source="source",
+            volume="volume",
+            pipeline=[
                 pipeline_elt1,
                 pipeline_elt2,
                 pipeline_elt3,
             ],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
         self.module.players = {"the-uuid": player_data}
 
+        self.module.pipeline_teardown = Mock()
+
         self.module._Audioplayer__reset_player(player_data)
 
-        player.set_state.assert_called()
-        pipeline_elt1.unlink.assert_called()
-        pipeline_elt2.unlink.assert_called()
-        self.assertFalse(pipeline_elt3.unlink.called)
-        player.remove.assert_any_call(pipeline_elt1)
-        player.remove.assert_any_call(pipeline_elt2)
-        player.remove.assert_any_call(pipeline_elt3)
-        self.assertIsNone(player_data["player"])
-        self.assertIsNone(player_data["source"])
-        self.assertIsNone(player_data["volume"])
-        self.assertEqual(len(player_data["pipeline"]), 0)
-        self.assertEqual(player_data["playlist"]["index"], 1)
-        self.assertEqual(len(player_data["playlist"]["tracks"]), 3)
-        self.assertEqual(player_data["playlist"]["volume"], 55)
-        self.assertEqual(player_data["internal"]["to_destroy"], False)
-        self.assertEqual(player_data["internal"]["tags_sent"], False)
+        self.module.pipeline_teardown.submit.assert_called_once_with(
+            player, [pipeline_elt1, pipeline_elt2, pipeline_elt3]
+        )
+        player.set_state.assert_called_once_with(Gst.State.NULL)
+        self.assertIsNone(player_data.player)
+        self.assertIsNone(player_data.source)
+        self.assertIsNone(player_data.volume)
+        self.assertEqual(len(player_data.pipeline), 0)
+        self.assertEqual(player_data.playlist.index, 1)
+        self.assertEqual(len(player_data.playlist.tracks), 3)
+        self.assertEqual(player_data.playlist.volume, 55)
+        self.assertEqual(player_data.internal.to_destroy, False)
+        self.assertEqual(player_data.internal.tags_sent, False)
 
     def test_destroy_player(self):
         self.init()
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": ["track1", "track2", "track3"],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": Mock(),
-            "source": "source",
-            "volume": "volume",
-            "pipeline": [Mock()],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=["track1", "track2", "track3"],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=Mock(),
+            source="source",
+            volume="volume",
+            pipeline=[Mock()],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
         self.module.players = {"the-uuid": player_data}
 
         self.module._destroy_player(player_data)
 
-        self.assertTrue(player_data["internal"]["to_destroy"])
+        self.assertTrue(player_data.internal.to_destroy)
 
     def test__destroy_player(self):
         self.init()
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": ["track1", "track2", "track3"],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": Mock(),
-            "source": "source",
-            "volume": "volume",
-            "pipeline": [Mock()],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=["track1", "track2", "track3"],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=Mock(),
+            source="source",
+            volume="volume",
+            pipeline=[Mock()],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
         self.module.players = {"the-uuid": player_data}
         self.module._Audioplayer__reset_player = Mock()
 
@@ -230,2364 +308,5001 @@ class TestAudioplayer(unittest.TestCase):
         self.module._Audioplayer__reset_player.assert_called_with(player_data)
         self.assertEqual(len(self.module.players), 0)
 
+    def test_get_player_lock(self):
+        self.init()
+        self.module.players = {
+            "uuid1": Player(uuid="uuid1"),
+            "uuid2": Player(uuid="uuid2"),
+        }
+
+        lock1 = self.module._get_player_lock("uuid1")
+        lock2 = self.module._get_player_lock("uuid2")
+
+        self.assertIs(self.module._get_player_lock("uuid1"), lock1)
+        self.assertIsNot(lock1, lock2)
+        self.assertIs(
+            self.module._get_player_lock("unknown"),
+            self.module._Audioplayer__players_lock,
+        )
+
+    def test__destroy_player_releases_player_lock(self):
+        self.init()
+        player_data = Player(uuid="the-uuid")
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__reset_player = Mock()
+        lock = self.module._get_player_lock("the-uuid")
+
+        self.module._Audioplayer__destroy_player(player_data)
+
+        self.assertNotIn("the-uuid", self.module._Audioplayer__players_locks)
+        self.assertIsNot(self.module._get_player_lock("the-uuid"), lock)
+
+    def test_get_players_snapshot(self):
+        self.init()
+        player_data = Player(uuid="the-uuid")
+        self.module.players = {"the-uuid": player_data}
+
+        snapshot = self.module._get_players_snapshot()
+        del self.module.players["the-uuid"]
+
+        self.assertListEqual(snapshot, [player_data])
+
     @patch("backend.audioplayer.Gst.Pipeline")
     @patch("backend.audioplayer.Gst.ElementFactory")
     def test__build_pipeline(self, elementFactoryMock, pipelineMock):
         self.init()
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": ["track1", "track2", "track3"],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": None,
-            "source": None,
-            "volume": None,
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=["track1", "track2", "track3"],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=None,
+            source=None,
+            volume=None,
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+                position_interval=0,
+            ),
+        )
         self.module.players = {"the-uuid": player_data}
         sourceMock = Mock()
+        # ignore audio sink probed at startup
+        elementFactoryMock.find.return_value.create.reset_mock()
 
         self.module._Audioplayer__build_pipeline(sourceMock, "audio/mpeg", player_data)
 
         pipelineMock.new.assert_called_once_with("the-uuid")
         self.assertEqual(
-            len(player_data["pipeline"]),
+            len(player_data.pipeline),
             len(Audioplayer.AUDIO_PIPELINE_ELEMENTS["audio/mpeg"]) + 4,
         )
-        self.assertIsNotNone(player_data["player"])
-        self.assertIsNotNone(player_data["source"])
-        self.assertIsNotNone(player_data["volume"])
+        self.assertIsNotNone(player_data.player)
+        self.assertIsNotNone(player_data.source)
+        self.assertIsNotNone(player_data.volume)
+        # elements created from factories resolved at startup
         self.assertEqual(
-            elementFactoryMock.make.call_count, len(player_data["pipeline"]) - 1
+            elementFactoryMock.find.return_value.create.call_count,
+            len(player_data.pipeline) - 1,
         )  # -1 because source element is created elsewhere
+        elementFactoryMock.make.assert_not_called()
 
     @patch("backend.audioplayer.Gst.Pipeline")
     @patch("backend.audioplayer.Gst.ElementFactory")
     def test__build_pipeline_exception(self, elementFactoryMock, pipelineMock):
         self.init()
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": ["track1", "track2", "track3"],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": None,
-            "source": None,
-            "volume": None,
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=["track1", "track2", "track3"],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=None,
+            source=None,
+            volume=None,
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+                position_interval=0,
+            ),
+        )
         self.module.players = {"the-uuid": player_data}
         sourceMock = Mock()
-        elementFactoryMock.make.side_effect = [Mock(), Mock(), Mock(), None]
+        elementFactoryMock.find.return_value.create.side_effect = [
+            Mock(),
+            Mock(),
+            Mock(),
+            None,
+        ]
 
         with self.assertRaises(Exception) as cm:
             self.module._Audioplayer__build_pipeline(
                 sourceMock, "audio/mpeg", player_data
             )
         self.assertEqual(str(cm.exception), "Error configuring audio player")
-        player_data["pipeline"].clear()
+        player_data.pipeline.clear()
 
-    def test_on_process(self):
+    @patch("backend.audioplayer.Gst.Pipeline")
+    @patch("backend.audioplayer.Gst.ElementFactory")
+    def test__build_pipeline_with_output_caps(self, elementFactoryMock, pipelineMock):
         self.init()
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": ["track1", "track2", "track3"],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": None,
-            "source": None,
-            "volume": None,
-            "pipeline": [],
-            "internal": {
-                "to_destroy": True,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=["track1", "track2", "track3"],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=None,
+            source=None,
+            volume=None,
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+                position_interval=0,
+            ),
+        )
         self.module.players = {"the-uuid": player_data}
-        self.module._Audioplayer__process_players_messages = Mock()
-        self.module._Audioplayer__destroy_player = Mock()
+        self.module.output_caps = Mock()
+        self.module._get_config_field = Mock(
+            return_value={"rate": 48000, "channels": 2, "format": "F32LE"}
+        )
+        sourceMock = Mock()
 
-        self.module._on_process()
+        self.module._Audioplayer__build_pipeline(sourceMock, "audio/mpeg", player_data)
 
-        self.module._Audioplayer__process_players_messages.assert_called_once()
-        self.module._Audioplayer__destroy_player.assert_called_once_with(player_data)
+        # converter2 is dropped, capsfilter is added
+        self.assertEqual(
+            len(player_data.pipeline),
+            len(Audioplayer.AUDIO_PIPELINE_ELEMENTS["audio/mpeg"]) + 4,
+        )
+        factory = elementFactoryMock.find.return_value
+        factory.create.assert_any_call("outputcaps")
+        names = [call.args[0] for call in factory.create.call_args_list]
+        self.assertNotIn("converter2", names)
+        factory.create.return_value.set_property.assert_any_call(
+            "caps", self.module.output_caps
+        )
 
-    def test_on_process_no_player_to_destroy(self):
+    @patch("backend.audioplayer.Gst.Pipeline")
+    @patch("backend.audioplayer.Gst.ElementFactory")
+    def test__build_pipeline_robust_latency_profile(
+        self, elementFactoryMock, pipelineMock
+    ):
         self.init()
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": ["track1", "track2", "track3"],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": None,
-            "source": None,
-            "volume": None,
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
+        player_data = Player(
+            uuid="the-uuid",
+            internal=PlayerInternal(latency_profile="robust"),
+        )
         self.module.players = {"the-uuid": player_data}
-        self.module._Audioplayer__process_players_messages = Mock()
-        self.module._Audioplayer__destroy_player = Mock()
 
-        self.module._on_process()
+        self.module._Audioplayer__build_pipeline(Mock(), "audio/mpeg", player_data)
 
-        self.module._Audioplayer__process_players_messages.assert_called_once()
-        self.assertEqual(self.module._Audioplayer__destroy_player.call_count, 0)
+        # queue is added before volume
+        self.assertEqual(
+            len(player_data.pipeline),
+            len(Audioplayer.AUDIO_PIPELINE_ELEMENTS["audio/mpeg"]) + 5,
+        )
+        factory = elementFactoryMock.find.return_value
+        factory.create.assert_any_call("queue")
+        element = factory.create.return_value
+        element.set_property.assert_any_call("max-size-time", 2000 * Gst.MSECOND)
+        element.set_property.assert_any_call("buffer-time", 500000)
+        element.set_property.assert_any_call("latency-time", 20000)
+
+    def test__apply_latency_profile(self):
+        self.init()
+        sink = Mock()
 
-    def test_on_process_no_player(self):
+        self.module._Audioplayer__apply_latency_profile(
+            sink, Audioplayer.LATENCY_PROFILES["low-latency"]
+        )
+
+        sink.set_property.assert_any_call("buffer-time", 40000)
+        sink.set_property.assert_any_call("latency-time", 10000)
+
+    def test__apply_latency_profile_not_configurable_sink(self):
         self.init()
-        self.module._Audioplayer__process_players_messages = Mock()
-        self.module._Audioplayer__destroy_player = Mock()
+        sink = Mock()
+        sink.find_property.return_value = None
 
-        self.module._on_process()
+        self.module._Audioplayer__apply_latency_profile(
+            sink, Audioplayer.LATENCY_PROFILES["low-latency"]
+        )
 
-        self.module._Audioplayer__process_players_messages.assert_called_once()
-        self.assertEqual(self.module._Audioplayer__destroy_player.call_count, 0)
+        sink.set_property.assert_not_called()
 
-    def test__process_players_messages(self):
+    def test__get_pipeline_elements(self):
         self.init()
-        player1_mock = Mock()
-        player1_mock.get_bus.return_value.pop.side_effect = ["msg1", "msg2", None]
-        player2_mock = Mock()
-        player2_mock.get_bus.return_value.pop.side_effect = ["msg3", None]
-        self.module.players = {
-            "uuid1": {
-                "uuid": "uuid1",
-                "player": player1_mock,
-                "pipeline": [],
-                "internal": {
-                    "to_destroy": False,
-                },
-            },
-            "uuid2": {
-                "uuid": "uuid2",
-                "player": player2_mock,
-                "pipeline": [],
-                "internal": {
-                    "to_destroy": False,
-                },
-            },
-        }
-        self.module._Audioplayer__process_gstreamer_message = Mock()
 
-        self.module._Audioplayer__process_players_messages()
+        result = self.module._Audioplayer__get_pipeline_elements("audio/mpeg")
 
-        self.module._Audioplayer__process_gstreamer_message.assert_any_call(
-            "uuid1", session.AnyArg(), "msg1"
+        self.assertDictEqual(
+            result,
+            dict(
+                Audioplayer.AUDIO_PIPELINE_ELEMENTS["audio/mpeg"],
+                decoder="mpg123audiodec",
+            ),
         )
-        self.module._Audioplayer__process_gstreamer_message.assert_any_call(
-            "uuid1", session.AnyArg(), "msg2"
+
+    def test__get_pipeline_elements_output_caps_not_gain_format(self):
+        self.init()
+        self.module.output_caps = Mock()
+        self.module._get_config_field = Mock(
+            return_value={"rate": 48000, "channels": 2, "format": "S16LE"}
         )
-        self.module._Audioplayer__process_gstreamer_message.assert_any_call(
-            "uuid2", session.AnyArg(), "msg3"
+
+        result = self.module._Audioplayer__get_pipeline_elements("audio/flac")
+
+        self.assertDictEqual(
+            result,
+            dict(Audioplayer.AUDIO_PIPELINE_ELEMENTS["audio/flac"], decoder="flacdec"),
         )
 
-    def test__process_players_messages_no_player(self):
+    def test__resolve_element_factories(self):
         self.init()
-        self.module._Audioplayer__process_gstreamer_message = Mock()
 
-        self.module._Audioplayer__process_players_messages()
+        with patch("backend.audioplayer.Gst") as gstMock:
+            gstMock.ElementFactory.find.side_effect = lambda name: (
+                None
+                if name in ("faad", "flacdec", "avdec_flac", "mpg123audiodec")
+                else Mock(name=name)
+            )
+            self.module._Audioplayer__resolve_element_factories()
 
-        self.module._Audioplayer__process_gstreamer_message.assert_not_called()
+        self.assertNotIn("faad", self.module.element_factories)
+        self.assertIn("avdec_mp3", self.module.element_factories)
+        self.assertListEqual(
+            self.module.supported_formats,
+            [
+                "audio/mpeg",
+                "audio/ogg",
+                "audio/x-hx-aac-adts",
+                "audio/x-hx-aac-adif",
+                "audio/aac",
+            ],
+        )
+        # first installed alternative is used
+        self.assertEqual(self.module.decoders["audio/mpeg"], "avdec_mp3")
+        self.assertEqual(self.module.decoders["audio/ogg"], "vorbisdec")
+        self.assertEqual(self.module.decoders["audio/aac"], "fdkaacdec")
+        # each factory resolved once
+        names = [call.args[0] for call in gstMock.ElementFactory.find.call_args_list]
+        self.assertEqual(len(names), len(set(names)))
+
+    def test__resolve_element_factories_required_element_missing(self):
+        self.init()
 
-    def test__process_players_messages_exception(self):
+        with patch("backend.audioplayer.Gst") as gstMock:
+            gstMock.ElementFactory.find.side_effect = lambda name: (
+                None if name in ("volume", "autoaudiosink") else Mock(name=name)
+            )
+            with self.assertRaises(Exception) as cm:
+                self.module._Audioplayer__resolve_element_factories()
+        self.assertEqual(
+            str(cm.exception),
+            "Required gstreamer elements are missing: volume, autoaudiosink",
+        )
+
+    def test_get_capabilities(self):
         self.init()
-        player1_mock = Mock()
-        player1_mock.get_bus.return_value.pop.side_effect = Exception("Test exception")
-        self.module.players = {
-            "uuid1": {
-                "uuid": "uuid1",
-                "player": player1_mock,
-                "pipeline": [],
-                "internal": {
-                    "to_destroy": False,
-                },
-            },
+        self.module._set_config_field(
+            "decoders_ranking",
+            {"audio/flac": [{"decoder": "flacdec", "cpu": 0.5}]},
+        )
+        self.module.element_factories = {
+            name: Mock()
+            for name in Audioplayer.REQUIRED_ELEMENTS
+            + ["flacparse", "flacdec", "audioconvert", "rgvolume", "audioresample"]
         }
-        self.module._Audioplayer__process_gstreamer_message = Mock()
-        self.module.logger.exception = Mock()
+        self.module.decoders = {"audio/flac": "flacdec"}
 
-        self.module._Audioplayer__process_players_messages()
+        result = self.module.get_capabilities()
 
-        self.module.logger.exception.assert_called_with(
-            'Error processing player "%s" messages', "uuid1"
+        self.assertFalse(result["streaming"])
+        self.assertDictEqual(
+            result["formats"]["audio/flac"],
+            {
+                "playable": True,
+                "missing": [],
+                "decoder": "flacdec",
+                "ranking": [{"decoder": "flacdec", "cpu": 0.5}],
+            },
+        )
+        self.assertDictEqual(
+            result["formats"]["audio/aac"],
+            {
+                "playable": False,
+                "missing": ["aacparse", "faad", "fdkaacdec", "avdec_aac"],
+                "decoder": None,
+                "ranking": [],
+            },
         )
+        self.assertFalse(result["formats"]["audio/mpeg"]["playable"])
 
-    def test__process_gstreamer_message_eos(self):
+    def test__select_decoders_ranked(self):
         self.init()
-        msg = GstreamerMsg()
-        msg.type = Gst.MessageType.EOS
-        player = Mock()
-        self.module._Audioplayer__play_next_track = Mock()
-        self.module._Audioplayer__send_playback_event = Mock()
+        self.module._set_config_field(
+            "decoders_ranking",
+            {
+                "audio/mpeg": [
+                    {"decoder": "avdec_mp3", "cpu": 0.2},
+                    {"decoder": "mpg123audiodec", "cpu": 0.3},
+                ],
+                "audio/flac": [
+                    {"decoder": "avdec_flac", "cpu": None},
+                    {"decoder": "flacdec", "cpu": 0.1},
+                ],
+            },
+        )
 
-        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
+        self.module._Audioplayer__select_decoders()
 
-        player.set_state.assert_called_with(Gst.State.NULL)
-        self.module._Audioplayer__play_next_track.assert_called_with("the-uuid")
-        self.module._Audioplayer__send_playback_event.assert_called_with(
-            "the-uuid", player
-        )
+        self.assertEqual(self.module.decoders["audio/mpeg"], "avdec_mp3")
+        # failing decoder is not selected
+        self.assertEqual(self.module.decoders["audio/flac"], "flacdec")
+        self.assertEqual(self.module.decoders["audio/ogg"], "vorbisdec")
 
-    def test__process_gstreamer_message_state_changed(self):
+    @patch("backend.audioplayer.DecoderBenchmark")
+    def test_rank_decoders(self, benchmarkMock):
         self.init()
-        msg = GstreamerMsg()
-        msg.type = Gst.MessageType.STATE_CHANGED
-        player = Mock()
-        self.module._Audioplayer__play_next_track = Mock()
-        self.module._Audioplayer__send_playback_event = Mock()
+        ranking = [
+            {"decoder": "avdec_aac", "cpu": 0.1},
+            {"decoder": "faad", "cpu": 0.2},
+            {"decoder": "fdkaacdec", "cpu": None},
+        ]
+        benchmarkMock.return_value.rank.return_value = ranking
+        self.module.supported_formats = ["audio/aac", "audio/x-hx-aac-adts"]
 
-        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
+        result = self.module.rank_decoders()
 
-        player.set_state.assert_not_called()
-        self.module._Audioplayer__play_next_track.assert_not_called()
-        self.module._Audioplayer__send_playback_event.assert_called_with(
-            "the-uuid", player
+        # formats with same pipeline are ranked once
+        benchmarkMock.return_value.rank.assert_called_once_with(
+            "audio/aac", ["aacparse"], ["faad", "fdkaacdec", "avdec_aac"]
+        )
+        self.assertDictEqual(
+            result, {"audio/aac": ranking, "audio/x-hx-aac-adts": ranking}
         )
+        self.assertEqual(
+            self.module._get_config_field("decoders_ranking")["audio/aac"], ranking
+        )
+        self.assertEqual(self.module.decoders["audio/aac"], "avdec_aac")
 
-    def test__process_gstreamer_message_error(self):
+    @patch("backend.audioplayer.DecoderBenchmark")
+    def test_rank_decoders_benchmark_failed(self, benchmarkMock):
         self.init()
-        msg = GstreamerMsg()
-        msg.type = Gst.MessageType.ERROR
-        msg.parse_error = Mock(return_value=("error", "debug"))
-        player = Mock()
-        self.module._Audioplayer__play_next_track = Mock()
-        self.module._Audioplayer__send_playback_event = Mock()
+        benchmarkMock.return_value.rank.side_effect = Exception("Test exception")
 
-        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
+        result = self.module.rank_decoders("audio/flac")
 
-        player.set_state.assert_called_with(Gst.State.NULL)
-        msg.parse_error.assert_called()
-        self.module._Audioplayer__play_next_track.assert_not_called()
-        self.module._Audioplayer__send_playback_event.assert_called_with(
-            "the-uuid", player
+        self.assertDictEqual(result, {})
+        self.assertEqual(self.module.decoders["audio/flac"], "flacdec")
+
+    def test_rank_decoders_invalid_params(self):
+        self.init()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.rank_decoders("audio/dummy")
+        self.assertEqual(
+            str(cm.exception), 'Audio format "audio/dummy" is not supported'
         )
 
-    def test__process_gstreamer_message_tag_with_metadata_complete(self):
+    def test_rank_decoders_save_failed(self):
         self.init()
-        msg = GstreamerMsg()
-        msg.type = Gst.MessageType.TAG
-        tag = {"album": "dummy"}
-        msg.parse_tag = Mock(return_value=tag)
-        player = Mock()
-        self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "playlist": {"metadata": {}},
-                "pipeline": [],
-                "internal": {
-                    "tags_sent": False,
-                    "to_destroy": False,
-                },
-            }
-        }
-        self.module._Audioplayer__play_next_track = Mock()
-        self.module._Audioplayer__send_playback_event = Mock()
-        self.module._Audioplayer__get_audio_metadata = Mock(return_value=(True, tag))
+        self.module.supported_formats = []
+        self.module._set_config_field = Mock(return_value=False)
 
-        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
+        with self.assertRaises(CommandError) as cm:
+            self.module.rank_decoders()
+        self.assertEqual(str(cm.exception), "Unable to save configuration")
 
-        player.set_state.assert_not_called()
-        msg.parse_tag.assert_called()
-        self.module._Audioplayer__get_audio_metadata.assert_called_with(tag)
-        self.module._Audioplayer__play_next_track.assert_not_called()
-        self.module._Audioplayer__send_playback_event.assert_called()
-        self.assertTrue(self.module.players["the-uuid"]["internal"]["tags_sent"])
+    def test_add_track_unsupported_format(self):
+        self.init()
+        self.module.players = {"the-uuid": Player(uuid="the-uuid")}
+        self.module.supported_formats = ["audio/mpeg"]
 
-        # call another time to check tags are not read again
-        msg.parse_tag.reset_mock()
-        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
-        msg.parse_tag.assert_not_called()
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.add_track("the-uuid", "/resource/track.flac", "audio/flac")
+        self.assertEqual(
+            str(cm.exception), 'Audio format "audio/flac" is not supported'
+        )
 
-    def test__process_gstreamer_message_tag_with_metadata_incomplete(self):
+    def test__negotiate_output_caps_no_output_format(self):
         self.init()
-        msg = GstreamerMsg()
-        msg.type = Gst.MessageType.TAG
-        tag = {"album": "dummy"}
-        msg.parse_tag = Mock(return_value=tag)
-        player = Mock()
-        self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "playlist": {"metadata": {}},
-                "pipeline": [],
-                "internal": {
-                    "tags_sent": False,
-                    "to_destroy": False,
-                },
-            }
-        }
-        self.module._Audioplayer__play_next_track = Mock()
-        self.module._Audioplayer__send_playback_event = Mock()
-        self.module._Audioplayer__get_audio_metadata = Mock(return_value=(False, tag))
 
-        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
-
-        player.set_state.assert_not_called()
-        msg.parse_tag.assert_called()
-        self.module._Audioplayer__get_audio_metadata.assert_called_with(tag)
-        self.module._Audioplayer__play_next_track.assert_not_called()
-        self.module._Audioplayer__send_playback_event.assert_not_called()
-        self.assertFalse(self.module.players["the-uuid"]["internal"]["tags_sent"])
+        with patch("backend.audioplayer.Gst") as gstMock:
+            self.module._Audioplayer__negotiate_output_caps()
 
-        # call another time to check tags are not read again
-        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
-        msg.parse_tag.assert_called()
-        self.assertFalse(self.module.players["the-uuid"]["internal"]["tags_sent"])
+            gstMock.ElementFactory.make.assert_not_called()
+        self.assertIsNone(self.module.output_caps)
 
-    def test__process_gstreamer_message_duration_changed(self):
+    def test__negotiate_output_caps(self):
         self.init()
-        msg = GstreamerMsg()
-        msg.type = Gst.MessageType.DURATION_CHANGED
-        player = Mock()
-        self.module._Audioplayer__play_next_track = Mock()
-        self.module._Audioplayer__send_playback_event = Mock()
+        self.module._get_config_field = Mock(
+            return_value={"rate": 48000, "channels": 2, "format": "F32LE"}
+        )
 
-        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
+        sink = Mock()
+        self.module._Audioplayer__make_sink = Mock(return_value=sink)
 
-        player.set_state.assert_not_called()
-        self.module._Audioplayer__play_next_track.assert_not_called()
-        self.module._Audioplayer__send_playback_event.assert_called()
+        with patch("backend.audioplayer.Gst") as gstMock:
+            caps = gstMock.Caps.from_string.return_value
+            caps.can_intersect.return_value = True
 
-    def test__send_playback_event(self):
+            self.module._Audioplayer__negotiate_output_caps()
+
+            gstMock.Caps.from_string.assert_called_with(
+                "audio/x-raw,format=F32LE,rate=48000,channels=2"
+            )
+            self.assertEqual(self.module.output_caps, caps.intersect.return_value)
+            sink.set_state.assert_called_with(gstMock.State.NULL)
+
+    def test__resolve_audio_sink_probe(self):
         self.init()
-        player = Mock()
-        player.get_state.return_value = ("dummy", Gst.State.PAUSED, "dummy")
-        player.query_duration.return_value = (True, 666000000000)
-        self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "internal": {
-                    "tags_sent": False,
-                    "to_destroy": False,
-                    "last_state": None,
-                },
-                "playlist": {
-                    "index": 0,
-                    "metadata": {},
-                    "tracks": ["track1"],
-                    "duration": 123,
-                },
+        self.module._get_config_field = Mock(
+            return_value={"element": None, "device": None}
+        )
+
+        with patch("backend.audioplayer.Gst") as gstMock:
+            probe = gstMock.ElementFactory.find.return_value.create.return_value
+            probe.get_children_count.return_value = 1
+            child = probe.get_child_by_index.return_value
+            child.get_factory.return_value.get_name.return_value = "alsasink"
+            child.get_property.return_value = "hw:1,0"
+            self.module.element_factories = {
+                "autoaudiosink": Mock(create=Mock(return_value=probe))
             }
-        }
 
-        self.module._Audioplayer__send_playback_event("the-uuid", player)
+            self.module._Audioplayer__resolve_audio_sink()
 
-        self.assertEqual(
-            self.module.players["the-uuid"]["internal"]["last_state"], Gst.State.PAUSED
+            self.assertDictEqual(
+                self.module.audio_sink, {"element": "alsasink", "device": "hw:1,0"}
+            )
+            self.assertIn("alsasink", self.module.element_factories)
+            probe.set_state.assert_called_with(gstMock.State.NULL)
+
+    def test__resolve_audio_sink_probe_no_child(self):
+        self.init()
+        self.module._get_config_field = Mock(
+            return_value={"element": None, "device": None}
         )
-        self.session.assert_event_called_with(
-            "audioplayer.playback.update",
-            {
-                "playeruuid": "the-uuid",
-                "state": "paused",
-                "index": 0,
-                "duration": 666,
-                "metadata": {},
-                "track": "track1",
-            },
+
+        with patch("backend.audioplayer.Gst"):
+            probe = Mock()
+            probe.get_children_count.return_value = 0
+            self.module.element_factories = {
+                "autoaudiosink": Mock(create=Mock(return_value=probe))
+            }
+
+            self.module._Audioplayer__resolve_audio_sink()
+
+        self.assertDictEqual(
+            self.module.audio_sink, {"element": "autoaudiosink", "device": None}
         )
 
-    def test__send_playback_event_no_duration(self):
+    def test__resolve_audio_sink_probe_exception(self):
         self.init()
-        player = Mock()
-        player.get_state.return_value = ("dummy", Gst.State.PAUSED, "dummy")
-        player.query_duration.return_value = (False, 0)
-        self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "internal": {
-                    "tags_sent": False,
-                    "to_destroy": False,
-                    "last_state": None,
-                },
-                "playlist": {
-                    "index": 0,
-                    "metadata": {},
-                    "tracks": ["track1"],
-                    "duration": 123,
-                },
+        self.module._get_config_field = Mock(
+            return_value={"element": None, "device": None}
+        )
+        self.module.logger = Mock()
+
+        with patch("backend.audioplayer.Gst"):
+            probe = Mock()
+            probe.get_children_count.side_effect = Exception("Test exception")
+            self.module.element_factories = {
+                "autoaudiosink": Mock(create=Mock(return_value=probe))
             }
-        }
 
-        self.module._Audioplayer__send_playback_event("the-uuid", player)
+            self.module._Audioplayer__resolve_audio_sink()
 
-        self.assertEqual(
-            self.module.players["the-uuid"]["internal"]["last_state"], Gst.State.PAUSED
+        self.assertDictEqual(
+            self.module.audio_sink, {"element": "autoaudiosink", "device": None}
         )
-        self.session.assert_event_called_with(
-            "audioplayer.playback.update",
-            {
-                "playeruuid": "the-uuid",
-                "state": "paused",
-                "index": 0,
-                "duration": 123,
-                "metadata": {},
-                "track": "track1",
-            },
+        self.module.logger.exception.assert_called_with(
+            "Error probing audio sink, autoaudiosink is used"
         )
 
-    def test__send_playback_event_same_state(self):
+    def test__resolve_audio_sink_configured(self):
         self.init()
-        player = Mock()
-        player.get_state = Mock(return_value=("dummy", Gst.State.PAUSED, "dummy"))
-        self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "internal": {
-                    "tags_sent": False,
-                    "to_destroy": False,
-                    "last_state": Gst.State.PAUSED,
-                },
-            }
+        self.module._get_config_field = Mock(
+            return_value={"element": "pulsesink", "device": "speakers"}
+        )
+        self.module.element_factories = {"pulsesink": Mock()}
+
+        self.module._Audioplayer__resolve_audio_sink()
+
+        self.assertDictEqual(
+            self.module.audio_sink, {"element": "pulsesink", "device": "speakers"}
+        )
+
+    def test__resolve_audio_sink_configured_not_installed(self):
+        self.init()
+        self.module._get_config_field = Mock(
+            return_value={"element": "pulsesink", "device": None}
+        )
+        probe = Mock()
+        probe.get_children_count.return_value = 0
+        self.module.element_factories = {
+            "autoaudiosink": Mock(create=Mock(return_value=probe))
         }
 
-        self.module._Audioplayer__send_playback_event("the-uuid", player)
+        with patch("backend.audioplayer.Gst") as gstMock:
+            gstMock.ElementFactory.find.return_value = None
 
-        self.assertEqual(
-            self.module.players["the-uuid"]["internal"]["last_state"], Gst.State.PAUSED
+            self.module._Audioplayer__resolve_audio_sink()
+
+        self.assertEqual(self.module.audio_sink["element"], "autoaudiosink")
+        probe.set_state.assert_called()
+
+    def test__make_sink(self):
+        self.init()
+        factory = Mock()
+        self.module.element_factories = {"alsasink": factory}
+        self.module.audio_sink = {"element": "alsasink", "device": "hw:1,0"}
+
+        sink = self.module._Audioplayer__make_sink()
+
+        factory.create.assert_called_with("sink")
+        sink.set_property.assert_called_with("device", "hw:1,0")
+
+    def test__make_sink_default_device(self):
+        self.init()
+        factory = Mock()
+        self.module.element_factories = {"alsasink": factory}
+        self.module.audio_sink = {"element": "alsasink", "device": None}
+
+        sink = self.module._Audioplayer__make_sink()
+
+        sink.set_property.assert_not_called()
+
+    def test__negotiate_output_caps_not_supported_by_sink(self):
+        self.init()
+        self.module._get_config_field = Mock(
+            return_value={"rate": 44100, "channels": None, "format": None}
         )
-        self.assertEqual(
-            self.session.event_call_count("audioplayer.playback.update"), 0
+
+        with patch("backend.audioplayer.Gst") as gstMock:
+            caps = gstMock.Caps.from_string.return_value
+            caps.can_intersect.return_value = False
+
+            self.module._Audioplayer__negotiate_output_caps()
+
+            gstMock.Caps.from_string.assert_called_with("audio/x-raw,rate=44100")
+        self.assertIsNone(self.module.output_caps)
+
+    def test_on_process(self):
+        self.init()
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=["track1", "track2", "track3"],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=None,
+            source=None,
+            volume=None,
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=True,
+                tags_sent=True,
+                last_state=1,
+                fade=None,
+            ),
         )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__process_players_messages = Mock()
+        self.module._Audioplayer__destroy_player = Mock()
 
-    def test__send_playback_event_same_state_but_forced(self):
+        self.module._on_process()
+
+        self.module._Audioplayer__process_players_messages.assert_called_once()
+        self.module._Audioplayer__destroy_player.assert_called_once_with(player_data)
+
+    def test_on_process_no_player_to_destroy(self):
         self.init()
-        player = Mock()
-        player.get_state = Mock(return_value=("dummy", Gst.State.PAUSED, "dummy"))
-        player.query_duration.return_value = (False, 0)
-        self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "internal": {
-                    "tags_sent": False,
-                    "to_destroy": False,
-                    "last_state": Gst.State.PAUSED,
-                },
-                "playlist": {
-                    "metadata": {},
-                    "index": 0,
-                    "tracks": ["track1"],
-                    "volume": 12,
-                    "duration": 123,
-                },
-            }
-        }
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=["track1", "track2", "track3"],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=None,
+            source=None,
+            volume=None,
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+                fade=None,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__process_players_messages = Mock()
+        self.module._Audioplayer__destroy_player = Mock()
 
-        self.module._Audioplayer__send_playback_event("the-uuid", player, force=True)
+        self.module._on_process()
 
-        self.assertEqual(
-            self.module.players["the-uuid"]["internal"]["last_state"], Gst.State.PAUSED
+        self.module._Audioplayer__process_players_messages.assert_called_once()
+        self.assertEqual(self.module._Audioplayer__destroy_player.call_count, 0)
+
+    def test_on_process_no_player(self):
+        self.init()
+        self.module._Audioplayer__process_players_messages = Mock()
+        self.module._Audioplayer__destroy_player = Mock()
+
+        self.module._on_process()
+
+        self.module._Audioplayer__process_players_messages.assert_called_once()
+        self.assertEqual(self.module._Audioplayer__destroy_player.call_count, 0)
+
+    def test__reap_idle_players(self):
+        self.init()
+        pipeline = Mock()
+        player_data = Player(
+            uuid="the-uuid",
+            player=pipeline,
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                last_state=Gst.State.PAUSED,
+                paused_since=None,
+            ),
         )
-        self.assertEqual(
-            self.session.event_call_count("audioplayer.playback.update"), 1
+        self.module.players = {"the-uuid": player_data}
+        self.module.idle_timeout = 60
+        self.module._Audioplayer__suspend_player = Mock()
+
+        with patch("backend.audioplayer.time.time") as time_mock:
+            time_mock.return_value = 1000
+            self.module._Audioplayer__reap_idle_players()
+            self.assertEqual(player_data.internal.paused_since, 1000)
+            self.module._Audioplayer__suspend_player.assert_not_called()
+
+            time_mock.return_value = 1059
+            self.module._Audioplayer__reap_idle_players()
+            self.module._Audioplayer__suspend_player.assert_not_called()
+
+            time_mock.return_value = 1060
+            self.module._Audioplayer__reap_idle_players()
+            self.module._Audioplayer__suspend_player.assert_called_once_with(
+                player_data
+            )
+
+    def test__reap_idle_players_playing_player(self):
+        self.init()
+        player_data = Player(
+            uuid="the-uuid",
+            player=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                last_state=Gst.State.PLAYING,
+                paused_since=1000,
+            ),
         )
+        self.module.players = {"the-uuid": player_data}
+        self.module.idle_timeout = 60
+        self.module._Audioplayer__suspend_player = Mock()
 
-    def test__send_playback_event_ready_state(self):
+        self.module._Audioplayer__reap_idle_players()
+
+        self.assertIsNone(player_data.internal.paused_since)
+        self.module._Audioplayer__suspend_player.assert_not_called()
+
+    def test__reap_idle_players_disabled(self):
         self.init()
-        player = Mock()
-        player.get_state = Mock(return_value=("dummy", Gst.State.READY, "dummy"))
-        self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "internal": {
-                    "tags_sent": False,
-                    "to_destroy": False,
-                    "last_state": Gst.State.PAUSED,
-                },
-            }
-        }
+        player_data = Player(
+            uuid="the-uuid",
+            player=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                last_state=Gst.State.PAUSED,
+                paused_since=0,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module.idle_timeout = 0
+        self.module._Audioplayer__suspend_player = Mock()
 
-        self.module._Audioplayer__send_playback_event("the-uuid", player)
+        self.module._Audioplayer__reap_idle_players()
 
-        self.assertEqual(
-            self.module.players["the-uuid"]["internal"]["last_state"], Gst.State.PAUSED
+        self.module._Audioplayer__suspend_player.assert_not_called()
+
+    def test__suspend_player(self):
+        self.init()
+        pipeline = Mock()
+        pipeline.query_position.return_value = (True, 12000000000)
+        player_data = Player(
+            uuid="the-uuid",
+            player=pipeline,
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                last_state=Gst.State.PAUSED,
+                paused_since=1000,
+                position=0,
+            ),
         )
-        self.assertEqual(
-            self.session.event_call_count("audioplayer.playback.update"), 0
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__reset_player = Mock()
+
+        self.module._Audioplayer__suspend_player(player_data)
+
+        self.module._Audioplayer__reset_player.assert_called_with(player_data)
+        self.assertEqual(player_data.internal.position, 12000000000)
+        self.assertIsNone(player_data.internal.paused_since)
+        self.assertEqual(player_data.internal.last_state, Gst.State.PAUSED)
+
+    def test__resume_player(self):
+        self.init()
+        pipeline = Mock()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            player=None,
+            pipeline=[],
+            playlist=Playlist(
+                index=0,
+                tracks=[track1],
+            ),
+            internal=PlayerInternal(
+                to_destroy=False,
+                last_state=Gst.State.PAUSED,
+                paused_since=None,
+                position=12000000000,
+            ),
         )
+        self.module.players = {"the-uuid": player_data}
 
-    def test__get_playback_info(self):
+        def play_track(track, player_uuid, volume=None, paused=False):
+            player_data.player = pipeline
+
+        self.module._Audioplayer__play_track = Mock(side_effect=play_track)
+
+        self.module._Audioplayer__resume_player("the-uuid")
+
+        self.module._Audioplayer__play_track.assert_called_with(
+            track1, "the-uuid", paused=True
+        )
+        pipeline.seek_simple.assert_called_with(
+            Gst.Format.TIME, session.AnyArg(), 12000000000
+        )
+        pipeline.set_state.assert_called_with(Gst.State.PLAYING)
+        self.assertEqual(player_data.internal.position, 0)
+
+    def test__ensure_pipeline_budget(self):
         self.init()
+        self.module.max_active_players = 2
         self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "internal": {
-                    "tags_sent": False,
-                    "to_destroy": False,
-                    "last_state": Gst.State.PAUSED,
-                },
-                "playlist": {
-                    "duration": 123,
-                    "index": 0,
-                    "tracks": ["track1"],
-                    "volume": 50,
-                    "metadata": {},
-                },
-            }
+            "uuid1": Player(
+                uuid="uuid1",
+                player=Mock(),
+                internal=PlayerInternal(
+                    to_destroy=False,
+                    last_state=Gst.State.PAUSED,
+                    last_used=20,
+                ),
+            ),
+            "uuid2": Player(
+                uuid="uuid2",
+                player=Mock(),
+                internal=PlayerInternal(
+                    to_destroy=False,
+                    last_state=Gst.State.PAUSED,
+                    last_used=10,
+                ),
+            ),
+            "uuid3": Player(
+                uuid="uuid3",
+                player=Mock(),
+                internal=PlayerInternal(
+                    to_destroy=False,
+                    last_state=Gst.State.PLAYING,
+                    last_used=5,
+                ),
+            ),
         }
+        self.module._Audioplayer__suspend_player = Mock()
 
-        result = self.module._Audioplayer__get_playback_info("the-uuid")
-        logging.debug("Playback info: %s", result)
+        self.module._Audioplayer__ensure_pipeline_budget()
 
-        self.assertDictEqual(
-            result,
-            {
-                "index": 0,
-                "playeruuid": "the-uuid",
-                "track": "track1",
-                "metadata": {},
-                "state": "paused",
-                "duration": 123,
-            },
+        self.assertEqual(self.module._Audioplayer__suspend_player.call_count, 2)
+        self.module._Audioplayer__suspend_player.assert_any_call(
+            self.module.players["uuid2"]
+        )
+        self.module._Audioplayer__suspend_player.assert_any_call(
+            self.module.players["uuid1"]
         )
 
-    def test__get_playback_info_player_not_found(self):
+    def test__ensure_pipeline_budget_exhausted(self):
         self.init()
+        self.module.max_active_players = 1
         self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "internal": {
-                    "tags_sent": False,
-                    "to_destroy": False,
-                    "last_state": Gst.State.PAUSED,
-                },
-                "playlist": {
-                    "duration": 123,
-                    "index": 0,
-                    "tracks": ["track1"],
-                    "volume": 50,
-                    "metadata": {},
-                },
-            }
+            "uuid1": Player(
+                uuid="uuid1",
+                player=Mock(),
+                internal=PlayerInternal(
+                    to_destroy=False,
+                    last_state=Gst.State.PLAYING,
+                    last_used=20,
+                ),
+            ),
         }
+        self.module._Audioplayer__suspend_player = Mock()
 
-        result = self.module._Audioplayer__get_playback_info("dummy")
-        logging.debug("Playback info: %s", result)
+        with self.assertRaises(CommandError) as cm:
+            self.module._Audioplayer__ensure_pipeline_budget()
+        self.assertEqual(
+            str(cm.exception), "Maximum number of active players reached (1)"
+        )
 
-        self.assertDictEqual(
-            result,
-            {
-                "index": 0,
-                "playeruuid": "dummy",
-                "track": None,
-                "metadata": {},
-                "state": "stopped",
-                "duration": 0,
-            },
+        # player requesting pipeline is not counted
+        self.module._Audioplayer__ensure_pipeline_budget("uuid1")
+        self.module._Audioplayer__suspend_player.assert_not_called()
+
+    def test__ensure_pipeline_budget_skip_busy_player(self):
+        self.init()
+        self.module.max_active_players = 2
+        self.module.players = {
+            "uuid1": Player(
+                uuid="uuid1",
+                player=Mock(),
+                internal=PlayerInternal(
+                    to_destroy=False,
+                    last_state=Gst.State.PAUSED,
+                    last_used=20,
+                ),
+            ),
+            "uuid2": Player(
+                uuid="uuid2",
+                player=Mock(),
+                internal=PlayerInternal(
+                    to_destroy=False,
+                    last_state=Gst.State.PAUSED,
+                    last_used=10,
+                ),
+            ),
+        }
+        self.module._Audioplayer__suspend_player = Mock()
+        # lock least recently used player from another thread
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            with self.module._get_player_lock("uuid2"):
+                locked.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        locked.wait()
+        try:
+            self.module._Audioplayer__ensure_pipeline_budget()
+        finally:
+            release.set()
+            thread.join()
+
+        self.module._Audioplayer__suspend_player.assert_called_once_with(
+            self.module.players["uuid1"]
         )
 
-    def test__get_audio_metadata(self):
+    def test__ensure_pipeline_budget_unlimited(self):
         self.init()
-        tags = Mock()
-        tags.to_string.return_value = "all-tags"
-        tags.nth_tag_name.side_effect = [
-            "artist",
-            "album-artist",
-            "album",
-            "title",
-            "genre",
-            "track-number",
-            "datetime",
-            "channel-mode",
-            "minimum-bitrate",
-            "maximum-bitrate",
-            "bitrate",
-        ]
-        tags.get_string.side_effect = [
-            (True, "[artist]"),
-            (True, "[album-artist]"),
-            (True, "[album]"),
-            (True, "[title]"),
-            (True, "[genre]"),
-            (True, "[channel-mode]"),
-        ]
-        tags.get_uint.side_effect = [
-            (True, 2),  # track-number
-            (True, 333),  # min bitrate
-            (True, 999),  # max bitrate
-            (True, 666),  # bitrate
-        ]
-        date_time = Mock()
-        date_time.has_year.return_value = True
-        date_time.get_year.return_value = 2021
-        tags.get_date_time.return_value = (True, date_time)
-        tags.n_tags.return_value = 11
+        self.module.max_active_players = 0
+        self.module.players = {
+            "uuid1": Player(
+                uuid="uuid1",
+                player=Mock(),
+                internal=PlayerInternal(
+                    to_destroy=False,
+                    last_state=Gst.State.PAUSED,
+                    last_used=20,
+                ),
+            ),
+        }
+        self.module._Audioplayer__suspend_player = Mock()
 
-        complete, metadata = self.module._Audioplayer__get_audio_metadata(tags)
-        logging.debug("Metadata: %s", metadata)
+        self.module._Audioplayer__ensure_pipeline_budget()
 
-        self.assertTrue(complete)
-        self.assertDictEqual(
-            metadata,
-            {
-                "artist": "[album-artist]",
-                "album": "[album]",
-                "title": "[title]",
-                "genre": "[genre]",
-                "year": 2021,
-                "track": 2,
-                "channels": "[channel-mode]",
-                "bitratemin": 333,
-                "bitratemax": 999,
-                "bitrateavg": 666,
-            },
-        )
+        self.module._Audioplayer__suspend_player.assert_not_called()
 
-    def test__get_audio_metadata_track_string(self):
+    @patch("backend.audioplayer.GstController")
+    def test__fade_volume(self, controller_mock):
         self.init()
-        tags = Mock()
-        tags.to_string.return_value = "all-tags"
-        tags.nth_tag_name.side_effect = [
-            "track-number",
-        ]
-        tags.get_string.side_effect = [
-            (True, "3"),
-        ]
-        tags.get_uint.side_effect = [
-            (False, 2),  # track-number
-        ]
-        tags.n_tags.return_value = 1
+        pipeline = Mock()
+        pipeline.query_position.return_value = (True, 2000000000)
+        volume = Mock()
+        volume.get_property.return_value = 0.5
+        player_data = Player(
+            uuid="the-uuid",
+            player=pipeline,
+            volume=volume,
+            playlist=Playlist(volume=50),
+            internal=PlayerInternal(fade=None),
+        )
+        self.module.players = {"the-uuid": player_data}
+        control_source = controller_mock.InterpolationControlSource.return_value
+        binding = controller_mock.DirectControlBinding.new_absolute.return_value
 
-        complete, metadata = self.module._Audioplayer__get_audio_metadata(tags)
-        logging.debug("Metadata: %s", metadata)
+        self.module._Audioplayer__fade_volume("the-uuid", 100, 1000)
 
-        self.assertFalse(complete)
+        control_source.set.assert_any_call(2000000000, 0.5)
+        control_source.set.assert_any_call(3000000000, 1.0)
+        controller_mock.DirectControlBinding.new_absolute.assert_called_with(
+            volume, "volume", control_source
+        )
+        volume.add_control_binding.assert_called_with(binding)
         self.assertDictEqual(
-            metadata,
-            {
-                "artist": None,
-                "album": None,
-                "title": None,
-                "genre": None,
-                "year": None,
-                "track": "3",
-                "channels": None,
-                "bitratemin": None,
-                "bitratemax": None,
-                "bitrateavg": None,
-            },
+            player_data.internal.fade,
+            {"binding": binding, "volume": 100, "end": 3000000000, "action": None},
         )
+        self.assertEqual(player_data.playlist.volume, 100)
 
-    @patch("backend.audioplayer.magic.from_file")
-    def test__get_file_audio_format(self, mock_from_file):
+    @patch("backend.audioplayer.GstController")
+    def test__fade_volume_with_action(self, controller_mock):
         self.init()
-        mock_from_file.return_value = "audio/mpeg"
+        pipeline = Mock()
+        pipeline.query_position.return_value = (False, 0)
+        old_binding = Mock()
+        volume = Mock()
+        volume.get_property.return_value = 0.5
+        player_data = Player(
+            uuid="the-uuid",
+            player=pipeline,
+            volume=volume,
+            playlist=Playlist(volume=50),
+            internal=PlayerInternal(fade={"binding": old_binding}),
+        )
+        self.module.players = {"the-uuid": player_data}
 
-        result = self.module._Audioplayer__get_file_audio_format("/audio/file/path.mp3")
-        logging.debug("Format: %s" % result)
+        self.module._Audioplayer__fade_volume("the-uuid", 0, 1000, action="stop")
 
-        self.assertEqual(result, "audio/mpeg")
+        volume.remove_control_binding.assert_called_with(old_binding)
+        self.assertEqual(player_data.internal.fade["action"], "stop")
+        self.assertEqual(player_data.internal.fade["end"], 1000000000)
+        self.assertEqual(player_data.playlist.volume, 50)
 
-    @patch("backend.audioplayer.magic.from_file")
-    def test__get_file_audio_format_unknown_format(self, mock_from_file):
+    def test__process_fades(self):
         self.init()
-        mock_from_file.return_value = "audio/dummy"
+        binding = Mock()
+        pipeline = Mock()
+        pipeline.query_position.return_value = (True, 1000)
+        player_data = Player(
+            uuid="the-uuid",
+            player=pipeline,
+            volume=Mock(),
+            playlist=Playlist(volume=50),
+            internal=PlayerInternal(
+                fade={"binding": binding, "volume": 80, "end": 2000, "action": None},
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
 
-        result = self.module._Audioplayer__get_file_audio_format("/audio/file/path.mp3")
-        logging.debug("Format: %s" % result)
+        # fade is running
+        self.module._Audioplayer__process_fades()
+        self.assertIsNotNone(player_data.internal.fade)
 
-        self.assertIsNone(result)
+        # fade is over
+        pipeline.query_position.return_value = (True, 2000)
+        self.module._Audioplayer__process_fades()
+        self.assertIsNone(player_data.internal.fade)
+        player_data.volume.remove_control_binding.assert_called_with(binding)
+        player_data.volume.set_property.assert_called_with("volume", 0.8)
 
-    @patch("backend.audioplayer.magic.from_file")
-    def test__get_file_audio_format_exception(self, mock_from_file):
+    def test__process_fades_pause_action(self):
         self.init()
-        mock_from_file.side_effect = Exception("Test exception")
+        pipeline = Mock()
+        pipeline.query_position.return_value = (True, 2000)
+        player_data = Player(
+            uuid="the-uuid",
+            player=pipeline,
+            volume=Mock(),
+            playlist=Playlist(volume=50),
+            internal=PlayerInternal(
+                fade={"binding": Mock(), "volume": 0, "end": 2000, "action": "pause"},
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
 
-        result = self.module._Audioplayer__get_file_audio_format("/audio/file/path.mp3")
-        logging.debug("Format: %s" % result)
+        self.module._Audioplayer__process_fades()
 
-        self.assertIsNone(result)
+        pipeline.set_state.assert_called_with(Gst.State.PAUSED)
+        player_data.volume.set_property.assert_called_with("volume", 0.5)
 
-    def test_is_filepath(self):
+    def test__process_fades_position_query_failed(self):
         self.init()
+        pipeline = Mock()
+        pipeline.query_position.return_value = (False, 0)
+        player_data = Player(
+            uuid="the-uuid",
+            player=pipeline,
+            volume=Mock(),
+            playlist=Playlist(volume=50),
+            internal=PlayerInternal(
+                fade={"binding": Mock(), "volume": 0, "end": 2000, "action": "stop"},
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__stop_player = Mock()
 
-        with patch("backend.audioplayer.os.path.exists") as exists_mock:
-            exists_mock.return_value = True
+        self.module._Audioplayer__process_fades()
 
-            self.assertTrue(self.module._is_filepath("/dummy/resource"))
+        self.assertIsNotNone(player_data.internal.fade)
+        self.module._Audioplayer__stop_player.assert_not_called()
 
-        with patch("backend.audioplayer.os.path.exists") as exists_mock:
-            with patch("backend.audioplayer.urlparse") as url_parse_mock:
-                exists_mock.return_value = False
-                result = ParseUrlResult()
-                result.scheme = "https"
-                url_parse_mock.return_value = result
+    def test__process_fades_stop_action(self):
+        self.init()
+        pipeline = Mock()
+        pipeline.query_position.return_value = (True, 2000)
+        player_data = Player(
+            uuid="the-uuid",
+            player=pipeline,
+            volume=Mock(),
+            playlist=Playlist(volume=50),
+            internal=PlayerInternal(
+                fade={"binding": Mock(), "volume": 0, "end": 2000, "action": "stop"},
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__stop_player = Mock()
 
-                self.assertFalse(self.module._is_filepath("/dummy/resource"))
+        self.module._Audioplayer__process_fades()
 
-        with patch("backend.audioplayer.os.path.exists") as exists_mock:
-            with patch("backend.audioplayer.urlparse") as url_parse_mock:
-                exists_mock.return_value = False
-                result = ParseUrlResult()
-                result.scheme = "dummy"
-                url_parse_mock.return_value = result
+        self.module._Audioplayer__stop_player.assert_called_with("the-uuid")
 
-                with self.assertRaises(Exception) as cm:
-                    self.assertFalse(self.module._is_filepath("/dummy/resource"))
-                self.assertEqual(
-                    str(cm.exception), "Resource is invalid (file may not exist)"
-                )
+    def test__process_players_messages(self):
+        self.init()
+        player1_mock = Mock()
+        player1_mock.get_bus.return_value.pop.side_effect = ["msg1", "msg2", None]
+        player2_mock = Mock()
+        player2_mock.get_bus.return_value.pop.side_effect = ["msg3", None]
+        self.module.players = {
+            "uuid1": Player(
+                uuid="uuid1",
+                player=player1_mock,
+                pipeline=[],
+                internal=PlayerInternal(
+                    to_destroy=False,
+                ),
+            ),
+            "uuid2": Player(
+                uuid="uuid2",
+                player=player2_mock,
+                pipeline=[],
+                internal=PlayerInternal(
+                    to_destroy=False,
+                ),
+            ),
+        }
+        self.module._Audioplayer__process_gstreamer_message = Mock()
 
-    def test_make_track(self):
+        self.module._Audioplayer__process_players_messages()
+
+        self.module._Audioplayer__process_gstreamer_message.assert_any_call(
+            "uuid1", session.AnyArg(), "msg1"
+        )
+        self.module._Audioplayer__process_gstreamer_message.assert_any_call(
+            "uuid1", session.AnyArg(), "msg2"
+        )
+        self.module._Audioplayer__process_gstreamer_message.assert_any_call(
+            "uuid2", session.AnyArg(), "msg3"
+        )
+
+    def test__process_players_messages_pipeline_released(self):
         self.init()
+        player_mock = Mock()
+        player_mock.get_bus.return_value.pop.side_effect = ["msg1", "msg2", None]
+        player_data = Player(uuid="uuid1", player=player_mock)
+        self.module.players = {"uuid1": player_data}
 
-        result = self.module._make_track("/dummy/resource", "audio/dummy")
+        def release_pipeline(*args):
+            player_data.player = None
 
-        self.assertDictEqual(
-            result,
-            {
-                "resource": "/dummy/resource",
-                "audio_format": "audio/dummy",
-            },
+        self.module._Audioplayer__process_gstreamer_message = Mock(
+            side_effect=release_pipeline
         )
 
-    def test_add_track(self):
+        self.module._Audioplayer__process_players_messages()
+
+        self.module._Audioplayer__process_gstreamer_message.assert_called_once_with(
+            "uuid1", player_mock, "msg1"
+        )
+
+    def test__process_players_messages_no_player(self):
+        self.init()
+        self.module._Audioplayer__process_gstreamer_message = Mock()
+
+        self.module._Audioplayer__process_players_messages()
+
+        self.module._Audioplayer__process_gstreamer_message.assert_not_called()
+
+    def test__process_players_messages_exception(self):
         self.init()
+        player1_mock = Mock()
+        player1_mock.get_bus.return_value.pop.side_effect = Exception("Test exception")
         self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "playlist": {
-                    "tracks": ["track1"],
-                    "index": 0,
-                },
-                "internal": {
-                    "to_destroy": False,
-                },
-            }
+            "uuid1": Player(
+                uuid="uuid1",
+                player=player1_mock,
+                pipeline=[],
+                internal=PlayerInternal(
+                    to_destroy=False,
+                ),
+            ),
         }
-        track = self.module._make_track("/dummy/resource", "audio/mpeg")
-
-        with patch("backend.audioplayer.os.path.exists") as exists_mock:
-            exists_mock.return_value = True
+        self.module._Audioplayer__process_gstreamer_message = Mock()
+        self.module.logger.exception = Mock()
 
-            self.module.add_track("the-uuid", "/dummy/resource", "audio/mpeg")
+        self.module._Audioplayer__process_players_messages()
 
-            self.assertDictEqual(
-                self.module.players["the-uuid"]["playlist"]["tracks"][-1], track
-            )
+        self.module.logger.exception.assert_called_with(
+            'Error processing player "%s" messages', "uuid1"
+        )
 
-    def test_add_track_playlist_limit_reached(self):
+    def test__process_players_messages_player_destroyed(self):
         self.init()
+        player1_mock = Mock()
+        player1_mock.get_bus.return_value.pop.side_effect = ["msg1", None]
+        player2_mock = Mock()
         self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "playlist": {
-                    "tracks": ["track1"],
-                    "index": 0,
-                },
-                "internal": {
-                    "to_destroy": False,
-                },
-            }
+            "uuid1": Player(
+                uuid="uuid1",
+                player=player1_mock,
+                pipeline=[],
+                internal=PlayerInternal(
+                    to_destroy=False,
+                ),
+            ),
+            "uuid2": Player(
+                uuid="uuid2",
+                player=player2_mock,
+                pipeline=[],
+                internal=PlayerInternal(
+                    to_destroy=False,
+                ),
+            ),
         }
-        self.module.MAX_PLAYLIST_TRACKS = 3
 
-        with patch("backend.audioplayer.os.path.exists") as exists_mock:
-            exists_mock.return_value = True
+        def destroy_player(*args):
+            # player removed by command thread while messages are processed
+            del self.module.players["uuid2"]
 
-            self.assertTrue(
-                self.module.add_track("the-uuid", "/dummy/resource", "audio/mpeg")
-            )
-            self.assertTrue(
-                self.module.add_track("the-uuid", "/dummy/resource", "audio/mpeg")
-            )
-            self.assertTrue(
-                self.module.add_track("the-uuid", "/dummy/resource", "audio/mpeg")
-            )
-            self.assertFalse(
-                self.module.add_track("the-uuid", "/dummy/resource", "audio/mpeg")
-            )
+        self.module._Audioplayer__process_gstreamer_message = Mock(
+            side_effect=destroy_player
+        )
 
-    def test_add_track_exception(self):
+        self.module._Audioplayer__process_players_messages()
+
+        self.module._Audioplayer__process_gstreamer_message.assert_called_once_with(
+            "uuid1", player1_mock, "msg1"
+        )
+        player2_mock.get_bus.assert_not_called()
+
+    def test__process_gstreamer_message_eos(self):
         self.init()
-        self.module.players = {}
+        msg = GstreamerMsg()
+        msg.type = Gst.MessageType.EOS
+        player = Mock()
+        self.module._Audioplayer__play_next_track = Mock(return_value=True)
+        self.module._Audioplayer__send_playback_update = Mock()
+
+        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
+
+        player.set_state.assert_not_called()
+        self.module._Audioplayer__play_next_track.assert_called_with("the-uuid")
+        self.module._Audioplayer__send_playback_update.assert_not_called()
+
+    def test__process_gstreamer_message_eos_end_of_playlist(self):
+        self.init()
+        msg = GstreamerMsg()
+        msg.type = Gst.MessageType.EOS
+        player = Mock()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            player=player,
+            playlist=Playlist(index=0, tracks=[track1]),
+            internal=PlayerInternal(last_state=Gst.State.PLAYING),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__play_next_track = Mock(return_value=False)
+        self.module._Audioplayer__send_playback_update = Mock()
+
+        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
+
+        player.set_state.assert_not_called()
+        self.assertEqual(player_data.internal.last_state, Gst.State.NULL)
+        self.module._Audioplayer__send_playback_update.assert_called_once()
+        self.assertEqual(
+            self.module._Audioplayer__send_playback_update.call_args[0][1]["state"],
+            "stopped",
+        )
+
+    def test__process_gstreamer_message_eos_during_stop_fade(self):
+        self.init()
+        msg = GstreamerMsg()
+        msg.type = Gst.MessageType.EOS
+        pipeline = Mock()
+        volume = Mock()
+        binding = Mock()
+        track1 = self.module._make_track("http://stream/track1", "audio/mpeg", 1)
+        track2 = self.module._make_track("http://stream/track2", "audio/mpeg", 2)
+        player_data = Player(
+            uuid="the-uuid",
+            player=pipeline,
+            volume=volume,
+            playlist=Playlist(index=0, tracks=[track1, track2], volume=50),
+            internal=PlayerInternal(
+                last_state=Gst.State.PLAYING,
+                tracks_index={1: 0, 2: 1},
+                fade={"binding": binding, "volume": 0, "end": 2000, "action": "stop"},
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module.pipeline_teardown = Mock()
+        self.module._Audioplayer__prepare_player = Mock()
+
+        self.module._Audioplayer__process_gstreamer_message("the-uuid", pipeline, msg)
+
+        self.module._Audioplayer__prepare_player.assert_not_called()
+        volume.remove_control_binding.assert_called_with(binding)
+        self.assertIsNone(player_data.internal.fade)
+        self.assertTrue(player_data.internal.to_destroy)
+        self.session.assert_event_called_with(
+            "audioplayer.playback.update",
+            {"playeruuid": "the-uuid", "state": "stopped"},
+        )
+
+    def test__process_gstreamer_message_eos_during_pause_fade(self):
+        self.init()
+        msg = GstreamerMsg()
+        msg.type = Gst.MessageType.EOS
+        pipeline = Mock()
+        track1 = self.module._make_track("http://stream/track1", "audio/mpeg", 1)
+        track2 = self.module._make_track("http://stream/track2", "audio/mpeg", 2)
+        player_data = Player(
+            uuid="the-uuid",
+            player=pipeline,
+            volume=Mock(),
+            playlist=Playlist(index=0, tracks=[track1, track2], volume=50),
+            internal=PlayerInternal(
+                last_state=Gst.State.PLAYING,
+                tracks_index={1: 0, 2: 1},
+                fade={"binding": Mock(), "volume": 0, "end": 2000, "action": "pause"},
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        new_player = Player(uuid="the-uuid", player=Mock(), source=Mock(), volume=Mock())
+        self.module._Audioplayer__make_element = Mock()
+        self.module._Audioplayer__prepare_player = Mock(return_value=new_player)
+
+        self.module._Audioplayer__process_gstreamer_message("the-uuid", pipeline, msg)
+
+        self.assertIsNone(player_data.internal.fade)
+        self.assertEqual(player_data.playlist.index, 1)
+        new_player.volume.set_property.assert_called_with("volume", 0.5)
+        new_player.player.set_state.assert_called_with(Gst.State.PAUSED)
+
+    def test__process_gstreamer_message_state_changed(self):
+        self.init()
+        msg = GstreamerMsg()
+        msg.type = Gst.MessageType.STATE_CHANGED
+        player = Mock()
+        self.module._Audioplayer__play_next_track = Mock()
+        self.module._Audioplayer__send_playback_event = Mock()
+
+        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
+
+        player.set_state.assert_not_called()
+        self.module._Audioplayer__play_next_track.assert_not_called()
+        self.module._Audioplayer__send_playback_event.assert_called_with(
+            "the-uuid", player
+        )
+
+    def test__process_gstreamer_message_error(self):
+        self.init()
+        msg = GstreamerMsg()
+        msg.type = Gst.MessageType.ERROR
+        msg.parse_error = Mock(return_value=("error", "debug"))
+        msg.src = Mock()
+        msg.src.get_name.return_value = "decoder"
+        player = Mock()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            player=player,
+            pipeline=["element"],
+            playlist=Playlist(index=0, tracks=[track1]),
+            internal=PlayerInternal(last_state=Gst.State.PLAYING),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module.pipeline_teardown = Mock()
+        self.module._Audioplayer__play_next_track = Mock()
+        self.module._Audioplayer__send_playback_update = Mock()
+        self.module._Audioplayer__resolve_audio_sink = Mock()
+
+        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
+
+        player.set_state.assert_called_once_with(Gst.State.NULL)
+        self.module.pipeline_teardown.submit.assert_called_once_with(
+            player, ["element"]
+        )
+        self.assertIsNone(player_data.player)
+        msg.parse_error.assert_called()
+        self.module._Audioplayer__play_next_track.assert_not_called()
+        self.assertEqual(
+            self.module._Audioplayer__send_playback_update.call_args[0][1]["state"],
+            "stopped",
+        )
+        self.module._Audioplayer__resolve_audio_sink.assert_not_called()
+
+    def test__process_gstreamer_message_sink_error(self):
+        self.init()
+        msg = GstreamerMsg()
+        msg.type = Gst.MessageType.ERROR
+        msg.parse_error = Mock(return_value=("error", "debug"))
+        msg.src = Mock()
+        msg.src.get_name.return_value = "sink"
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid", playlist=Playlist(index=0, tracks=[track1])
+            )
+        }
+        self.module._Audioplayer__send_playback_update = Mock()
+        self.module._Audioplayer__resolve_audio_sink = Mock()
+
+        self.module.clip_player = Mock()
+
+        self.module._Audioplayer__process_gstreamer_message("the-uuid", Mock(), msg)
+
+        self.module._Audioplayer__resolve_audio_sink.assert_called_once()
+        self.module.clip_player.stop.assert_called_once()
+
+    def test__process_gstreamer_message_sink_error_configured_sink(self):
+        self.init()
+        self.module._set_config_field(
+            "audio_sink", {"element": "alsasink", "device": None}
+        )
+        msg = GstreamerMsg()
+        msg.type = Gst.MessageType.ERROR
+        msg.parse_error = Mock(return_value=("error", "debug"))
+        msg.src = Mock()
+        msg.src.get_name.return_value = "sink"
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid", playlist=Playlist(index=0, tracks=[track1])
+            )
+        }
+        self.module._Audioplayer__send_playback_update = Mock()
+        self.module._Audioplayer__resolve_audio_sink = Mock()
+
+        self.module.clip_player = Mock()
+
+        self.module._Audioplayer__process_gstreamer_message("the-uuid", Mock(), msg)
+
+        self.module._Audioplayer__resolve_audio_sink.assert_not_called()
+        self.module.clip_player.stop.assert_not_called()
+
+    def test__process_gstreamer_message_tag_with_metadata_complete(self):
+        self.init()
+        msg = GstreamerMsg()
+        msg.type = Gst.MessageType.TAG
+        tag = {"album": "dummy"}
+        msg.parse_tag = Mock(return_value=tag)
+        player = Mock()
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                playlist=Playlist(metadata={}),
+                pipeline=[],
+                internal=PlayerInternal(
+                    tags_sent=False,
+                    to_destroy=False,
+                ),
+            )
+        }
+        self.module._Audioplayer__play_next_track = Mock()
+        self.module._Audioplayer__send_playback_event = Mock()
+        self.module._Audioplayer__get_audio_metadata = Mock(return_value=(True, tag))
+
+        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
+
+        player.set_state.assert_not_called()
+        msg.parse_tag.assert_called()
+        self.module._Audioplayer__get_audio_metadata.assert_called_with(tag)
+        self.module._Audioplayer__play_next_track.assert_not_called()
+        self.module._Audioplayer__send_playback_event.assert_called()
+        self.assertTrue(self.module.players["the-uuid"].internal.tags_sent)
+
+        # call another time to check tags are not read again
+        msg.parse_tag.reset_mock()
+        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
+        msg.parse_tag.assert_not_called()
+
+    def test__process_gstreamer_message_tag_with_metadata_incomplete(self):
+        self.init()
+        msg = GstreamerMsg()
+        msg.type = Gst.MessageType.TAG
+        tag = {"album": "dummy"}
+        msg.parse_tag = Mock(return_value=tag)
+        player = Mock()
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                playlist=Playlist(metadata={}),
+                pipeline=[],
+                internal=PlayerInternal(
+                    tags_sent=False,
+                    to_destroy=False,
+                ),
+            )
+        }
+        self.module._Audioplayer__play_next_track = Mock()
+        self.module._Audioplayer__send_playback_event = Mock()
+        self.module._Audioplayer__get_audio_metadata = Mock(return_value=(False, tag))
+
+        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
+
+        player.set_state.assert_not_called()
+        msg.parse_tag.assert_called()
+        self.module._Audioplayer__get_audio_metadata.assert_called_with(tag)
+        self.module._Audioplayer__play_next_track.assert_not_called()
+        self.module._Audioplayer__send_playback_event.assert_not_called()
+        self.assertFalse(self.module.players["the-uuid"].internal.tags_sent)
+
+        # call another time to check tags are not read again
+        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
+        msg.parse_tag.assert_called()
+        self.assertFalse(self.module.players["the-uuid"].internal.tags_sent)
+
+    def test__process_gstreamer_message_duration_changed(self):
+        self.init()
+        msg = GstreamerMsg()
+        msg.type = Gst.MessageType.DURATION_CHANGED
+        player = Mock()
+        self.module._Audioplayer__play_next_track = Mock()
+        self.module._Audioplayer__send_playback_event = Mock()
+
+        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
+
+        player.set_state.assert_not_called()
+        self.module._Audioplayer__play_next_track.assert_not_called()
+        self.module._Audioplayer__send_playback_event.assert_called()
+
+    def test__process_gstreamer_message_progress(self):
+        self.init()
+        msg = GstreamerMsg()
+        msg.type = Gst.MessageType.ELEMENT
+        structure = Mock()
+        structure.get_name.return_value = "progress"
+        msg.get_structure = Mock(return_value=structure)
+        player = Mock()
+        player.query_position.return_value = (True, 42500000000)
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                playlist=Playlist(duration=180),
+                internal=PlayerInternal(position_interval=1),
+            )
+        }
+
+        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
+
+        self.session.assert_event_called_with(
+            "audioplayer.playback.position",
+            {"playeruuid": "the-uuid", "position": 42, "duration": 180},
+        )
+
+    def test__process_gstreamer_message_progress_disabled(self):
+        self.init()
+        msg = GstreamerMsg()
+        msg.type = Gst.MessageType.ELEMENT
+        msg.get_structure = Mock()
+        player = Mock()
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                playlist=Playlist(duration=180),
+                internal=PlayerInternal(position_interval=0),
+            )
+        }
+
+        self.module._Audioplayer__process_gstreamer_message("the-uuid", player, msg)
+
+        msg.get_structure.assert_not_called()
+        self.assertEqual(
+            self.session.event_call_count("audioplayer.playback.position"), 0
+        )
+
+    def test__send_playback_event(self):
+        self.init()
+        player = Mock()
+        player.get_state.return_value = ("dummy", Gst.State.PAUSED, "dummy")
+        player.query_duration.return_value = (True, 666000000000)
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                internal=PlayerInternal(
+                    tags_sent=False,
+                    to_destroy=False,
+                    last_state=None,
+                ),
+                playlist=Playlist(
+                    index=0,
+                    metadata={},
+                    tracks=[Track(1, "/resource/track1", "audio/mpeg")],
+                    duration=123,
+                ),
+            )
+        }
+
+        self.module._Audioplayer__send_playback_event("the-uuid", player)
+
+        self.assertEqual(
+            self.module.players["the-uuid"].internal.last_state, Gst.State.PAUSED
+        )
+        self.session.assert_event_called_with(
+            "audioplayer.playback.update",
+            {
+                "playeruuid": "the-uuid",
+                "state": "paused",
+                "index": 0,
+                "duration": 666,
+                "latency_profile": "balanced",
+                "metadata": {},
+                "track": {
+                    "id": 1,
+                    "resource": "/resource/track1",
+                    "audio_format": "audio/mpeg",
+                    "duration": 666,
+                },
+            },
+        )
+
+    def test__send_playback_event_no_duration(self):
+        self.init()
+        player = Mock()
+        player.get_state.return_value = ("dummy", Gst.State.PAUSED, "dummy")
+        player.query_duration.return_value = (False, 0)
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                internal=PlayerInternal(
+                    tags_sent=False,
+                    to_destroy=False,
+                    last_state=None,
+                ),
+                playlist=Playlist(
+                    index=0,
+                    metadata={},
+                    tracks=[Track(1, "/resource/track1", "audio/mpeg")],
+                    duration=123,
+                ),
+            )
+        }
+
+        self.module._Audioplayer__send_playback_event("the-uuid", player)
+
+        self.assertEqual(
+            self.module.players["the-uuid"].internal.last_state, Gst.State.PAUSED
+        )
+        self.session.assert_event_called_with(
+            "audioplayer.playback.update",
+            {
+                "playeruuid": "the-uuid",
+                "state": "paused",
+                "index": 0,
+                "duration": 123,
+                "latency_profile": "balanced",
+                "metadata": {},
+                "track": {
+                    "id": 1,
+                    "resource": "/resource/track1",
+                    "audio_format": "audio/mpeg",
+                    "duration": None,
+                },
+            },
+        )
+
+    def test__send_playback_event_same_state(self):
+        self.init()
+        player = Mock()
+        player.get_state = Mock(return_value=("dummy", Gst.State.PAUSED, "dummy"))
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                internal=PlayerInternal(
+                    tags_sent=False,
+                    to_destroy=False,
+                    last_state=Gst.State.PAUSED,
+                ),
+            )
+        }
+
+        self.module._Audioplayer__send_playback_event("the-uuid", player)
+
+        self.assertEqual(
+            self.module.players["the-uuid"].internal.last_state, Gst.State.PAUSED
+        )
+        self.assertEqual(
+            self.session.event_call_count("audioplayer.playback.update"), 0
+        )
+
+    def test__send_playback_event_same_state_but_forced(self):
+        self.init()
+        player = Mock()
+        player.get_state = Mock(return_value=("dummy", Gst.State.PAUSED, "dummy"))
+        player.query_duration.return_value = (False, 0)
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                internal=PlayerInternal(
+                    tags_sent=False,
+                    to_destroy=False,
+                    last_state=Gst.State.PAUSED,
+                ),
+                playlist=Playlist(
+                    metadata={},
+                    index=0,
+                    tracks=[Track(1, "/resource/track1", "audio/mpeg")],
+                    volume=12,
+                    duration=123,
+                ),
+            )
+        }
+
+        self.module._Audioplayer__send_playback_event("the-uuid", player, force=True)
+
+        self.assertEqual(
+            self.module.players["the-uuid"].internal.last_state, Gst.State.PAUSED
+        )
+        self.assertEqual(
+            self.session.event_call_count("audioplayer.playback.update"), 1
+        )
+
+    def test__send_playback_event_ready_state(self):
+        self.init()
+        player = Mock()
+        player.get_state = Mock(return_value=("dummy", Gst.State.READY, "dummy"))
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                internal=PlayerInternal(
+                    tags_sent=False,
+                    to_destroy=False,
+                    last_state=Gst.State.PAUSED,
+                ),
+            )
+        }
+
+        self.module._Audioplayer__send_playback_event("the-uuid", player)
+
+        self.assertEqual(
+            self.module.players["the-uuid"].internal.last_state, Gst.State.PAUSED
+        )
+        self.assertEqual(
+            self.session.event_call_count("audioplayer.playback.update"), 0
+        )
+
+    def test__send_playback_update_delta(self):
+        self.init()
+        self.module.delta_events = True
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                internal=PlayerInternal(event_seq=0, last_event={}),
+            )
+        }
+        info = {
+            "index": 0,
+            "playeruuid": "the-uuid",
+            "track": "track1",
+            "metadata": {},
+            "state": "paused",
+            "duration": 123,
+        }
+
+        self.module._Audioplayer__send_playback_update("the-uuid", dict(info))
+        self.session.assert_event_called_with(
+            "audioplayer.playback.update", dict(info, seq=1)
+        )
+
+        self.module._Audioplayer__send_playback_update(
+            "the-uuid", dict(info, state="playing")
+        )
+        self.session.assert_event_called_with(
+            "audioplayer.playback.update",
+            {"playeruuid": "the-uuid", "state": "playing", "seq": 2},
+        )
+
+        # nothing changed
+        self.module._Audioplayer__send_playback_update(
+            "the-uuid", dict(info, state="playing")
+        )
+        self.assertEqual(
+            self.session.event_call_count("audioplayer.playback.update"), 2
+        )
+
+    def test_get_playback_snapshot(self):
+        self.init()
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                internal=PlayerInternal(event_seq=12),
+            )
+        }
+        self.module._Audioplayer__get_playback_info = Mock(
+            return_value={"playeruuid": "the-uuid", "state": "playing"}
+        )
+
+        result = self.module.get_playback_snapshot("the-uuid")
+
+        self.assertDictEqual(
+            result, {"playeruuid": "the-uuid", "state": "playing", "seq": 12}
+        )
+
+    def test_get_playback_snapshot_invalid_params(self):
+        self.init()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.get_playback_snapshot("dummy")
+        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
+
+    def test__get_playback_info(self):
+        self.init()
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                internal=PlayerInternal(
+                    tags_sent=False,
+                    to_destroy=False,
+                    last_state=Gst.State.PAUSED,
+                ),
+                playlist=Playlist(
+                    duration=123,
+                    index=0,
+                    tracks=[Track(1, "/resource/track1", "audio/mpeg")],
+                    volume=50,
+                    metadata={},
+                ),
+            )
+        }
+
+        result = self.module._Audioplayer__get_playback_info("the-uuid")
+        logging.debug("Playback info: %s", result)
+
+        self.assertDictEqual(
+            result,
+            {
+                "index": 0,
+                "playeruuid": "the-uuid",
+                "track": {
+                    "id": 1,
+                    "resource": "/resource/track1",
+                    "audio_format": "audio/mpeg",
+                    "duration": None,
+                },
+                "metadata": {},
+                "state": "paused",
+                "duration": 123,
+                "latency_profile": "balanced",
+            },
+        )
+
+    def test__get_playback_info_player_not_found(self):
+        self.init()
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                internal=PlayerInternal(
+                    tags_sent=False,
+                    to_destroy=False,
+                    last_state=Gst.State.PAUSED,
+                ),
+                playlist=Playlist(
+                    duration=123,
+                    index=0,
+                    tracks=["track1"],
+                    volume=50,
+                    metadata={},
+                ),
+            )
+        }
+
+        result = self.module._Audioplayer__get_playback_info("dummy")
+        logging.debug("Playback info: %s", result)
+
+        self.assertDictEqual(
+            result,
+            {
+                "index": 0,
+                "playeruuid": "dummy",
+                "track": None,
+                "metadata": {},
+                "state": "stopped",
+                "duration": 0,
+                "latency_profile": None,
+            },
+        )
+
+    def test__get_audio_metadata(self):
+        self.init()
+        tags = Mock()
+        tags.to_string.return_value = "all-tags"
+        tags.nth_tag_name.side_effect = [
+            "artist",
+            "album-artist",
+            "album",
+            "title",
+            "genre",
+            "track-number",
+            "datetime",
+            "channel-mode",
+            "minimum-bitrate",
+            "maximum-bitrate",
+            "bitrate",
+        ]
+        tags.get_string.side_effect = [
+            (True, "[artist]"),
+            (True, "[album-artist]"),
+            (True, "[album]"),
+            (True, "[title]"),
+            (True, "[genre]"),
+            (True, "[channel-mode]"),
+        ]
+        tags.get_uint.side_effect = [
+            (True, 2),  # track-number
+            (True, 333),  # min bitrate
+            (True, 999),  # max bitrate
+            (True, 666),  # bitrate
+        ]
+        date_time = Mock()
+        date_time.has_year.return_value = True
+        date_time.get_year.return_value = 2021
+        tags.get_date_time.return_value = (True, date_time)
+        tags.n_tags.return_value = 11
+
+        complete, metadata = self.module._Audioplayer__get_audio_metadata(tags)
+        logging.debug("Metadata: %s", metadata)
+
+        self.assertTrue(complete)
+        self.assertDictEqual(
+            metadata,
+            {
+                "artist": "[album-artist]",
+                "album": "[album]",
+                "title": "[title]",
+                "genre": "[genre]",
+                "year": 2021,
+                "track": 2,
+                "channels": "[channel-mode]",
+                "bitratemin": 333,
+                "bitratemax": 999,
+                "bitrateavg": 666,
+            },
+        )
+
+    def test__get_audio_metadata_track_string(self):
+        self.init()
+        tags = Mock()
+        tags.to_string.return_value = "all-tags"
+        tags.nth_tag_name.side_effect = [
+            "track-number",
+        ]
+        tags.get_string.side_effect = [
+            (True, "3"),
+        ]
+        tags.get_uint.side_effect = [
+            (False, 2),  # track-number
+        ]
+        tags.n_tags.return_value = 1
+
+        complete, metadata = self.module._Audioplayer__get_audio_metadata(tags)
+        logging.debug("Metadata: %s", metadata)
+
+        self.assertFalse(complete)
+        self.assertDictEqual(
+            metadata,
+            {
+                "artist": None,
+                "album": None,
+                "title": None,
+                "genre": None,
+                "year": None,
+                "track": "3",
+                "channels": None,
+                "bitratemin": None,
+                "bitratemax": None,
+                "bitrateavg": None,
+            },
+        )
+
+    @patch("backend.audioplayer.magic.from_file")
+    def test__get_file_audio_format(self, mock_from_file):
+        self.init()
+        mock_from_file.return_value = "audio/mpeg"
+
+        result = self.module._Audioplayer__get_file_audio_format("/audio/file/path.mp3")
+        logging.debug("Format: %s" % result)
+
+        self.assertEqual(result, "audio/mpeg")
+
+    @patch("backend.audioplayer.magic.from_file")
+    def test__get_file_audio_format_unknown_format(self, mock_from_file):
+        self.init()
+        mock_from_file.return_value = "audio/dummy"
+
+        result = self.module._Audioplayer__get_file_audio_format("/audio/file/path.mp3")
+        logging.debug("Format: %s" % result)
+
+        self.assertIsNone(result)
+
+    @patch("backend.audioplayer.magic.from_file")
+    def test__get_file_audio_format_exception(self, mock_from_file):
+        self.init()
+        mock_from_file.side_effect = Exception("Test exception")
+
+        result = self.module._Audioplayer__get_file_audio_format("/audio/file/path.mp3")
+        logging.debug("Format: %s" % result)
+
+        self.assertIsNone(result)
+
+    def test_is_filepath(self):
+        self.init()
+
+        with patch("backend.audioplayer.os.path.exists") as exists_mock:
+            exists_mock.return_value = True
+
+            self.assertTrue(self.module._is_filepath("/dummy/resource"))
+
+        with patch("backend.audioplayer.os.path.exists") as exists_mock:
+            with patch("backend.audioplayer.urlparse") as url_parse_mock:
+                exists_mock.return_value = False
+                result = ParseUrlResult()
+                result.scheme = "https"
+                url_parse_mock.return_value = result
+
+                self.assertFalse(self.module._is_filepath("/dummy/resource"))
+
+        with patch("backend.audioplayer.os.path.exists") as exists_mock:
+            with patch("backend.audioplayer.urlparse") as url_parse_mock:
+                exists_mock.return_value = False
+                result = ParseUrlResult()
+                result.scheme = "dummy"
+                url_parse_mock.return_value = result
+
+                with self.assertRaises(Exception) as cm:
+                    self.assertFalse(self.module._is_filepath("/dummy/resource"))
+                self.assertEqual(
+                    str(cm.exception), "Resource is invalid (file may not exist)"
+                )
+
+    def test_make_track(self):
+        self.init()
+
+        result = self.module._make_track("/dummy/resource", "audio/dummy", 3)
+
+        self.assertIsInstance(result, Track)
+        self.assertDictEqual(
+            result.to_dict(),
+            {
+                "id": 3,
+                "resource": "/dummy/resource",
+                "audio_format": "audio/dummy",
+                "duration": None,
+            },
+        )
+
+    def test_add_track(self):
+        self.init()
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=["track1"],
+                    index=0,
+                    version=0,
+                ),
+                internal=PlayerInternal(
+                    shuffle_order=None,
+                    to_destroy=False,
+                    tracks_index={},
+                ),
+            )
+        }
+        track = self.module._make_track("/dummy/resource", "audio/mpeg", 1)
+
+        with patch("backend.audioplayer.os.path.exists") as exists_mock:
+            exists_mock.return_value = True
+
+            self.module.add_track("the-uuid", "/dummy/resource", "audio/mpeg")
+
+            self.assertDictEqual(
+                self.module.players["the-uuid"].playlist.tracks[-1].to_dict(),
+                track.to_dict(),
+            )
+            self.assertEqual(self.module.players["the-uuid"].playlist.version, 1)
+            self.assertEqual(
+                self.module.players["the-uuid"].internal.tracks_index[1],
+                len(self.module.players["the-uuid"].playlist.tracks) - 1,
+            )
+            self.session.assert_event_called_with(
+                "audioplayer.playlist.update",
+                {
+                    "playeruuid": "the-uuid",
+                    "version": 1,
+                    "index": 0,
+                    "changes": [{"action": "insert", "index": 1, "count": 1, "ids": [1]}],
+                }
+            )
+
+    def test_add_track_playlist_limit_reached(self):
+        self.init()
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=["track1"],
+                    index=0,
+                    version=0,
+                ),
+                internal=PlayerInternal(
+                    shuffle_order=None,
+                    to_destroy=False,
+                    tracks_index={},
+                ),
+            )
+        }
+        self.module.max_playlist_tracks = 3
+
+        with patch("backend.audioplayer.os.path.exists") as exists_mock:
+            exists_mock.return_value = True
+
+            self.assertTrue(
+                self.module.add_track("the-uuid", "/dummy/resource", "audio/mpeg")
+            )
+            self.assertTrue(
+                self.module.add_track("the-uuid", "/dummy/resource", "audio/mpeg")
+            )
+            self.assertFalse(
+                self.module.add_track("the-uuid", "/dummy/resource", "audio/mpeg")
+            )
+
+    def test_add_track_before_current_track(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/mpeg", 10)
+        track2 = self.module._make_track("/resource/track2", "audio/mpeg", 11)
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=[track1, track2],
+                    index=1,
+                    version=0,
+                ),
+                internal=PlayerInternal(
+                    shuffle_order=None,
+                    to_destroy=False,
+                    tracks_index={10: 0, 11: 1},
+                ),
+            )
+        }
+
+        with patch("backend.audioplayer.os.path.exists") as exists_mock:
+            exists_mock.return_value = True
+
+            self.module.add_track(
+                "the-uuid", "/dummy/resource", "audio/mpeg", track_index=0
+            )
+
+        playlist = self.module.players["the-uuid"].playlist
+        self.assertEqual(playlist.tracks[0].resource, "/dummy/resource")
+        self.assertEqual(playlist.index, 2)
+        self.assertIs(playlist.tracks[playlist.index], track2)
+        self.assertEqual(
+            self.module.players["the-uuid"].internal.tracks_index,
+            {playlist.tracks[0].id: 0, 10: 1, 11: 2},
+        )
+
+    def test_add_track_exception(self):
+        self.init()
+        self.module.players = {}
+
+        with self.assertRaises(Exception) as cm:
+            self.module.add_track("the-uuid", "/dummy/resource", "audio/dummy")
+        self.assertEqual(str(cm.exception), 'Player "the-uuid" does not exist')
+
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                internal=PlayerInternal(to_destroy=False),
+            )
+        }
+        with patch("backend.audioplayer.os.path.exists") as exists_mock:
+            with patch("backend.audioplayer.urlparse") as url_parse_mock:
+                exists_mock.return_value = False
+                result = ParseUrlResult()
+                result.scheme = "http"
+                url_parse_mock.return_value = result
+
+                with self.assertRaises(MissingParameter) as cm:
+                    self.module.add_track("the-uuid", "/dummy/resource/url")
+                self.assertEqual(
+                    str(cm.exception), "Url resource must have audio_format specified"
+                )
+
+                with self.assertRaises(Exception) as cm:
+                    self.module.add_track("the-uuid", "/dummy/resource", "audio/dummy")
+                self.assertEqual(
+                    str(cm.exception), 'Audio format "audio/dummy" is not supported'
+                )
+
+    def test_add_tracks(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/mpeg", 10)
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=[track1],
+                    index=0,
+                    version=0,
+                ),
+                internal=PlayerInternal(
+                    shuffle_order=None,
+                    to_destroy=False,
+                    tracks_index={10: 0},
+                ),
+            )
+        }
+        tracks = [
+            {"resource": "/dummy/resource1", "audio_format": "audio/mpeg"},
+            {"resource": "/dummy/resource2", "audio_format": None},
+            {"resource": "/dummy/resource3", "audio_format": "audio/mpeg"},
+        ]
+
+        with patch("backend.audioplayer.os.path.exists") as exists_mock:
+            exists_mock.return_value = True
+
+            result = self.module.add_tracks("the-uuid", tracks, track_index=0)
+
+        self.assertDictEqual(result, {"added": [1, 2, 3], "failed": []})
+        playlist = self.module.players["the-uuid"].playlist
+        self.assertListEqual(
+            [track.resource for track in playlist.tracks],
+            [
+                "/dummy/resource1",
+                "/dummy/resource2",
+                "/dummy/resource3",
+                "/resource/track1",
+            ],
+        )
+        self.assertEqual(playlist.index, 3)
+        self.assertEqual(
+            self.session.event_call_count("audioplayer.playlist.update"), 1
+        )
+        self.session.assert_event_called_with(
+            "audioplayer.playlist.update",
+            {
+                "playeruuid": "the-uuid",
+                "version": 1,
+                "index": 3,
+                "changes": [{"action": "insert", "index": 0, "count": 3, "ids": [1, 2, 3]}],
+            },
+        )
+        self.assertEqual(playlist.version, 1)
+
+    def test_add_tracks_failed_entries(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/mpeg", 10)
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=[track1],
+                    index=0,
+                    version=0,
+                ),
+                internal=PlayerInternal(
+                    shuffle_order=None,
+                    to_destroy=False,
+                    tracks_index={10: 0},
+                ),
+            )
+        }
+        self.module.max_playlist_tracks = 3
+        tracks = [
+            {"resource": "/dummy/resource1", "audio_format": "audio/mpeg"},
+            {"audio_format": "audio/mpeg"},
+            {"resource": "/dummy/resource2", "audio_format": "audio/dummy"},
+            {"resource": "http://dummy.com/stream"},
+            {"resource": "/dummy/resource3"},
+            {"resource": "/dummy/resource4"},
+        ]
+
+        with patch("backend.audioplayer.os.path.exists") as exists_mock:
+            exists_mock.side_effect = lambda resource: resource.startswith("/")
+
+            result = self.module.add_tracks("the-uuid", tracks)
+
+        self.assertDictEqual(
+            result,
+            {
+                "added": [1, 2],
+                "failed": [
+                    {"index": 1, "error": "Track resource is missing"},
+                    {
+                        "index": 2,
+                        "error": 'Audio format "audio/dummy" is not supported',
+                    },
+                    {
+                        "index": 3,
+                        "error": "Url resource must have audio_format specified",
+                    },
+                    {"index": 5, "error": "Playlist limit reached"},
+                ],
+            },
+        )
+        self.assertEqual(len(self.module.players["the-uuid"].playlist.tracks), 3)
+
+    def test_add_tracks_invalid_params(self):
+        self.init()
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                playlist=Playlist(tracks=[], index=0, version=0),
+            )
+        }
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.add_tracks("dummy", [])
+        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.add_tracks("the-uuid", [], track_index=1)
+        self.assertEqual(str(cm.exception), "Track index is invalid")
+
+    def test_remove_track_middle(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        track3 = self.module._make_track("/resource/track3", "audio/dummy")
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=[track1, track2, track3],
+                    index=0,
+                    version=0,
+                ),
+                internal=PlayerInternal(
+                    shuffle_order=None,
+                    to_destroy=False,
+                    tracks_index={},
+                ),
+            )
+        }
+
+        self.module.remove_track("the-uuid", 1)
+        logging.debug(
+            "Playlist tracks:%s" % self.module.players["the-uuid"].playlist.tracks
+        )
+
+        self.assertListEqual(
+            self.module.players["the-uuid"].playlist.tracks, [track1, track3]
+        )
+        self.session.assert_event_called_with(
+            "audioplayer.playlist.update",
+            {
+                "playeruuid": "the-uuid",
+                "version": 1,
+                "index": 0,
+                "changes": [{"action": "remove", "index": 1, "count": 1}],
+            }
+        )
+
+    def test_remove_track_last(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        track3 = self.module._make_track("/resource/track3", "audio/dummy")
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=[track1, track2, track3],
+                    index=0,
+                    version=0,
+                ),
+                internal=PlayerInternal(
+                    shuffle_order=None,
+                    to_destroy=False,
+                    tracks_index={},
+                ),
+            )
+        }
+
+        self.module.remove_track("the-uuid", 2)
+        logging.debug(
+            "Playlist tracks:%s" % self.module.players["the-uuid"].playlist.tracks
+        )
+
+        self.assertListEqual(
+            self.module.players["the-uuid"].playlist.tracks, [track1, track2]
+        )
+
+    def test_remove_track_first(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        track3 = self.module._make_track("/resource/track3", "audio/dummy")
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=[track1, track2, track3],
+                    index=1,
+                    version=0,
+                ),
+                internal=PlayerInternal(
+                    shuffle_order=None,
+                    to_destroy=False,
+                    tracks_index={},
+                ),
+            )
+        }
+
+        self.module.remove_track("the-uuid", 0)
+        logging.debug(
+            "Playlist tracks:%s" % self.module.players["the-uuid"].playlist.tracks
+        )
+
+        self.assertListEqual(
+            self.module.players["the-uuid"].playlist.tracks, [track2, track3]
+        )
+        self.assertEqual(self.module.players["the-uuid"].playlist.index, 0)
+
+    def test_remove_track_by_id(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy", 10)
+        track2 = self.module._make_track("/resource/track2", "audio/dummy", 11)
+        track3 = self.module._make_track("/resource/track3", "audio/dummy", 12)
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=[track1, track2, track3],
+                    index=2,
+                    version=0,
+                ),
+                internal=PlayerInternal(
+                    shuffle_order=None,
+                    to_destroy=False,
+                    tracks_index={10: 0, 11: 1, 12: 2},
+                ),
+            )
+        }
+
+        self.module.remove_track("the-uuid", track_id=11)
+
+        player = self.module.players["the-uuid"]
+        self.assertListEqual(player.playlist.tracks, [track1, track3])
+        self.assertEqual(player.playlist.index, 1)
+        self.assertDictEqual(player.internal.tracks_index, {10: 0, 12: 1})
+
+    def test_remove_track_by_id_exception(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy", 10)
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=[track1],
+                    index=0,
+                    version=0,
+                ),
+                internal=PlayerInternal(
+                    shuffle_order=None,
+                    to_destroy=False,
+                    tracks_index={10: 0},
+                ),
+            )
+        }
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.remove_track("the-uuid", track_id=666)
+        self.assertEqual(str(cm.exception), "Track does not exist")
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.remove_track("the-uuid", track_id=10)
+        self.assertEqual(str(cm.exception), "You can't remove current track")
+
+        with self.assertRaises(MissingParameter) as cm:
+            self.module.remove_track("the-uuid")
+        self.assertEqual(
+            str(cm.exception), "Parameter track_index or track_id must be specified"
+        )
+
+    def test_remove_track_exception(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        track3 = self.module._make_track("/resource/track3", "audio/dummy")
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=[track1, track2, track3],
+                    index=0,
+                ),
+                internal=PlayerInternal(
+                    shuffle_order=None,
+                    to_destroy=False,
+                    tracks_index={},
+                ),
+            )
+        }
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.remove_track("the-uuid", 0)
+        self.assertEqual(str(cm.exception), "You can't remove current track")
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.remove_track("the-uuid", -1)
+        self.assertEqual(str(cm.exception), "Track index is invalid")
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.remove_track("the-uuid", 3)
+        self.assertEqual(str(cm.exception), "Track index is invalid")
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.remove_track("dummy", 1)
+        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
+
+    def test_start_playback(self):
+        self.init()
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=[],
+                repeat=False,
+                volume=None,
+                metadata={},
+            ),
+            player=None,
+            source=None,
+            volume=None,
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=False,
+                last_state=None,
+                tracks_index={},
+            ),
+        )
+        self.module._Audioplayer__play_track = Mock()
+        self.module._Audioplayer__destroy_player = Mock()
+        self.module._Audioplayer__create_player = Mock(return_value=player_data)
+
+        result = self.module.start_playback("/resource/dummy")
+
+        self.module._Audioplayer__create_player.assert_called()
+        track = player_data.playlist.tracks[0]
+        self.assertDictEqual(
+            track.to_dict(),
+            {
+                "id": 1,
+                "resource": "/resource/dummy",
+                "audio_format": None,
+                "duration": None,
+            },
+        )
+        self.module._Audioplayer__play_track.assert_called_with(
+            track,
+            "the-uuid",
+            100,
+            False,
+        )
+        self.assertEqual(result, player_data.uuid)
+        self.module._Audioplayer__destroy_player.assert_not_called()
+        self.assertEqual(player_data.internal.latency_profile, "balanced")
+
+    def test_start_playback_holds_player_lock(self):
+        self.init()
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=[],
+                repeat=False,
+                volume=None,
+                metadata={},
+            ),
+            player=None,
+            source=None,
+            volume=None,
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=False,
+                last_state=None,
+                tracks_index={},
+            ),
+        )
+        locked = []
+
+        def play_track(*args):
+            # command running in another thread while player is set up
+            def other_command():
+                lock = self.module._get_player_lock("the-uuid")
+                acquired = lock.acquire(blocking=False)
+                if acquired:
+                    lock.release()
+                locked.append(not acquired)
+
+            thread = threading.Thread(target=other_command)
+            thread.start()
+            thread.join()
+
+        self.module._Audioplayer__play_track = Mock(side_effect=play_track)
+        self.module._Audioplayer__fade_in = Mock(side_effect=lambda *args: play_track())
+        self.module._Audioplayer__create_player = Mock(return_value=player_data)
+
+        self.module.start_playback("/resource/dummy", fade=1000)
+
+        self.assertListEqual(locked, [True, True])
+        lock = self.module._get_player_lock("the-uuid")
+        self.assertTrue(lock.acquire(blocking=False))
+        lock.release()
+
+    def test_start_playback_latency_profile(self):
+        self.init()
+        player_data = Player(uuid="the-uuid")
+        self.module._Audioplayer__play_track = Mock()
+        self.module._Audioplayer__create_player = Mock(return_value=player_data)
+
+        self.module.start_playback("/resource/dummy", latency_profile="low-latency")
+
+        self.assertEqual(player_data.internal.latency_profile, "low-latency")
+
+    def test_start_playback_invalid_latency_profile(self):
+        self.init()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.start_playback("/resource/dummy", latency_profile="dummy")
+        self.assertEqual(
+            str(cm.exception), 'Latency profile "dummy" is not supported'
+        )
+
+    @patch("backend.audioplayer.os.path.isfile", Mock(return_value=True))
+    def test_play_clip(self):
+        self.init()
+        clip = Mock(duration=500)
+        self.module.clip_cache.get = Mock(return_value=clip)
+        self.module.clip_player = Mock(started=False)
+        sink = Mock()
+        self.module._Audioplayer__make_sink = Mock(return_value=sink)
+
+        result = self.module.play_clip("/resource/chime.wav", 80)
+
+        self.assertEqual(result, 500)
+        self.module.clip_cache.get.assert_called_with("/resource/chime.wav")
+        self.module.clip_player.start.assert_called_with(sink)
+        self.module.clip_player.play.assert_called_with(clip, 80)
+        sink.set_property.assert_any_call(
+            "buffer-time", Audioplayer.LATENCY_PROFILES["low-latency"]["buffer_time"]
+        )
+
+    @patch("backend.audioplayer.os.path.isfile", Mock(return_value=True))
+    def test_play_clip_player_started(self):
+        self.init()
+        self.module.clip_cache.get = Mock()
+        self.module.clip_player = Mock(started=True)
+
+        self.module.play_clip("/resource/chime.wav")
+
+        self.module.clip_player.start.assert_not_called()
+        self.module.clip_player.play.assert_called_with(
+            self.module.clip_cache.get.return_value, 100
+        )
+
+    @patch("backend.audioplayer.os.path.isfile", Mock(return_value=True))
+    def test_play_clip_exception(self):
+        self.init()
+        self.module.clip_cache.get = Mock(side_effect=Exception("Test exception"))
+
+        with self.assertRaises(CommandError) as cm:
+            self.module.play_clip("/resource/chime.wav")
+        self.assertEqual(str(cm.exception), "Unable to play clip")
+
+    @patch("backend.audioplayer.os.path.isfile", Mock(return_value=True))
+    def test_play_clip_not_supported(self):
+        self.init()
+        self.module.element_factories.pop("appsrc")
+
+        with self.assertRaises(CommandError) as cm:
+            self.module.play_clip("/resource/chime.wav")
+        self.assertEqual(str(cm.exception), "Clip playback is not supported")
+
+    def test_play_clip_invalid_params(self):
+        self.init()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.play_clip("/dummy/chime.wav")
+        self.assertEqual(str(cm.exception), 'Clip "/dummy/chime.wav" does not exist')
+
+        with patch("backend.audioplayer.os.path.isfile", Mock(return_value=True)):
+            with self.assertRaises(InvalidParameter) as cm:
+                self.module.play_clip("/resource/chime.wav", 0)
+            self.assertEqual(str(cm.exception), "Volume must be between 1 and 100")
+
+    def test_start_playback_exception(self):
+        self.init()
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=[],
+                repeat=False,
+                volume=None,
+                metadata={},
+            ),
+            player=None,
+            source=None,
+            volume=None,
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=False,
+                last_state=None,
+                tracks_index={},
+            ),
+        )
+        self.module._Audioplayer__play_track = Mock(
+            side_effect=Exception("Test exception")
+        )
+        self.module._Audioplayer__destroy_player = Mock()
+        self.module._Audioplayer__create_player = Mock(return_value=player_data)
+
+        with self.assertRaises(CommandError) as cm:
+            self.module.start_playback("/resource/dummy")
+        self.assertEqual(str(cm.exception), "Unable to play resource")
+
+        self.module._Audioplayer__create_player.assert_called()
+        track = player_data.playlist.tracks[0]
+        self.assertDictEqual(
+            track.to_dict(),
+            {
+                "id": 1,
+                "resource": "/resource/dummy",
+                "audio_format": None,
+                "duration": None,
+            },
+        )
+        self.module._Audioplayer__play_track.assert_called_with(
+            track,
+            "the-uuid",
+            100,
+            False,
+        )
+        self.module._Audioplayer__destroy_player.assert_called_with(player_data)
+
+    @patch("backend.audioplayer.Gst.ElementFactory")
+    @patch("backend.audioplayer.Audioplayer._is_filepath")
+    def test__play_track_with_file(self, is_filepath_mock, element_factory_mock):
+        self.init()
+        is_filepath_mock.return_value = True
+        player = MagicMock()
+        self.module._Audioplayer__prepare_player = Mock(return_value=player)
+        track = self.module._make_track("/resource/dummy", "audio/mpeg")
+        self.module._Audioplayer__get_file_audio_format = Mock(
+            return_value="audio/mpeg"
+        )
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=[],
+                    index=0,
+                    volume=50,
+                ),
+                internal=PlayerInternal(
+                    to_destroy=False,
+                ),
+            )
+        }
+
+        self.module._Audioplayer__play_track(track, "the-uuid")
+        logging.debug("Players: %s" % self.module.players)
+
+        self.module._Audioplayer__get_file_audio_format.assert_called_with(
+            "/resource/dummy"
+        )
+        player.source.set_property.assert_any_call("location", "/resource/dummy")
+        player.volume.set_property.assert_any_call("volume", 0.5)
+        player.player.set_state.assert_called_with(Gst.State.PLAYING)
+        self.assertEqual(player.volume.call_count, 0)
+
+    @patch("backend.audioplayer.Gst.ElementFactory")
+    @patch("backend.audioplayer.Audioplayer._is_filepath")
+    def test__play_track_stops_previous_pipeline(self, is_filepath_mock, element_factory_mock):
+        self.init()
+        is_filepath_mock.return_value = True
+        calls = Mock()
+        old_pipeline = Mock()
+        new_pipeline = Mock()
+        calls.attach_mock(old_pipeline.set_state, "old_set_state")
+        calls.attach_mock(new_pipeline.set_state, "new_set_state")
+        self.module.pipeline_teardown = Mock()
+        calls.attach_mock(self.module.pipeline_teardown.submit, "teardown")
+        player_data = Player(
+            uuid="the-uuid",
+            player=old_pipeline,
+            pipeline=["element"],
+            playlist=Playlist(tracks=[], index=0, volume=50),
+            internal=PlayerInternal(last_state=Gst.State.PLAYING),
+        )
+        self.module.players = {"the-uuid": player_data}
+
+        def build_pipeline(source, audio_format, player):
+            player.player = new_pipeline
+            player.source = Mock()
+            player.volume = Mock()
+
+        self.module._Audioplayer__build_pipeline = Mock(side_effect=build_pipeline)
+        self.module._Audioplayer__get_file_audio_format = Mock(return_value="audio/mpeg")
+        track = self.module._make_track("/resource/dummy", "audio/mpeg")
+
+        self.module._Audioplayer__play_track(track, "the-uuid")
+
+        # old pipeline leaves PLAYING and releases device before new pipeline starts
+        self.assertListEqual(
+            calls.mock_calls,
+            [
+                call.old_set_state(Gst.State.NULL),
+                call.teardown(old_pipeline, ["element"]),
+                call.new_set_state(Gst.State.PLAYING),
+            ],
+        )
+
+    @patch("backend.audioplayer.Gst.ElementFactory")
+    @patch("backend.audioplayer.Audioplayer._is_filepath")
+    def test__play_track_with_url(self, is_filepath_mock, element_factory_mock):
+        self.init()
+        is_filepath_mock.return_value = False
+        player = MagicMock()
+        self.module._Audioplayer__prepare_player = Mock(return_value=player)
+        track = self.module._make_track("/resource/dummy", "audio/mpeg")
+        self.module._Audioplayer__get_file_audio_format = Mock(
+            return_value="audio/mpeg"
+        )
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=[],
+                    index=0,
+                    volume=50,
+                ),
+                internal=PlayerInternal(
+                    to_destroy=False,
+                ),
+            )
+        }
+
+        self.module._Audioplayer__play_track(track, "the-uuid")
+        logging.debug("Players: %s" % self.module.players)
+
+        self.module._Audioplayer__get_file_audio_format.assert_not_called()
+        player.source.set_property.assert_any_call("location", "/resource/dummy")
+        player.volume.set_property.assert_any_call("volume", 0.5)
+        player.player.set_state.assert_called_with(Gst.State.PLAYING)
+        self.assertEqual(player.volume.call_count, 0)
+
+    @patch("backend.audioplayer.Gst.ElementFactory")
+    @patch("backend.audioplayer.Audioplayer._is_filepath")
+    def test__play_track_with_volume(self, is_filepath_mock, element_factory_mock):
+        self.init()
+        is_filepath_mock.return_value = True
+        player = MagicMock()
+        self.module._Audioplayer__prepare_player = Mock(return_value=player)
+        track = self.module._make_track("/resource/dummy", "audio/mpeg")
+        self.module._Audioplayer__get_file_audio_format = Mock(
+            return_value="audio/mpeg"
+        )
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=[],
+                    index=0,
+                ),
+                internal=PlayerInternal(
+                    to_destroy=False,
+                ),
+            )
+        }
+
+        self.module._Audioplayer__play_track(track, "the-uuid", 66)
+        logging.debug("Players: %s" % self.module.players)
+
+        player.volume.set_property.assert_called_with("volume", 0.66)
+
+    @patch("backend.audioplayer.Gst.ElementFactory")
+    @patch("backend.audioplayer.Audioplayer._is_filepath")
+    def test__play_track_get_audio_format_failed(
+        self, is_filepath_mock, element_factory_mock
+    ):
+        self.init()
+        is_filepath_mock.return_value = True
+        player = MagicMock()
+        self.module._Audioplayer__prepare_player = Mock(return_value=player)
+        track = self.module._make_track("/resource/dummy", "audio/mpeg")
+        self.module._Audioplayer__get_file_audio_format = Mock(return_value=None)
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=[],
+                    index=0,
+                ),
+                internal=PlayerInternal(
+                    to_destroy=False,
+                ),
+            )
+        }
+
+        with self.assertRaises(CommandError) as cm:
+            self.module._Audioplayer__play_track(track, "the-uuid")
+        self.assertEqual(str(cm.exception), "Audio file not supported")
+
+    @patch("backend.audioplayer.Gst.ElementFactory")
+    @patch("backend.audioplayer.Audioplayer._is_filepath")
+    def test__play_track_exception(self, is_filepath_mock, element_factory_mock):
+        self.init()
+        is_filepath_mock.return_value = True
+        player = MagicMock()
+        player.source.set_property.side_effect = Exception("Test exception")
+        self.module._Audioplayer__prepare_player = Mock(return_value=player)
+        track = self.module._make_track("/resource/dummy", "audio/mpeg")
+        self.module._Audioplayer__get_file_audio_format = Mock(
+            return_value="audio/mpeg"
+        )
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=[],
+                    index=0,
+                ),
+                internal=PlayerInternal(
+                    to_destroy=False,
+                ),
+            )
+        }
+
+        with self.assertRaises(Exception) as cm:
+            self.module._Audioplayer__play_track(track, "the-uuid")
+        self.assertEqual(str(cm.exception), "Test exception")
+
+    def test_get_track_index(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy", 1)
+        track2 = self.module._make_track("/resource/track2", "audio/dummy", 2)
+        track3 = self.module._make_track("/resource/track3", "audio/dummy", 3)
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=[track1, track2, track3],
+                    index=0,
+                ),
+                internal=PlayerInternal(
+                    to_destroy=False,
+                    tracks_index={track1.id: 0, track2.id: 1, track3.id: 2},
+                ),
+            )
+        }
+
+        index = self.module._get_track_index("the-uuid", track1)
+        self.assertEqual(index, 0)
+
+        index = self.module._get_track_index("the-uuid", track3)
+        self.assertEqual(index, 2)
+
+        index = self.module._get_track_index("the-uuid", track2)
+        self.assertEqual(index, 1)
+
+    def test_get_track_index_unknown_track(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy", 1)
+        track2 = self.module._make_track("/resource/track2", "audio/dummy", 2)
+        track3 = self.module._make_track("/resource/track3", "audio/dummy", 3)
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                pipeline=[],
+                playlist=Playlist(
+                    tracks=[track1, track3],
+                    index=0,
+                ),
+                internal=PlayerInternal(
+                    to_destroy=False,
+                    tracks_index={track1.id: 0, track3.id: 1},
+                ),
+            )
+        }
+
+        index = self.module._get_track_index("the-uuid", track2)
+        self.assertEqual(index, 0)
+
+    def test_pause_playback_while_playing(self):
+        self.init()
+        player = Mock()
+        player.get_state.return_value = ("dummy", Gst.State.PLAYING, "dummy")
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=[track1],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=player,
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._set_volume = Mock()
+
+        self.module.pause_playback("the-uuid")
+
+        player.get_state.assert_called_with(1)
+        player.set_state.assert_called_with(Gst.State.PAUSED)
+        self.module._set_volume.assert_not_called()
+
+    def test_pause_playback_with_volume(self):
+        self.init()
+        player = Mock()
+        player.get_state.return_value = ("dummy", Gst.State.PLAYING, "dummy")
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=[track1],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=player,
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._set_volume = Mock()
+
+        self.module.pause_playback("the-uuid", volume=66)
+
+        self.module._set_volume.assert_called_with("the-uuid", 66)
+
+    def test_pause_playback_force_play(self):
+        self.init()
+        player = Mock()
+        player.get_state.return_value = ("dummy", Gst.State.PLAYING, "dummy")
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=[track1],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=player,
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+
+        self.module.pause_playback("the-uuid", force_play=True)
+
+        player.set_state.assert_called_with(Gst.State.PLAYING)
+
+    def test_pause_playback_force_pause(self):
+        self.init()
+        player = Mock()
+        player.get_state.return_value = ("dummy", Gst.State.PLAYING, "dummy")
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=[track1],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=player,
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+
+        self.module.pause_playback("the-uuid", force_pause=True)
+
+        player.set_state.assert_called_with(Gst.State.PAUSED)
+
+    def test_pause_playback_while_paused(self):
+        self.init()
+        player = Mock()
+        player.get_state.return_value = ("dummy", Gst.State.PAUSED, "dummy")
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=[track1],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=player,
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+
+        self.module.pause_playback("the-uuid")
+
+        player.get_state.assert_called_with(1)
+        player.set_state.assert_called_with(Gst.State.PLAYING)
+
+    def test_pause_playback_fade_while_paused(self):
+        self.init()
+        player = Mock()
+        player.get_state.return_value = ("dummy", Gst.State.PAUSED, "dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(volume=50),
+            player=player,
+            volume=Mock(),
+            internal=PlayerInternal(last_state=Gst.State.PAUSED),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__fade_volume = Mock()
+
+        self.module.pause_playback("the-uuid", force_pause=True, fade=1000)
+
+        self.module._Audioplayer__fade_volume.assert_not_called()
+        player.set_state.assert_called_with(Gst.State.PAUSED)
+
+    def test_pause_playback_cancels_running_fade(self):
+        self.init()
+        player = Mock()
+        player.get_state.return_value = ("dummy", Gst.State.PLAYING, "dummy")
+        binding = Mock()
+        volume = Mock()
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(volume=50),
+            player=player,
+            volume=volume,
+            internal=PlayerInternal(
+                last_state=Gst.State.PLAYING,
+                fade={"binding": binding, "volume": 0, "end": 2000, "action": "pause"},
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+
+        self.module.pause_playback("the-uuid", force_play=True)
+
+        self.assertIsNone(player_data.internal.fade)
+        volume.remove_control_binding.assert_called_with(binding)
+        volume.set_property.assert_called_with("volume", 0.5)
+        player.set_state.assert_called_with(Gst.State.PLAYING)
+
+    def test_pause_playback_suspended_player(self):
+        self.init()
+        player_data = Player(
+            uuid="the-uuid",
+            player=None,
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                last_state=Gst.State.PAUSED,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__resume_player = Mock()
+
+        result = self.module.pause_playback("the-uuid", force_pause=True)
+        self.assertEqual(result, "paused")
+        self.module._Audioplayer__resume_player.assert_not_called()
+
+        result = self.module.pause_playback("the-uuid")
+        self.assertEqual(result, "playing")
+        self.module._Audioplayer__resume_player.assert_called_with("the-uuid")
+
+    def test_pause_playback_invalid_params(self):
+        self.init()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.pause_playback("dummy")
+        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
+
+    def test_stop_playback(self):
+        self.init()
+        player = Mock()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=[track1],
+                repeat=True,
+                volume=55,
+                metadata={},
+                duration=12,
+            ),
+            player=player,
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._destroy_player = Mock()
+        self.module.pipeline_teardown = Mock()
+
+        self.module.stop_playback("the-uuid")
+
+        player.set_state.assert_called_once_with(Gst.State.NULL)
+        self.module.pipeline_teardown.submit.assert_called_once_with(player, [])
+        self.module._destroy_player.assert_called_with(player_data)
+        self.session.assert_event_called_with(
+            "audioplayer.playback.update",
+            {
+                "playeruuid": "the-uuid",
+                "state": "stopped",
+            },
+        )
+
+    def test_stop_playback_with_fade(self):
+        self.init()
+        player = Mock()
+        player_data = Player(
+            uuid="the-uuid",
+            player=player,
+            internal=PlayerInternal(
+                to_destroy=False,
+                last_state=Gst.State.PLAYING,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__fade_volume = Mock()
+        self.module._destroy_player = Mock()
+
+        self.module.stop_playback("the-uuid", fade=2000)
+
+        self.module._Audioplayer__fade_volume.assert_called_with(
+            "the-uuid", 0, 2000, action="stop"
+        )
+        player.set_state.assert_not_called()
+        self.module._destroy_player.assert_not_called()
+
+    def test_stop_playback_invalid_params(self):
+        self.init()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.stop_playback("dummy")
+        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
+
+    def test_play_next_track(self):
+        self.init()
+        player = Mock()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=[track1, track2],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=player,
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__play_next_track = Mock(return_value=True)
+
+        result = self.module.play_next_track("the-uuid")
+
+        self.assertTrue(result)
+        self.module._Audioplayer__play_next_track.assert_called_with("the-uuid")
+
+    def test_play_next_track_no_more_track(self):
+        self.init()
+        player = Mock()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=[track1, track2],
+                repeat=False,
+                volume=55,
+                metadata={},
+            ),
+            player=player,
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__play_next_track = Mock(return_value=True)
+
+        result = self.module.play_next_track("the-uuid")
+
+        self.assertFalse(result)
+        self.module._Audioplayer__play_next_track.assert_not_called()
+
+    def test_play_next_track_no_more_track_but_repeat_enabled(self):
+        self.init()
+        player = Mock()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=[track1, track2],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=player,
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__play_next_track = Mock(return_value=True)
+
+        result = self.module.play_next_track("the-uuid")
+
+        self.assertTrue(result)
+        self.module._Audioplayer__play_next_track.assert_called_with("the-uuid")
+
+    def test_play_next_track_error_playing_track(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=[track1, track2],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__play_next_track = Mock(return_value=False)
+
+        with self.assertRaises(CommandError) as cm:
+            self.module.play_next_track("the-uuid")
+        self.assertEqual(str(cm.exception), "Error playing next track")
+
+    def test_play_next_track_invalid_params(self):
+        self.init()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.play_next_track("dummy")
+        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
+
+    def test__play_next_track(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=[track1, track2],
+                repeat=False,
+                volume=55,
+                metadata={},
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__handle_end_of_playlist = Mock()
+        self.module._Audioplayer__play_track = Mock()
+
+        result = self.module._Audioplayer__play_next_track("the-uuid")
+
+        self.assertTrue(result)
+        self.module._Audioplayer__handle_end_of_playlist.assert_not_called()
+        self.module._Audioplayer__play_track.assert_called_with(track2, "the-uuid")
+        self.assertEqual(player_data.playlist.index, 1)
+
+    def test__play_next_track_exception(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=[track1, track2],
+                repeat=False,
+                volume=55,
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__handle_end_of_playlist = Mock()
+        self.module._Audioplayer__play_track = Mock(
+            side_effect=Exception("Test exception")
+        )
+
+        result = self.module._Audioplayer__play_next_track("the-uuid")
+
+        self.assertFalse(result)
+        self.module._Audioplayer__handle_end_of_playlist.assert_not_called()
+
+    def test__play_next_track_handle_end_of_playlist(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=[track1, track2],
+                repeat=False,
+                volume=55,
+                metadata={},
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+
+        self.module._Audioplayer__handle_end_of_playlist = Mock(return_value=False)
+        result = self.module._Audioplayer__play_next_track("the-uuid")
+        self.assertFalse(result)
+
+        self.module._Audioplayer__handle_end_of_playlist.return_value = True
+        result = self.module._Audioplayer__play_next_track("the-uuid")
+        self.assertTrue(result)
+
+    def test__play_next_track_invalid_params(self):
+        self.init()
+
+        self.assertFalse(self.module._Audioplayer__play_next_track("dummy"))
+
+    def test__handle_end_of_playlist(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=[track1, track2],
+                repeat=False,
+                volume=55,
+                metadata={},
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._destroy_player = Mock()
+
+        result = self.module._Audioplayer__handle_end_of_playlist("the-uuid")
+
+        self.assertFalse(result)
+        self.module._destroy_player.assert_called_with(player_data)
+
+    def test__handle_end_of_playlist_repeat_enabled(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=[track1, track2],
+                repeat=True,
+                shuffle=False,
+                volume=55,
+                metadata={},
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._destroy_player = Mock()
+        self.module._Audioplayer__play_track = Mock()
+        self.module.shuffle_playlist = Mock()
 
-        with self.assertRaises(Exception) as cm:
-            self.module.add_track("the-uuid", "/dummy/resource", "audio/dummy")
-        self.assertEqual(str(cm.exception), 'Player "the-uuid" does not exist')
+        result = self.module._Audioplayer__handle_end_of_playlist("the-uuid")
 
-        self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "internal": {"to_destroy": False},
-            }
-        }
-        with patch("backend.audioplayer.os.path.exists") as exists_mock:
-            with patch("backend.audioplayer.urlparse") as url_parse_mock:
-                exists_mock.return_value = False
-                result = ParseUrlResult()
-                result.scheme = "http"
-                url_parse_mock.return_value = result
+        self.assertTrue(result)
+        self.module._destroy_player.assert_not_called()
+        self.module._Audioplayer__play_track.assert_called_with(track1, "the-uuid")
+        self.module.shuffle_playlist.assert_not_called()
 
-                with self.assertRaises(MissingParameter) as cm:
-                    self.module.add_track("the-uuid", "/dummy/resource/url")
-                self.assertEqual(
-                    str(cm.exception), "Url resource must have audio_format specified"
-                )
+    def test__handle_end_of_playlist_shuffle_enabled(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy", 10)
+        track2 = self.module._make_track("/resource/track2", "audio/dummy", 11)
+        shuffle_order = ShuffleOrder([10, 11], 11)
+        shuffle_order.next()
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=[track1, track2],
+                repeat=True,
+                shuffle=True,
+                volume=55,
+                metadata={},
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=shuffle_order,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+                tracks_index={10: 0, 11: 1},
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._destroy_player = Mock()
+        self.module._Audioplayer__play_track = Mock()
 
-                with self.assertRaises(Exception) as cm:
-                    self.module.add_track("the-uuid", "/dummy/resource", "audio/dummy")
-                self.assertEqual(
-                    str(cm.exception), 'Audio format "audio/dummy" is not supported'
-                )
+        result = self.module._Audioplayer__handle_end_of_playlist("the-uuid")
 
-    def test_add_tracks(self):
+        self.assertTrue(result)
+        self.module._destroy_player.assert_not_called()
+        new_order = player_data.internal.shuffle_order
+        self.assertIsNot(new_order, shuffle_order)
+        self.assertTrue(new_order.has_next())
+        track = player_data.playlist.tracks[player_data.playlist.index]
+        self.module._Audioplayer__play_track.assert_called_with(track, "the-uuid")
+
+    def test_play_previous_track(self):
         self.init()
-        track = self.module._make_track("/dummy/resource", "audio/dummy")
-        self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "playlist": {
-                    "tracks": [track],
-                    "index": 0,
-                },
-                "internal": {
-                    "to_destroy": False,
-                },
-            }
-        }
-        self.module.add_track = Mock(return_value=True)
+        player = Mock()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=[track1, track2],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=player,
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__play_track = Mock()
 
-        self.module.add_tracks("the-uuid", [track, track, track])
+        result = self.module.play_previous_track("the-uuid")
 
-        self.assertEqual(self.module.add_track.call_count, 3)
+        self.assertTrue(result)
+        self.assertEqual(player_data.playlist.index, 0)
+        self.module._Audioplayer__play_track.assert_called_with(track1, "the-uuid")
 
-    def test_add_tracks_playlist_limit_reached(self):
+    def test_play_previous_track_first_track(self):
         self.init()
-        track = self.module._make_track("/dummy/resource", "audio/dummy")
-        self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "playlist": {
-                    "tracks": [track],
-                    "index": 0,
-                },
-                "internal": {
-                    "to_destroy": False,
-                },
-            }
-        }
-        self.module.add_track = Mock(side_effect=[True, True, False])
-
-        with self.assertRaises(CommandInfo) as cm:
-            self.module.add_tracks("the-uuid", [track, track, track, track])
-        self.assertEqual(
-            str(cm.exception), "All tracks were not added (playlist limit reached)"
+        player = Mock()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=[track1, track2],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=player,
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
         )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__play_track = Mock(return_value=True)
 
-    def test_remove_track_middle(self):
+        result = self.module.play_previous_track("the-uuid")
+
+        self.assertFalse(result)
+        self.assertEqual(player_data.playlist.index, 0)
+        self.module._Audioplayer__play_track.assert_not_called()
+
+    def test_play_previous_track_error_playing_track(self):
         self.init()
         track1 = self.module._make_track("/resource/track1", "audio/dummy")
         track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        track3 = self.module._make_track("/resource/track3", "audio/dummy")
-        self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "playlist": {
-                    "tracks": [track1, track2, track3],
-                    "index": 0,
-                },
-                "internal": {
-                    "to_destroy": False,
-                },
-            }
-        }
-
-        self.module.remove_track("the-uuid", 1)
-        logging.debug(
-            "Playlist tracks:%s" % self.module.players["the-uuid"]["playlist"]["tracks"]
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=[track1, track2],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=1,
+            ),
         )
-
-        self.assertListEqual(
-            self.module.players["the-uuid"]["playlist"]["tracks"], [track1, track3]
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__play_track = Mock(
+            side_effect=Exception("Test exception")
         )
 
-    def test_remove_track_last(self):
+        with self.assertRaises(Exception) as cm:
+            self.module.play_previous_track("the-uuid")
+        self.assertEqual(str(cm.exception), "Test exception")
+
+    def test_play_previous_track_invalid_params(self):
+        self.init()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.play_previous_track("dummy")
+        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
+
+    def test_play_track(self):
         self.init()
         track1 = self.module._make_track("/resource/track1", "audio/dummy")
         track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        track3 = self.module._make_track("/resource/track3", "audio/dummy")
-        self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "playlist": {
-                    "tracks": [track1, track2, track3],
-                    "index": 0,
-                },
-                "internal": {
-                    "to_destroy": False,
-                },
-            }
-        }
-
-        self.module.remove_track("the-uuid", 2)
-        logging.debug(
-            "Playlist tracks:%s" % self.module.players["the-uuid"]["playlist"]["tracks"]
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=[track1, track2],
+                repeat=True,
+                volume=55,
+                metadata={},
+                duration=666,
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=Gst.State.PLAYING,
+            ),
         )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__play_track = Mock()
 
-        self.assertListEqual(
-            self.module.players["the-uuid"]["playlist"]["tracks"], [track1, track2]
+        result = self.module.play_track("the-uuid", 1)
+
+        self.assertTrue(result)
+        self.module._Audioplayer__play_track.assert_called_with(track2, "the-uuid")
+
+    def test_play_track_by_id(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy", 10)
+        track2 = self.module._make_track("/resource/track2", "audio/dummy", 11)
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=[track1, track2],
+                repeat=True,
+                volume=55,
+                metadata={},
+                duration=666,
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=Gst.State.PLAYING,
+                tracks_index={10: 0, 11: 1},
+            ),
         )
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__play_track = Mock()
 
-    def test_remove_track_first(self):
+        self.assertTrue(self.module.play_track("the-uuid", track_id=11))
+        self.module._Audioplayer__play_track.assert_called_with(track2, "the-uuid")
+        self.assertEqual(player_data.playlist.index, 1)
+
+        self.assertFalse(self.module.play_track("the-uuid", track_id=666))
+
+    def test_move_track(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        track3 = self.module._make_track("/resource/track3", "audio/dummy")
+        track1 = self.module._make_track("/resource/track1", "audio/dummy", 10)
+        track2 = self.module._make_track("/resource/track2", "audio/dummy", 11)
+        track3 = self.module._make_track("/resource/track3", "audio/dummy", 12)
         self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "playlist": {
-                    "tracks": [track1, track2, track3],
-                    "index": 1,
-                },
-                "internal": {
-                    "to_destroy": False,
-                },
-            }
+            "the-uuid": Player(
+                uuid="the-uuid",
+                playlist=Playlist(
+                    tracks=[track1, track2, track3],
+                    index=1,
+                    version=0,
+                ),
+                internal=PlayerInternal(
+                    tracks_index={10: 0, 11: 1, 12: 2},
+                ),
+            )
         }
+        playlist = self.module.players["the-uuid"].playlist
 
-        self.module.remove_track("the-uuid", 0)
-        logging.debug(
-            "Playlist tracks:%s" % self.module.players["the-uuid"]["playlist"]["tracks"]
+        self.module.move_track("the-uuid", 12, 0)
+
+        self.assertListEqual(playlist.tracks, [track3, track1, track2])
+        self.assertEqual(playlist.index, 2)
+        self.session.assert_event_called_with(
+            "audioplayer.playlist.update",
+            {
+                "playeruuid": "the-uuid",
+                "version": 1,
+                "index": 2,
+                "changes": [{"action": "move", "from": 2, "to": 0, "count": 1}],
+            },
         )
 
-        self.assertListEqual(
-            self.module.players["the-uuid"]["playlist"]["tracks"], [track2, track3]
+        self.module.move_track("the-uuid", 11, 0)
+
+        self.assertListEqual(playlist.tracks, [track2, track3, track1])
+        self.assertEqual(playlist.index, 0)
+        self.assertDictEqual(
+            self.module.players["the-uuid"].internal.tracks_index,
+            {11: 0, 12: 1, 10: 2},
         )
 
-    def test_remove_track_exception(self):
+    def test_move_track_invalid_params(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        track3 = self.module._make_track("/resource/track3", "audio/dummy")
+        track1 = self.module._make_track("/resource/track1", "audio/dummy", 10)
         self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "playlist": {
-                    "tracks": [track1, track2, track3],
-                    "index": 0,
-                },
-                "internal": {
-                    "to_destroy": False,
-                },
-            }
+            "the-uuid": Player(
+                uuid="the-uuid",
+                playlist=Playlist(tracks=[track1], index=0, version=0),
+                internal=PlayerInternal(tracks_index={10: 0}),
+            )
         }
 
         with self.assertRaises(InvalidParameter) as cm:
-            self.module.remove_track("the-uuid", 0)
-        self.assertEqual(str(cm.exception), "You can't remove current track")
+            self.module.move_track("dummy", 10, 0)
+        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
 
         with self.assertRaises(InvalidParameter) as cm:
-            self.module.remove_track("the-uuid", -1)
-        self.assertEqual(str(cm.exception), "Track index is invalid")
+            self.module.move_track("the-uuid", 666, 0)
+        self.assertEqual(str(cm.exception), "Track does not exist")
 
         with self.assertRaises(InvalidParameter) as cm:
-            self.module.remove_track("the-uuid", 3)
+            self.module.move_track("the-uuid", 10, 1)
         self.assertEqual(str(cm.exception), "Track index is invalid")
 
-        with self.assertRaises(InvalidParameter) as cm:
-            self.module.remove_track("dummy", 1)
-        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
-
-    def test_start_playback(self):
+    def test_play_track_invalid_track_index(self):
         self.init()
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 0,
-                "tracks": [],
-                "repeat": False,
-                "volume": None,
-                "metadata": {},
-            },
-            "player": None,
-            "source": None,
-            "volume": None,
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": False,
-                "last_state": None,
-            },
-        }
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=[track1, track2],
+                repeat=True,
+                volume=55,
+                metadata={},
+                duration=666,
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=Gst.State.PLAYING,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
         self.module._Audioplayer__play_track = Mock()
-        self.module._Audioplayer__destroy_player = Mock()
-        self.module._Audioplayer__create_player = Mock(return_value=player_data)
 
-        result = self.module.start_playback("/resource/dummy")
+        result = self.module.play_track("the-uuid", 2)
+        self.assertFalse(result)
 
-        self.module._Audioplayer__create_player.assert_called()
-        self.module._Audioplayer__play_track.assert_called_with(
-            {"resource": "/resource/dummy", "audio_format": None},
-            "the-uuid",
-            100,
-            False,
+        result = self.module.play_track("the-uuid", -1)
+        self.assertFalse(result)
+
+        self.assertEqual(self.module._Audioplayer__play_track.call_count, 0)
+
+    def test_play_track_invalid_player(self):
+        self.init()
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=[track1, track2],
+                repeat=True,
+                volume=55,
+                metadata={},
+                duration=666,
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=Gst.State.PLAYING,
+            ),
         )
-        self.assertEqual(result, player_data["uuid"])
-        self.module._Audioplayer__destroy_player.assert_not_called()
+        self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__play_track = Mock()
 
-    def test_start_playback_exception(self):
+        result = self.module.play_track("an-uuid", 1)
+
+        self.assertFalse(result)
+        self.assertEqual(self.module._Audioplayer__play_track.call_count, 0)
+
+    def test_play_track_play_track_failed(self):
         self.init()
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 0,
-                "tracks": [],
-                "repeat": False,
-                "volume": None,
-                "metadata": {},
-            },
-            "player": None,
-            "source": None,
-            "volume": None,
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": False,
-                "last_state": None,
-            },
-        }
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=[track1, track2],
+                repeat=True,
+                volume=55,
+                metadata={},
+                duration=666,
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=Gst.State.PLAYING,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
         self.module._Audioplayer__play_track = Mock(
             side_effect=Exception("Test exception")
         )
-        self.module._Audioplayer__destroy_player = Mock()
-        self.module._Audioplayer__create_player = Mock(return_value=player_data)
 
-        with self.assertRaises(CommandError) as cm:
-            self.module.start_playback("/resource/dummy")
-        self.assertEqual(str(cm.exception), "Unable to play resource")
+        result = self.module.play_track("the-uuid", 1)
 
-        self.module._Audioplayer__create_player.assert_called()
-        self.module._Audioplayer__play_track.assert_called_with(
-            {"resource": "/resource/dummy", "audio_format": None},
-            "the-uuid",
-            100,
-            False,
-        )
-        self.module._Audioplayer__destroy_player.assert_called_with(player_data)
+        self.assertFalse(result)
 
-    @patch("backend.audioplayer.Gst.ElementFactory")
-    @patch("backend.audioplayer.Audioplayer._is_filepath")
-    def test__play_track_with_file(self, is_filepath_mock, element_factory_mock):
+    def test_get_players(self):
         self.init()
-        is_filepath_mock.return_value = True
-        player = MagicMock()
-        self.module._Audioplayer__prepare_player = Mock(return_value=player)
-        track = self.module._make_track("/resource/dummy", "audio/mpeg")
-        self.module._Audioplayer__get_file_audio_format = Mock(
-            return_value="audio/mpeg"
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=[track1, track2],
+                repeat=True,
+                volume=55,
+                metadata={},
+                duration=666,
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=Gst.State.PLAYING,
+            ),
+        )
+        self.module.players = {"the-uuid": player_data}
+
+        players = self.module.get_players()
+        logging.debug("Players: %s", players)
+
+        self.assertListEqual(
+            players,
+            [
+                {
+                    "playeruuid": "the-uuid",
+                    "track": track2.to_dict(),
+                    "state": "playing",
+                    "duration": 666,
+                    "latency_profile": "balanced",
+                    "index": 1,
+                    "metadata": {},
+                }
+            ],
         )
+
+    def test_get_players_with_usage(self):
+        self.init()
+        self.module.max_active_players = 4
+        self.module._Audioplayer__get_playback_info = Mock(return_value={})
         self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "playlist": {
-                    "tracks": [],
-                    "index": 0,
-                    "volume": 50,
-                },
-                "internal": {
-                    "to_destroy": False,
-                },
-            }
+            "uuid1": Player(
+                uuid="uuid1",
+                player=Mock(),
+                internal=PlayerInternal(to_destroy=False),
+            ),
+            "uuid2": Player(
+                uuid="uuid2",
+                player=None,
+                internal=PlayerInternal(to_destroy=False),
+            ),
         }
 
-        self.module._Audioplayer__play_track(track, "the-uuid")
-        logging.debug("Players: %s" % self.module.players)
+        result = self.module.get_players(usage=True)
 
-        self.module._Audioplayer__get_file_audio_format.assert_called_with(
-            "/resource/dummy"
+        self.assertDictEqual(
+            result,
+            {
+                "players": [{}, {}],
+                "usage": {"active": 1, "suspended": 1, "max": 4},
+            },
         )
-        player["source"].set_property.assert_any_call("location", "/resource/dummy")
-        player["volume"].set_property.assert_any_call("volume", 0.5)
-        player["player"].set_state.assert_called_with(Gst.State.PLAYING)
-        self.assertEqual(player["volume"].call_count, 0)
 
-    @patch("backend.audioplayer.Gst.ElementFactory")
-    @patch("backend.audioplayer.Audioplayer._is_filepath")
-    def test__play_track_with_url(self, is_filepath_mock, element_factory_mock):
+    def test_get_events_since(self):
         self.init()
-        is_filepath_mock.return_value = False
-        player = MagicMock()
-        self.module._Audioplayer__prepare_player = Mock(return_value=player)
-        track = self.module._make_track("/resource/dummy", "audio/mpeg")
-        self.module._Audioplayer__get_file_audio_format = Mock(
-            return_value="audio/mpeg"
-        )
         self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "playlist": {
-                    "tracks": [],
-                    "index": 0,
-                    "volume": 50,
-                },
-                "internal": {
-                    "to_destroy": False,
-                },
-            }
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                internal=PlayerInternal(to_destroy=False),
+            )
         }
+        self.module._Audioplayer__get_playback_info = Mock(return_value={})
+        for _ in range(3):
+            self.module._Audioplayer__stop_player("the-uuid")
 
-        self.module._Audioplayer__play_track(track, "the-uuid")
-        logging.debug("Players: %s" % self.module.players)
+        result = self.module.get_events_since(1)
 
-        self.module._Audioplayer__get_file_audio_format.assert_not_called()
-        player["source"].set_property.assert_any_call("location", "/resource/dummy")
-        player["volume"].set_property.assert_any_call("volume", 0.5)
-        player["player"].set_state.assert_called_with(Gst.State.PLAYING)
-        self.assertEqual(player["volume"].call_count, 0)
+        self.assertEqual(result["seq"], 3)
+        self.assertTrue(result["complete"])
+        self.assertEqual([event["id"] for event in result["events"]], [2, 3])
+        self.assertEqual(result["events"][0]["event"], "audioplayer.playback.update")
+        self.assertDictEqual(
+            result["events"][0]["params"],
+            {"playeruuid": "the-uuid", "state": "stopped"},
+        )
 
-    @patch("backend.audioplayer.Gst.ElementFactory")
-    @patch("backend.audioplayer.Audioplayer._is_filepath")
-    def test__play_track_with_volume(self, is_filepath_mock, element_factory_mock):
+    def test_get_events_since_incomplete(self):
         self.init()
-        is_filepath_mock.return_value = True
-        player = MagicMock()
-        self.module._Audioplayer__prepare_player = Mock(return_value=player)
-        track = self.module._make_track("/resource/dummy", "audio/mpeg")
-        self.module._Audioplayer__get_file_audio_format = Mock(
-            return_value="audio/mpeg"
-        )
         self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "playlist": {
-                    "tracks": [],
-                    "index": 0,
-                },
-                "internal": {
-                    "to_destroy": False,
-                },
-            }
+            "the-uuid": Player(
+                uuid="the-uuid",
+                player=None,
+                internal=PlayerInternal(to_destroy=False),
+            )
         }
+        self.module._Audioplayer__get_playback_info = Mock(return_value={})
+        self.module.events_backlog = deque(maxlen=2)
+        for _ in range(4):
+            self.module._Audioplayer__stop_player("the-uuid")
 
-        self.module._Audioplayer__play_track(track, "the-uuid", 66)
-        logging.debug("Players: %s" % self.module.players)
+        result = self.module.get_events_since(1)
 
-        player["volume"].set_property.assert_called_with("volume", 0.66)
+        self.assertEqual(result["seq"], 4)
+        self.assertFalse(result["complete"])
+        self.assertEqual([event["id"] for event in result["events"]], [3, 4])
 
-    @patch("backend.audioplayer.Gst.ElementFactory")
-    @patch("backend.audioplayer.Audioplayer._is_filepath")
-    def test__play_track_get_audio_format_failed(
-        self, is_filepath_mock, element_factory_mock
-    ):
+        # client already up to date
+        result = self.module.get_events_since(4)
+        self.assertTrue(result["complete"])
+        self.assertListEqual(result["events"], [])
+
+    def test_get_events_since_invalid_params(self):
         self.init()
-        is_filepath_mock.return_value = True
-        player = MagicMock()
-        self.module._Audioplayer__prepare_player = Mock(return_value=player)
-        track = self.module._make_track("/resource/dummy", "audio/mpeg")
-        self.module._Audioplayer__get_file_audio_format = Mock(return_value=None)
-        self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "playlist": {
-                    "tracks": [],
-                    "index": 0,
-                },
-                "internal": {
-                    "to_destroy": False,
-                },
-            }
-        }
 
-        with self.assertRaises(CommandError) as cm:
-            self.module._Audioplayer__play_track(track, "the-uuid")
-        self.assertEqual(str(cm.exception), "Audio file not supported")
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.get_events_since(-1)
+        self.assertEqual(str(cm.exception), "Sequence id must be positive")
 
-    @patch("backend.audioplayer.Gst.ElementFactory")
-    @patch("backend.audioplayer.Audioplayer._is_filepath")
-    def test__play_track_exception(self, is_filepath_mock, element_factory_mock):
+    def test_get_playlist(self):
         self.init()
-        is_filepath_mock.return_value = True
-        player = MagicMock()
-        player["source"].set_property.side_effect = Exception("Test exception")
-        self.module._Audioplayer__prepare_player = Mock(return_value=player)
-        track = self.module._make_track("/resource/dummy", "audio/mpeg")
-        self.module._Audioplayer__get_file_audio_format = Mock(
-            return_value="audio/mpeg"
+        track1 = self.module._make_track("/resource/track1", "audio/dummy")
+        track2 = self.module._make_track("/resource/track2", "audio/dummy")
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=1,
+                tracks=[track1, track2],
+                repeat=True,
+                volume=55,
+                metadata={},
+                version=3,
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=Gst.State.PLAYING,
+            ),
         )
-        self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "playlist": {
-                    "tracks": [],
-                    "index": 0,
-                },
-                "internal": {
-                    "to_destroy": False,
-                },
-            }
-        }
+        self.module.players = {"the-uuid": player_data}
 
-        with self.assertRaises(Exception) as cm:
-            self.module._Audioplayer__play_track(track, "the-uuid")
-        self.assertEqual(str(cm.exception), "Test exception")
+        playlist = self.module.get_playlist("the-uuid")
+        logging.debug("Playlist: %s", playlist)
 
-    def test_get_track_index(self):
+        self.assertEqual(playlist["index"], 1)
+        self.assertEqual(playlist["offset"], 0)
+        self.assertEqual(playlist["count"], 2)
+        self.assertListEqual(
+            playlist["tracks"], [track1.to_dict(), track2.to_dict()]
+        )
+
+    def test_get_playlist_window(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        track3 = self.module._make_track("/resource/track3", "audio/dummy")
+        tracks = [
+            self.module._make_track(f"/resource/track{index}", "audio/mpeg", index)
+            for index in range(10)
+        ]
         self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "playlist": {
-                    "tracks": [track1, track2, track3],
-                    "index": 0,
-                },
-                "internal": {
-                    "to_destroy": False,
-                },
-            }
+            "the-uuid": Player(
+                uuid="the-uuid",
+                playlist=Playlist(
+                    index=0,
+                    tracks=tracks,
+                    version=3,
+                ),
+            )
         }
 
-        index = self.module._get_track_index("the-uuid", track1)
-        self.assertEqual(index, 0)
+        playlist = self.module.get_playlist(
+            "the-uuid", offset=4, limit=3, fields=["id", "resource"]
+        )
 
-        index = self.module._get_track_index("the-uuid", track3)
-        self.assertEqual(index, 2)
+        self.assertEqual(playlist["offset"], 4)
+        self.assertEqual(playlist["count"], 10)
+        self.assertListEqual(
+            playlist["tracks"],
+            [
+                {"id": 4, "resource": "/resource/track4"},
+                {"id": 5, "resource": "/resource/track5"},
+                {"id": 6, "resource": "/resource/track6"},
+            ],
+        )
 
-        index = self.module._get_track_index("the-uuid", track2)
-        self.assertEqual(index, 1)
+        playlist = self.module.get_playlist("the-uuid", offset=8, limit=5)
+        self.assertEqual(len(playlist["tracks"]), 2)
 
-    def test_get_track_index_unknown_track(self):
+    def test_get_playlist_summary(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        track3 = self.module._make_track("/resource/track3", "audio/dummy")
+        track1 = self.module._make_track("/resource/track1", "audio/mpeg", 1)
+        track2 = self.module._make_track("/resource/track2", "audio/mpeg", 2)
+        track3 = self.module._make_track("/resource/track3", "audio/mpeg", 3)
+        track1.duration = 120
+        track2.duration = 60
         self.module.players = {
-            "the-uuid": {
-                "uuid": "the-uuid",
-                "player": None,
-                "pipeline": [],
-                "playlist": {
-                    "tracks": [track1, track3],
-                    "index": 0,
-                },
-                "internal": {
-                    "to_destroy": False,
-                },
-            }
+            "the-uuid": Player(
+                uuid="the-uuid",
+                playlist=Playlist(
+                    index=1,
+                    tracks=[track1, track2, track3],
+                    version=3,
+                ),
+            )
         }
 
-        index = self.module._get_track_index("the-uuid", track2)
-        self.assertEqual(index, 0)
+        result = self.module.get_playlist("the-uuid", summary=True)
 
-    def test_pause_playback_while_playing(self):
+        self.assertDictEqual(
+            result, {"count": 3, "index": 1, "total_duration": 180, "version": 3}
+        )
+
+    def test_get_playlist_invalid_params(self):
         self.init()
-        player = Mock()
-        player.get_state.return_value = ("dummy", Gst.State.PLAYING, "dummy")
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": [track1],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": player,
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
-        self.module._set_volume = Mock()
 
-        self.module.pause_playback("the-uuid")
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.get_playlist("dummy")
+        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
 
-        player.get_state.assert_called_with(1)
-        player.set_state.assert_called_with(Gst.State.PAUSED)
-        self.module._set_volume.assert_not_called()
+        self.module.players = {"the-uuid": Player(uuid="the-uuid")}
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.get_playlist("the-uuid", offset=-1)
+        self.assertEqual(str(cm.exception), "Offset must be positive")
 
-    def test_pause_playback_with_volume(self):
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.get_playlist("the-uuid", limit=0)
+        self.assertEqual(str(cm.exception), "Limit must be greater than 0")
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.get_playlist("the-uuid", fields=["dummy"])
+        self.assertEqual(
+            str(cm.exception),
+            "Fields must be in ['id', 'resource', 'audio_format', 'duration']",
+        )
+
+    def test_fade_volume(self):
         self.init()
-        player = Mock()
-        player.get_state.return_value = ("dummy", Gst.State.PLAYING, "dummy")
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": [track1],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": player,
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
-        self.module._set_volume = Mock()
+        self.module.players = {"the-uuid": Player(uuid="the-uuid")}
+        self.module._Audioplayer__fade_volume = Mock()
 
-        self.module.pause_playback("the-uuid", volume=66)
+        self.module.fade_volume("the-uuid", 20, 3000, "cubic")
 
-        self.module._set_volume.assert_called_with("the-uuid", 66)
+        self.module._Audioplayer__fade_volume.assert_called_with(
+            "the-uuid", 20, 3000, "cubic"
+        )
 
-    def test_pause_playback_force_play(self):
+    def test_fade_volume_invalid_params(self):
         self.init()
-        player = Mock()
-        player.get_state.return_value = ("dummy", Gst.State.PLAYING, "dummy")
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": [track1],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": player,
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
+        self.module.players = {"the-uuid": Player(uuid="the-uuid")}
 
-        self.module.pause_playback("the-uuid", force_play=True)
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.fade_volume("dummy", 20, 3000)
+        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
 
-        player.set_state.assert_called_with(Gst.State.PLAYING)
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.fade_volume("the-uuid", 101, 3000)
+        self.assertEqual(str(cm.exception), "Volume must be between 0 and 100")
 
-    def test_pause_playback_force_pause(self):
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.fade_volume("the-uuid", 20, 0)
+        self.assertEqual(str(cm.exception), "Duration must be between 1 and 60000")
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.fade_volume("the-uuid", 20, 3000, "dummy")
+        self.assertEqual(str(cm.exception), 'Fade curve "dummy" is not supported')
+
+    def test_set_position_updates(self):
         self.init()
-        player = Mock()
-        player.get_state.return_value = ("dummy", Gst.State.PLAYING, "dummy")
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": [track1],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": player,
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
+        pipeline = Mock()
+        player_data = Player(
+            uuid="the-uuid",
+            player=pipeline,
+            internal=PlayerInternal(position_interval=0),
+        )
         self.module.players = {"the-uuid": player_data}
 
-        self.module.pause_playback("the-uuid", force_pause=True)
+        self.module.set_position_updates("the-uuid", 2)
+        self.assertEqual(player_data.internal.position_interval, 2)
+        pipeline.get_by_name.return_value.set_property.assert_called_with(
+            "update-freq", 2
+        )
 
-        player.set_state.assert_called_with(Gst.State.PAUSED)
+        self.module.set_position_updates("the-uuid", 0)
+        self.assertEqual(player_data.internal.position_interval, 0)
+        pipeline.get_by_name.return_value.set_property.assert_called_with(
+            "update-freq", 15
+        )
 
-    def test_pause_playback_while_paused(self):
+    def test_set_latency_profile(self):
         self.init()
-        player = Mock()
-        player.get_state.return_value = ("dummy", Gst.State.PAUSED, "dummy")
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": [track1],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": player,
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
+        player_data = Player(uuid="the-uuid")
         self.module.players = {"the-uuid": player_data}
 
-        self.module.pause_playback("the-uuid")
+        self.module.set_latency_profile("the-uuid", "robust")
 
-        player.get_state.assert_called_with(1)
-        player.set_state.assert_called_with(Gst.State.PLAYING)
+        self.assertEqual(player_data.internal.latency_profile, "robust")
 
-    def test_pause_playback_invalid_params(self):
+    def test_set_latency_profile_invalid_params(self):
         self.init()
+        self.module.players = {"the-uuid": Player(uuid="the-uuid")}
 
         with self.assertRaises(InvalidParameter) as cm:
-            self.module.pause_playback("dummy")
+            self.module.set_latency_profile("dummy", "robust")
         self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
 
-    def test_stop_playback(self):
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_latency_profile("the-uuid", "dummy")
+        self.assertEqual(
+            str(cm.exception), 'Latency profile "dummy" is not supported'
+        )
+
+    def test_set_position_updates_invalid_params(self):
         self.init()
-        player = Mock()
+        self.module.players = {"the-uuid": Player(uuid="the-uuid")}
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_position_updates("dummy", 1)
+        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_position_updates("the-uuid", 61)
+        self.assertEqual(str(cm.exception), "Interval must be between 0 and 60")
+
+    def test_set_volume(self):
+        self.init()
+        volume = Mock()
         track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 0,
-                "tracks": [track1],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-                "duration": 12,
-            },
-            "player": player,
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=[track1],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=volume,
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=Gst.State.PLAYING,
+                fade=None,
+            ),
+        )
         self.module.players = {"the-uuid": player_data}
-        self.module._destroy_player = Mock()
 
-        self.module.stop_playback("the-uuid")
+        self.module.set_volume("the-uuid", 1)
+        self.module.set_volume("the-uuid", 100)
+        self.module.set_volume("the-uuid", 66)
+
+        self.assertEqual(player_data.playlist.volume, 66)
+        volume.set_property.assert_called_with("volume", 0.66)
+
+    def test_set_volume_coalesce(self):
+        self.init()
+        self.module.players = {"the-uuid": Player(uuid="the-uuid")}
+        self.module._set_volume = Mock()
+
+        with patch("backend.audioplayer.threading.Timer") as timer_mock:
+            self.module.set_volume("the-uuid", 10, coalesce=True)
+            self.module.set_volume("the-uuid", 20, coalesce=True)
+            self.module.set_volume("the-uuid", 30, coalesce=True)
+
+            timer_mock.assert_called_once()
+            timer_mock.return_value.start.assert_called_once()
+            self.module._set_volume.assert_not_called()
+
+        self.module._Audioplayer__apply_pending_volumes()
 
-        player.set_state.assert_called_with(Gst.State.NULL)
-        self.module._destroy_player.assert_called_with(player_data)
-        self.session.assert_event_called_with(
-            "audioplayer.playback.update",
+        self.module._set_volume.assert_called_once_with("the-uuid", 30)
+        self.assertDictEqual(
+            self.module.get_stats(),
             {
-                "playeruuid": "the-uuid",
-                "state": "stopped",
+                "volume_updates": 1,
+                "volume_merged": 2,
+                "pending_teardowns": 0,
+                "clip_cache": {
+                    "clips": 0,
+                    "size": 0,
+                    "max_size": 4 * 1024 * 1024,
+                    "hits": 0,
+                    "misses": 0,
+                },
             },
         )
 
-    def test_stop_playback_invalid_params(self):
+    def test_set_volume_coalesce_player_destroyed(self):
         self.init()
+        self.module.players = {"the-uuid": Player(uuid="the-uuid")}
+        self.module._set_volume = Mock()
 
-        with self.assertRaises(InvalidParameter) as cm:
-            self.module.stop_playback("dummy")
-        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
+        with patch("backend.audioplayer.threading.Timer"):
+            self.module.set_volume("the-uuid", 10, coalesce=True)
+        self.module.players = {}
+        self.module._Audioplayer__apply_pending_volumes()
 
-    def test_play_next_track(self):
+        self.module._set_volume.assert_not_called()
+
+    def test_set_volume_coalesce_player_error(self):
         self.init()
-        player = Mock()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 0,
-                "tracks": [track1, track2],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": player,
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
+        self.module.players = {
+            "uuid1": Player(uuid="uuid1"),
+            "uuid2": Player(uuid="uuid2"),
         }
-        self.module.players = {"the-uuid": player_data}
-        self.module._Audioplayer__play_next_track = Mock(return_value=True)
+        self.module._set_volume = Mock(side_effect=[Exception("Test"), None])
 
-        result = self.module.play_next_track("the-uuid")
+        with patch("backend.audioplayer.threading.Timer"):
+            self.module.set_volume("uuid1", 10, coalesce=True)
+            self.module.set_volume("uuid2", 20, coalesce=True)
+        self.module._Audioplayer__apply_pending_volumes()
 
-        self.assertTrue(result)
-        self.module._Audioplayer__play_next_track.assert_called_with("the-uuid")
+        self.module._set_volume.assert_called_with("uuid2", 20)
+        self.assertEqual(self.module.get_stats()["volume_updates"], 1)
 
-    def test_play_next_track_no_more_track(self):
+    def test_set_volume_coalesce_invalid_params(self):
         self.init()
-        player = Mock()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": [track1, track2],
-                "repeat": False,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": player,
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_volume("the-uuid", 0, coalesce=True)
+        self.assertEqual(str(cm.exception), "Volume must be between 1 and 100")
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_volume("the-uuid", "10", coalesce=True)
+        self.assertEqual(str(cm.exception), "Volume must be between 1 and 100")
+
+    def test_set_volume_invalid_params(self):
+        self.init()
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=[{}],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=Gst.State.PLAYING,
+            ),
+        )
         self.module.players = {"the-uuid": player_data}
-        self.module._Audioplayer__play_next_track = Mock(return_value=True)
 
-        result = self.module.play_next_track("the-uuid")
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_volume("dummy", 50)
+        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
 
-        self.assertFalse(result)
-        self.module._Audioplayer__play_next_track.assert_not_called()
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_volume("the-uuid", -1)
+        self.assertEqual(str(cm.exception), "Volume must be between 1 and 100")
 
-    def test_play_next_track_no_more_track_but_repeat_enabled(self):
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_volume("the-uuid", 101)
+        self.assertEqual(str(cm.exception), "Volume must be between 1 and 100")
+
+    def test_set_repeat(self):
         self.init()
-        player = Mock()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": [track1, track2],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": player,
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=[{}],
+                repeat=True,
+                volume=55,
+                metadata={},
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                shuffle_order=None,
+                to_destroy=False,
+                tags_sent=True,
+                last_state=Gst.State.PLAYING,
+            ),
+        )
         self.module.players = {"the-uuid": player_data}
-        self.module._Audioplayer__play_next_track = Mock(return_value=True)
 
-        result = self.module.play_next_track("the-uuid")
+        self.module.set_repeat("the-uuid", False)
+        self.assertFalse(player_data.playlist.repeat)
 
-        self.assertTrue(result)
-        self.module._Audioplayer__play_next_track.assert_called_with("the-uuid")
+        self.module.set_repeat("the-uuid", True)
+        self.assertTrue(player_data.playlist.repeat)
 
-    def test_play_next_track_error_playing_track(self):
+    def test_set_repeat_keep_shuffle(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 0,
-                "tracks": [track1, track2],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
+        tracks = [
+            self.module._make_track(f"/resource/track{index}", "audio/dummy", index)
+            for index in range(5)
+        ]
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=list(tracks),
+                repeat=False,
+                shuffle=False,
+                volume=55,
+                metadata={},
+                version=0,
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=Gst.State.PLAYING,
+                tracks_index={track.id: position for position, track in enumerate(tracks)},
+                shuffle_order=None,
+            ),
+        )
         self.module.players = {"the-uuid": player_data}
-        self.module._Audioplayer__play_next_track = Mock(return_value=False)
+        self.module.shuffle_playlist("the-uuid")
+        shuffle_order = player_data.internal.shuffle_order
 
-        with self.assertRaises(CommandError) as cm:
-            self.module.play_next_track("the-uuid")
-        self.assertEqual(str(cm.exception), "Error playing next track")
+        self.module.set_repeat("the-uuid", True)
+        self.module.set_repeat("the-uuid", False)
 
-    def test_play_next_track_invalid_params(self):
+        self.assertTrue(player_data.playlist.shuffle)
+        self.assertIs(player_data.internal.shuffle_order, shuffle_order)
+
+        self.module.set_repeat("the-uuid", True, shuffle=False)
+
+        self.assertTrue(player_data.playlist.repeat)
+        self.assertFalse(player_data.playlist.shuffle)
+        self.assertIsNone(player_data.internal.shuffle_order)
+
+    def test_set_repeat_invalid_params(self):
         self.init()
 
         with self.assertRaises(InvalidParameter) as cm:
-            self.module.play_next_track("dummy")
+            self.module.set_repeat("dummy", True)
         self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
 
-    def test__play_next_track(self):
+    def test_shuffle_playlist(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 0,
-                "tracks": [track1, track2],
-                "repeat": False,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
+        tracks = [
+            self.module._make_track(f"/resource/track{index}", "audio/dummy", index)
+            for index in range(5)
+        ]
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=2,
+                tracks=list(tracks),
+                repeat=False,
+                shuffle=False,
+                volume=55,
+                metadata={},
+                version=0,
+            ),
+            player=Mock(),
+            source=Mock(),
+            volume=Mock(),
+            pipeline=[],
+            internal=PlayerInternal(
+                to_destroy=False,
+                tags_sent=True,
+                last_state=Gst.State.PLAYING,
+                tracks_index={track.id: position for position, track in enumerate(tracks)},
+                shuffle_order=None,
+            ),
+        )
         self.module.players = {"the-uuid": player_data}
-        self.module._Audioplayer__handle_end_of_playlist = Mock()
         self.module._Audioplayer__play_track = Mock()
 
-        result = self.module._Audioplayer__play_next_track("the-uuid")
-
-        self.assertTrue(result)
-        self.module._Audioplayer__handle_end_of_playlist.assert_not_called()
-        self.module._Audioplayer__play_track.assert_called_with(track2, "the-uuid")
-        self.assertEqual(player_data["playlist"]["index"], 1)
+        self.module.shuffle_playlist("the-uuid")
 
-    def test__play_next_track_exception(self):
-        self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 0,
-                "tracks": [track1, track2],
-                "repeat": False,
-                "volume": 55,
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
+        self.assertTrue(player_data.playlist.shuffle)
+        self.assertListEqual(player_data.playlist.tracks, tracks)
+        self.assertEqual(player_data.playlist.index, 2)
+        self.session.assert_event_called_with(
+            "audioplayer.playlist.update",
+            {
+                "playeruuid": "the-uuid",
+                "version": 1,
+                "index": 2,
+                "changes": [{"action": "shuffle", "shuffle": True}],
             },
-        }
-        self.module.players = {"the-uuid": player_data}
-        self.module._Audioplayer__handle_end_of_playlist = Mock()
-        self.module._Audioplayer__play_track = Mock(
-            side_effect=Exception("Test exception")
         )
 
-        result = self.module._Audioplayer__play_next_track("the-uuid")
+        # reshuffling an already shuffled playlist doesn't change it
+        self.module.shuffle_playlist("the-uuid")
+        self.assertEqual(
+            self.session.event_call_count("audioplayer.playlist.update"), 1
+        )
 
-        self.assertFalse(result)
-        self.module._Audioplayer__handle_end_of_playlist.assert_not_called()
+        # all other tracks are played once in shuffled order
+        played = []
+        while self.module.play_next_track("the-uuid"):
+            played.append(player_data.playlist.index)
+        self.assertListEqual(sorted(played), [0, 1, 3, 4])
+        self.assertEqual(self.module._Audioplayer__play_track.call_count, 4)
 
-    def test__play_next_track_handle_end_of_playlist(self):
+        # previous track follows shuffled order
+        self.assertTrue(self.module.play_previous_track("the-uuid"))
+        self.assertEqual(player_data.playlist.index, played[-2])
+
+    def test_unshuffle_playlist(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": [track1, track2],
-                "repeat": False,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
+        tracks = [
+            self.module._make_track(f"/resource/track{index}", "audio/dummy", index)
+            for index in range(5)
+        ]
+        player_data = Player(
+            uuid="the-uuid",
+            playlist=Playlist(
+                index=0,
+                tracks=list(tracks),
+                repeat=False,
+                shuffle=False,
+                volume=55,
+                metadata={},
+            ),
+            internal=PlayerInternal(
+                tracks_index={track.id: position for position, track in enumerate(tracks)},
+                shuffle_order=None,
+            ),
+        )
         self.module.players = {"the-uuid": player_data}
+        self.module._Audioplayer__play_track = Mock()
+        self.module.shuffle_playlist("the-uuid")
+        self.module.play_next_track("the-uuid")
+        current_index = player_data.playlist.index
 
-        self.module._Audioplayer__handle_end_of_playlist = Mock(return_value=False)
-        result = self.module._Audioplayer__play_next_track("the-uuid")
-        self.assertFalse(result)
+        self.module.unshuffle_playlist("the-uuid")
 
-        self.module._Audioplayer__handle_end_of_playlist.return_value = True
-        result = self.module._Audioplayer__play_next_track("the-uuid")
-        self.assertTrue(result)
+        self.assertFalse(player_data.playlist.shuffle)
+        self.assertIsNone(player_data.internal.shuffle_order)
+        self.assertListEqual(player_data.playlist.tracks, tracks)
+        self.assertEqual(player_data.playlist.index, current_index)
+        self.session.assert_event_called_with(
+            "audioplayer.playlist.update",
+            {
+                "playeruuid": "the-uuid",
+                "version": 2,
+                "index": current_index,
+                "changes": [{"action": "shuffle", "shuffle": False}],
+            },
+        )
 
-    def test__play_next_track_invalid_params(self):
+    def test_shuffle_playlist_invalid_params(self):
         self.init()
 
-        self.assertFalse(self.module._Audioplayer__play_next_track("dummy"))
+        with self.assertRaises(CommandError) as cm:
+            self.module.shuffle_playlist("dummy")
+        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
 
-    def test__handle_end_of_playlist(self):
+        with self.assertRaises(CommandError) as cm:
+            self.module.unshuffle_playlist("dummy")
+        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
+
+    def test_set_output_format(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": [track1, track2],
-                "repeat": False,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
-        self.module._destroy_player = Mock()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module._Audioplayer__negotiate_output_caps = Mock()
+        self.module.output_caps = "caps"
 
-        result = self.module._Audioplayer__handle_end_of_playlist("the-uuid")
+        result = self.module.set_output_format(48000, 2, "F32LE")
 
-        self.assertFalse(result)
-        self.module._destroy_player.assert_called_with(player_data)
+        self.assertTrue(result)
+        self.module._set_config_field.assert_called_with(
+            "output_format", {"rate": 48000, "channels": 2, "format": "F32LE"}
+        )
+        self.module._Audioplayer__negotiate_output_caps.assert_called()
 
-    def test__handle_end_of_playlist_repeat_enabled(self):
+    def test_set_output_format_unsupported_by_sink(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": [track1, track2],
-                "repeat": True,
-                "shuffle": False,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
-        self.module._destroy_player = Mock()
-        self.module._Audioplayer__play_track = Mock()
-        self.module.shuffle_playlist = Mock()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module._Audioplayer__negotiate_output_caps = Mock()
+        self.module.output_caps = None
 
-        result = self.module._Audioplayer__handle_end_of_playlist("the-uuid")
+        self.assertFalse(self.module.set_output_format(rate=48000))
+        self.assertTrue(self.module.set_output_format())
 
-        self.assertTrue(result)
-        self.module._destroy_player.assert_not_called()
-        self.module._Audioplayer__play_track.assert_called_with(track1, "the-uuid")
-        self.module.shuffle_playlist.assert_not_called()
+    def test_set_output_format_invalid_params(self):
+        self.init()
 
-    def test__handle_end_of_playlist_shuffle_enabled(self):
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_output_format(rate=100)
+        self.assertEqual(str(cm.exception), "Rate must be between 8000 and 192000")
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_output_format(channels=0)
+        self.assertEqual(str(cm.exception), "Channels must be between 1 and 8")
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_output_format(sample_format="U8")
+        self.assertEqual(str(cm.exception), 'Sample format "U8" is not supported')
+
+    def test_set_audio_sink(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": [track1, track2],
-                "repeat": True,
-                "shuffle": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
-        self.module._destroy_player = Mock()
-        self.module._Audioplayer__play_track = Mock()
-        self.module.shuffle_playlist = Mock()
+        self.module._set_config_field = Mock(return_value=True)
+        self.module._Audioplayer__resolve_audio_sink = Mock()
+        self.module._Audioplayer__negotiate_output_caps = Mock()
+        self.module.element_factories["alsasink"] = Mock()
+        self.module.clip_player = Mock()
 
-        result = self.module._Audioplayer__handle_end_of_playlist("the-uuid")
+        self.module.set_audio_sink("alsasink", "hw:1,0")
 
-        self.assertTrue(result)
-        self.module._destroy_player.assert_not_called()
-        self.module._Audioplayer__play_track.assert_called_with(track1, "the-uuid")
-        self.module.shuffle_playlist.assert_called()
+        self.module._set_config_field.assert_called_with(
+            "audio_sink", {"element": "alsasink", "device": "hw:1,0"}
+        )
+        self.module._Audioplayer__resolve_audio_sink.assert_called()
+        self.module._Audioplayer__negotiate_output_caps.assert_called()
+        self.module.clip_player.stop.assert_called()
 
-    def test_play_previous_track(self):
+    def test_set_audio_sink_reset(self):
         self.init()
-        player = Mock()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": [track1, track2],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": player,
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
-        self.module._Audioplayer__play_track = Mock()
+        self.module._set_config_field = Mock(return_value=True)
 
-        result = self.module.play_previous_track("the-uuid")
+        self.module.set_audio_sink()
 
-        self.assertTrue(result)
-        self.assertEqual(player_data["playlist"]["index"], 0)
-        self.module._Audioplayer__play_track.assert_called_with(track1, "the-uuid")
+        self.module._set_config_field.assert_called_with(
+            "audio_sink", {"element": None, "device": None}
+        )
 
-    def test_play_previous_track_first_track(self):
+    def test_set_audio_sink_invalid_params(self):
         self.init()
-        player = Mock()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 0,
-                "tracks": [track1, track2],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": player,
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
-        self.module._Audioplayer__play_track = Mock(return_value=True)
 
-        result = self.module.play_previous_track("the-uuid")
+        with patch("backend.audioplayer.Gst") as gstMock:
+            gstMock.ElementFactory.find.return_value = None
+            with self.assertRaises(InvalidParameter) as cm:
+                self.module.set_audio_sink("dummysink")
+            self.assertEqual(
+                str(cm.exception), 'Audio sink "dummysink" is not installed'
+            )
 
-        self.assertFalse(result)
-        self.assertEqual(player_data["playlist"]["index"], 0)
-        self.module._Audioplayer__play_track.assert_not_called()
+        with self.assertRaises(MissingParameter) as cm:
+            self.module.set_audio_sink(device="hw:1,0")
+        self.assertEqual(
+            str(cm.exception), "Parameter element must be specified with device"
+        )
 
-    def test_play_previous_track_error_playing_track(self):
+    def test_set_audio_sink_failed(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": [track1, track2],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": 1,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
-        self.module._Audioplayer__play_track = Mock(
-            side_effect=Exception("Test exception")
-        )
+        self.module._set_config_field = Mock(return_value=False)
 
-        with self.assertRaises(Exception) as cm:
-            self.module.play_previous_track("the-uuid")
-        self.assertEqual(str(cm.exception), "Test exception")
+        with self.assertRaises(CommandError) as cm:
+            self.module.set_audio_sink()
+        self.assertEqual(str(cm.exception), "Unable to save configuration")
 
-    def test_play_previous_track_invalid_params(self):
+    def test_set_clip_cache_size(self):
         self.init()
+        self.module._set_config_field = Mock(return_value=True)
 
-        with self.assertRaises(InvalidParameter) as cm:
-            self.module.play_previous_track("dummy")
-        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
+        self.module.set_clip_cache_size(8)
 
-    def test_play_track(self):
+        self.module._set_config_field.assert_called_with("clip_cache_size", 8)
+        self.assertEqual(self.module.clip_cache.max_size, 8 * 1024 * 1024)
+
+    def test_set_clip_cache_size_invalid_params(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 0,
-                "tracks": [track1, track2],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-                "duration": 666,
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": Gst.State.PLAYING,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
-        self.module._Audioplayer__play_track = Mock()
 
-        result = self.module.play_track("the-uuid", 1)
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_clip_cache_size(65)
+        self.assertEqual(str(cm.exception), "Size must be between 1 and 64")
 
-        self.assertTrue(result)
-        self.module._Audioplayer__play_track.assert_called_with(track2, "the-uuid")
+    def test_set_clip_cache_size_failed(self):
+        self.init()
+        self.module._set_config_field = Mock(return_value=False)
 
-    def test_play_track_invalid_track_index(self):
+        with self.assertRaises(CommandError) as cm:
+            self.module.set_clip_cache_size(8)
+        self.assertEqual(str(cm.exception), "Unable to save configuration")
+
+    def test_set_warmup(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 0,
-                "tracks": [track1, track2],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-                "duration": 666,
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": Gst.State.PLAYING,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
-        self.module._Audioplayer__play_track = Mock()
+        self.module._set_config_field = Mock(return_value=True)
 
-        result = self.module.play_track("the-uuid", 2)
-        self.assertFalse(result)
+        self.module.set_warmup(True)
 
-        result = self.module.play_track("the-uuid", -1)
-        self.assertFalse(result)
+        self.module._set_config_field.assert_called_with("warmup", True)
 
-        self.assertEqual(self.module._Audioplayer__play_track.call_count, 0)
+    def test_set_warmup_failed(self):
+        self.init()
+        self.module._set_config_field = Mock(return_value=False)
 
-    def test_play_track_invalid_player(self):
+        with self.assertRaises(CommandError) as cm:
+            self.module.set_warmup(True)
+        self.assertEqual(str(cm.exception), "Unable to save configuration")
+
+    def test_set_delta_events(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 0,
-                "tracks": [track1, track2],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-                "duration": 666,
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": Gst.State.PLAYING,
-            },
+        self.module._set_config_field = Mock(return_value=True)
+        self.module.players = {
+            "the-uuid": Player(
+                uuid="the-uuid",
+                internal=PlayerInternal(event_seq=3, last_event={"state": "playing"}),
+            )
         }
-        self.module.players = {"the-uuid": player_data}
-        self.module._Audioplayer__play_track = Mock()
 
-        result = self.module.play_track("an-uuid", 1)
+        self.module.set_delta_events(True)
 
-        self.assertFalse(result)
-        self.assertEqual(self.module._Audioplayer__play_track.call_count, 0)
+        self.module._set_config_field.assert_called_with("delta_events", True)
+        self.assertTrue(self.module.delta_events)
+        self.assertDictEqual(self.module.players["the-uuid"].internal.last_event, {})
 
-    def test_play_track_play_track_failed(self):
+    def test_set_idle_timeout(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 0,
-                "tracks": [track1, track2],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-                "duration": 666,
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": Gst.State.PLAYING,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
-        self.module._Audioplayer__play_track = Mock(
-            side_effect=Exception("Test exception")
-        )
+        self.module._set_config_field = Mock(return_value=True)
 
-        result = self.module.play_track("the-uuid", 1)
+        self.module.set_idle_timeout(300)
 
-        self.assertFalse(result)
+        self.module._set_config_field.assert_called_with("idle_timeout", 300)
+        self.assertEqual(self.module.idle_timeout, 300)
 
-    def test_get_players(self):
+    def test_set_idle_timeout_invalid_params(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": [track1, track2],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-                "duration": 666,
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": Gst.State.PLAYING,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
-
-        players = self.module.get_players()
-        logging.debug("Players: %s", players)
 
-        self.assertListEqual(
-            players,
-            [
-                {
-                    "playeruuid": "the-uuid",
-                    "track": track2,
-                    "state": "playing",
-                    "duration": 666,
-                    "index": 1,
-                    "metadata": {},
-                }
-            ],
-        )
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_idle_timeout(-1)
+        self.assertEqual(str(cm.exception), "Idle timeout must be positive")
 
-    def test_get_playlist(self):
+    def test_set_max_active_players(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 1,
-                "tracks": [track1, track2],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": Gst.State.PLAYING,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
+        self.module._set_config_field = Mock(return_value=True)
 
-        playlist = self.module.get_playlist("the-uuid")
-        logging.debug("Playlist: %s", playlist)
+        self.module.set_max_active_players(8)
 
-        self.assertEqual(playlist["index"], 1)
-        self.assertListEqual(playlist["tracks"], [track1, track2])
+        self.module._set_config_field.assert_called_with("max_active_players", 8)
+        self.assertEqual(self.module.max_active_players, 8)
 
-    def test_get_playlist_invalid_params(self):
+    def test_set_max_active_players_invalid_params(self):
         self.init()
 
         with self.assertRaises(InvalidParameter) as cm:
-            self.module.get_playlist("dummy")
-        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
+            self.module.set_max_active_players(-1)
+        self.assertEqual(str(cm.exception), "Max active players must be positive")
 
-    def test_set_volume(self):
+    def test_set_max_playlist_tracks(self):
         self.init()
-        volume = Mock()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 0,
-                "tracks": [track1],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": volume,
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": Gst.State.PLAYING,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
+        self.module._set_config_field = Mock(return_value=True)
 
-        self.module.set_volume("the-uuid", 1)
-        self.module.set_volume("the-uuid", 100)
-        self.module.set_volume("the-uuid", 66)
+        self.module.set_max_playlist_tracks(10000)
 
-        self.assertEqual(player_data["playlist"]["volume"], 66)
-        volume.set_property.assert_called_with("volume", 0.66)
+        self.module._set_config_field.assert_called_with("max_playlist_tracks", 10000)
+        self.assertEqual(self.module.max_playlist_tracks, 10000)
 
-    def test_set_volume_invalid_params(self):
+    def test_set_max_playlist_tracks_invalid_params(self):
         self.init()
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 0,
-                "tracks": [{}],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": Gst.State.PLAYING,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
 
         with self.assertRaises(InvalidParameter) as cm:
-            self.module.set_volume("dummy", 50)
-        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
+            self.module.set_max_playlist_tracks(0)
+        self.assertEqual(str(cm.exception), "Max tracks must be between 1 and 100000")
 
         with self.assertRaises(InvalidParameter) as cm:
-            self.module.set_volume("the-uuid", -1)
-        self.assertEqual(str(cm.exception), "Volume must be between 1 and 100")
+            self.module.set_max_playlist_tracks(100001)
+        self.assertEqual(str(cm.exception), "Max tracks must be between 1 and 100000")
 
-        with self.assertRaises(InvalidParameter) as cm:
-            self.module.set_volume("the-uuid", 101)
-        self.assertEqual(str(cm.exception), "Volume must be between 1 and 100")
+    def test_set_loudness_analysis(self):
+        self.init()
+        self.module._update_config = Mock(return_value=True)
+        self.module.loudness_analyzer = Mock()
 
-    def test_set_repeat(self):
+        self.module.set_loudness_analysis(True, workers=2, niceness=10)
+
+        self.module._update_config.assert_called_with(
+            {
+                "loudness_analysis": True,
+                "loudness_workers": 2,
+                "loudness_niceness": 10,
+            }
+        )
+        self.module.loudness_analyzer.stop.assert_called()
+        self.module.loudness_analyzer.start.assert_called()
+
+    def test_set_loudness_analysis_disable(self):
         self.init()
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 0,
-                "tracks": [{}],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": Gst.State.PLAYING,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
+        self.module._update_config = Mock(return_value=True)
+        self.module.loudness_analyzer = Mock()
 
-        self.module.set_repeat("the-uuid", False)
-        self.assertFalse(player_data["playlist"]["repeat"])
+        self.module.set_loudness_analysis(False)
 
-        self.module.set_repeat("the-uuid", True)
-        self.assertTrue(player_data["playlist"]["repeat"])
+        self.module._update_config.assert_called_with({"loudness_analysis": False})
+        self.module.loudness_analyzer.stop.assert_called()
+        self.module.loudness_analyzer.start.assert_not_called()
 
-    def test_set_repeat_invalid_params(self):
+    def test_set_loudness_analysis_invalid_params(self):
         self.init()
 
         with self.assertRaises(InvalidParameter) as cm:
-            self.module.set_repeat("dummy", True)
-        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
+            self.module.set_loudness_analysis(True, workers=0)
+        self.assertEqual(str(cm.exception), "Workers must be between 1 and 4")
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_loudness_analysis(True, niceness=20)
+        self.assertEqual(str(cm.exception), "Niceness must be between 0 and 19")
 
-    def test_shuffle_playlist_first_track_playing(self):
+    @patch("backend.audioplayer.os.path.isfile")
+    def test_analyze_loudness(self, isfile_mock):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        track3 = self.module._make_track("/resource/track3", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 0,
-                "tracks": [track1, track2, track3],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": Gst.State.PLAYING,
-            },
-        }
-        self.module.players = {"the-uuid": player_data}
+        isfile_mock.side_effect = [True, False, True]
+        self.module._get_config_field = Mock(return_value=True)
+        self.module.loudness_analyzer = Mock()
+        self.module.loudness_analyzer.analyze.side_effect = [True, False]
 
-        self.module.shuffle_playlist("the-uuid")
+        result = self.module.analyze_loudness(["/file1", "/file2", "/file3"])
 
-        self.assertDictEqual(player_data["playlist"]["tracks"][0], track1)
-        self.assertEqual(player_data["playlist"]["index"], 0)
+        self.assertEqual(result, 1)
+        self.module.loudness_analyzer.analyze.assert_any_call("/file1")
+        self.module.loudness_analyzer.analyze.assert_any_call("/file3")
 
-    def test_shuffle_playlist_last_track_playing(self):
+    def test_analyze_loudness_disabled(self):
         self.init()
-        track1 = self.module._make_track("/resource/track1", "audio/dummy")
-        track2 = self.module._make_track("/resource/track2", "audio/dummy")
-        track3 = self.module._make_track("/resource/track3", "audio/dummy")
-        player_data = {
-            "uuid": "the-uuid",
-            "playlist": {
-                "index": 2,
-                "tracks": [track1, track2, track3],
-                "repeat": True,
-                "volume": 55,
-                "metadata": {},
-            },
-            "player": Mock(),
-            "source": Mock(),
-            "volume": Mock(),
-            "pipeline": [],
-            "internal": {
-                "to_destroy": False,
-                "tags_sent": True,
-                "last_state": Gst.State.PLAYING,
-            },
+        self.module._get_config_field = Mock(return_value=False)
+
+        with self.assertRaises(CommandError) as cm:
+            self.module.analyze_loudness(["/file1"])
+        self.assertEqual(str(cm.exception), "Loudness analysis is disabled")
+
+    def test_get_loudness_analysis(self):
+        self.init()
+        self.module.loudness_analyzer = Mock()
+        self.module.loudness_analyzer.get_status.return_value = {
+            "pending": 1,
+            "analyzed": 2,
+            "workers": 1,
+            "niceness": 19,
         }
-        self.module.players = {"the-uuid": player_data}
 
-        self.module.shuffle_playlist("the-uuid")
+        result = self.module.get_loudness_analysis()
+
+        self.assertDictEqual(
+            result,
+            {
+                "enabled": False,
+                "pending": 1,
+                "analyzed": 2,
+                "workers": 1,
+                "niceness": 19,
+            },
+        )
+
+    def test__apply_loudness(self):
+        self.init()
+        self.module._get_config_field = Mock(return_value=True)
+        self.module.loudness_analyzer = Mock()
+        self.module.loudness_analyzer.get_gain.return_value = -6.5
+        player = MagicMock()
+        track = self.module._make_track("/resource/dummy", "audio/mpeg")
 
-        self.assertDictEqual(player_data["playlist"]["tracks"][0], track3)
-        self.assertEqual(player_data["playlist"]["index"], 0)
+        self.module._Audioplayer__apply_loudness(player, track)
 
-    def test_shuffle_playlist_invalid_params(self):
+        player.player.get_by_name.assert_called_with("gain")
+        player.player.get_by_name.return_value.set_property.assert_called_with(
+            "fallback-gain", -6.5
+        )
+
+    @patch("backend.audioplayer.os.path.isfile")
+    def test__apply_loudness_not_analyzed(self, isfile_mock):
         self.init()
+        isfile_mock.return_value = True
+        self.module._get_config_field = Mock(return_value=True)
+        self.module.loudness_analyzer = Mock()
+        self.module.loudness_analyzer.get_gain.return_value = None
+        player = MagicMock()
+        track = self.module._make_track("/resource/dummy", "audio/mpeg")
 
-        with self.assertRaises(CommandError) as cm:
-            self.module.shuffle_playlist("dummy")
-        self.assertEqual(str(cm.exception), 'Player "dummy" does not exist')
+        self.module._Audioplayer__apply_loudness(player, track)
+
+        player.player.get_by_name.assert_not_called()
+        self.module.loudness_analyzer.analyze.assert_called_with("/resource/dummy")
 
 
 class TestAudioplayerPlaybackUpdateEvent(unittest.TestCase):
@@ -2609,6 +5324,49 @@ class TestAudioplayerPlaybackUpdateEvent(unittest.TestCase):
                 "track",
                 "metadata",
                 "index",
+                "seq",
+                "latency_profile",
+            ],
+        )
+
+
+class TestAudioplayerPlaybackPositionEvent(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(
+            level=logging.FATAL,
+            format="%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s",
+        )
+        self.session = session.TestSession(self)
+        self.event = self.session.setup_event(AudioplayerPlaybackPositionEvent)
+
+    def test_event_params(self):
+        self.assertEqual(
+            self.event.EVENT_PARAMS,
+            [
+                "playeruuid",
+                "position",
+                "duration",
+            ],
+        )
+
+
+class TestAudioplayerPlaylistUpdateEvent(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(
+            level=logging.FATAL,
+            format="%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s",
+        )
+        self.session = session.TestSession(self)
+        self.event = self.session.setup_event(AudioplayerPlaylistUpdateEvent)
+
+    def test_event_params(self):
+        self.assertEqual(
+            self.event.EVENT_PARAMS,
+            [
+                "playeruuid",
+                "version",
+                "index",
+                "changes",
             ],
         )
 
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import os
+import sys
+import tempfile
+
+sys.path.append("../")
+from backend.clipcache import ClipCache, Clip
+from mock import Mock, patch
+
+
+class TestClipCache(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(
+            level=logging.FATAL,
+            format="%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s",
+        )
+        self.cache = ClipCache(logging.getLogger("test"), 100)
+        self.files = []
+        for _ in range(3):
+            handle, path = tempfile.mkstemp(prefix="audioplayer-clip-")
+            os.close(handle)
+            self.files.append(path)
+
+    def tearDown(self):
+        for path in self.files:
+            os.remove(path)
+
+    def test_clip_duration(self):
+        clip = Clip("/dummy", b"\0" * ClipCache.BYTES_PER_SECOND, 0)
+
+        self.assertEqual(clip.duration, 1000)
+
+    def test_get(self):
+        self.cache._decode = Mock(return_value=b"\0" * 40)
+
+        clip1 = self.cache.get(self.files[0])
+        clip2 = self.cache.get(self.files[0])
+
+        self.assertIs(clip1, clip2)
+        self.cache._decode.assert_called_once_with(self.files[0])
+        self.assertDictEqual(
+            self.cache.get_stats(),
+            {"clips": 1, "size": 40, "max_size": 100, "hits": 1, "misses": 1},
+        )
+
+    def test_get_file_changed(self):
+        self.cache._decode = Mock(side_effect=[b"\0" * 40, b"\0" * 30])
+        self.cache.get(self.files[0])
+        os.utime(self.files[0], (0, 0))
+
+        clip = self.cache.get(self.files[0])
+
+        self.assertEqual(len(clip.data), 30)
+        self.assertEqual(self.cache._decode.call_count, 2)
+        self.assertEqual(self.cache.get_stats()["size"], 30)
+
+    def test_get_evict_least_recently_used(self):
+        self.cache._decode = Mock(return_value=b"\0" * 40)
+        self.cache.get(self.files[0])
+        self.cache.get(self.files[1])
+        # first clip becomes most recently used
+        self.cache.get(self.files[0])
+
+        self.cache.get(self.files[2])
+
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["clips"], 2)
+        self.assertEqual(stats["size"], 80)
+        self.cache.get(self.files[0])
+        self.assertEqual(self.cache._decode.call_count, 3)
+
+    def test_get_decode_failed(self):
+        self.cache._decode = Mock(side_effect=Exception("Test exception"))
+
+        with self.assertRaises(Exception):
+            self.cache.get(self.files[0])
+        self.assertEqual(self.cache.get_stats()["clips"], 0)
+
+    def test_set_max_size(self):
+        self.cache._decode = Mock(return_value=b"\0" * 40)
+        self.cache.get(self.files[0])
+        self.cache.get(self.files[1])
+
+        self.cache.max_size = 50
+
+        self.assertEqual(self.cache.max_size, 50)
+        self.assertEqual(self.cache.get_stats()["clips"], 1)
+
+    def test_clear(self):
+        self.cache._decode = Mock(return_value=b"\0" * 40)
+        self.cache.get(self.files[0])
+
+        self.cache.clear()
+
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["clips"], 0)
+        self.assertEqual(stats["size"], 0)
+
+    @patch("backend.clipcache.Gst")
+    def test_decode(self, gstMock):
+        pipeline = gstMock.parse_launch.return_value
+        sink = pipeline.get_by_name.return_value
+        sample = Mock()
+        sample.get_buffer.return_value.extract_dup.side_effect = [b"ab", b"cd"]
+        sink.emit.side_effect = [sample, sample, None]
+        sink.get_property.return_value = True
+        pipeline.get_bus.return_value.pop_filtered.return_value = None
+
+        result = self.cache._decode("/dummy/clip.wav")
+
+        self.assertEqual(result, b"abcd")
+        pipeline.get_by_name.return_value.set_property.assert_called_with(
+            "location", "/dummy/clip.wav"
+        )
+        pipeline.set_state.assert_called_with(gstMock.State.NULL)
+
+    @patch("backend.clipcache.Gst")
+    def test_decode_too_large(self, gstMock):
+        pipeline = gstMock.parse_launch.return_value
+        sample = Mock()
+        sample.get_buffer.return_value.extract_dup.return_value = b"\0" * 101
+        pipeline.get_by_name.return_value.emit.return_value = sample
+
+        with self.assertRaises(Exception) as cm:
+            self.cache._decode("/dummy/clip.wav")
+        self.assertEqual(str(cm.exception), "Clip is larger than clip cache")
+        pipeline.set_state.assert_called_with(gstMock.State.NULL)
+
+    @patch("backend.clipcache.Gst")
+    def test_decode_error(self, gstMock):
+        pipeline = gstMock.parse_launch.return_value
+        pipeline.get_by_name.return_value.emit.return_value = None
+        message = pipeline.get_bus.return_value.pop_filtered.return_value
+        message.parse_error.return_value = (Mock(message="Test error"), None)
+
+        with self.assertRaises(Exception) as cm:
+            self.cache._decode("/dummy/clip.wav")
+        self.assertEqual(str(cm.exception), "Test error")
+
+    @patch("backend.clipcache.Gst")
+    def test_decode_timeout(self, gstMock):
+        pipeline = gstMock.parse_launch.return_value
+        sink = pipeline.get_by_name.return_value
+        sink.emit.return_value = None
+        sink.get_property.return_value = False
+        pipeline.get_bus.return_value.pop_filtered.return_value = None
+
+        with self.assertRaises(Exception) as cm:
+            self.cache._decode("/dummy/clip.wav")
+        self.assertEqual(str(cm.exception), "Clip decoding timed out")
+
+
+if __name__ == "__main__":
+    unittest.main()
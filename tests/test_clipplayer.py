@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+from array import array
+
+sys.path.append("../")
+from backend.clipplayer import ClipPlayer
+from backend.clipcache import Clip, ClipCache
+from mock import Mock, patch
+
+
+class TestClipPlayer(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(
+            level=logging.FATAL,
+            format="%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s",
+        )
+        self.player = ClipPlayer(logging.getLogger("test"))
+
+    @patch("backend.clipplayer.Gst")
+    def test_start(self, gstMock):
+        pipeline = gstMock.parse_launch.return_value
+        sink = Mock()
+
+        self.player.start(sink)
+        self.player.start(sink)
+
+        self.assertTrue(self.player.started)
+        gstMock.parse_launch.assert_called_once_with(ClipPlayer.PIPELINE)
+        gstMock.Caps.from_string.assert_called_with(ClipCache.CAPS)
+        pipeline.get_by_name.assert_any_call("resample")
+        pipeline.add.assert_called_once_with(sink)
+        pipeline.get_by_name.return_value.link.assert_called_once_with(sink)
+        pipeline.set_state.assert_called_once_with(gstMock.State.PLAYING)
+
+    @patch("backend.clipplayer.Gst")
+    def test_stop(self, gstMock):
+        pipeline = gstMock.parse_launch.return_value
+        self.player.start(Mock())
+
+        self.player.stop()
+        self.player.stop()
+
+        self.assertFalse(self.player.started)
+        pipeline.set_state.assert_called_with(gstMock.State.NULL)
+
+    @patch("backend.clipplayer.Gst")
+    def test_play(self, gstMock):
+        element = gstMock.parse_launch.return_value.get_by_name.return_value
+        element.emit.return_value = gstMock.FlowReturn.OK
+        self.player.start(Mock())
+        clip = Clip("/dummy", b"\0" * ClipCache.BYTES_PER_SECOND, 0)
+
+        self.player.play(clip, 100)
+
+        gstMock.Buffer.new_wrapped.assert_called_with(clip.data)
+        element.emit.assert_called_with(
+            "push-buffer", gstMock.Buffer.new_wrapped.return_value
+        )
+
+    @patch("backend.clipplayer.Gst")
+    def test_play_volume(self, gstMock):
+        element = gstMock.parse_launch.return_value.get_by_name.return_value
+        element.emit.return_value = gstMock.FlowReturn.OK
+        self.player.start(Mock())
+        samples = array("h", [1000, -1000, 32767, -32768])
+        if sys.byteorder == "big":
+            samples.byteswap()
+        clip = Clip("/dummy", samples.tobytes(), 0)
+
+        self.player.play(clip, 50)
+
+        scaled = array("h", gstMock.Buffer.new_wrapped.call_args[0][0])
+        if sys.byteorder == "big":
+            scaled.byteswap()
+        self.assertListEqual(scaled.tolist(), [500, -500, 16383, -16384])
+        # cached clip is not modified
+        self.assertEqual(clip.data, samples.tobytes())
+
+    @patch("backend.clipplayer.Gst")
+    def test_play_volume_scaled_once(self, gstMock):
+        element = gstMock.parse_launch.return_value.get_by_name.return_value
+        element.emit.return_value = gstMock.FlowReturn.OK
+        self.player.start(Mock())
+        clip = Clip("/dummy", b"\0\1" * 4, 0)
+
+        with patch.object(
+            ClipPlayer, "_scale_samples", wraps=ClipPlayer._scale_samples
+        ) as scaleMock:
+            self.player.play(clip, 50)
+            self.player.play(clip, 50)
+            self.player.play(clip, 20)
+            # clip decoded again after file update is scaled again
+            self.player.play(Clip("/dummy", clip.data, 1), 50)
+
+        self.assertEqual(scaleMock.call_count, 3)
+        self.assertEqual(
+            gstMock.Buffer.new_wrapped.call_args_list[0],
+            gstMock.Buffer.new_wrapped.call_args_list[1],
+        )
+
+    @patch("backend.clipplayer.Gst")
+    def test_play_volume_scaled_clips_limit(self, gstMock):
+        element = gstMock.parse_launch.return_value.get_by_name.return_value
+        element.emit.return_value = gstMock.FlowReturn.OK
+        self.player.start(Mock())
+        clips = [
+            Clip(f"/dummy{index}", b"\0\1", 0)
+            for index in range(ClipPlayer.SCALED_CLIPS + 1)
+        ]
+
+        with patch.object(
+            ClipPlayer, "_scale_samples", wraps=ClipPlayer._scale_samples
+        ) as scaleMock:
+            for clip in clips:
+                self.player.play(clip, 50)
+            # oldest scaled clip was dropped
+            self.player.play(clips[-1], 50)
+            self.player.play(clips[0], 50)
+
+        self.assertEqual(scaleMock.call_count, ClipPlayer.SCALED_CLIPS + 2)
+
+    @patch("backend.clipplayer.Gst")
+    def test_play_refused(self, gstMock):
+        element = gstMock.parse_launch.return_value.get_by_name.return_value
+        element.emit.return_value = gstMock.FlowReturn.FLUSHING
+        self.player.start(Mock())
+
+        with self.assertRaises(Exception):
+            self.player.play(Clip("/dummy", b"\0", 0), 100)
+
+    def test_play_not_started(self):
+        with self.assertRaises(Exception) as cm:
+            self.player.play(Clip("/dummy", b"\0", 0), 100)
+        self.assertEqual(str(cm.exception), "Clip player is not started")
+
+    @patch("backend.clipplayer.Gst")
+    def test_process(self, gstMock):
+        pipeline = gstMock.parse_launch.return_value
+        pipeline.get_bus.return_value.pop_filtered.return_value = None
+        self.player.start(Mock())
+
+        self.assertFalse(self.player.process())
+        self.assertTrue(self.player.started)
+
+    @patch("backend.clipplayer.Gst")
+    def test_process_error(self, gstMock):
+        pipeline = gstMock.parse_launch.return_value
+        message = pipeline.get_bus.return_value.pop_filtered.return_value
+        message.parse_error.return_value = ("error", "debug")
+        self.player.start(Mock())
+
+        self.assertTrue(self.player.process())
+        self.assertFalse(self.player.started)
+
+    def test_process_not_started(self):
+        self.assertFalse(self.player.process())
+
+
+if __name__ == "__main__":
+    unittest.main()
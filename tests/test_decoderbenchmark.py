@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import os
+import sys
+
+sys.path.append("../")
+from backend.decoderbenchmark import DecoderBenchmark, _measure_pipeline
+from mock import Mock, patch
+
+
+class TestDecoderBenchmark(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(
+            level=logging.FATAL,
+            format="%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s",
+        )
+        self.benchmark = DecoderBenchmark(logging.getLogger("test"))
+
+    def test_rank(self):
+        costs = {"decoder1": 0.3, "decoder2": 0.1, "decoder3": None}
+        descriptions = []
+
+        def run(description):
+            descriptions.append(description)
+            if "audiotestsrc" in description:
+                return 1.0
+            decoder = description.split(" ! ")[-2]
+            if costs[decoder] is None:
+                raise Exception("Test exception")
+            return costs[decoder]
+
+        self.benchmark._run = Mock(side_effect=run)
+
+        result = self.benchmark.rank(
+            "audio/flac", ["flacparse"], ["decoder3", "decoder1", "decoder2"]
+        )
+
+        self.assertListEqual(
+            result,
+            [
+                {"decoder": "decoder2", "cpu": 0.1},
+                {"decoder": "decoder1", "cpu": 0.3},
+                {"decoder": "decoder3", "cpu": None},
+            ],
+        )
+        # sample is generated once then removed
+        self.assertIn("flacenc", descriptions[0])
+        location = descriptions[0].split("location=")[1]
+        self.assertTrue(
+            descriptions[-1].startswith(f"filesrc location={location} ! flacparse ! ")
+        )
+        self.assertFalse(os.path.exists(location))
+
+    def test_rank_no_encoder(self):
+        with self.assertRaises(Exception) as cm:
+            self.benchmark.rank("audio/dummy", [], ["decoder"])
+        self.assertEqual(
+            str(cm.exception), 'No encoder to generate "audio/dummy" sample'
+        )
+
+    def test_rank_sample_failed(self):
+        self.benchmark._run = Mock(side_effect=Exception("Test exception"))
+
+        with self.assertRaises(Exception):
+            self.benchmark.rank("audio/flac", ["flacparse"], ["flacdec"])
+        self.benchmark._run.assert_called_once()
+
+    @patch("backend.decoderbenchmark.ProcessPoolExecutor")
+    def test_rank_benchmark_process(self, executorMock):
+        executor = executorMock.return_value
+        executor.submit.return_value.result.return_value = 0.2
+
+        result = self.benchmark.rank("audio/flac", ["flacparse"], ["flacdec"])
+
+        # pipelines are measured in a dedicated spawned process, not in module process
+        self.assertEqual(
+            executorMock.call_args[1]["mp_context"].get_start_method(), "spawn"
+        )
+        self.assertEqual(executor.submit.call_count, 1 + DecoderBenchmark.RUNS)
+        for args in executor.submit.call_args_list:
+            self.assertIs(args[0][0], _measure_pipeline)
+            self.assertEqual(args[0][2], DecoderBenchmark.PIPELINE_TIMEOUT)
+        executor.shutdown.assert_called_once()
+        self.assertListEqual(result, [{"decoder": "flacdec", "cpu": 0.2}])
+
+    @patch("backend.decoderbenchmark.Gst")
+    def test_measure_pipeline_error(self, gstMock):
+        message = Mock()
+        message.type = gstMock.MessageType.ERROR
+        message.parse_error.return_value = (Mock(message="Test error"), None)
+        pipeline = gstMock.parse_launch.return_value
+        pipeline.get_bus.return_value.timed_pop_filtered.return_value = message
+
+        with self.assertRaises(Exception) as cm:
+            _measure_pipeline("dummy", 60)
+        self.assertEqual(str(cm.exception), "Test error")
+        pipeline.set_state.assert_called_with(gstMock.State.NULL)
+
+    @patch("backend.decoderbenchmark.Gst")
+    def test_measure_pipeline_timeout(self, gstMock):
+        pipeline = gstMock.parse_launch.return_value
+        pipeline.get_bus.return_value.timed_pop_filtered.return_value = None
+
+        with self.assertRaises(Exception) as cm:
+            _measure_pipeline("dummy", 60)
+        self.assertEqual(str(cm.exception), "Pipeline timed out")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import sys
+import threading
+
+sys.path.append("../")
+from backend.lazyimport import LazyModule
+from mock import Mock
+
+
+class TestLazyModule(unittest.TestCase):
+    def test_not_loaded(self):
+        loader = Mock()
+
+        module = LazyModule(loader)
+
+        self.assertFalse(module.loaded)
+        loader.assert_not_called()
+
+    def test_load_on_attribute_access(self):
+        loader = Mock()
+        loader.return_value.attr = "value"
+        module = LazyModule(loader)
+
+        self.assertEqual(module.attr, "value")
+        self.assertEqual(module.attr, "value")
+
+        self.assertTrue(module.loaded)
+        loader.assert_called_once()
+
+    def test_load_concurrently(self):
+        loader = Mock()
+        module = LazyModule(loader)
+        threads = [threading.Thread(target=module.load) for _ in range(10)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        loader.assert_called_once()
+
+    def test_load_exception(self):
+        loader = Mock(side_effect=[ImportError("Test exception"), Mock()])
+        module = LazyModule(loader)
+
+        with self.assertRaises(ImportError):
+            module.load()
+        self.assertFalse(module.loaded)
+        module.load()
+
+        self.assertTrue(module.loaded)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import unittest
+import logging
+import sys
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+
+sys.path.append("../")
+from backend.loudnessanalyzer import LoudnessAnalyzer, _init_worker
+from mock import Mock, patch
+
+
+class StatResult:
+    def __init__(self, mtime, size):
+        self.st_mtime = mtime
+        self.st_size = size
+
+
+class SyncExecutor:
+    """
+    Executor running tasks in caller thread
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.kwargs = kwargs
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+    def shutdown(self, *args, **kwargs):
+        pass
+
+
+def get_thread_niceness():
+    """
+    Return niceness of a thread started in current process
+    """
+    result = []
+    thread = threading.Thread(
+        target=lambda: result.append(
+            os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+        )
+    )
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+class TestLoudnessAnalyzer(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(
+            level=logging.FATAL,
+            format="%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s",
+        )
+        self.fs = Mock()
+        self.fs.read_json.return_value = {
+            "/music/track.mp3": {
+                "gain": -4.0,
+                "peak": 0.5,
+                "mtime": 123,
+                "size": 456,
+            },
+        }
+        self.analyzer = LoudnessAnalyzer(
+            logging.getLogger("test"), self.fs, "/tmp/cache.json"
+        )
+
+    def tearDown(self):
+        self.analyzer.stop()
+
+    @patch("backend.loudnessanalyzer.os.path.exists", Mock(return_value=True))
+    @patch("backend.loudnessanalyzer.os.stat", Mock(return_value=StatResult(123, 456)))
+    def test_get_gain(self):
+        self.analyzer.start()
+
+        self.assertEqual(self.analyzer.get_gain("/music/track.mp3"), -4.0)
+        self.assertIsNone(self.analyzer.get_gain("/music/other.mp3"))
+
+    @patch("backend.loudnessanalyzer.os.path.exists", Mock(return_value=True))
+    @patch("backend.loudnessanalyzer.os.stat", Mock(return_value=StatResult(123, 456)))
+    def test_get_gain_limited_by_peak(self):
+        self.fs.read_json.return_value["/music/track.mp3"]["gain"] = 8.0
+        self.analyzer.start()
+
+        # peak 0.5 allows +6.02dB before clipping
+        self.assertAlmostEqual(self.analyzer.get_gain("/music/track.mp3"), 6.0206, 3)
+
+    @patch("backend.loudnessanalyzer.os.path.exists", Mock(return_value=True))
+    @patch("backend.loudnessanalyzer.os.stat", Mock(return_value=StatResult(999, 456)))
+    def test_get_gain_file_changed(self):
+        self.analyzer.start()
+
+        self.assertIsNone(self.analyzer.get_gain("/music/track.mp3"))
+
+    @patch("backend.loudnessanalyzer.os.path.exists", Mock(return_value=True))
+    @patch("backend.loudnessanalyzer.os.stat", Mock(return_value=StatResult(123, 456)))
+    @patch("backend.loudnessanalyzer.ProcessPoolExecutor", SyncExecutor)
+    @patch("backend.loudnessanalyzer._compute_replaygain")
+    def test_analyze(self, compute_mock):
+        compute_mock.return_value = (-3.0, 0.9)
+        self.analyzer.start()
+
+        self.assertFalse(self.analyzer.analyze("/music/track.mp3"))
+        self.assertTrue(self.analyzer.analyze("/music/new.mp3"))
+
+        compute_mock.assert_called_once_with("/music/new.mp3")
+        self.fs.write_json.assert_called()
+        self.assertEqual(self.analyzer.get_status()["pending"], 0)
+        self.assertEqual(self.analyzer.get_status()["analyzed"], 2)
+
+    @patch("backend.loudnessanalyzer.os.path.exists", Mock(return_value=True))
+    @patch("backend.loudnessanalyzer.os.stat", Mock(return_value=StatResult(123, 456)))
+    @patch("backend.loudnessanalyzer.ProcessPoolExecutor", SyncExecutor)
+    @patch("backend.loudnessanalyzer._compute_replaygain")
+    def test_analyze_failed(self, compute_mock):
+        compute_mock.side_effect = Exception("Test")
+        self.analyzer.start()
+
+        self.assertTrue(self.analyzer.analyze("/music/new.mp3"))
+
+        self.assertEqual(self.analyzer.get_status()["pending"], 0)
+        self.assertEqual(self.analyzer.get_status()["analyzed"], 1)
+
+    def test_analysis_process_threads_niceness(self):
+        # niceness of threads started by analysis process (as gstreamer streaming threads) is
+        # measured in a real worker process
+        niceness = min(os.getpriority(os.PRIO_PROCESS, 0) + 5, 19)
+        executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(niceness,),
+        )
+        try:
+            result = executor.submit(get_thread_niceness).result(30)
+        finally:
+            executor.shutdown()
+
+        self.assertEqual(result, niceness)
+        self.assertLess(os.getpriority(os.PRIO_PROCESS, 0), niceness)
+
+    def test_analyze_not_started(self):
+        self.assertFalse(self.analyzer.analyze("/music/new.mp3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
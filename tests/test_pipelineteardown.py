@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+import threading
+
+sys.path.append("../")
+from backend.pipelineteardown import PipelineTeardown
+from mock import Mock
+
+
+class TestPipelineTeardown(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(
+            level=logging.FATAL,
+            format="%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s",
+        )
+        self.teardown = PipelineTeardown(logging.getLogger("test"))
+
+    def tearDown(self):
+        self.teardown.stop()
+
+    def test_teardown(self):
+        pipeline = Mock()
+        elements = [Mock(), Mock(), Mock()]
+
+        PipelineTeardown.teardown(pipeline, elements)
+
+        pipeline.set_state.assert_not_called()
+        elements[0].unlink.assert_called_once_with(elements[1])
+        elements[1].unlink.assert_called_once_with(elements[2])
+        elements[2].unlink.assert_not_called()
+        for element in elements:
+            pipeline.remove.assert_any_call(element)
+
+    def test_submit_worker_not_started(self):
+        pipeline = Mock()
+        element = Mock()
+
+        self.teardown.submit(pipeline, [element])
+
+        pipeline.remove.assert_called_once_with(element)
+        self.assertEqual(self.teardown.pending, 0)
+
+    def test_submit(self):
+        release = threading.Event()
+        pipeline1 = Mock()
+        pipeline1.remove.side_effect = lambda element: release.wait(5)
+        pipeline2 = Mock()
+        element = Mock()
+        self.teardown.start()
+
+        self.teardown.submit(pipeline1, [Mock()])
+        self.teardown.submit(pipeline2, [element])
+
+        # pipeline blocked while releasing elements does not block caller
+        self.assertEqual(self.teardown.pending, 2)
+        release.set()
+        self.teardown.stop()
+        pipeline2.remove.assert_called_once_with(element)
+        self.assertEqual(self.teardown.pending, 0)
+
+    def test_submit_exception(self):
+        pipeline1 = Mock()
+        pipeline1.remove.side_effect = Exception("Test exception")
+        pipeline2 = Mock()
+        element = Mock()
+        self.teardown.logger = Mock()
+        self.teardown.start()
+
+        self.teardown.submit(pipeline1, [Mock()])
+        self.teardown.submit(pipeline2, [element])
+        self.teardown.stop()
+
+        self.teardown.logger.exception.assert_called_with("Error tearing down pipeline")
+        pipeline2.remove.assert_called_once_with(element)
+        self.assertEqual(self.teardown.pending, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
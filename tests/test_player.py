@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+
+sys.path.append("../")
+from backend.player import Player, Playlist, PlayerInternal
+from backend.track import Track
+from mock import Mock, patch
+
+
+class TestPlayer(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(
+            level=logging.FATAL,
+            format="%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s",
+        )
+
+    def test_defaults(self):
+        player1 = Player("uuid1")
+        player2 = Player("uuid2")
+
+        self.assertIsNone(player1.player)
+        self.assertListEqual(player1.pipeline, [])
+        self.assertIsInstance(player1.playlist, Playlist)
+        self.assertIsInstance(player1.internal, PlayerInternal)
+        # mutable defaults are not shared
+        self.assertIsNot(player1.pipeline, player2.pipeline)
+        self.assertIsNot(player1.playlist.tracks, player2.playlist.tracks)
+        self.assertIsNot(player1.internal.tracks_index, player2.internal.tracks_index)
+        self.assertIsNot(player1.internal.last_event, player2.internal.last_event)
+
+    @patch("backend.player.time.time", Mock(return_value=1000))
+    def test_internal_last_used(self):
+        self.assertEqual(PlayerInternal().last_used, 1000)
+        self.assertEqual(PlayerInternal(last_used=10).last_used, 10)
+
+    def test_playlist_to_dict(self):
+        track = Track(1, "/music/track.mp3", "audio/mpeg")
+        playlist = Playlist(index=0, tracks=[track], volume=50, version=2)
+
+        self.assertDictEqual(
+            playlist.to_dict(),
+            {
+                "index": 0,
+                "duration": None,
+                "tracks": [track.to_dict()],
+                "repeat": False,
+                "shuffle": False,
+                "volume": 50,
+                "metadata": None,
+                "version": 2,
+            },
+        )
+
+    def test_playlist_to_dict_window(self):
+        tracks = [Track(i, f"/music/track{i}.mp3", "audio/mpeg") for i in range(5)]
+        playlist = Playlist(index=0, tracks=tracks)
+
+        result = playlist.to_dict(offset=1, limit=2, fields=["id"])
+
+        self.assertListEqual(result["tracks"], [{"id": 1}, {"id": 2}])
+
+    def test_no_dict(self):
+        for obj in (Player("uuid"), Playlist(), PlayerInternal()):
+            with self.assertRaises(AttributeError):
+                obj.dummy = "value"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+
+sys.path.append("../")
+from backend.shuffleorder import ShuffleOrder
+
+
+class TestShuffleOrder(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(
+            level=logging.FATAL,
+            format="%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s",
+        )
+
+    def _play_all(self, order):
+        played = []
+        while order.has_next():
+            played.append(order.next())
+        return played
+
+    def test_next(self):
+        order = ShuffleOrder(range(100), 50)
+
+        played = self._play_all(order)
+
+        self.assertEqual(len(played), 99)
+        self.assertSetEqual(set(played), set(range(100)) - {50})
+        self.assertIsNone(order.next())
+
+    def test_next_without_current_track(self):
+        order = ShuffleOrder(range(10))
+
+        self.assertSetEqual(set(self._play_all(order)), set(range(10)))
+
+    def test_previous(self):
+        order = ShuffleOrder(range(10), 0)
+        first = order.next()
+        second = order.next()
+
+        self.assertEqual(order.previous(), first)
+        self.assertEqual(order.previous(), 0)
+        self.assertIsNone(order.previous())
+        self.assertEqual(order.next(), first)
+        self.assertEqual(order.next(), second)
+
+    def test_add(self):
+        order = ShuffleOrder(range(3), 0)
+
+        order.add(10)
+
+        self.assertSetEqual(set(self._play_all(order)), {1, 2, 10})
+
+    def test_remove(self):
+        order = ShuffleOrder(range(5), 0)
+        played = order.next()
+
+        order.remove(played)
+        order.remove(4 if played != 4 else 3)
+
+        self.assertEqual(len(self._play_all(order)), 2)
+        order.previous()
+        self.assertEqual(order.previous(), 0)
+
+    def test_play(self):
+        order = ShuffleOrder(range(5), 0)
+
+        order.play(3)
+
+        self.assertNotIn(3, self._play_all(order))
+        order.previous()
+        order.previous()
+        self.assertEqual(order.previous(), 3)
+        self.assertEqual(order.previous(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+
+sys.path.append("../")
+from backend.track import Track
+
+
+class TestTrack(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(
+            level=logging.FATAL,
+            format="%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s",
+        )
+
+    def test_to_dict(self):
+        track = Track(1, "/music/track.mp3", "audio/mpeg")
+
+        self.assertDictEqual(
+            track.to_dict(),
+            {
+                "id": 1,
+                "resource": "/music/track.mp3",
+                "audio_format": "audio/mpeg",
+                "duration": None,
+            },
+        )
+
+    def test_to_dict_fields(self):
+        track = Track(1, "/music/track.mp3", "audio/mpeg")
+
+        self.assertDictEqual(
+            track.to_dict(["resource", "audio_format"]),
+            {"resource": "/music/track.mp3", "audio_format": "audio/mpeg"},
+        )
+
+    def test_audio_format_is_interned(self):
+        audio_format = "".join(["audio/", "mpeg"])
+        track1 = Track(1, "/music/track1.mp3", audio_format)
+        track2 = Track(2, "/music/track2.mp3", "".join(["audio/", "mpeg"]))
+
+        self.assertIs(track1.audio_format, track2.audio_format)
+
+    def test_audio_format_none(self):
+        track = Track(1, "http://stream", None)
+
+        self.assertIsNone(track.audio_format)
+        track.audio_format = "audio/flac"
+        self.assertEqual(track.audio_format, "audio/flac")
+
+    def test_no_dict(self):
+        track = Track(1, "/music/track.mp3", "audio/mpeg")
+
+        with self.assertRaises(AttributeError):
+            track.dummy = "value"
+
+
+if __name__ == "__main__":
+    unittest.main()